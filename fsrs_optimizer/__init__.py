@@ -0,0 +1,11 @@
+"""Offline FSRS weight optimizer for the flashcard scheduler in ``src/lib/fsrs.js``.
+
+- ``fsrs_optimizer.model``: the client's FSRS formulas, replayed over card
+  histories with a vectorized loss and gradient (NumPy).
+- ``fsrs_optimizer.data``: loads ``review_logs`` (JSON/CSV export or the
+  Supabase REST API) into per-card histories.
+- ``fsrs_optimizer.optimize``: fits per-user weights and writes them to a
+  JSON file or ``user_settings.fsrs_weights`` (``python -m fsrs_optimizer``).
+
+Needs NumPy only (``pip install -r fsrs_optimizer/requirements.txt``).
+"""
@@ -0,0 +1,5 @@
+import sys
+
+from fsrs_optimizer.optimize import main
+
+sys.exit(main())
@@ -0,0 +1,181 @@
+"""Load ``review_logs`` rows and turn them into per-card review histories.
+
+Rows are what ``FSRSContext.answerCard`` inserts (``card_id``, ``user_id``,
+``rating``, ``state_before``, ``stability_after``, ``difficulty_after``) plus
+the table's ``reviewed_at`` default. They come from a JSON or CSV export of
+the table, or straight from Supabase's REST API.
+"""
+
+import csv
+import json
+import urllib.parse
+import urllib.request
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+RATINGS = {"AGAIN": 1, "HARD": 2, "GOOD": 3, "EASY": 4}
+COLUMNS = "user_id,card_id,rating,state_before,stability_after,difficulty_after,reviewed_at"
+PAGE_SIZE = 1000  # PostgREST's default max-rows on Supabase
+MS_PER_DAY = 86400 * 1000
+MAX_HISTORY = 256
+
+
+def load_logs(path):
+    """Rows of a ``review_logs`` export (``.json`` array or ``.csv`` with a header)."""
+    path = Path(path)
+    if path.suffix.lower() == ".csv":
+        with path.open(newline="", encoding="utf-8") as handle:
+            return list(csv.DictReader(handle))
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def fetch_logs(supabase_url, key, user_id=None, timeout=60):
+    """All ``review_logs`` rows (of one user, if given) from Supabase's REST API.
+
+    ``key`` is a service-role key to read every user, or a user's access
+    token to read that user's own logs under RLS.
+    """
+    rows, offset = [], 0
+    while True:
+        query = {"select": COLUMNS, "order": "user_id,card_id,reviewed_at", "limit": PAGE_SIZE, "offset": offset}
+        if user_id:
+            query["user_id"] = f"eq.{user_id}"
+        request = urllib.request.Request(
+            f"{supabase_url.rstrip('/')}/rest/v1/review_logs?{urllib.parse.urlencode(query)}",
+            headers={"apikey": key, "Authorization": f"Bearer {key}"},
+        )
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            page = json.load(response)
+        rows += page
+        if len(page) < PAGE_SIZE:
+            return rows
+        offset += PAGE_SIZE
+
+
+def _timestamp_ms(value):
+    return datetime.fromisoformat(str(value).replace("Z", "+00:00")).timestamp() * 1000
+
+
+def _number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+@dataclass
+class Histories:
+    """Review histories of a set of cards, one padded row per card, longest first.
+
+    ``elapsed[i, j]`` is the number of days between review ``j - 1`` and
+    review ``j`` of card ``i``; ``new_starts[i, j]`` marks reviews of a card in
+    state NEW (its first review, or a reset).
+    """
+
+    ratings: np.ndarray
+    elapsed: np.ndarray
+    new_starts: np.ndarray
+    start_stability: np.ndarray
+    start_difficulty: np.ndarray
+    lengths: np.ndarray
+
+    @property
+    def cards(self):
+        return len(self.lengths)
+
+    @property
+    def reviews(self):
+        return int(self.lengths.sum())
+
+    def subset(self, chosen):
+        """The histories of the cards at rows ``chosen``, longest first."""
+        chosen = np.sort(chosen)  # rows are already longest first
+        longest = int(self.lengths[chosen[0]]) if len(chosen) else 0
+        return Histories(
+            self.ratings[chosen, :longest], self.elapsed[chosen, :longest], self.new_starts[chosen, :longest],
+            self.start_stability[chosen], self.start_difficulty[chosen], self.lengths[chosen],
+        )
+
+    def batches(self, size, rng=None):
+        """Split into batches of ``size`` cards (shuffled when ``rng`` is given), each longest first."""
+        order = rng.permutation(self.cards) if rng is not None else np.arange(self.cards)
+        for start in range(0, self.cards, size):
+            yield self.subset(order[start:start + size])
+
+    def split(self, fraction, rng):
+        """``(train, held_out)``: a random ``fraction`` of the cards held out whole."""
+        order = rng.permutation(self.cards)
+        held = int(round(self.cards * fraction))
+        return self.subset(order[held:]), self.subset(order[:held])
+
+
+def build_histories(rows):
+    """Group rows by card into :class:`Histories` (rows without a valid rating are skipped)."""
+    cards, ratings, times, new, stability, difficulty = [], [], [], [], [], []
+    for row in rows:
+        rating = RATINGS.get(str(row.get("rating", "")).upper())
+        if rating is None or not row.get("reviewed_at"):
+            continue
+        cards.append(str(row["card_id"]))
+        ratings.append(rating)
+        times.append(_timestamp_ms(row["reviewed_at"]))
+        new.append(row.get("state_before") == "NEW")
+        stability.append(_number(row.get("stability_after")))
+        difficulty.append(_number(row.get("difficulty_after")))
+    if not cards:
+        empty = np.zeros((0, 0))
+        return Histories(empty.astype(np.int8), empty, empty.astype(bool), np.zeros(0), np.zeros(0), np.zeros(0, int))
+
+    card_ids, card_index = np.unique(np.array(cards), return_inverse=True)
+    times = np.array(times)
+    order = np.lexsort((times, card_index))
+    card_index, times = card_index[order], times[order]
+    ratings = np.array(ratings, dtype=np.int8)[order]
+    new = np.array(new)[order]
+    stability, difficulty = np.array(stability)[order], np.array(difficulty)[order]
+
+    elapsed = np.zeros(len(order))
+    elapsed[1:] = np.diff(times) / MS_PER_DAY
+
+    # Keep the last MAX_HISTORY reviews per card; a truncated card starts from
+    # the logged state after its first kept review.
+    lengths = np.bincount(card_index, minlength=len(card_ids))
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    position = np.arange(len(order)) - starts[card_index]
+    keep = position >= lengths[card_index] - MAX_HISTORY
+    if not keep.all():
+        card_index, ratings, new, elapsed = card_index[keep], ratings[keep], new[keep], elapsed[keep]
+        stability, difficulty = stability[keep], difficulty[keep]
+        lengths = np.bincount(card_index, minlength=len(card_ids))
+        starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        position = np.arange(len(card_index)) - starts[card_index]
+    elapsed[position == 0] = 0
+
+    # Rows of the padded matrices, longest history first.
+    rank = np.empty(len(card_ids), dtype=np.int64)
+    rank[np.argsort(-lengths, kind="stable")] = np.arange(len(card_ids))
+    row_of = rank[card_index]
+    shape = (len(card_ids), int(lengths.max()))
+    padded_ratings = np.zeros(shape, dtype=np.int8)
+    padded_elapsed = np.zeros(shape)
+    padded_new = np.zeros(shape, dtype=bool)
+    padded_ratings[row_of, position] = ratings
+    padded_elapsed[row_of, position] = np.maximum(elapsed, 0)
+    padded_new[row_of, position] = new
+
+    by_row = np.argsort(rank)
+    return Histories(
+        padded_ratings, padded_elapsed, padded_new,
+        stability[starts][by_row], difficulty[starts][by_row], lengths[by_row],
+    )
+
+
+def split_by_user(rows):
+    """``{user_id: [rows]}``."""
+    users = {}
+    for row in rows:
+        users.setdefault(str(row.get("user_id")), []).append(row)
+    return users
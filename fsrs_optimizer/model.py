@@ -0,0 +1,195 @@
+"""The client's FSRS model (``src/lib/fsrs.js``) replayed over review histories.
+
+Formulas follow ``scheduleCard`` exactly, including its use of the weights
+(``w5`` is the difficulty step, ``w6`` the mean-reversion weight, ``w14``
+both the hard penalty and the forgetting retrievability factor). ``w7`` and
+``w16`` are not read by the client and are never fitted.
+
+The replay is vectorized over cards: each step advances every card that has
+another review, and the gradient of the log loss is carried forward with the
+state (forward-mode sensitivities: one ``(cards, 17)`` array each for
+stability and difficulty), so one pass gives the loss and the full gradient.
+"""
+
+import numpy as np
+
+DEFAULT_W = np.array([
+    0.4, 0.6, 2.4, 5.8, 4.93, 0.94, 0.86, 0.01, 1.49,
+    0.14, 0.94, 2.18, 0.05, 0.34, 1.26, 0.29, 2.61,
+])
+DECAY = -0.5
+FACTOR = 19 / 81
+
+# (low, high) per weight; the fit is projected back into these after each step.
+BOUNDS = np.array([
+    (0.1, 100.0), (0.1, 100.0), (0.1, 100.0), (0.1, 100.0),  # w0-w3 initial stability per rating
+    (1.0, 10.0),    # w4 initial / mean difficulty
+    (0.01, 4.0),    # w5 difficulty step per rating
+    (0.01, 0.99),   # w6 mean reversion weight
+    (0.01, 0.01),   # w7 unused by the client
+    (0.0, 6.0),     # w8 stability growth base (exp)
+    (0.0, 0.8),     # w9 stability growth stability exponent
+    (0.01, 3.0),    # w10 stability growth retrievability factor
+    (0.1, 5.0),     # w11 forget stability base
+    (0.01, 0.5),    # w12 forget stability difficulty exponent
+    (0.01, 0.9),    # w13 forget stability stability exponent
+    (0.0, 4.0),     # w14 hard penalty / forget retrievability factor
+    (0.0, 5.0),     # w15 easy bonus
+    (2.61, 2.61),   # w16 unused by the client
+])
+FROZEN = np.array([index in (7, 16) for index in range(len(DEFAULT_W))])
+
+AGAIN, HARD, GOOD, EASY = 1, 2, 3, 4
+
+# Reviews less than this many days after the previous one (learning steps)
+# are replayed but not scored: their recall says little about memory decay.
+MIN_SCORED_ELAPSED_DAYS = 1.0
+_EPSILON = 1e-6
+
+
+def clip_to_bounds(w):
+    return np.clip(w, BOUNDS[:, 0], BOUNDS[:, 1])
+
+
+def _initial_state(w, rating):
+    """``calculateInitialStability`` / ``calculateInitialDifficulty`` and their sensitivities."""
+    n, params = len(rating), len(w)
+    rows = np.arange(n)
+    stability = np.maximum(w[rating - 1], 0.1)
+    d_stability = np.zeros((n, params))
+    d_stability[rows, rating - 1] = w[rating - 1] > 0.1
+
+    raw = w[4] - (rating - 3) * w[5]
+    difficulty = np.clip(raw, 1, 10)
+    inside = (raw > 1) & (raw < 10)
+    d_difficulty = np.zeros((n, params))
+    d_difficulty[:, 4] = inside
+    d_difficulty[:, 5] = -(rating - 3) * inside
+    return stability, difficulty, d_stability, d_difficulty
+
+
+def retrievability(stability, elapsed, d_stability=None):
+    """``calculateRetrievability`` and, given ``dS/dw``, ``dR/dw``."""
+    base = 1 + FACTOR * elapsed / stability
+    value = base ** DECAY
+    if d_stability is None:
+        return value, None
+    d_value = DECAY * base ** (DECAY - 1) * (-FACTOR * elapsed / stability ** 2)
+    return value, d_value[:, None] * d_stability
+
+
+def _review(w, stability, difficulty, d_stability, d_difficulty, rating, recall, d_recall):
+    """State after a review of a non-new card (``scheduleCard``'s else branch)."""
+    n, params = len(rating), len(w)
+
+    # calculateNextDifficulty
+    target = difficulty - w[5] * (rating - 3)
+    raw = w[6] * w[4] + (1 - w[6]) * target
+    next_difficulty = np.clip(raw, 1, 10)
+    inside = ((raw > 1) & (raw < 10))[:, None]
+    d_next_difficulty = (1 - w[6]) * d_difficulty
+    d_next_difficulty[:, 4] += w[6]
+    d_next_difficulty[:, 5] += -(1 - w[6]) * (rating - 3)
+    d_next_difficulty[:, 6] += w[4] - target
+    d_next_difficulty *= inside
+
+    # calculateForgetStability (uses the difficulty before the review)
+    power = difficulty ** -w[12]
+    grown = (stability + 1) ** w[13]
+    boost = np.exp(w[14] * (1 - recall))
+    forget = w[11] * power * (grown - 1) * boost
+    d_forget = np.zeros((n, params))
+    d_forget[:, 11] = power * (grown - 1) * boost
+    d_forget[:, 12] = -forget * np.log(difficulty)
+    d_forget[:, 13] = w[11] * power * boost * grown * np.log(stability + 1)
+    d_forget[:, 14] = forget * (1 - recall)
+    d_forget += (
+        (-forget * w[12] / difficulty)[:, None] * d_difficulty
+        + (w[11] * power * boost * w[13] * (stability + 1) ** (w[13] - 1))[:, None] * d_stability
+        + (-forget * w[14])[:, None] * d_recall
+    )
+    floored = forget <= 0.1
+    forget = np.maximum(forget, 0.1)
+    d_forget[floored] = 0
+
+    # calculateRecallStability
+    penalty = np.where(rating == HARD, w[14], 1.0) * np.where(rating == EASY, w[15], 1.0)
+    spacing = np.exp(w[10] * (1 - recall))
+    scale = np.exp(w[8]) * stability ** -w[9]
+    base = scale * (11 - difficulty) * (spacing - 1)
+    growth = base * penalty
+    remembered = stability * (growth + 1)
+    d_remembered = np.zeros((n, params))
+    d_remembered[:, 8] = stability * growth
+    d_remembered[:, 9] = -stability * growth * np.log(stability)
+    d_remembered[:, 10] = stability * scale * (11 - difficulty) * penalty * spacing * (1 - recall)
+    d_remembered[:, 14] = np.where(rating == HARD, stability * base, 0)
+    d_remembered[:, 15] = np.where(rating == EASY, stability * base, 0)
+    d_remembered += (
+        (-stability * scale * (spacing - 1) * penalty)[:, None] * d_difficulty
+        + (1 + growth * (1 - w[9]))[:, None] * d_stability
+        + (-stability * scale * (11 - difficulty) * penalty * spacing * w[10])[:, None] * d_recall
+    )
+
+    lapse = rating == AGAIN
+    next_stability = np.where(lapse, forget, remembered)
+    d_next_stability = np.where(lapse[:, None], d_forget, d_remembered)
+    return next_stability, next_difficulty, d_next_stability, d_next_difficulty
+
+
+def replay(w, batch, gradient=True):
+    """Replay ``batch`` (a :class:`fsrs_optimizer.data.Histories`, longest first).
+
+    Returns ``(summed log loss, scored reviews, summed gradient or None)``.
+    """
+    params = len(w)
+    ratings, elapsed, lengths = batch.ratings, batch.elapsed, batch.lengths
+
+    # First logged review: a new card starts from the initial state; a card
+    # whose earlier history is missing starts from the logged state after it.
+    stability, difficulty, d_stability, d_difficulty = _initial_state(w, np.maximum(ratings[:, 0], 1))
+    logged = ~batch.new_starts[:, 0]
+    stability[logged] = np.maximum(batch.start_stability[logged], 0.1)
+    difficulty[logged] = np.clip(batch.start_difficulty[logged], 1, 10)
+    d_stability[logged] = 0
+    d_difficulty[logged] = 0
+
+    loss, scored = 0.0, 0
+    total_gradient = np.zeros(params) if gradient else None
+    negative_lengths = -lengths
+    for step in range(1, ratings.shape[1]):
+        active = int(np.searchsorted(negative_lengths, -step, side="left"))
+        if active == 0:
+            break
+        stability, difficulty = stability[:active], difficulty[:active]
+        d_stability, d_difficulty = d_stability[:active], d_difficulty[:active]
+        rating = ratings[:active, step].astype(np.int64)
+        days = elapsed[:active, step]
+
+        recall, d_recall = retrievability(stability, days, d_stability)
+        if not gradient:
+            d_recall = np.zeros((active, params))
+
+        restart = batch.new_starts[:active, step]
+        score = (days >= MIN_SCORED_ELAPSED_DAYS) & ~restart
+        if score.any():
+            probability = np.clip(recall[score], _EPSILON, 1 - _EPSILON)
+            remembered = rating[score] > AGAIN
+            loss -= np.sum(np.where(remembered, np.log(probability), np.log(1 - probability)))
+            scored += int(score.sum())
+            if gradient:
+                d_loss = np.where(remembered, -1 / probability, 1 / (1 - probability))
+                total_gradient += d_loss @ d_recall[score]
+
+        stability, difficulty, d_stability, d_difficulty = _review(
+            w, stability, difficulty, d_stability, d_difficulty, rating, recall, d_recall
+        )
+        if restart.any():
+            # A card reset to NEW starts over from the initial state.
+            fresh = _initial_state(w, rating[restart])
+            stability[restart], difficulty[restart] = fresh[0], fresh[1]
+            d_stability[restart], d_difficulty[restart] = fresh[2], fresh[3]
+
+    if gradient:
+        total_gradient[FROZEN] = 0
+    return loss, scored, total_gradient
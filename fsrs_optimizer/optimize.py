@@ -0,0 +1,301 @@
+"""Fit per-user FSRS weights to ``review_logs`` and emit them for the client.
+
+Each user's card histories are replayed through the client's model
+(``fsrs_optimizer.model``) in mini-batches of cards; Adam follows the exact
+log-loss gradient of the recall predictions, projected onto the weight bounds,
+with a small pull towards the defaults so thin histories do not drift. Users
+with fewer than ``--min-reviews`` logs keep the defaults.
+
+A random ``--holdout`` share of each user's cards is kept out of the fit and
+scores both the fitted and the default weights; with too few cards for that,
+the in-sample losses are compared instead. A fit that does not beat the
+defaults is reported but never uploaded.
+
+The output is ``{"users": {user_id: {"w": [...17 weights], ...}}}``;
+``--upload`` writes each improving ``w`` to ``user_settings.fsrs_weights``,
+which ``FSRSContext.loadUserSettings`` loads into the scheduler. A user whose
+upload fails keeps the error in the report and the run goes on.
+
+Usage (from the repository root)::
+
+    python -m fsrs_optimizer --logs review_logs.json --out fsrs_params.json
+    python -m fsrs_optimizer --supabase-url https://<project>.supabase.co --key "$SUPABASE_SERVICE_ROLE_KEY" --upload
+    python -m fsrs_optimizer --synthetic 300000      # check the fit on simulated logs
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import urllib.request
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from fsrs_optimizer import data, model
+
+DEFAULT_EPOCHS = 5
+DEFAULT_BATCH_CARDS = 2048
+DEFAULT_LEARNING_RATE = 0.05
+DEFAULT_MIN_REVIEWS = 400
+DEFAULT_HOLDOUT = 0.2
+MIN_HELD_OUT_CARDS = 20
+
+# Weight of the pull towards the defaults, per scored review, in units of
+# each weight's bound width.
+PRIOR_STRENGTH = 2.0
+_WIDTH = np.maximum(model.BOUNDS[:, 1] - model.BOUNDS[:, 0], 1e-9)
+
+
+@dataclass
+class Fit:
+    """Fitted weights of one user and how much they improved the log loss.
+
+    ``log_loss_*`` are measured on the training cards, ``held_out_*`` on the
+    ``held_out_cards`` left out of the fit (``None`` without a held-out set).
+    """
+
+    w: list
+    reviews: int
+    cards: int
+    scored: int
+    log_loss_default: float
+    log_loss_fitted: float
+    seconds: float
+    held_out_cards: int = 0
+    held_out_loss_default: float = None
+    held_out_loss_fitted: float = None
+    uploaded: bool = False
+    upload_error: str = None
+
+    @property
+    def improved(self):
+        """Whether the fitted weights beat the defaults (held out when measured)."""
+        if self.held_out_loss_fitted is not None:
+            return self.held_out_loss_fitted < self.held_out_loss_default
+        return self.log_loss_fitted < self.log_loss_default
+
+
+def evaluate(w, histories, batch_cards=DEFAULT_BATCH_CARDS):
+    """Mean log loss of ``w``'s recall predictions over ``histories``."""
+    loss, scored = 0.0, 0
+    for batch in histories.batches(batch_cards):
+        batch_loss, batch_scored, _ = model.replay(w, batch, gradient=False)
+        loss, scored = loss + batch_loss, scored + batch_scored
+    return loss / scored if scored else float("nan")
+
+
+def fit(histories, w=model.DEFAULT_W, epochs=DEFAULT_EPOCHS, batch_cards=DEFAULT_BATCH_CARDS,
+        learning_rate=DEFAULT_LEARNING_RATE, seed=0, held_out=None):
+    """Adam over shuffled card batches with a cosine learning-rate decay,
+    scored on ``held_out`` histories when given."""
+    started = time.perf_counter()
+    rng = np.random.default_rng(seed)
+    prior = model.clip_to_bounds(np.array(w, dtype=float))
+    w = prior.copy()
+    first_moment, second_moment = np.zeros_like(w), np.zeros_like(w)
+    total_steps = epochs * -(-histories.cards // batch_cards)
+    step = 0
+    for _ in range(epochs):
+        for batch in histories.batches(batch_cards, rng):
+            _, scored, gradient = model.replay(w, batch)
+            if not scored:
+                continue
+            gradient = gradient / scored + 2 * PRIOR_STRENGTH / histories.reviews * (w - prior) / _WIDTH ** 2
+            step += 1
+            rate = learning_rate * 0.5 * (1 + np.cos(np.pi * step / max(total_steps, 1)))
+            first_moment = 0.9 * first_moment + 0.1 * gradient
+            second_moment = 0.999 * second_moment + 0.001 * gradient ** 2
+            corrected = first_moment / (1 - 0.9 ** step) / (np.sqrt(second_moment / (1 - 0.999 ** step)) + 1e-8)
+            # Adam steps are scale-free; scale them by each weight's range.
+            w = model.clip_to_bounds(w - rate * corrected * np.minimum(_WIDTH, 10) / 10)
+            w[model.FROZEN] = prior[model.FROZEN]
+
+    scored = sum(model.replay(w, batch, gradient=False)[1] for batch in histories.batches(batch_cards))
+    held_out_default = held_out_fitted = None
+    if held_out is not None and held_out.cards:
+        held_out_default = evaluate(prior, held_out, batch_cards)
+        if not np.isnan(held_out_default):
+            held_out_fitted = round(float(evaluate(w, held_out, batch_cards)), 5)
+            held_out_default = round(float(held_out_default), 5)
+        else:
+            held_out_default = None
+    return Fit(
+        w=[round(float(value), 4) for value in w],
+        reviews=histories.reviews,
+        cards=histories.cards,
+        scored=scored,
+        log_loss_default=round(float(evaluate(prior, histories, batch_cards)), 5),
+        log_loss_fitted=round(float(evaluate(w, histories, batch_cards)), 5),
+        seconds=round(time.perf_counter() - started, 2),
+        held_out_cards=held_out.cards if held_out_fitted is not None else 0,
+        held_out_loss_default=held_out_default,
+        held_out_loss_fitted=held_out_fitted,
+    )
+
+
+def upload(supabase_url, key, user_id, w, timeout=30):
+    """Store ``w`` in ``user_settings.fsrs_weights`` for ``user_id``.
+
+    PostgREST answers a PATCH that matches no row with an empty success, so
+    the updated row is requested back and its absence raises ``LookupError``.
+    """
+    request = urllib.request.Request(
+        f"{supabase_url.rstrip('/')}/rest/v1/user_settings?id=eq.{user_id}",
+        data=json.dumps({"fsrs_weights": w}).encode("utf-8"),
+        headers={"apikey": key, "Authorization": f"Bearer {key}", "Content-Type": "application/json",
+                 "Prefer": "return=representation"},
+        method="PATCH",
+    )
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        updated = json.load(response)
+    if not updated:
+        raise LookupError(f"no user_settings row for {user_id}")
+
+
+# ============================================
+# Synthetic logs
+# ============================================
+
+def synthetic_logs(reviews, w=model.DEFAULT_W, cards_per_user=2000, reviews_per_card=12, seed=0):
+    """``review_logs`` rows simulated from ``w`` with the client's scheduler,
+    to check that :func:`fit` recovers known weights."""
+    rng = np.random.default_rng(seed)
+    w = np.asarray(w, dtype=float)
+    cards = max(1, reviews // reviews_per_card)
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    clock = rng.uniform(0, 30, cards)  # days since ``start``
+    rows = []
+
+    def emit(index, rating, state_before, stability, difficulty):
+        for card, value, before, s, d, day in zip(index, rating, state_before, stability, difficulty, clock[index]):
+            rows.append({
+                "user_id": f"synthetic-{card // cards_per_user}",
+                "card_id": f"card-{card}",
+                "rating": ("AGAIN", "HARD", "GOOD", "EASY")[value - 1],
+                "state_before": before,
+                "stability_after": float(s),
+                "difficulty_after": float(d),
+                "reviewed_at": (start + timedelta(days=float(day))).isoformat(),
+            })
+
+    index = np.arange(cards)
+    rating = rng.choice([1, 2, 3, 4], size=cards, p=[0.2, 0.15, 0.55, 0.1])
+    stability, difficulty, _, _ = model._initial_state(w, rating)
+    emit(index, rating, ["NEW"] * cards, stability, difficulty)
+
+    for _ in range(reviews_per_card - 1):
+        interval = stability / model.FACTOR * (0.9 ** (1 / model.DECAY) - 1)
+        days = np.where(rating == model.AGAIN, 1 / 1440, np.clip(np.round(interval), 1, 365))
+        days = days * rng.uniform(0.7, 1.6, cards)
+        clock += days
+        recall, _ = model.retrievability(stability, days)
+        remembered = rng.random(cards) < recall
+        rating = np.where(remembered, rng.choice([2, 3, 4], size=cards, p=[0.15, 0.75, 0.1]), 1)
+        zeros = np.zeros((cards, len(w)))
+        stability, difficulty, _, _ = model._review(w, stability, difficulty, zeros, zeros, rating, recall, zeros)
+        emit(index, rating, ["REVIEW"] * cards, stability, difficulty)
+    return rows
+
+
+# ============================================
+# CLI
+# ============================================
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m fsrs_optimizer",
+                                     description="Fit per-user FSRS weights to review_logs.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--logs", help="JSON or CSV export of review_logs")
+    source.add_argument("--supabase-url", default=None, help="read review_logs from this Supabase project")
+    source.add_argument("--synthetic", type=int, metavar="REVIEWS", help="fit simulated logs of this size")
+    parser.add_argument("--key", default=os.environ.get("SUPABASE_SERVICE_ROLE_KEY"),
+                        help="service-role key or user access token (default: $SUPABASE_SERVICE_ROLE_KEY)")
+    parser.add_argument("--user", default=None, help="only fit this user_id")
+    parser.add_argument("--out", default="fsrs_params.json", help="where to write the fitted weights")
+    parser.add_argument("--upload", action="store_true",
+                        help="write each user's weights to user_settings.fsrs_weights")
+    parser.add_argument("--epochs", type=int, default=DEFAULT_EPOCHS)
+    parser.add_argument("--batch-cards", type=int, default=DEFAULT_BATCH_CARDS)
+    parser.add_argument("--learning-rate", type=float, default=DEFAULT_LEARNING_RATE)
+    parser.add_argument("--min-reviews", type=int, default=DEFAULT_MIN_REVIEWS,
+                        help="users with fewer logs keep the default weights")
+    parser.add_argument("--holdout", type=float, default=DEFAULT_HOLDOUT,
+                        help="share of each user's cards left out of the fit to score it")
+    parser.add_argument("--seed", type=int, default=0)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if (args.supabase_url or args.upload) and not args.key:
+        print("A Supabase key is required (--key or $SUPABASE_SERVICE_ROLE_KEY).", file=sys.stderr)
+        return 2
+    if args.upload and not args.supabase_url:
+        print("--upload needs --supabase-url.", file=sys.stderr)
+        return 2
+
+    started = time.perf_counter()
+    if args.logs:
+        rows = data.load_logs(args.logs)
+    elif args.supabase_url:
+        rows = data.fetch_logs(args.supabase_url, args.key, args.user)
+    else:
+        truth = model.clip_to_bounds(model.DEFAULT_W * np.random.default_rng(args.seed).uniform(0.7, 1.3, 17))
+        truth[model.FROZEN] = model.DEFAULT_W[model.FROZEN]
+        print(f"Simulating with w = {[round(float(value), 3) for value in truth]}")
+        rows = synthetic_logs(args.synthetic, truth, cards_per_user=10 ** 9, seed=args.seed)
+    users = data.split_by_user(rows)
+    if args.user:
+        users = {args.user: users.get(args.user, [])}
+    print(f"{len(rows)} review logs from {len(users)} user(s) loaded in {time.perf_counter() - started:.1f}s")
+
+    fits = {}
+    for user_id, user_rows in sorted(users.items(), key=lambda item: -len(item[1])):
+        if len(user_rows) < args.min_reviews:
+            print(f"  {user_id}: {len(user_rows)} logs, keeping the defaults")
+            continue
+        histories = data.build_histories(user_rows)
+        held_out = None
+        if histories.cards * args.holdout >= MIN_HELD_OUT_CARDS:
+            histories, held_out = histories.split(args.holdout, np.random.default_rng(args.seed))
+        result = fit(histories, epochs=args.epochs, batch_cards=args.batch_cards,
+                     learning_rate=args.learning_rate, seed=args.seed, held_out=held_out)
+        if not result.scored:
+            print(f"  {user_id}: no reviews a day or more apart, keeping the defaults")
+            continue
+        fits[user_id] = result
+        summary = (f"  {user_id}: {result.reviews} logs / {result.cards} cards, log loss "
+                   f"{result.log_loss_default:.4f} -> {result.log_loss_fitted:.4f}")
+        if result.held_out_loss_fitted is not None:
+            summary += (f", held out ({result.held_out_cards} cards) "
+                        f"{result.held_out_loss_default:.4f} -> {result.held_out_loss_fitted:.4f}")
+        print(f"{summary} in {result.seconds:.1f}s")
+        if not result.improved:
+            print(f"  {user_id}: the fit does not beat the defaults, not uploading")
+        elif args.upload:
+            try:
+                upload(args.supabase_url, args.key, user_id, result.w)
+                result.uploaded = True
+            except (OSError, ValueError, LookupError) as error:
+                result.upload_error = str(error)
+                print(f"  {user_id}: upload failed: {error}", file=sys.stderr)
+
+    output = {
+        "model": "synapse-fsrs-4.5",
+        "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "users": {user_id: {**asdict(result), "improved": bool(result.improved)} for user_id, result in fits.items()},
+    }
+    with open(args.out, "w", encoding="utf-8") as handle:
+        json.dump(output, handle, indent=2)
+    uploaded = sum(result.uploaded for result in fits.values())
+    failed = sum(result.upload_error is not None for result in fits.values())
+    print(f"Wrote {args.out}" + (f", uploaded {uploaded} user(s) to user_settings.fsrs_weights" if args.upload else "")
+          + (f", {failed} upload(s) failed" if failed else ""))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
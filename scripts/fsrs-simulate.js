@@ -0,0 +1,214 @@
+/**
+ * FSRS workload forecast and scheduler benchmark
+ *
+ * Runs src/lib/fsrsSimulator.js (the app's own scheduling code) under Node.
+ *
+ * Usage:
+ *   npm run fsrs:simulate -- --cards 3000 --days 90 --new-per-day 30
+ *   npm run fsrs:simulate -- --cards 3000 --days 60 --exam-in 45 --review-limit 200
+ *   npm run fsrs:simulate -- --logs review_logs.json --retention 0.85 --json > forecast.json
+ *   npm run fsrs:bench                       # cards/sec at 10k, 100k and 1M cards
+ *   npm run fsrs:bench -- --sizes 50000 --json
+ */
+
+import { readFileSync } from 'node:fs';
+import { performance } from 'node:perf_hooks';
+import { parseArgs } from 'node:util';
+import {
+    scheduleCard,
+    scheduleBatch,
+    rankByUrgency,
+    toCardColumns,
+    DEFAULT_FSRS_PARAMS,
+    CardState
+} from '../src/lib/fsrs.js';
+import {
+    simulateWorkload,
+    createDeckColumns,
+    ratingModelFromLogs,
+    createRandom,
+    DEFAULT_RATING_MODEL
+} from '../src/lib/fsrsSimulator.js';
+
+const MS_PER_DAY = 1000 * 60 * 60 * 24;
+const DEFAULT_SIZES = [10000, 100000, 1000000];
+
+const { values: args } = parseArgs({
+    options: {
+        benchmark: { type: 'boolean', default: false },
+        sizes: { type: 'string' },
+        cards: { type: 'string', default: '2000' },
+        days: { type: 'string', default: '60' },
+        'new-per-day': { type: 'string', default: '20' },
+        'review-limit': { type: 'string' },
+        'exam-in': { type: 'string' },
+        'exam-date': { type: 'string' },
+        retention: { type: 'string' },
+        'max-interval': { type: 'string' },
+        logs: { type: 'string' },
+        seed: { type: 'string', default: '1' },
+        json: { type: 'boolean', default: false }
+    }
+});
+
+function number(value, fallback) {
+    const parsed = Number(value);
+    return value === undefined || Number.isNaN(parsed) ? fallback : parsed;
+}
+
+function pad(value, width, right = false) {
+    const text = String(value);
+    return right ? text.padEnd(width) : text.padStart(width);
+}
+
+// ============================================
+// Forecast
+// ============================================
+
+function forecast() {
+    const start = Date.now();
+    const params = {
+        ...DEFAULT_FSRS_PARAMS,
+        requestRetention: number(args.retention, DEFAULT_FSRS_PARAMS.requestRetention),
+        maximumInterval: number(args['max-interval'], DEFAULT_FSRS_PARAMS.maximumInterval)
+    };
+    const examDate = args['exam-date']
+        ? new Date(args['exam-date'])
+        : args['exam-in'] !== undefined ? new Date(start + number(args['exam-in'], 0) * MS_PER_DAY) : null;
+    const ratingModel = args.logs
+        ? ratingModelFromLogs(JSON.parse(readFileSync(args.logs, 'utf8')))
+        : DEFAULT_RATING_MODEL;
+
+    const cards = number(args.cards, 2000);
+    const started = performance.now();
+    const result = simulateWorkload({
+        columns: createDeckColumns(cards, { now: start }),
+        days: number(args.days, 60),
+        start,
+        params,
+        examDate,
+        newPerDay: number(args['new-per-day'], 20),
+        reviewLimit: number(args['review-limit'], Infinity),
+        ratingModel,
+        random: createRandom(number(args.seed, 1))
+    });
+    const seconds = (performance.now() - started) / 1000;
+
+    if (args.json) {
+        console.log(JSON.stringify({ params, examDate, ratingModel, ...result }, null, 2));
+        return;
+    }
+
+    const percent = value => (value === null ? '-' : `${(value * 100).toFixed(1)}%`);
+    console.log(`${cards} cards, ${result.summary.days} days, retention target ${params.requestRetention}` +
+        (examDate ? `, exam ${examDate.toISOString().slice(0, 10)}` : '') +
+        (args.logs ? `, ratings from ${args.logs}` : ''));
+    console.log('');
+    console.log(`${pad('date', 10, true)} ${pad('due', 7)} ${pad('reviews', 8)} ${pad('new', 5)} ` +
+        `${pad('relearn', 8)} ${pad('lapses', 7)} ${pad('backlog', 8)} ${pad('minutes', 8)} ${pad('retention', 10)}`);
+    for (const row of result.days) {
+        console.log(`${pad(row.date, 10, true)} ${pad(row.due, 7)} ${pad(row.reviews, 8)} ${pad(row.newCards, 5)} ` +
+            `${pad(row.relearns, 8)} ${pad(row.lapses, 7)} ${pad(row.backlog, 8)} ` +
+            `${pad((row.seconds / 60).toFixed(1), 8)} ${pad(percent(row.retention), 10)}`);
+    }
+
+    const { summary } = result;
+    console.log('');
+    console.log(`${summary.reviews} reviews (${summary.meanReviewsPerDay.toFixed(1)}/day, peak ${summary.peakReviews} ` +
+        `on ${summary.peakDate}), ${summary.minutesPerDay.toFixed(1)} min/day`);
+    console.log(`recalled ${percent(summary.observedRetention)} of due reviews; ` +
+        `mean retention at the end ${percent(summary.finalRetention)}` +
+        (examDate ? `, on exam day ${percent(summary.examRetention)}` : ''));
+    if (summary.backlog > 0) {
+        console.log(`${summary.backlog} due cards left over on the last day (raise --review-limit)`);
+    }
+    console.log(`simulated in ${seconds.toFixed(2)}s`);
+}
+
+// ============================================
+// Benchmark
+// ============================================
+
+/**
+ * Deck in the shape the app loads from Supabase: a mix of states, due dates
+ * spread over the last and next month, all priorities
+ */
+function syntheticCards(count, now, random) {
+    const states = [CardState.NEW, CardState.LEARNING, CardState.REVIEW, CardState.REVIEW, CardState.RELEARNING];
+    const priorities = ['CRITICAL', 'HIGH', 'NORMAL', 'NORMAL', 'LOW'];
+    const cards = new Array(count);
+    for (let i = 0; i < count; i++) {
+        const state = states[Math.floor(random() * states.length)];
+        const stability = state === CardState.NEW ? 0 : 0.5 + random() * 60;
+        cards[i] = {
+            id: `card-${i}`,
+            state,
+            priority: priorities[i % priorities.length],
+            stability,
+            difficulty: state === CardState.NEW ? 0 : 1 + random() * 9,
+            retrievability: state === CardState.NEW ? 1 : 0.6 + random() * 0.4,
+            last_review: state === CardState.NEW ? null : new Date(now - random() * 30 * MS_PER_DAY).toISOString(),
+            due_date: new Date(now + (random() - 0.5) * 60 * MS_PER_DAY).toISOString(),
+            reps: Math.floor(random() * 10),
+            lapses: Math.floor(random() * 3)
+        };
+    }
+    return cards;
+}
+
+function measure(count, work) {
+    // Repeat small runs so the timing is not dominated by timer resolution and JIT warm-up
+    const repeats = Math.max(1, Math.ceil(200000 / count));
+    if (repeats > 1) work();
+    const started = performance.now();
+    for (let r = 0; r < repeats; r++) work();
+    const seconds = (performance.now() - started) / 1000 / repeats;
+    return { seconds, cardsPerSecond: count / seconds };
+}
+
+function benchmark() {
+    const sizes = args.sizes ? args.sizes.split(',').map(Number) : DEFAULT_SIZES;
+    const now = Date.now();
+    const examDate = new Date(now + 5 * MS_PER_DAY);
+    const results = [];
+
+    for (const size of sizes) {
+        const random = createRandom(number(args.seed, 1));
+        const cards = syntheticCards(size, now, random);
+        const ratings = Uint8Array.from({ length: size }, () => 1 + Math.floor(random() * 4));
+        const columns = toCardColumns(cards);
+        let batch = null;
+
+        const steps = {
+            toCardColumns: measure(size, () => toCardColumns(cards)),
+            scheduleBatch: measure(size, () => scheduleBatch(columns, { now })),
+            'scheduleBatch (exam)': measure(size, () => {
+                batch = scheduleBatch(columns, { now, examDate });
+            }),
+            'rankByUrgency (due)': measure(size, () => rankByUrgency(batch, batch.dueIndices)),
+            scheduleCard: measure(size, () => {
+                const reviewTime = new Date(now);
+                for (let i = 0; i < size; i++) scheduleCard(cards[i], ratings[i], DEFAULT_FSRS_PARAMS, reviewTime);
+            })
+        };
+        results.push({ cards: size, due: batch.counts.due, steps });
+    }
+
+    if (args.json) {
+        console.log(JSON.stringify(results, null, 2));
+        return;
+    }
+    console.log(`${pad('cards', 9)}  ${pad('step', 22, true)} ${pad('ms', 10)} ${pad('cards/sec', 14)}`);
+    for (const { cards, steps } of results) {
+        for (const [name, { seconds, cardsPerSecond }] of Object.entries(steps)) {
+            console.log(`${pad(cards, 9)}  ${pad(name, 22, true)} ${pad((seconds * 1000).toFixed(2), 10)} ` +
+                `${pad(Math.round(cardsPerSecond).toLocaleString('en-US'), 14)}`);
+        }
+    }
+}
+
+if (args.benchmark) {
+    benchmark();
+} else {
+    forecast();
+}
@@ -0,0 +1,274 @@
+import { forwardRef, memo, useCallback, useEffect, useImperativeHandle, useLayoutEffect, useMemo, useRef, useState } from 'react'
+import { Page } from 'react-pdf'
+import { Loader2 } from 'lucide-react'
+import { layoutPages, pageAt, visiblePages } from '../lib/pageLayout'
+import { PageRenderCache } from '../lib/pageRenderCache'
+
+// Pages mounted above and below the visible ones, so they are ready when scrolled to
+const PREFETCH_PAGES = 2
+// Space between pages (px)
+const PAGE_GAP = 16
+// Page sizes read per step while the document is measured in the background
+const SIZE_BATCH = 50
+
+function releaseCanvas(canvas) {
+    // Browsers keep the backing store of a detached canvas until GC; shrinking it frees it now
+    if (canvas) {
+        canvas.width = 0
+        canvas.height = 0
+    }
+}
+
+/**
+ * One page slot: a bitmap from the render cache when there is one, otherwise a
+ * pdf.js render that is then copied into the cache. The text layer is always
+ * rendered, so text can be selected either way.
+ */
+const PageSlot = memo(function PageSlot({ pageNumber, top, height, width, scale, rotation, renderCache, renderKey }) {
+    const canvasRef = useRef(null)
+    const bitmapCanvasRef = useRef(null)
+    // Read once: a slot is remounted when the render key changes
+    const [bitmap] = useState(() => renderCache.get(pageNumber))
+
+    useLayoutEffect(() => {
+        const canvas = bitmapCanvasRef.current
+        if (!bitmap || !canvas) return
+        canvas.width = bitmap.width
+        canvas.height = bitmap.height
+        canvas.getContext('2d').drawImage(bitmap, 0, 0)
+    }, [bitmap])
+
+    useEffect(() => () => {
+        releaseCanvas(canvasRef.current)
+        releaseCanvas(bitmapCanvasRef.current)
+    }, [])
+
+    const handleRenderSuccess = useCallback(() => {
+        if (canvasRef.current) renderCache.put(pageNumber, canvasRef.current, renderKey)
+    }, [pageNumber, renderCache, renderKey])
+
+    return (
+        <div className="pdf-page-slot pdf-page" style={{ top, height, width: width * scale }}>
+            {bitmap && <canvas ref={bitmapCanvasRef} className="pdf-page-bitmap" />}
+            <Page
+                pageNumber={pageNumber}
+                width={width}
+                scale={scale}
+                rotate={rotation}
+                renderMode={bitmap ? 'none' : 'canvas'}
+                // The page div is white by default and would cover the cached bitmap
+                canvasBackground={bitmap ? 'transparent' : undefined}
+                canvasRef={canvasRef}
+                onRenderSuccess={handleRenderSuccess}
+                renderTextLayer
+                renderAnnotationLayer={false}
+                loading={bitmap ? null : (
+                    <div className="page-loading">
+                        <Loader2 size={24} className="spin" />
+                    </div>
+                )}
+                error={
+                    <div className="pdf-error">
+                        <p>Error al cargar esta página</p>
+                    </div>
+                }
+            />
+        </div>
+    )
+})
+
+/**
+ * Continuous scroll over every page of a document (inside react-pdf's Document).
+ *
+ * The list is as tall as the whole document, but only the pages in view plus
+ * PREFETCH_PAGES on each side are mounted; the others have no canvas or text
+ * layer. Page sizes come from page 1 at first and are refined in the
+ * background; the reading position is kept when sizes, zoom or rotation change.
+ */
+const PDFPageList = forwardRef(function PDFPageList({
+    pdf,
+    scrollRef,
+    width,
+    scale,
+    rotation,
+    initialPage = 1,
+    onCurrentPageChange
+}, ref) {
+    const listRef = useRef(null)
+    const [sizes, setSizes] = useState(null)
+    const [range, setRange] = useState({ first: initialPage - 1, last: initialPage - 1 })
+    // Reading position to keep across layout changes: page index and fraction of it scrolled past
+    const anchorRef = useRef({ index: initialPage - 1, fraction: 0 })
+    const currentPageRef = useRef(initialPage)
+    const frameRef = useRef(null)
+
+    const renderCacheRef = useRef(null)
+    if (!renderCacheRef.current) renderCacheRef.current = new PageRenderCache()
+    const renderKey = `${width}:${scale}:${rotation}`
+    renderCacheRef.current.setRenderKey(renderKey)
+
+    useEffect(() => {
+        const renderCache = renderCacheRef.current
+        return () => renderCache.clear()
+    }, [])
+
+    // Measure the pages: page 1 for all at once, then the real size of each, in batches
+    useEffect(() => {
+        let cancelled = false
+        const measure = async (pageNumber) => {
+            const page = await pdf.getPage(pageNumber)
+            const viewport = page.getViewport({ scale: 1, rotation: 0 })
+            return { width: viewport.width, height: viewport.height }
+        }
+
+        const run = async () => {
+            const first = await measure(1)
+            if (cancelled) return
+            setSizes(Array(pdf.numPages).fill(first))
+
+            for (let start = 2; start <= pdf.numPages; start += SIZE_BATCH) {
+                const end = Math.min(pdf.numPages, start + SIZE_BATCH - 1)
+                const numbers = Array.from({ length: end - start + 1 }, (_, i) => start + i)
+                const batch = await Promise.all(numbers.map(measure))
+                if (cancelled) return
+                setSizes(prev => {
+                    const changed = batch.some((size, i) =>
+                        size.width !== prev[start - 1 + i].width || size.height !== prev[start - 1 + i].height
+                    )
+                    if (!changed) return prev
+                    const next = prev.slice()
+                    batch.forEach((size, i) => { next[start - 1 + i] = size })
+                    return next
+                })
+            }
+        }
+
+        run().catch(err => console.error('Error measuring PDF pages:', err))
+        return () => { cancelled = true }
+    }, [pdf])
+
+    const layout = useMemo(
+        () => (sizes ? layoutPages(sizes, width * scale, PAGE_GAP, rotation) : null),
+        [sizes, width, scale, rotation]
+    )
+
+    // Top of the list inside the scroll container
+    const listOffset = useCallback(() => {
+        const scroller = scrollRef.current
+        const list = listRef.current
+        if (!scroller || !list) return 0
+        return list.getBoundingClientRect().top - scroller.getBoundingClientRect().top + scroller.scrollTop
+    }, [scrollRef])
+
+    const updateRange = useCallback(() => {
+        const scroller = scrollRef.current
+        if (!scroller || !layout) return
+
+        const top = scroller.scrollTop - listOffset()
+        const bottom = top + scroller.clientHeight
+        const { first, last } = visiblePages(layout, Math.max(0, top), Math.max(0, bottom))
+        setRange(prev => (prev.first === first && prev.last === last ? prev : { first, last }))
+
+        const anchor = pageAt(layout, Math.max(0, top))
+        anchorRef.current = {
+            index: anchor,
+            fraction: Math.min(1, Math.max(0, (top - layout.tops[anchor]) / (layout.heights[anchor] || 1)))
+        }
+
+        // Current page: the one taking up most of the viewport
+        let current = first + 1
+        let mostVisible = -1
+        for (let i = first; i <= last; i++) {
+            const visible = Math.min(bottom, layout.tops[i] + layout.heights[i]) - Math.max(top, layout.tops[i])
+            if (visible > mostVisible) {
+                mostVisible = visible
+                current = i + 1
+            }
+        }
+        if (current !== currentPageRef.current) {
+            currentPageRef.current = current
+            onCurrentPageChange?.(current)
+        }
+    }, [layout, listOffset, onCurrentPageChange, scrollRef])
+
+    // New layout (sizes measured, zoom, rotation, width): scroll back to the same place
+    useLayoutEffect(() => {
+        const scroller = scrollRef.current
+        if (!scroller || !layout) return
+        const { index, fraction } = anchorRef.current
+        const page = Math.min(index, layout.tops.length - 1)
+        scroller.scrollTop = listOffset() + layout.tops[page] + fraction * layout.heights[page]
+        updateRange()
+    }, [layout])
+
+    // One update per frame however many scroll events arrive
+    useEffect(() => {
+        const scroller = scrollRef.current
+        if (!scroller) return
+        const onScroll = () => {
+            if (frameRef.current) return
+            frameRef.current = requestAnimationFrame(() => {
+                frameRef.current = null
+                updateRange()
+            })
+        }
+        scroller.addEventListener('scroll', onScroll, { passive: true })
+        window.addEventListener('resize', onScroll)
+        return () => {
+            scroller.removeEventListener('scroll', onScroll)
+            window.removeEventListener('resize', onScroll)
+            cancelAnimationFrame(frameRef.current)
+            frameRef.current = null
+        }
+    }, [scrollRef, updateRange])
+
+    useImperativeHandle(ref, () => ({
+        scrollToPage: (pageNumber) => {
+            const scroller = scrollRef.current
+            if (!scroller || !layout) return
+            const index = Math.max(0, Math.min(layout.tops.length - 1, pageNumber - 1))
+            anchorRef.current = { index, fraction: 0 }
+            currentPageRef.current = index + 1
+            scroller.scrollTop = listOffset() + layout.tops[index]
+        }
+    }), [layout, listOffset, scrollRef])
+
+    if (!layout) {
+        return (
+            <div className="page-loading">
+                <Loader2 size={24} className="spin" />
+            </div>
+        )
+    }
+
+    const start = Math.max(0, range.first - PREFETCH_PAGES)
+    const end = Math.min(layout.tops.length - 1, range.last + PREFETCH_PAGES)
+    const slots = []
+    for (let i = start; i <= end; i++) {
+        slots.push(
+            <PageSlot
+                key={`${i + 1}@${renderKey}`}
+                pageNumber={i + 1}
+                top={layout.tops[i]}
+                height={layout.heights[i]}
+                width={width}
+                scale={scale}
+                rotation={rotation}
+                renderCache={renderCacheRef.current}
+                renderKey={renderKey}
+            />
+        )
+    }
+
+    return (
+        <div
+            ref={listRef}
+            className="pdf-page-list"
+            style={{ height: layout.total, width: width * scale }}
+        >
+            {slots}
+        </div>
+    )
+})
+
+export default PDFPageList
@@ -14,8 +14,11 @@ import {
     Search,
     Loader2,
     AlertCircle,
-    RefreshCw
+    RefreshCw,
+    ScrollText,
+    File
 } from 'lucide-react'
+import PDFPageList from './PDFPageList'
 import './PDFViewer.css'
 
 // Configure PDF.js worker - use bundled worker from pdfjs-dist (most reliable)
@@ -42,8 +45,13 @@ export default function PDFViewer({
     const [showSearch, setShowSearch] = useState(false)
     const [pageInputValue, setPageInputValue] = useState('1')
     const [retryCount, setRetryCount] = useState(0)
+    // 'continuous': every page in one scroll (virtualized, see PDFPageList); 'single': one page at a time
+    const [viewMode, setViewMode] = useState('continuous')
+    const [pdf, setPdf] = useState(null)
 
     const containerRef = useRef(null)
+    const contentRef = useRef(null)
+    const pageListRef = useRef(null)
     const [containerWidth, setContainerWidth] = useState(800)
 
     // Memoize document options to prevent re-renders
@@ -123,14 +131,18 @@ export default function PDFViewer({
 
         window.addEventListener('keydown', handleKeyDown)
         return () => window.removeEventListener('keydown', handleKeyDown)
-    }, [currentPage, numPages])
+    }, [currentPage, numPages, viewMode])
 
-    const onDocumentLoadSuccess = ({ numPages: pages }) => {
+    const onDocumentLoadSuccess = (loadedPdf) => {
+        const pages = loadedPdf.numPages
+        setPdf(loadedPdf)
         setNumPages(pages)
         setIsLoading(false)
         setLoadError(null)
-        setCurrentPage(initialPage)
-        setPageInputValue(String(initialPage))
+        // initialPage may come from a link (?page=N) past the end of a shorter document
+        const startPage = Math.max(1, Math.min(initialPage, pages))
+        setCurrentPage(startPage)
+        setPageInputValue(String(startPage))
     }
 
     const onDocumentLoadError = (error) => {
@@ -163,8 +175,19 @@ export default function PDFViewer({
         const validPage = Math.max(1, Math.min(numPages || 1, page))
         setCurrentPage(validPage)
         setPageInputValue(String(validPage))
+        // Re-entering the current page number should not move the reader to its top
+        if (viewMode === 'continuous' && validPage !== currentPage) {
+            pageListRef.current?.scrollToPage(validPage)
+        }
         if (onPageChange) onPageChange(validPage)
-    }, [numPages, onPageChange])
+    }, [numPages, onPageChange, viewMode, currentPage])
+
+    // Continuous mode: the page being read changes as the user scrolls
+    const handleScrolledToPage = useCallback((page) => {
+        setCurrentPage(page)
+        setPageInputValue(String(page))
+        if (onPageChange) onPageChange(page)
+    }, [onPageChange])
 
     const handlePageInputChange = (e) => {
         setPageInputValue(e.target.value)
@@ -223,6 +246,8 @@ export default function PDFViewer({
         }
     }
 
+    const pageWidth = containerWidth ? Math.min(containerWidth, 900) : 700
+
     // Determine the file source
     const pdfSource = fileData || fileUrl
 
@@ -310,6 +335,14 @@ export default function PDFViewer({
 
                 {/* Actions */}
                 <div className="toolbar-group">
+                    <button
+                        className="toolbar-btn"
+                        onClick={() => setViewMode(prev => prev === 'continuous' ? 'single' : 'continuous')}
+                        title={viewMode === 'continuous' ? 'Ver página a página' : 'Ver en desplazamiento continuo'}
+                    >
+                        {viewMode === 'continuous' ? <File size={18} /> : <ScrollText size={18} />}
+                    </button>
+
                     <button
                         className="toolbar-btn"
                         onClick={handleRotate}
@@ -360,7 +393,7 @@ export default function PDFViewer({
             )}
 
             {/* PDF Content */}
-            <div className="pdf-content">
+            <div ref={contentRef} className="pdf-content">
                 {isLoading && !loadError && (
                     <div className="pdf-loading">
                         <Loader2 size={40} className="spin" />
@@ -396,12 +429,24 @@ export default function PDFViewer({
                         className="pdf-document"
                         options={documentOptions}
                     >
-                        {!isLoading && !loadError && (
+                        {!isLoading && !loadError && viewMode === 'continuous' && pdf && (
+                            <PDFPageList
+                                ref={pageListRef}
+                                pdf={pdf}
+                                scrollRef={contentRef}
+                                width={pageWidth}
+                                scale={scale}
+                                rotation={rotation}
+                                initialPage={currentPage}
+                                onCurrentPageChange={handleScrolledToPage}
+                            />
+                        )}
+                        {!isLoading && !loadError && viewMode === 'single' && (
                             <Page
                                 pageNumber={currentPage}
                                 scale={scale}
                                 rotate={rotation}
-                                width={containerWidth ? Math.min(containerWidth, 900) : 700}
+                                width={pageWidth}
                                 className="pdf-page"
                                 loading={
                                     <div className="page-loading">
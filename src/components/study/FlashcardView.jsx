@@ -49,7 +49,7 @@ function FlashcardView({ card, showAnswer, isFlipping, onFlip }) {
                     {/* Question */}
                     <div className="card-content">
                         <div className="question-text">
-                            {card.front_content}
+                            {card.front_content ?? card.front}
                         </div>
                     </div>
 
@@ -64,7 +64,7 @@ function FlashcardView({ card, showAnswer, isFlipping, onFlip }) {
                 <div className="flashcard-face flashcard-back">
                     {/* Question reminder */}
                     <div className="question-reminder">
-                        {card.front_content}
+                        {card.front_content ?? card.front}
                     </div>
 
                     {/* Divider */}
@@ -75,16 +75,16 @@ function FlashcardView({ card, showAnswer, isFlipping, onFlip }) {
                     {/* Answer */}
                     <div className="card-content">
                         <div className="answer-text">
-                            {card.back_content}
+                            {card.back_content ?? card.back}
                         </div>
 
                         {/* Extra info if available */}
-                        {card.extra_info && (
+                        {(card.extra_info ?? card.key_point) && (
                             <div className="extra-info">
                                 <details>
                                     <summary>💡 Más información</summary>
                                     <div className="extra-content">
-                                        {card.extra_info}
+                                        {card.extra_info ?? card.key_point}
                                     </div>
                                 </details>
                             </div>
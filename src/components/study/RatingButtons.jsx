@@ -1,6 +1,42 @@
 import React from 'react';
 import './RatingButtons.css';
 
+// Static: built once, not on every render
+const buttonConfig = [
+    {
+        key: 'AGAIN',
+        rating: 1,
+        label: 'Otra vez',
+        shortLabel: 'Again',
+        color: '#ef4444',
+        icon: '❌'
+    },
+    {
+        key: 'HARD',
+        rating: 2,
+        label: 'Difícil',
+        shortLabel: 'Hard',
+        color: '#f59e0b',
+        icon: '😅'
+    },
+    {
+        key: 'GOOD',
+        rating: 3,
+        label: 'Bien',
+        shortLabel: 'Good',
+        color: '#10b981',
+        icon: '✓'
+    },
+    {
+        key: 'EASY',
+        rating: 4,
+        label: 'Fácil',
+        shortLabel: 'Easy',
+        color: '#06b6d4',
+        icon: '⭐'
+    }
+];
+
 /**
  * RatingButtons Component
  * Displays rating buttons (AGAIN, HARD, GOOD, EASY) with calculated intervals
@@ -8,41 +44,6 @@ import './RatingButtons.css';
 function RatingButtons({ options, onRate, loading }) {
     if (!options) return null;
 
-    const buttonConfig = [
-        {
-            key: 'AGAIN',
-            rating: 1,
-            label: 'Otra vez',
-            shortLabel: 'Again',
-            color: '#ef4444',
-            icon: '❌'
-        },
-        {
-            key: 'HARD',
-            rating: 2,
-            label: 'Difícil',
-            shortLabel: 'Hard',
-            color: '#f59e0b',
-            icon: '😅'
-        },
-        {
-            key: 'GOOD',
-            rating: 3,
-            label: 'Bien',
-            shortLabel: 'Good',
-            color: '#10b981',
-            icon: '✓'
-        },
-        {
-            key: 'EASY',
-            rating: 4,
-            label: 'Fácil',
-            shortLabel: 'Easy',
-            color: '#06b6d4',
-            icon: '⭐'
-        }
-    ];
-
     return (
         <div className="rating-buttons">
             {buttonConfig.map(({ key, rating, label, color, icon }) => (
@@ -64,4 +65,5 @@ function RatingButtons({ options, onRate, loading }) {
     );
 }
 
-export default RatingButtons;
+// options come memoized from FSRSContext, so a card only re-renders the buttons once
+export default React.memo(RatingButtons);
@@ -1,6 +1,7 @@
 // Supabase Client - SYNAPSE Medical Platform
 import { createClient } from '@supabase/supabase-js';
 import { SUPABASE_CONFIG } from './supabase.config';
+import resumableUpload from '../services/resumableUpload';
 
 // Create Supabase client
 export const supabase = createClient(
@@ -102,16 +103,13 @@ export const supabaseHelpers = {
             return { data, error };
         },
 
-        getDueCards: async (userId, limit = 50) => {
+        // One page of due cards (by due date, then priority) with the fields a study
+        // session uses; pass the returned cursor to get the next page (null: no more).
+        // The due_cards_page RPC scopes the cards to the signed-in user.
+        getDueCards: async (userId, limit = 50, cursor = null) => {
             const { data, error } = await supabase
-                .from('flashcards')
-                .select('*, flashcard_decks(name, color, icon)')
-                .eq('user_id', userId)
-                .lte('due_date', new Date().toISOString())
-                .order('priority', { ascending: false })
-                .order('due_date', { ascending: true })
-                .limit(limit);
-            return { data, error };
+                .rpc('due_cards_page', { p_cursor: cursor, p_limit: limit });
+            return { data: data?.cards ?? null, cursor: data?.cursor ?? null, error };
         },
 
         getNewCards: async (userId, limit = 20) => {
@@ -164,15 +162,18 @@ export const supabaseHelpers = {
             return { data, error };
         },
 
+        // Daily aggregates (review_daily_stats), one row per day with reviews:
+        // { day: 'YYYY-MM-DD', reviews, correct, new_cards, review_ms }
         getStats: async (userId, days = 7) => {
             const startDate = new Date();
             startDate.setDate(startDate.getDate() - days);
 
             const { data, error } = await supabase
-                .from('review_logs')
-                .select('*')
+                .from('review_daily_stats')
+                .select('day, reviews, correct, new_cards, review_ms')
                 .eq('user_id', userId)
-                .gte('reviewed_at', startDate.toISOString());
+                .gte('day', startDate.toISOString().split('T')[0])
+                .order('day', { ascending: true });
             return { data, error };
         }
     },
@@ -263,7 +264,7 @@ export const supabaseHelpers = {
         get: async (userId) => {
             const { data, error } = await supabase
                 .from('study_stats')
-                .select('stats_data')
+                .select('stats_data, recent_batches')
                 .eq('user_id', userId)
                 .single();
             return { data, error };
@@ -306,17 +307,39 @@ export const supabaseHelpers = {
     storage: {
         /**
          * Upload a file to Supabase Storage
+         * Files larger than one chunk go through the resumable (tus) endpoint:
+         * byte progress, retries that continue where the connection dropped,
+         * and a later upload of the same file resumes (services/resumableUpload).
          * @param {string} userId - User ID for folder path
          * @param {File} file - File to upload
+         * @param {Object} [options]
+         * @param {Function} [options.onProgress] - Called with (bytesSent, totalBytes)
+         * @param {AbortSignal} [options.signal] - Cancels a chunked upload
          * @returns {Promise<{path: string, error: Error|null}>}
          */
-        uploadDocument: async (userId, file) => {
+        uploadDocument: async (userId, file, { onProgress, signal } = {}) => {
             try {
                 // Generate unique filename
                 const timestamp = Date.now();
                 const sanitizedName = file.name.replace(/[^a-zA-Z0-9.-]/g, '_');
                 const filePath = `${userId}/${timestamp}_${sanitizedName}`;
 
+                if (file.size > resumableUpload.CHUNK_SIZE) {
+                    const { path } = await resumableUpload.upload({
+                        userId,
+                        bucket: 'documents',
+                        path: filePath,
+                        file,
+                        getAccessToken: async () => {
+                            const { data } = await supabase.auth.getSession();
+                            return data?.session?.access_token;
+                        },
+                        onProgress,
+                        signal
+                    });
+                    return { path, error: null };
+                }
+
                 const { data, error } = await supabase.storage
                     .from('documents')
                     .upload(filePath, file, {
@@ -326,6 +349,7 @@ export const supabaseHelpers = {
 
                 if (error) throw error;
 
+                onProgress?.(file.size, file.size);
                 return { path: data.path, error: null };
             } catch (error) {
                 console.error('Upload error:', error);
@@ -458,15 +482,48 @@ export const supabaseHelpers = {
         },
 
         /**
-         * Search documents by name or tags
+         * Search documents by name, tags and subject (search_documents RPC):
+         * accent-insensitive, each word matched as a prefix, best match first.
+         * Searches the signed-in user's documents; userId is kept for the
+         * helpers' common signature.
          */
-        search: async (userId, query) => {
-            const { data, error } = await supabase
-                .from('documents')
-                .select('*')
-                .eq('user_id', userId)
-                .or(`name.ilike.%${query}%,subject.ilike.%${query}%`)
-                .order('created_at', { ascending: false });
+        search: async (userId, query, limit = 50) => {
+            const { data, error } = await supabase.rpc('search_documents', {
+                p_query: query,
+                p_limit: limit
+            });
+            return { data, error };
+        },
+
+        /**
+         * Store the extracted text of a document, one row per page
+         */
+        savePages: async (userId, documentId, pages) => {
+            const rows = pages.map(({ page, content }) => ({
+                document_id: documentId,
+                user_id: userId,
+                page,
+                content
+            }));
+            // Several requests for long books, each well under the request size limit
+            for (let i = 0; i < rows.length; i += 100) {
+                const { error } = await supabase
+                    .from('document_pages')
+                    .upsert(rows.slice(i, i + 100), { onConflict: 'document_id,page' });
+                if (error) return { error };
+            }
+            return { error: null };
+        },
+
+        /**
+         * Search the text of every page in the library (search_document_pages RPC)
+         * @returns {{ data: Array<{document_id, page, rank, snippet}>, error }}
+         */
+        searchPages: async (query, limit = 20) => {
+            const { data, error } = await supabase.rpc('search_document_pages', {
+                p_query: query,
+                p_limit: limit
+            });
             return { data, error };
         }
     },
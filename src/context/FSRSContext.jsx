@@ -1,20 +1,55 @@
-import React, { createContext, useContext, useState, useCallback } from 'react';
+import React, { createContext, useContext, useState, useCallback, useEffect, useMemo, useRef } from 'react';
 import { useAuth } from './AuthContext';
-import { supabase } from '../config/supabase';
+import { useStudyStats } from './StudyStatsContext';
+import { supabase, supabaseHelpers } from '../config/supabase';
 import {
     scheduleCard,
-    getSchedulingOptions,
-    sortCardsByPriority,
+    getCachedSchedulingOptions,
     getDueCards,
     getStudyStats,
     DEFAULT_FSRS_PARAMS,
+    resolveWeights,
     Rating,
     CardState
 } from '../lib/fsrs';
+import { StudyQueue } from '../lib/studyQueue';
+import reviewJournal from '../services/reviewJournal';
 
 // Create context
 const FSRSContext = createContext(null);
 
+// Options of a regular study session (StudySession page, dashboard prefetch)
+export const DEFAULT_SESSION_OPTIONS = {
+    includeNew: true,
+    newCardsLimit: 20,
+    reviewLimit: 100
+};
+
+// Due cards beyond the first page are streamed in pages of this size,
+// requested once fewer than DUE_REFILL_THRESHOLD cards are left in the queue
+const DUE_PAGE_SIZE = 100;
+const DUE_REFILL_THRESHOLD = 20;
+
+// Time on a card counted as review time at most (an idle tab is not studying)
+const MAX_REVIEW_DURATION_MS = 5 * 60 * 1000;
+
+// A prefetched session bootstrap older than this is fetched again
+export const PREFETCH_MAX_AGE_MS = 2 * 60 * 1000;
+
+/**
+ * Arguments of the start_study_session RPC for startStudySession's options
+ */
+function sessionArgs(deckId, options) {
+    return {
+        p_deck_id: deckId,
+        p_include_new: !!options.includeNew,
+        p_new_limit: options.newCardsLimit || 20,
+        p_review_limit: (options.includeNew ? options.reviewLimit : options.limit) || 100,
+        p_exam_mode: options.examMode || false,
+        p_session_type: options.sessionType || 'normal'
+    };
+}
+
 /**
  * FSRS Provider Component
  * Manages flashcard study sessions and FSRS scheduling
@@ -25,6 +60,9 @@ export function FSRSProvider({ children }) {
     // Study session state
     const [studyQueue, setStudyQueue] = useState([]);
     const [currentCardIndex, setCurrentCardIndex] = useState(0);
+    const [currentCard, setCurrentCard] = useState(null);
+    // Cards still to show, by urgency (see lib/studyQueue); studyQueue keeps the session's cards
+    const pendingRef = useRef(null);
     const [isStudying, setIsStudying] = useState(false);
     const [sessionStats, setSessionStats] = useState({
         studied: 0,
@@ -41,30 +79,89 @@ export function FSRSProvider({ children }) {
     const [loading, setLoading] = useState(false);
     const [error, setError] = useState(null);
 
+    // Settings and cards of the next session, fetched ahead by prefetchStudySession
+    const prefetchRef = useRef(null);
+    // Cursor of the due-card stream of the current session (null once exhausted)
+    const dueStreamRef = useRef(null);
+    // study_sessions insert of a session started from a prefetch, until it returns the id
+    const sessionInsertRef = useRef(null);
+    const currentCardRef = useRef(null);
+    currentCardRef.current = currentCard;
+    // When the current card was shown, to time its review
+    const shownAtRef = useRef(Date.now());
+    const { recordReview } = useStudyStats();
+
+    useEffect(() => {
+        shownAtRef.current = Date.now();
+    }, [currentCard]);
+
+    // Flush journaled reviews (services/reviewJournal) while signed in
+    useEffect(() => {
+        if (!user) return undefined;
+        return reviewJournal.start(user.id);
+    }, [user]);
+
+    /**
+     * Apply a user_settings row to the FSRS parameters
+     */
+    const applyUserSettings = useCallback((settings) => {
+        if (!settings) return;
+        setFsrsParams(prev => ({
+            ...prev,
+            // Weights fitted from this user's review_logs (fsrs_optimizer), if any
+            w: resolveWeights(settings.fsrs_weights),
+            requestRetention: settings.fsrs_request_retention || 0.9,
+            maximumInterval: settings.fsrs_maximum_interval || 365
+        }));
+    }, []);
+
     /**
-     * Load user's FSRS settings from database
+     * Fetch the settings and cards of the next session ahead of time (e.g. while the
+     * dashboard is open), so starting it with the same deck and options shows the
+     * first card without waiting for the network
+     * @param {string|null} deckId - Optional deck ID to study from
+     * @param {Object} options - Same options as startStudySession
      */
-    const loadUserSettings = useCallback(async () => {
-        if (!user) return;
+    const prefetchStudySession = useCallback(async (deckId = null, options = DEFAULT_SESSION_OPTIONS) => {
+        if (!user || isStudying) return;
+
+        const args = sessionArgs(deckId, options);
+        const key = JSON.stringify(args);
+        const cached = prefetchRef.current;
+        if (cached && cached.userId === user.id && cached.key === key
+            && Date.now() - cached.fetchedAt < PREFETCH_MAX_AGE_MS) {
+            return;
+        }
 
         try {
-            const { data: settings } = await supabase
-                .from('user_settings')
-                .select('fsrs_request_retention, fsrs_maximum_interval')
-                .eq('id', user.id)
-                .single();
-
-            if (settings) {
-                setFsrsParams(prev => ({
-                    ...prev,
-                    requestRetention: settings.fsrs_request_retention || 0.9,
-                    maximumInterval: settings.fsrs_maximum_interval || 365
-                }));
-            }
+            // Cards must reflect reviews still in the journal
+            await reviewJournal.flush();
+            const { data, error: rpcError } = await supabase
+                .rpc('start_study_session', { ...args, p_create_session: false });
+            if (rpcError) throw rpcError;
+
+            prefetchRef.current = { userId: user.id, key, fetchedAt: Date.now(), data };
         } catch (err) {
-            console.error('Error loading FSRS settings:', err);
+            console.error('Error prefetching study session:', err);
         }
-    }, [user]);
+    }, [user, isStudying]);
+
+    // Back to no session
+    const resetSession = useCallback(() => {
+        setIsStudying(false);
+        setStudyQueue([]);
+        setCurrentCardIndex(0);
+        setCurrentCard(null);
+        pendingRef.current = null;
+        dueStreamRef.current = null;
+        setSessionStats({
+            studied: 0,
+            correct: 0,
+            incorrect: 0,
+            startTime: null,
+            sessionId: null
+        });
+    }, []);
 
     /**
      * Start a study session
@@ -77,83 +174,95 @@ export function FSRSProvider({ children }) {
             return false;
         }
 
-        setLoading(true);
         setError(null);
 
-        try {
-            // Load user settings
-            await loadUserSettings();
-
-            // Build query for cards
-            let query = supabase
-                .from('flashcards')
-                .select('*, flashcard_decks(name, color, icon)')
-                .eq('user_id', user.id)
-                .lte('due_date', new Date().toISOString());
-
-            if (deckId) {
-                query = query.eq('deck_id', deckId);
-            }
-
-            // Add new cards if requested
-            if (options.includeNew) {
-                const { data: newCards } = await supabase
-                    .from('flashcards')
-                    .select('*, flashcard_decks(name, color, icon)')
-                    .eq('user_id', user.id)
-                    .eq('state', CardState.NEW)
-                    .limit(options.newCardsLimit || 20);
-
-                const { data: dueCards } = await query.limit(options.reviewLimit || 100);
-
-                // Combine and sort
-                const allCards = [...(dueCards || []), ...(newCards || [])];
-                const sortedCards = sortCardsByPriority(
-                    allCards,
-                    options.examDate ? new Date(options.examDate) : null
-                );
-
-                setStudyQueue(sortedCards);
-            } else {
-                const { data: cards, error: fetchError } = await query
-                    .limit(options.limit || 100);
-
-                if (fetchError) throw fetchError;
-
-                const sortedCards = sortCardsByPriority(
-                    cards || [],
-                    options.examDate ? new Date(options.examDate) : null
-                );
-
-                setStudyQueue(sortedCards);
-            }
+        const args = sessionArgs(deckId, options);
+        const cached = prefetchRef.current;
+        prefetchRef.current = null;
+        const prefetched = cached && cached.userId === user.id && cached.key === JSON.stringify(args)
+            && Date.now() - cached.fetchedAt < PREFETCH_MAX_AGE_MS
+            && reviewJournal.pendingCount() === 0
+            ? cached.data
+            : null;
+
+        const beginSession = (bootstrap) => {
+            applyUserSettings(bootstrap.settings);
+            // New cards can also be due; keep one copy of each
+            const seen = new Set();
+            const sessionCards = [...(bootstrap.due_cards || []), ...(bootstrap.new_cards || [])]
+                .filter(card => !seen.has(card.id) && seen.add(card.id));
+            dueStreamRef.current = { cursor: bootstrap.due_cursor || null, loading: false, seen };
+
+            // Order by urgency in one O(n) heap build instead of a full sort
+            const pending = new StudyQueue(sessionCards, {
+                examDate: options.examDate ? new Date(options.examDate) : null
+            });
+            pendingRef.current = pending;
+            setStudyQueue(sessionCards);
+            setCurrentCard(pending.next());
+            setSessionStats({
+                studied: 0,
+                correct: 0,
+                incorrect: 0,
+                startTime: new Date(),
+                sessionId: bootstrap.session ? bootstrap.session.id : null
+            });
+            setCurrentCardIndex(0);
+            setIsStudying(true);
+        };
 
-            // Create study session record
-            const { data: session, error: sessionError } = await supabase
+        if (prefetched) {
+            // Show the prefetched cards now; only the session record is still to create
+            beginSession(prefetched);
+            const pending = pendingRef.current;
+            // endStudySession waits for this when the session ends before the id is back
+            const insert = supabase
                 .from('study_sessions')
                 .insert({
                     user_id: user.id,
                     deck_id: deckId,
                     started_at: new Date().toISOString(),
-                    exam_mode: options.examMode || false,
-                    session_type: options.sessionType || 'normal'
+                    exam_mode: args.p_exam_mode,
+                    session_type: args.p_session_type
                 })
                 .select()
-                .single();
+                .single()
+                .then(({ data: session, error: sessionError }) => {
+                    if (sessionError) throw sessionError;
+                    return session.id;
+                });
+            sessionInsertRef.current = insert;
+
+            try {
+                const sessionId = await insert;
+                // Unless the session was ended (or replaced) meanwhile
+                if (pendingRef.current === pending) {
+                    setSessionStats(prev => ({ ...prev, sessionId }));
+                }
+                return true;
+            } catch (err) {
+                console.error('Error creating study session:', err);
+                setError(err.message);
+                if (pendingRef.current === pending) resetSession();
+                return false;
+            } finally {
+                if (sessionInsertRef.current === insert) sessionInsertRef.current = null;
+            }
+        }
 
-            if (sessionError) throw sessionError;
+        setLoading(true);
 
-            setSessionStats({
-                studied: 0,
-                correct: 0,
-                incorrect: 0,
-                startTime: new Date(),
-                sessionId: session.id
-            });
+        try {
+            // Send reviews still in the journal so due cards are current
+            await reviewJournal.flush();
 
-            setCurrentCardIndex(0);
-            setIsStudying(true);
+            // Settings, due cards, new cards and the session record in one round trip
+            const { data: bootstrap, error: rpcError } = await supabase
+                .rpc('start_study_session', args);
+
+            if (rpcError) throw rpcError;
 
+            beginSession(bootstrap);
             return true;
         } catch (err) {
             console.error('Error starting study session:', err);
@@ -162,24 +271,67 @@ export function FSRSProvider({ children }) {
         } finally {
             setLoading(false);
         }
-    }, [user, loadUserSettings]);
+    }, [user, applyUserSettings, resetSession]);
 
     /**
      * Get the current card being studied
      */
-    const getCurrentCard = useCallback(() => {
-        if (currentCardIndex >= studyQueue.length) return null;
-        return studyQueue[currentCardIndex];
-    }, [studyQueue, currentCardIndex]);
+    const getCurrentCard = useCallback(() => currentCard, [currentCard]);
+
+    // Interval previews of the rating buttons, memoized by card state and params
+    const currentSchedulingOptions = useMemo(
+        () => (currentCard ? getCachedSchedulingOptions(currentCard, fsrsParams) : null),
+        [currentCard, fsrsParams]
+    );
+
+    // While this card is answered, compute the next card's previews when the browser is idle
+    useEffect(() => {
+        const next = pendingRef.current?.peek();
+        if (!next) return undefined;
+
+        const warm = () => getCachedSchedulingOptions(next, fsrsParams);
+        if (typeof window.requestIdleCallback === 'function') {
+            const handle = window.requestIdleCallback(warm, { timeout: 2000 });
+            return () => window.cancelIdleCallback(handle);
+        }
+        const timer = setTimeout(warm, 200);
+        return () => clearTimeout(timer);
+    }, [currentCard, fsrsParams]);
 
     /**
      * Get scheduling options for the current card
      */
-    const getCurrentSchedulingOptions = useCallback(() => {
-        const card = getCurrentCard();
-        if (!card) return null;
-        return getSchedulingOptions(card, fsrsParams);
-    }, [getCurrentCard, fsrsParams]);
+    const getCurrentSchedulingOptions = useCallback(() => currentSchedulingOptions, [currentSchedulingOptions]);
+
+    /**
+     * Append the next page of due cards to the session once the queue runs low
+     */
+    const pullDuePage = useCallback(async () => {
+        const stream = dueStreamRef.current;
+        const pending = pendingRef.current;
+        if (!stream || !stream.cursor || stream.loading || !pending || pending.size >= DUE_REFILL_THRESHOLD) return;
+
+        stream.loading = true;
+        try {
+            const { data: cards, cursor, error: pageError } =
+                await supabaseHelpers.cards.getDueCards(user.id, DUE_PAGE_SIZE, stream.cursor);
+            if (pageError) throw pageError;
+            // The session ended or restarted meanwhile
+            if (dueStreamRef.current !== stream) return;
+
+            stream.cursor = cursor;
+            const fresh = (cards || []).filter(card => !stream.seen.has(card.id) && stream.seen.add(card.id));
+            fresh.forEach(card => pending.push(card));
+            setStudyQueue(prev => [...prev, ...fresh]);
+            if (!currentCardRef.current) {
+                setCurrentCard(pending.next());
+            }
+        } catch (err) {
+            console.error('Error loading more due cards:', err);
+        } finally {
+            stream.loading = false;
+        }
+    }, [user]);
 
     /**
      * Answer the current card with a rating
@@ -189,47 +341,18 @@ export function FSRSProvider({ children }) {
         const card = getCurrentCard();
         if (!card || !user) return null;
 
-        setLoading(true);
-
         try {
             // Calculate new card state using FSRS
             const updatedCard = scheduleCard(card, rating, fsrsParams);
 
-            // Update card in database
-            const { error: updateError } = await supabase
-                .from('flashcards')
-                .update({
-                    state: updatedCard.state,
-                    difficulty: updatedCard.difficulty,
-                    stability: updatedCard.stability,
-                    retrievability: updatedCard.retrievability,
-                    due_date: updatedCard.due_date,
-                    last_review: updatedCard.last_review,
-                    scheduled_days: updatedCard.scheduled_days,
-                    elapsed_days: updatedCard.elapsed_days,
-                    reps: updatedCard.reps,
-                    lapses: updatedCard.lapses
-                })
-                .eq('id', card.id);
-
-            if (updateError) throw updateError;
-
-            // Log the review
-            await supabase.from('review_logs').insert({
-                card_id: card.id,
-                user_id: user.id,
-                rating: ['AGAIN', 'HARD', 'GOOD', 'EASY'][rating - 1],
-                state_before: card.state,
-                difficulty_before: card.difficulty,
-                stability_before: card.stability,
-                state_after: updatedCard.state,
-                difficulty_after: updatedCard.difficulty,
-                stability_after: updatedCard.stability,
-                scheduled_days: updatedCard.scheduled_days
-            });
+            // Journal the card update and review log; they reach Supabase in batches
+            const durationMs = Math.min(Date.now() - shownAtRef.current, MAX_REVIEW_DURATION_MS);
+            reviewJournal.record({ userId: user.id, card, updatedCard, rating, durationMs });
 
             // Update session stats
             const isCorrect = rating >= Rating.GOOD;
+            // Counted in today's totals right away; the server keeps the same ones (review_daily_stats)
+            recordReview({ correct: isCorrect, isNew: card.state === CardState.NEW, durationMs });
             setSessionStats(prev => ({
                 ...prev,
                 studied: prev.studied + 1,
@@ -237,42 +360,40 @@ export function FSRSProvider({ children }) {
                 incorrect: !isCorrect ? prev.incorrect + 1 : prev.incorrect
             }));
 
-            // If card needs relearning, add it back to the queue
+            // If card needs relearning, add it back to the queue for when its step is due
+            const pending = pendingRef.current;
             if (rating === Rating.AGAIN) {
-                setStudyQueue(prev => {
-                    const newQueue = [...prev];
-                    newQueue[currentCardIndex] = updatedCard;
-                    // Move card to later in the queue (about 5-10 cards later)
-                    const reinsertPosition = Math.min(
-                        currentCardIndex + Math.floor(Math.random() * 5) + 5,
-                        newQueue.length
-                    );
-                    const [removedCard] = newQueue.splice(currentCardIndex, 1);
-                    newQueue.splice(reinsertPosition, 0, removedCard);
-                    return newQueue;
-                });
+                pending?.relearn(updatedCard);
             } else {
-                // Move to next card
                 setCurrentCardIndex(prev => prev + 1);
             }
+            // Move to next card
+            setCurrentCard(pending ? pending.next() : null);
+            pullDuePage();
 
             return updatedCard;
         } catch (err) {
             console.error('Error answering card:', err);
             setError(err.message);
             return null;
-        } finally {
-            setLoading(false);
         }
-    }, [getCurrentCard, user, fsrsParams, currentCardIndex]);
+    }, [getCurrentCard, user, fsrsParams, pullDuePage, recordReview]);
 
     /**
      * End the current study session
      */
     const endStudySession = useCallback(async () => {
-        if (!sessionStats.sessionId) return;
+        let sessionId = sessionStats.sessionId;
+        if (!sessionId && sessionInsertRef.current) {
+            // Started from a prefetch and the session record is still being created
+            sessionId = await sessionInsertRef.current.catch(() => null);
+        }
 
         try {
+            // Send the session's reviews now rather than on the next interval
+            reviewJournal.flush();
+            if (!sessionId) return;
+
             const duration = sessionStats.startTime
                 ? Math.round((new Date() - sessionStats.startTime) / 60000)
                 : 0;
@@ -287,36 +408,25 @@ export function FSRSProvider({ children }) {
                     cards_incorrect: sessionStats.incorrect,
                     new_cards_studied: studyQueue.filter(c => c.state === CardState.NEW).length
                 })
-                .eq('id', sessionStats.sessionId);
-
-            setIsStudying(false);
-            setStudyQueue([]);
-            setCurrentCardIndex(0);
-            setSessionStats({
-                studied: 0,
-                correct: 0,
-                incorrect: 0,
-                startTime: null,
-                sessionId: null
-            });
+                .eq('id', sessionId);
         } catch (err) {
             console.error('Error ending study session:', err);
+        } finally {
+            // Without a session record the local session still ends
+            resetSession();
         }
-    }, [sessionStats, studyQueue]);
+    }, [sessionStats, studyQueue, resetSession]);
 
     /**
      * Skip the current card (move to end of queue)
      */
     const skipCard = useCallback(() => {
-        if (currentCardIndex >= studyQueue.length) return;
+        const pending = pendingRef.current;
+        if (!currentCard || !pending) return;
 
-        setStudyQueue(prev => {
-            const newQueue = [...prev];
-            const [skippedCard] = newQueue.splice(currentCardIndex, 1);
-            newQueue.push(skippedCard);
-            return newQueue;
-        });
-    }, [currentCardIndex, studyQueue.length]);
+        pending.skip(currentCard);
+        setCurrentCard(pending.next());
+    }, [currentCard]);
 
     /**
      * Get progress information for the current session
@@ -403,6 +513,7 @@ export function FSRSProvider({ children }) {
 
         // Functions
         startStudySession,
+        prefetchStudySession,
         endStudySession,
         getCurrentCard,
         getCurrentSchedulingOptions,
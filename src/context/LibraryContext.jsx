@@ -1,6 +1,9 @@
-import { createContext, useContext, useState, useEffect, useCallback } from 'react'
+import { createContext, useContext, useState, useEffect, useCallback, useMemo, useRef } from 'react'
 import { supabase, supabaseHelpers } from '../config/supabase'
 import { useAuth } from './AuthContext'
+import { SearchIndex } from '../lib/searchIndex'
+import { extractPdfPages } from '../lib/pdfText'
+import documentCache from '../services/documentCache'
 
 const LibraryContext = createContext()
 
@@ -30,8 +33,12 @@ const initialCollections = [
     { id: 4, name: 'Farmacología', count: 0, color: '#3fb950' }
 ]
 
+// Search weight of each document field
+const SEARCH_FIELDS = { title: 3, tags: 2, category: 1.5, summary: 1 }
+
 // Constants
 const MAX_FILE_SIZE = 100 * 1024 * 1024 // 100MB
+const UPLOAD_CONCURRENCY = 3 // files uploaded at the same time
 const ALLOWED_TYPES = [
     'application/pdf',
     'image/jpeg', 'image/png', 'image/gif', 'image/webp', 'image/svg+xml',
@@ -56,6 +63,15 @@ export function LibraryProvider({ children }) {
     const [uploadProgress, setUploadProgress] = useState(0)
     const [error, setError] = useState(null)
 
+    // Inverted index over the loaded documents, kept in step with every change to them
+    const searchIndexRef = useRef(null)
+    if (!searchIndexRef.current) searchIndexRef.current = new SearchIndex(SEARCH_FIELDS)
+    const documentsById = useMemo(() => new Map(documents.map(doc => [doc.id, doc])), [documents])
+    // Bytes sent / total of the uploads of the current batch, for the overall progress bar
+    const activeUploadsRef = useRef(new Map())
+    // Text extraction of uploaded PDFs, one file at a time
+    const extractionQueueRef = useRef(Promise.resolve())
+
     const [collections, setCollections] = useState(() => {
         const saved = localStorage.getItem('synapse_collections')
         return saved ? JSON.parse(saved) : initialCollections
@@ -78,6 +94,7 @@ export function LibraryProvider({ children }) {
     // Fetch documents from Supabase when user changes
     const fetchDocuments = useCallback(async () => {
         if (!isAuthenticated || !user?.id) {
+            searchIndexRef.current.replaceAll(sampleDocuments)
             setDocuments(sampleDocuments)
             setLoading(false)
             return
@@ -105,15 +122,20 @@ export function LibraryProvider({ children }) {
                 size: formatFileSize(doc.file_size),
                 sizeBytes: doc.file_size,
                 filePath: doc.file_path,
+                pageCount: doc.page_count || null,
                 isNote: false,
                 isSample: false
             }))
 
+            searchIndexRef.current.replaceAll(transformedDocs)
             setDocuments(transformedDocs)
         } catch (err) {
             console.error('Error fetching documents:', err)
             setError('Error al cargar documentos')
-            setDocuments([])
+            // Offline or unreachable: the documents opened before are still readable from the browser cache
+            const cachedDocs = documentCache.cachedDocuments(user.id)
+            searchIndexRef.current.replaceAll(cachedDocs)
+            setDocuments(cachedDocs)
         } finally {
             setLoading(false)
         }
@@ -123,6 +145,15 @@ export function LibraryProvider({ children }) {
         fetchDocuments()
     }, [fetchDocuments])
 
+    // Cached files and signed URLs belong to the signed-in user; drop them when the user changes
+    const cachedUserRef = useRef(user?.id)
+    useEffect(() => {
+        if (cachedUserRef.current && cachedUserRef.current !== user?.id) {
+            documentCache.clear()
+        }
+        cachedUserRef.current = user?.id
+    }, [user?.id])
+
     // Helper functions
     const formatFileSize = (bytes) => {
         if (!bytes) return '0 B'
@@ -163,15 +194,53 @@ export function LibraryProvider({ children }) {
         return { valid: true, error: null }
     }
 
+    // Store the text of an uploaded PDF, page by page, for content search (lib/pdfText).
+    // Runs in the background after the upload; a failure only leaves the document
+    // out of content search.
+    const indexDocumentText = (documentId, file) => {
+        const userId = user.id
+        extractionQueueRef.current = extractionQueueRef.current.then(async () => {
+            try {
+                const { numPages, pages } = await extractPdfPages(file)
+                const { error: pagesError } = await supabaseHelpers.documents.savePages(userId, documentId, pages)
+                if (pagesError) throw pagesError
+
+                await supabaseHelpers.documents.update(documentId, { page_count: numPages })
+                setDocuments(prev => prev.map(doc =>
+                    doc.id === documentId ? { ...doc, pageCount: numPages } : doc
+                ))
+            } catch (err) {
+                console.error('Error indexing document text:', err)
+            }
+        })
+    }
+
+    const reportUploadProgress = () => {
+        let loaded = 0
+        let total = 0
+        for (const upload of activeUploadsRef.current.values()) {
+            loaded += upload.loaded
+            total += upload.total
+        }
+        setUploading(true)
+        setUploadProgress(total > 0 ? Math.round((loaded / total) * 100) : 0)
+    }
+
     // Add document with file upload to Supabase Storage
-    const addDocument = async (docData, file = null) => {
+    const addDocument = async (docData, file = null, { onProgress } = {}) => {
         if (!isAuthenticated || !user?.id) {
             setError('Debes iniciar sesión para subir documentos')
             return { error: 'No autenticado' }
         }
 
-        setUploading(true)
-        setUploadProgress(0)
+        // Uploads can run in parallel (addDocuments); each one reports its own bytes
+        const uploadKey = {}
+        const trackProgress = (loaded, total) => {
+            activeUploadsRef.current.set(uploadKey, { loaded, total, done: false })
+            reportUploadProgress()
+            onProgress?.(loaded, total)
+        }
+        trackProgress(0, file?.size || 1)
         setError(null)
 
         try {
@@ -186,16 +255,15 @@ export function LibraryProvider({ children }) {
                     throw new Error(validation.error)
                 }
 
-                setUploadProgress(25)
-
                 // Upload to Supabase Storage
-                const { path, error: uploadError } = await supabaseHelpers.storage.uploadDocument(user.id, file)
+                const { path, error: uploadError } = await supabaseHelpers.storage.uploadDocument(user.id, file, {
+                    onProgress: trackProgress
+                })
 
                 if (uploadError) throw uploadError
 
                 filePath = path
                 fileSize = file.size
-                setUploadProgress(75)
             }
 
             // Save metadata to database
@@ -213,7 +281,7 @@ export function LibraryProvider({ children }) {
 
             if (dbError) throw dbError
 
-            setUploadProgress(100)
+            trackProgress(file?.size || 1, file?.size || 1)
 
             // Add to local state
             const newDoc = {
@@ -234,8 +302,13 @@ export function LibraryProvider({ children }) {
                 isSample: false
             }
 
+            searchIndexRef.current.add(newDoc)
             setDocuments(prev => [newDoc, ...prev])
 
+            if (file && data.file_type === 'application/pdf') {
+                indexDocumentText(data.id, file)
+            }
+
             // Update collection count
             if (data.subject) {
                 updateCollectionCount(data.subject, 1)
@@ -247,11 +320,39 @@ export function LibraryProvider({ children }) {
             setError(err.message || 'Error al subir documento')
             return { data: null, error: err }
         } finally {
-            setUploading(false)
-            setTimeout(() => setUploadProgress(0), 1000)
+            // Finished uploads keep counting until the whole batch is done, so the bar never goes back
+            const uploads = activeUploadsRef.current
+            uploads.set(uploadKey, { ...uploads.get(uploadKey), done: true })
+            if ([...uploads.values()].every(upload => upload.done)) {
+                uploads.clear()
+                setUploading(false)
+                setTimeout(() => {
+                    if (activeUploadsRef.current.size === 0) setUploadProgress(0)
+                }, 1000)
+            }
         }
     }
 
+    // Add several files, UPLOAD_CONCURRENCY at a time
+    // entries: [{ docData, file }]; onFileProgress(index, bytesSent, totalBytes)
+    const addDocuments = async (entries, onFileProgress) => {
+        const results = new Array(entries.length)
+        let next = 0
+        const worker = async () => {
+            while (next < entries.length) {
+                const index = next++
+                const { docData, file } = entries[index]
+                results[index] = await addDocument(docData, file, {
+                    onProgress: (loaded, total) => onFileProgress?.(index, loaded, total)
+                })
+            }
+        }
+        await Promise.all(
+            Array.from({ length: Math.min(UPLOAD_CONCURRENCY, entries.length) }, worker)
+        )
+        return results
+    }
+
     // Update document metadata
     const updateDocument = async (id, updates) => {
         if (!isAuthenticated) return { error: 'No autenticado' }
@@ -265,6 +366,8 @@ export function LibraryProvider({ children }) {
 
             if (updateError) throw updateError
 
+            const current = documentsById.get(id)
+            if (current) searchIndexRef.current.add({ ...current, ...updates })
             setDocuments(prev => prev.map(doc =>
                 doc.id === id ? { ...doc, ...updates } : doc
             ))
@@ -285,6 +388,7 @@ export function LibraryProvider({ children }) {
 
         // Skip sample documents
         if (doc.isSample) {
+            searchIndexRef.current.remove(id)
             setDocuments(prev => prev.filter(d => d.id !== id))
             return { error: null }
         }
@@ -296,6 +400,7 @@ export function LibraryProvider({ children }) {
                 if (storageError) {
                     console.warn('Error deleting from storage:', storageError)
                 }
+                documentCache.remove(doc.filePath)
             }
 
             // Delete from Database
@@ -306,6 +411,7 @@ export function LibraryProvider({ children }) {
             if (doc.collection) {
                 updateCollectionCount(doc.collection, -1)
             }
+            searchIndexRef.current.remove(id)
             setDocuments(prev => prev.filter(d => d.id !== id))
 
             return { error: null }
@@ -321,7 +427,7 @@ export function LibraryProvider({ children }) {
         const doc = documents.find(d => d.id === id)
         if (!doc?.filePath) return { url: null, error: 'No file path' }
 
-        const { url, error } = await supabaseHelpers.storage.getSignedUrl(doc.filePath, 7200)
+        const { url, error } = await documentCache.getSignedUrl(doc.filePath)
         return { url, error }
     }
 
@@ -333,7 +439,7 @@ export function LibraryProvider({ children }) {
         if (!doc.filePath) return { url: null, error: 'Sin archivo asociado' }
 
         try {
-            const { url, error } = await supabaseHelpers.storage.getSignedUrl(doc.filePath, 7200)
+            const { url, error } = await documentCache.getSignedUrl(doc.filePath)
             if (error) throw error
             return { url, error: null }
         } catch (err) {
@@ -342,13 +448,40 @@ export function LibraryProvider({ children }) {
         }
     }
 
+    // Get the file of a document, from the browser cache when it was opened before (services/documentCache)
+    const getDocumentFile = useCallback(async (docId) => {
+        const doc = documents.find(d => String(d.id) === String(docId))
+        if (!doc) return { data: null, error: 'Documento no encontrado' }
+        if (!doc.filePath) return { data: null, error: 'Sin archivo asociado' }
+
+        const { data, error } = await documentCache.getFile(doc.filePath, { userId: user?.id, document: doc })
+        if (error) {
+            return { data: null, error: error.message || 'Error al obtener el documento' }
+        }
+        return { data, error: null }
+    }, [documents, user?.id])
+
+    // Open a document without waiting for the whole file: the cached copy when there is one,
+    // otherwise its signed URL while the copy is downloaded in the background
+    const openDocumentFile = useCallback(async (docId) => {
+        const doc = documents.find(d => String(d.id) === String(docId))
+        if (!doc) return { data: null, url: null, error: 'Documento no encontrado' }
+        if (!doc.filePath) return { data: null, url: null, error: 'Sin archivo asociado' }
+
+        const { data, url, error } = await documentCache.openFile(doc.filePath, { userId: user?.id, document: doc })
+        if (error) {
+            return { data: null, url: null, error: error.message || 'Error al obtener el documento' }
+        }
+        return { data, url, error: null }
+    }, [documents, user?.id])
+
     // Download a document
     const downloadDocument = async (id) => {
         const doc = documents.find(d => d.id === id)
         if (!doc?.filePath) return { error: 'No file path' }
 
         try {
-            const { data, error } = await supabaseHelpers.storage.downloadDocument(doc.filePath)
+            const { data, error } = await documentCache.getFile(doc.filePath, { userId: user?.id, document: doc })
             if (error) throw error
 
             // Create download link
@@ -443,19 +576,12 @@ export function LibraryProvider({ children }) {
         }
     }
 
-    // Search function
+    // Search function: ranked by relevance when there is a query (see lib/searchIndex)
     const searchDocuments = (query, filters = {}) => {
-        let results = [...documents]
-
-        if (query) {
-            const lowerQuery = query.toLowerCase()
-            results = results.filter(doc =>
-                doc.title.toLowerCase().includes(lowerQuery) ||
-                doc.summary?.toLowerCase().includes(lowerQuery) ||
-                doc.tags.some(tag => tag.toLowerCase().includes(lowerQuery)) ||
-                doc.category?.toLowerCase().includes(lowerQuery)
-            )
-        }
+        const hits = query ? searchIndexRef.current.search(query) : null
+        let results = hits
+            ? hits.map(hit => documentsById.get(hit.id)).filter(Boolean)
+            : [...documents]
 
         if (filters.collection) {
             results = results.filter(doc => doc.collection === filters.collection)
@@ -473,6 +599,10 @@ export function LibraryProvider({ children }) {
 
         if (filters.sortBy) {
             switch (filters.sortBy) {
+                case 'relevance':
+                    // Without a query there is nothing to rank by; newest first
+                    if (!hits) results.sort((a, b) => new Date(b.date) - new Date(a.date))
+                    break
                 case 'date':
                     results.sort((a, b) => new Date(b.date) - new Date(a.date))
                     break
@@ -490,6 +620,28 @@ export function LibraryProvider({ children }) {
         return results
     }
 
+    // Content search: pages of the library's PDFs containing every word of the query
+    const searchDocumentContents = useCallback(async (query, limit = 20) => {
+        if (!isAuthenticated || !query?.trim()) {
+            return { data: [], error: null }
+        }
+
+        const { data, error: searchError } = await supabaseHelpers.documents.searchPages(query, limit)
+        if (searchError) {
+            console.error('Error searching document contents:', searchError)
+            return { data: [], error: searchError }
+        }
+
+        const hits = (data || [])
+            .filter(hit => documentsById.has(hit.document_id))
+            .map(hit => ({
+                document: documentsById.get(hit.document_id),
+                page: hit.page,
+                snippet: hit.snippet
+            }))
+        return { data: hits, error: null }
+    }, [isAuthenticated, documentsById])
+
     // Create note (stored in database without file)
     const createNote = async (title, content, collection = null, noteTags = []) => {
         return addDocument({
@@ -517,11 +669,14 @@ export function LibraryProvider({ children }) {
         error,
         // Document operations
         addDocument,
+        addDocuments,
         updateDocument,
         deleteDocument,
         moveToCollection,
         getDocumentUrl,
         getDocumentViewUrl,
+        getDocumentFile,
+        openDocumentFile,
         downloadDocument,
         // Collection operations
         addCollection,
@@ -533,6 +688,7 @@ export function LibraryProvider({ children }) {
         removeTagFromDocument,
         // Search
         searchDocuments,
+        searchDocumentContents,
         createNote,
         // Refresh
         refreshDocuments: fetchDocuments,
@@ -1,6 +1,7 @@
 import React, { createContext, useContext, useState, useCallback, useEffect } from 'react'
 import { useAuth } from './AuthContext'
 import { supabaseHelpers } from '../config/supabase'
+import { N8N_BASE_URL } from '../services/n8n'
 
 const StudyAIContext = createContext(null)
 
@@ -401,7 +402,7 @@ export function StudyAIProvider({ children }) {
 
             while (retries > 0) {
                 try {
-                    response = await fetch('https://n8n-n8n.8noypn.easypanel.host/webhook/estudio-ia/query', {
+                    response = await fetch(`${N8N_BASE_URL}/estudio-ia/query`, {
                         method: 'POST',
                         headers: {
                             'Content-Type': 'application/json'
@@ -1,10 +1,16 @@
-import { createContext, useContext, useState, useEffect } from 'react'
+import { createContext, useContext, useState, useEffect, useCallback, useRef } from 'react'
 import { useAuth } from './AuthContext'
 import { supabaseHelpers } from '../config/supabase'
+import { applyOps } from '../lib/statsOps'
+import studyStatsSync from '../services/studyStatsSync'
 
 const StudyStatsContext = createContext(null)
 
-const STORAGE_KEY = 'synapse_study_stats'
+// Sesiones Pomodoro que se guardan una a una; las anteriores quedan como totales por mes
+const POMODORO_KEEP_DAYS = 30
+
+// Días de agregados de repasos (review_daily_stats) que se cargan
+const REVIEW_STATS_DAYS = 90
 
 // Obtener fecha actual en formato YYYY-MM-DD
 const getToday = () => new Date().toISOString().split('T')[0]
@@ -17,6 +23,9 @@ const daysDifference = (date1, date2) => {
     return Math.floor(diffTime / (1000 * 60 * 60 * 24))
 }
 
+// Totales de repasos de flashcards de un día
+const emptyReviewDay = () => ({ reviews: 0, correct: 0, newCards: 0, reviewMs: 0 })
+
 // Estado inicial
 const createInitialState = () => ({
     dailyGoal: 240, // 4 horas en minutos
@@ -26,6 +35,7 @@ const createInitialState = () => ({
     totalStudyTime: 0,
     lastStudyDate: null,
     pomodoroSessions: [], // { date, studyMinutes, breakMinutes, completedAt }
+    pomodoroArchive: {}, // { 'YYYY-MM': { sessions, studyMinutes, breakMinutes } }
     completedGoalsCount: 0,
     lastRewardDate: null
 })
@@ -34,45 +44,53 @@ export function StudyStatsProvider({ children }) {
     const { user } = useAuth()
     const [stats, setStats] = useState(createInitialState())
     const [isLoaded, setIsLoaded] = useState(false)
+    // { 'YYYY-MM-DD': { reviews, correct, newCards, reviewMs } }
+    const [reviewHistory, setReviewHistory] = useState({})
+
+    // Estado actual, para calcular las operaciones de cada cambio
+    const statsRef = useRef(stats)
+
+    const replaceStats = (next) => {
+        statsRef.current = next
+        setStats(next)
+    }
+
+    // Aplicar un cambio como operaciones (lib/statsOps): solo ellas se guardan y se envían
+    const commit = (ops) => {
+        if (ops.length === 0) return
+        const next = applyOps(statsRef.current, ops)
+        replaceStats(next)
+        studyStatsSync.record(ops, next)
+    }
 
-    // Cargar datos (de Supabase primero, luego localStorage)
+    // Sincronizar los cambios con Supabase mientras hay sesión
+    useEffect(() => {
+        if (!user?.id) return undefined
+        return studyStatsSync.start(user.id, () => statsRef.current)
+    }, [user])
+
+    // Cargar datos (de Supabase, más los cambios aún sin enviar; si no, localStorage)
     useEffect(() => {
         let isMounted = true
 
         const loadStats = async () => {
-            const localSaved = localStorage.getItem(STORAGE_KEY)
-            let parsedLocal = null
-            if (localSaved) {
-                try {
-                    parsedLocal = JSON.parse(localSaved)
-                } catch (e) {}
-            }
-
-            if (!user?.id) {
-                if (isMounted) {
-                    setStats(parsedLocal ? { ...createInitialState(), ...parsedLocal } : createInitialState())
-                    setIsLoaded(true)
-                }
-                return
-            }
-
             try {
-                const { data, error } = await supabaseHelpers.studyStats.get(user.id)
-                if (!error && data?.stats_data) {
-                    if (isMounted) setStats({ ...createInitialState(), ...data.stats_data })
-                } else {
-                    // Si no hay datos en la BD pero sí locales, subimos los locales
-                    if (parsedLocal) {
-                        if (isMounted) setStats({ ...createInitialState(), ...parsedLocal })
-                        supabaseHelpers.studyStats.upsert(user.id, parsedLocal).catch(() => {})
-                    } else {
-                        if (isMounted) setStats(createInitialState())
-                    }
+                const loaded = await studyStatsSync.load(user?.id)
+                if (!isMounted) return
+                replaceStats({ ...createInitialState(), ...loaded })
+
+                // Compactar sesiones Pomodoro antiguas en totales por mes
+                const cutoff = new Date()
+                cutoff.setDate(cutoff.getDate() - POMODORO_KEEP_DAYS)
+                const before = cutoff.toISOString().split('T')[0]
+                if ((loaded?.pomodoroSessions || []).some(s => s.date < before)) {
+                    commit([{ op: 'compactPomodoros', before }])
                 }
             } catch (err) {
                 console.error("Error cargando estadísticas de estudio:", err)
-                if (isMounted && parsedLocal) {
-                    setStats({ ...createInitialState(), ...parsedLocal })
+                const local = studyStatsSync.restore()
+                if (isMounted && local) {
+                    replaceStats({ ...createInitialState(), ...local })
                 }
             } finally {
                 if (isMounted) setIsLoaded(true)
@@ -86,21 +104,42 @@ export function StudyStatsProvider({ children }) {
         }
     }, [user])
 
-    // Guardar stats (en localStorage siempre, en Supabase debounced)
+    // Cargar agregados diarios de repasos: una fila por día, no los review_logs
     useEffect(() => {
-        if (!isLoaded) return // No guardar si no se han cargado
-        
-        localStorage.setItem(STORAGE_KEY, JSON.stringify(stats))
-        
-        const saveTimeout = setTimeout(() => {
-            if (user?.id) {
-                supabaseHelpers.studyStats.upsert(user.id, stats)
-                    .catch(err => console.error("Error guardando estadísticas de estudio:", err))
-            }
-        }, 2000)
+        if (!user?.id) {
+            setReviewHistory({})
+            return
+        }
+        let isMounted = true
+
+        supabaseHelpers.reviews.getStats(user.id, REVIEW_STATS_DAYS)
+            .then(({ data, error }) => {
+                if (error) throw error
+                if (!isMounted) return
+                const loaded = {}
+                for (const row of data || []) {
+                    loaded[row.day] = {
+                        reviews: row.reviews,
+                        correct: row.correct,
+                        newCards: row.new_cards,
+                        reviewMs: Number(row.review_ms)
+                    }
+                }
+                // Repasos de esta pestaña aún sin enviar pueden faltar en el servidor
+                setReviewHistory(prev => {
+                    const merged = { ...loaded }
+                    for (const [day, totals] of Object.entries(prev)) {
+                        if (!merged[day] || totals.reviews > merged[day].reviews) merged[day] = totals
+                    }
+                    return merged
+                })
+            })
+            .catch(err => console.error("Error cargando estadísticas de repasos:", err))
 
-        return () => clearTimeout(saveTimeout)
-    }, [stats, user, isLoaded])
+        return () => {
+            isMounted = false
+        }
+    }, [user])
 
     // Calcular racha actual al cargar
     useEffect(() => {
@@ -131,11 +170,10 @@ export function StudyStatsProvider({ children }) {
             }
 
             if (streak !== stats.currentStreak) {
-                setStats(prev => ({
-                    ...prev,
-                    currentStreak: streak,
-                    longestStreak: Math.max(prev.longestStreak, streak)
-                }))
+                commit([
+                    { op: 'set', path: ['currentStreak'], value: streak },
+                    { op: 'set', path: ['longestStreak'], value: Math.max(statsRef.current.longestStreak, streak) }
+                ])
             }
         }
 
@@ -145,44 +183,34 @@ export function StudyStatsProvider({ children }) {
     // Agregar tiempo de estudio y detectar metas
     const addStudyTime = (minutes) => {
         const today = getToday()
+        const prev = statsRef.current
+        const currentTodayMinutes = prev.studyHistory[today] || 0
+        const newTodayMinutes = currentTodayMinutes + minutes
+
+        // Check if goal just completed
+        const wasComplete = currentTodayMinutes >= prev.dailyGoal
+        const isComplete = newTodayMinutes >= prev.dailyGoal
+
+        const ops = [
+            { op: 'inc', path: ['studyHistory', today], value: minutes },
+            { op: 'inc', path: ['totalStudyTime'], value: minutes },
+            { op: 'set', path: ['lastStudyDate'], value: today }
+        ]
+
+        // Si apenas completamos la meta HOY, otorgamos el premio
+        if (!wasComplete && isComplete && prev.lastRewardDate !== today) {
+            ops.push(
+                { op: 'inc', path: ['completedGoalsCount'], value: 1 },
+                { op: 'set', path: ['lastRewardDate'], value: today }
+            )
+        }
 
-        setStats(prev => {
-            const currentTodayMinutes = prev.studyHistory[today] || 0
-            const newTodayMinutes = currentTodayMinutes + minutes
-            
-            // Check if goal just completed
-            const wasComplete = currentTodayMinutes >= prev.dailyGoal
-            const isComplete = newTodayMinutes >= prev.dailyGoal
-            
-            let newCompletedGoals = prev.completedGoalsCount || 0
-            let newRewardDate = prev.lastRewardDate
-            
-            // Si apenas completamos la meta HOY, otorgamos el premio
-            if (!wasComplete && isComplete && prev.lastRewardDate !== today) {
-                newCompletedGoals += 1
-                newRewardDate = today
-            }
-
-            return {
-                ...prev,
-                studyHistory: {
-                    ...prev.studyHistory,
-                    [today]: newTodayMinutes
-                },
-                totalStudyTime: prev.totalStudyTime + minutes,
-                lastStudyDate: today,
-                completedGoalsCount: newCompletedGoals,
-                lastRewardDate: newRewardDate
-            }
-        })
+        commit(ops)
     }
 
     // Establecer meta diaria
     const setDailyGoal = (minutes) => {
-        setStats(prev => ({
-            ...prev,
-            dailyGoal: minutes
-        }))
+        commit([{ op: 'set', path: ['dailyGoal'], value: minutes }])
     }
 
     // Obtener progreso de hoy
@@ -288,6 +316,47 @@ export function StudyStatsProvider({ children }) {
         return weeks
     }
 
+    // Sumar un repaso de flashcard a los totales de hoy (el servidor los mantiene igual)
+    const recordReview = useCallback(({ correct, isNew, durationMs }) => {
+        const today = getToday()
+        setReviewHistory(prev => {
+            const day = prev[today] || emptyReviewDay()
+            return {
+                ...prev,
+                [today]: {
+                    reviews: day.reviews + 1,
+                    correct: day.correct + (correct ? 1 : 0),
+                    newCards: day.newCards + (isNew ? 1 : 0),
+                    reviewMs: day.reviewMs + (durationMs || 0)
+                }
+            }
+        })
+    }, [])
+
+    // Resumen de repasos de flashcards de los últimos N días (desde los agregados diarios)
+    const getReviewStats = (days = 30) => {
+        const daily = []
+        const totals = emptyReviewDay()
+        for (let i = days - 1; i >= 0; i--) {
+            const date = new Date()
+            date.setDate(date.getDate() - i)
+            const dateStr = date.toISOString().split('T')[0]
+            const day = reviewHistory[dateStr] || emptyReviewDay()
+            daily.push({ date: dateStr, ...day })
+            totals.reviews += day.reviews
+            totals.correct += day.correct
+            totals.newCards += day.newCards
+            totals.reviewMs += day.reviewMs
+        }
+
+        return {
+            ...totals,
+            accuracy: totals.reviews > 0 ? Math.round((totals.correct / totals.reviews) * 100) : 0,
+            minutes: Math.round(totals.reviewMs / 60000),
+            daily
+        }
+    }
+
     // Obtener saludo basado en hora del día
     const getGreeting = () => {
         const hour = new Date().getHours()
@@ -306,10 +375,7 @@ export function StudyStatsProvider({ children }) {
             completedAt: new Date().toISOString(),
         }
         addStudyTime(studyMinutes)
-        setStats(prev => ({
-            ...prev,
-            pomodoroSessions: [...(prev.pomodoroSessions || []), session],
-        }))
+        commit([{ op: 'append', path: ['pomodoroSessions'], value: session }])
     }
 
     // Obtener sesiones Pomodoro de hoy
@@ -378,6 +444,8 @@ export function StudyStatsProvider({ children }) {
         getTodayPomodoros,
         getCalendarHeatmapData,
         getStudyInRange,
+        recordReview,
+        getReviewStats,
     }
 
     return (
@@ -38,6 +38,17 @@ export const DEFAULT_FSRS_PARAMS = {
     factor: 19 / 81  // ~0.2346
 };
 
+/**
+ * Pick per-user weights fitted by fsrs_optimizer (user_settings.fsrs_weights)
+ * @param {Array|null} weights - Stored weight vector
+ * @returns {Array} The stored weights if they are a complete numeric vector, else the defaults
+ */
+export function resolveWeights(weights) {
+    const defaults = DEFAULT_FSRS_PARAMS.w;
+    if (!Array.isArray(weights) || weights.length !== defaults.length) return defaults;
+    return weights.every(Number.isFinite) ? weights : defaults;
+}
+
 // ============================================
 // Card States
 // ============================================
@@ -222,10 +233,10 @@ export function calculateInterval(stability, params = DEFAULT_FSRS_PARAMS) {
  * @param {Object} card - Card object with FSRS state
  * @param {number} rating - Review rating (1-4)
  * @param {Object} params - FSRS parameters
+ * @param {Date} now - Time of the review (defaults to now; the simulator passes simulated time)
  * @returns {Object} Updated card state
  */
-export function scheduleCard(card, rating, params = DEFAULT_FSRS_PARAMS) {
-    const now = new Date();
+export function scheduleCard(card, rating, params = DEFAULT_FSRS_PARAMS, now = new Date()) {
     const lastReview = card.last_review ? new Date(card.last_review) : now;
     const elapsedDays = Math.max(
         (now.getTime() - lastReview.getTime()) / (1000 * 60 * 60 * 24),
@@ -312,13 +323,14 @@ export function scheduleCard(card, rating, params = DEFAULT_FSRS_PARAMS) {
  * Get all possible intervals for each rating (for displaying on buttons)
  * @param {Object} card - Card object with FSRS state
  * @param {Object} params - FSRS parameters
+ * @param {Date} now - Time of the review (defaults to now)
  * @returns {Object} Intervals for each rating
  */
-export function getSchedulingOptions(card, params = DEFAULT_FSRS_PARAMS) {
+export function getSchedulingOptions(card, params = DEFAULT_FSRS_PARAMS, now = new Date()) {
     const options = {};
 
     for (const [key, rating] of Object.entries(Rating)) {
-        const scheduledCard = scheduleCard({ ...card }, rating, params);
+        const scheduledCard = scheduleCard({ ...card }, rating, params, now);
         const interval = scheduledCard.scheduled_days;
 
         options[key] = {
@@ -331,6 +343,45 @@ export function getSchedulingOptions(card, params = DEFAULT_FSRS_PARAMS) {
     return options;
 }
 
+// Interval previews by params object, then by card state; see getCachedSchedulingOptions
+const previewCache = new WeakMap();
+const PREVIEW_CACHE_SIZE = 256;
+// Intervals move with elapsed time (retrievability), but by far less than a
+// day within this window
+export const PREVIEW_MAX_AGE_MS = 5 * 60 * 1000;
+
+/**
+ * getSchedulingOptions, memoized by card state and params so the rating buttons
+ * of a card can be computed ahead (e.g. for the next card of the session) and
+ * reused on every render
+ * @param {Object} card - Card object with FSRS state
+ * @param {Object} params - FSRS parameters (cache is per params object)
+ * @param {number} now - Current time in milliseconds
+ * @returns {Object} Intervals for each rating
+ */
+export function getCachedSchedulingOptions(card, params = DEFAULT_FSRS_PARAMS, now = Date.now()) {
+    let entries = previewCache.get(params);
+    if (!entries) {
+        entries = new Map();
+        previewCache.set(params, entries);
+    }
+
+    const key = `${card.id}|${card.state}|${card.stability}|${card.difficulty}|${card.last_review}`;
+    const cached = entries.get(key);
+    if (cached && now - cached.computedAt < PREVIEW_MAX_AGE_MS) {
+        return cached.options;
+    }
+
+    const options = getSchedulingOptions(card, params, new Date(now));
+    entries.delete(key);
+    entries.set(key, { options, computedAt: now });
+    // Map keeps insertion order: drop the oldest entry
+    if (entries.size > PREVIEW_CACHE_SIZE) {
+        entries.delete(entries.keys().next().value);
+    }
+    return options;
+}
+
 /**
  * Format interval for display
  * @param {number} days - Interval in days
@@ -369,13 +420,9 @@ export function formatInterval(days) {
  * @returns {Array} Sorted cards
  */
 export function sortCardsByPriority(cards, examDate = null) {
-    return [...cards].sort((a, b) => {
-        // Calculate urgency score
-        const scoreA = calculateUrgencyScore(a, examDate);
-        const scoreB = calculateUrgencyScore(b, examDate);
-
-        return scoreB - scoreA; // Higher score = more urgent
-    });
+    // Score every card once instead of twice per comparison
+    const batch = scheduleBatch(toCardColumns(cards), { examDate });
+    return Array.from(rankByUrgency(batch), index => cards[index]);
 }
 
 /**
@@ -400,18 +447,163 @@ export function calculateUrgencyScore(card, examDate = null) {
         ? 2 - card.retrievability
         : 1;
 
-    // Exam boost
-    let examBoost = 1;
-    if (examDate) {
-        const daysToExam = (examDate.getTime() - now.getTime()) / (1000 * 60 * 60 * 24);
-        if (daysToExam > 0 && daysToExam < 7) {
-            examBoost = 3; // Triple priority if exam within a week
-        } else if (daysToExam > 0 && daysToExam < 14) {
-            examBoost = 2;
+    return baseScore * priorityMult * retrievabilityFactor * calculateExamBoost(examDate, now.getTime());
+}
+
+/**
+ * Urgency multiplier for an upcoming exam
+ * @param {Date|null} examDate - Optional exam date
+ * @param {number} now - Current time in milliseconds
+ * @returns {number} 3 within a week, 2 within two weeks, otherwise 1
+ */
+export function calculateExamBoost(examDate, now = Date.now()) {
+    if (!examDate) return 1;
+
+    const daysToExam = (examDate.getTime() - now) / MS_PER_DAY;
+    if (daysToExam > 0 && daysToExam < 7) {
+        return 3; // Triple priority if exam within a week
+    } else if (daysToExam > 0 && daysToExam < 14) {
+        return 2;
+    }
+    return 1;
+}
+
+// ============================================
+// Batch Scheduling (columnar)
+// ============================================
+
+const MS_PER_DAY = 1000 * 60 * 60 * 24;
+
+/**
+ * Numeric codes for card states in the columnar layout
+ */
+export const CardStateCode = {
+    [CardState.NEW]: 0,
+    [CardState.LEARNING]: 1,
+    [CardState.REVIEW]: 2,
+    [CardState.RELEARNING]: 3
+};
+
+const UNKNOWN_STATE_CODE = 255;
+
+function toTimestamp(value) {
+    // Same result as new Date(value).getTime() (null -> 0, missing -> NaN), without a Date for ISO strings
+    return typeof value === 'string' ? Date.parse(value) : new Date(value).getTime();
+}
+
+/**
+ * Convert card objects into typed-array columns for the batch functions.
+ * Parse once and reuse the columns for every batch call on the same deck.
+ * @param {Array} cards - Array of cards
+ * @returns {Object} Columns: state, stability, difficulty, lastReview and due (ms),
+ *   priority multiplier and stored retrievability, one entry per card
+ */
+export function toCardColumns(cards) {
+    const length = cards.length;
+    const columns = {
+        length,
+        state: new Uint8Array(length),
+        stability: new Float64Array(length),
+        difficulty: new Float64Array(length),
+        lastReview: new Float64Array(length),
+        due: new Float64Array(length),
+        priority: new Float32Array(length),
+        retrievability: new Float64Array(length)
+    };
+
+    for (let i = 0; i < length; i++) {
+        const card = cards[i];
+        columns.state[i] = CardStateCode[card.state] ?? UNKNOWN_STATE_CODE;
+        columns.stability[i] = card.stability || 0;
+        columns.difficulty[i] = card.difficulty || 0;
+        columns.lastReview[i] = card.last_review ? toTimestamp(card.last_review) : NaN;
+        columns.due[i] = toTimestamp(card.due_date);
+        columns.priority[i] = PriorityMultiplier[card.priority] || 1;
+        // Number() keeps the comparisons of calculateUrgencyScore (null counts as 0)
+        columns.retrievability[i] = Number(card.retrievability);
+    }
+
+    return columns;
+}
+
+/**
+ * Due set, current retrievability and urgency of a whole deck in one pass
+ * @param {Object} columns - Output of toCardColumns
+ * @param {Object} options - { now (ms), examDate (Date), params (FSRS parameters) }
+ * @returns {Object} retrievability and urgency (Float64Array), due (Uint8Array mask),
+ *   dueIndices (Uint32Array) and counts matching getStudyStats
+ */
+export function scheduleBatch(columns, { now = Date.now(), examDate = null, params = DEFAULT_FSRS_PARAMS } = {}) {
+    const { length, state, stability, lastReview, due, priority } = columns;
+    const { factor, decay } = params;
+    const examBoost = calculateExamBoost(examDate, now);
+
+    const retrievability = new Float64Array(length);
+    const urgency = new Float64Array(length);
+    const dueMask = new Uint8Array(length);
+    const dueIndices = new Uint32Array(length);
+    const counts = { total: length, new: 0, learning: 0, review: 0, due: 0 };
+
+    for (let i = 0; i < length; i++) {
+        const code = state[i];
+        const isNew = code === CardStateCode.NEW;
+
+        // Retrievability now (as scheduleCard computes it before a review)
+        const s = stability[i];
+        if (isNew || s <= 0) {
+            retrievability[i] = 1;
+        } else {
+            const reviewed = lastReview[i];
+            const elapsedDays = reviewed === reviewed ? Math.max((now - reviewed) / MS_PER_DAY, 0) : 0;
+            retrievability[i] = Math.pow(1 + factor * elapsedDays / s, decay);
+        }
+
+        // Due set and counts
+        const isDueNow = isNew || now >= due[i];
+        if (isDueNow) {
+            dueMask[i] = 1;
+            dueIndices[counts.due++] = i;
+        }
+        if (isNew) {
+            counts.new++;
+        } else if (code === CardStateCode.LEARNING || code === CardStateCode.RELEARNING) {
+            counts.learning++;
+        } else if (code === CardStateCode.REVIEW && isDueNow) {
+            counts.review++;
         }
+
+        // Urgency, same formula as calculateUrgencyScore
+        const stored = columns.retrievability[i];
+        urgency[i] = (Math.max((now - due[i]) / MS_PER_DAY, 0) + 1) *
+            priority[i] *
+            (stored < 0.9 ? 2 - stored : 1) *
+            examBoost;
     }
 
-    return baseScore * priorityMult * retrievabilityFactor * examBoost;
+    return {
+        length,
+        now,
+        retrievability,
+        urgency,
+        due: dueMask,
+        dueIndices: dueIndices.subarray(0, counts.due),
+        counts
+    };
+}
+
+/**
+ * Card indices ordered by urgency, most urgent first (ties keep deck order)
+ * @param {Object} batch - Output of scheduleBatch
+ * @param {Uint32Array|Array} indices - Optional subset, e.g. batch.dueIndices
+ * @returns {Uint32Array} Sorted card indices
+ */
+export function rankByUrgency(batch, indices = null) {
+    const order = indices ? Uint32Array.from(indices) : Uint32Array.from({ length: batch.length }, (_, i) => i);
+    const urgency = batch.urgency;
+    // Cards without a valid due date score NaN; rank them last
+    const key = i => (urgency[i] === urgency[i] ? urgency[i] : -Infinity);
+
+    return order.sort((a, b) => (key(b) - key(a)) || (a - b));
 }
 
 // ============================================
@@ -442,7 +634,8 @@ export function isDue(card) {
  * @returns {Array} Cards that are due
  */
 export function getDueCards(cards) {
-    return cards.filter(isDue);
+    const { dueIndices } = scheduleBatch(toCardColumns(cards));
+    return Array.from(dueIndices, index => cards[index]);
 }
 
 /**
@@ -451,30 +644,22 @@ export function getDueCards(cards) {
  * @returns {Object} Statistics
  */
 export function getStudyStats(cards) {
-    const newCards = cards.filter(c => c.state === CardState.NEW);
-    const learningCards = cards.filter(c =>
-        c.state === CardState.LEARNING || c.state === CardState.RELEARNING
-    );
-    const reviewCards = cards.filter(c => c.state === CardState.REVIEW && isDue(c));
-
-    return {
-        total: cards.length,
-        new: newCards.length,
-        learning: learningCards.length,
-        review: reviewCards.length,
-        due: getDueCards(cards).length
-    };
+    return scheduleBatch(toCardColumns(cards)).counts;
 }
 
 export default {
     scheduleCard,
     getSchedulingOptions,
+    getCachedSchedulingOptions,
     formatInterval,
     sortCardsByPriority,
     isDue,
     getDueCards,
     getStudyStats,
     calculateRetrievability,
+    toCardColumns,
+    scheduleBatch,
+    rankByUrgency,
     Rating,
     RatingLabels,
     CardState,
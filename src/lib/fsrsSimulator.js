@@ -0,0 +1,330 @@
+/**
+ * FSRS workload simulator
+ *
+ * Replays D days of study over a deck with the app's own scheduler: every
+ * simulated day the due set and urgency come from scheduleBatch (so an exam
+ * date ranks cards as in a real session), the most urgent cards are reviewed
+ * up to the daily limit, and each review goes through scheduleCard at the
+ * simulated time. Whether a card is recalled is drawn from its current
+ * retrievability; the rating is then drawn from a rating model, synthetic or
+ * fitted to recorded review_logs. Cards answered AGAIN come back the same day
+ * once their relearning step is due.
+ *
+ * The result is a day-by-day forecast of reviews, new cards, lapses, time spent
+ * and retention, to size daily limits and exam-mode workloads.
+ */
+
+import {
+    scheduleCard,
+    scheduleBatch,
+    rankByUrgency,
+    DEFAULT_FSRS_PARAMS,
+    CardState,
+    CardStateCode,
+    Rating
+} from './fsrs.js'; // explicit extension: also imported by scripts/fsrs-simulate.js under plain Node
+
+const MS_PER_DAY = 1000 * 60 * 60 * 24;
+const STATE_NAMES = Object.keys(CardStateCode);
+
+// Safety cap on AGAIN loops of one card within a day
+const MAX_REVIEWS_PER_CARD_PER_DAY = 8;
+
+/**
+ * Rating probabilities when none are recorded.
+ * first: AGAIN/HARD/GOOD/EASY on a new card; recall: HARD/GOOD/EASY when recalled
+ */
+export const DEFAULT_RATING_MODEL = {
+    first: [0.2, 0.15, 0.55, 0.1],
+    recall: [0.15, 0.75, 0.1]
+};
+
+/**
+ * Seconds spent on a review, by card state before it
+ */
+export const DEFAULT_REVIEW_SECONDS = {
+    [CardState.NEW]: 20,
+    [CardState.LEARNING]: 12,
+    [CardState.REVIEW]: 8,
+    [CardState.RELEARNING]: 12
+};
+
+// ============================================
+// Inputs
+// ============================================
+
+/**
+ * Seeded PRNG (mulberry32), so a forecast can be reproduced
+ * @param {number} seed - Integer seed
+ * @returns {Function} Uniform random numbers in [0, 1)
+ */
+export function createRandom(seed = 1) {
+    let a = seed >>> 0;
+    return () => {
+        a = (a + 0x6D2B79F5) >>> 0;
+        let t = a;
+        t = Math.imul(t ^ (t >>> 15), t | 1);
+        t ^= t + Math.imul(t ^ (t >>> 7), t | 61);
+        return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+    };
+}
+
+function pick(probabilities, random) {
+    let r = random();
+    for (let i = 0; i < probabilities.length - 1; i++) {
+        r -= probabilities[i];
+        if (r < 0) return i;
+    }
+    return probabilities.length - 1;
+}
+
+function normalize(counts) {
+    const total = counts.reduce((sum, value) => sum + value, 0);
+    return total > 0 ? counts.map(value => value / total) : null;
+}
+
+/**
+ * Rating model fitted to recorded reviews
+ * @param {Array} logs - review_logs rows (rating, state_before)
+ * @returns {Object} { first, recall } probabilities; DEFAULT_RATING_MODEL where there is no data
+ */
+export function ratingModelFromLogs(logs) {
+    const first = [0, 0, 0, 0];
+    const recall = [0, 0, 0];
+    for (const log of logs) {
+        const rating = Rating[String(log.rating).toUpperCase()];
+        if (!rating) continue;
+        if (log.state_before === CardState.NEW) {
+            first[rating - 1]++;
+        } else if (rating > Rating.AGAIN) {
+            recall[rating - 2]++;
+        }
+    }
+    return {
+        first: normalize(first) || DEFAULT_RATING_MODEL.first,
+        recall: normalize(recall) || DEFAULT_RATING_MODEL.recall
+    };
+}
+
+/**
+ * Deck of new cards in the columnar layout of toCardColumns
+ * @param {number} count - Number of cards
+ * @param {Object} options - { now (ms), priorities: multipliers to cycle through }
+ * @returns {Object} Columns plus reps and lapses counters
+ */
+export function createDeckColumns(count, { now = Date.now(), priorities = [1] } = {}) {
+    const columns = {
+        length: count,
+        state: new Uint8Array(count),
+        stability: new Float64Array(count),
+        difficulty: new Float64Array(count),
+        lastReview: new Float64Array(count).fill(NaN),
+        due: new Float64Array(count).fill(now),
+        priority: new Float32Array(count),
+        retrievability: new Float64Array(count).fill(1),
+        reps: new Uint32Array(count),
+        lapses: new Uint32Array(count)
+    };
+    for (let i = 0; i < count; i++) {
+        columns.priority[i] = priorities[i % priorities.length];
+    }
+    return columns;
+}
+
+// ============================================
+// Simulation
+// ============================================
+
+function reviewCard(columns, i, rating, params, now) {
+    const card = {
+        state: STATE_NAMES[columns.state[i]],
+        stability: columns.stability[i],
+        difficulty: columns.difficulty[i],
+        last_review: columns.lastReview[i] === columns.lastReview[i] ? columns.lastReview[i] : null,
+        reps: columns.reps[i],
+        lapses: columns.lapses[i]
+    };
+    const updated = scheduleCard(card, rating, params, new Date(now));
+    columns.state[i] = CardStateCode[updated.state];
+    columns.stability[i] = updated.stability;
+    columns.difficulty[i] = updated.difficulty;
+    columns.lastReview[i] = now;
+    columns.due[i] = Date.parse(updated.due_date);
+    columns.retrievability[i] = updated.retrievability;
+    columns.reps[i] = updated.reps;
+    columns.lapses[i] = updated.lapses;
+}
+
+function meanRetrievability(columns, now, params) {
+    let sum = 0;
+    let count = 0;
+    for (let i = 0; i < columns.length; i++) {
+        if (columns.state[i] === CardStateCode.NEW || columns.stability[i] <= 0) continue;
+        const elapsedDays = Math.max((now - columns.lastReview[i]) / MS_PER_DAY, 0);
+        sum += Math.pow(1 + params.factor * elapsedDays / columns.stability[i], params.decay);
+        count++;
+    }
+    return count > 0 ? sum / count : null;
+}
+
+/**
+ * Forecast the daily workload of a deck
+ * @param {Object} options
+ * @param {Object} options.columns - Deck (createDeckColumns, or toCardColumns plus reps/lapses)
+ * @param {number} options.days - Days to simulate
+ * @param {number} options.start - Time of the first day's session (ms)
+ * @param {Object} options.params - FSRS parameters
+ * @param {Date|null} options.examDate - Exam date; boosts urgency as in a study session
+ * @param {number} options.newPerDay - New cards introduced per day
+ * @param {number} options.reviewLimit - Reviews of due cards per day (Infinity for no limit)
+ * @param {Object} options.ratingModel - { first, recall } (DEFAULT_RATING_MODEL, ratingModelFromLogs)
+ * @param {Object} options.reviewSeconds - Seconds per review by state (DEFAULT_REVIEW_SECONDS)
+ * @param {Function} options.random - Uniform random numbers (createRandom)
+ * @returns {Object} { days: per-day rows, summary }
+ */
+export function simulateWorkload({
+    columns,
+    days = 30,
+    start = Date.now(),
+    params = DEFAULT_FSRS_PARAMS,
+    examDate = null,
+    newPerDay = 20,
+    reviewLimit = Infinity,
+    ratingModel = DEFAULT_RATING_MODEL,
+    reviewSeconds = DEFAULT_REVIEW_SECONDS,
+    random = createRandom()
+}) {
+    const rows = [];
+    const reviewsToday = new Uint8Array(columns.length);
+    const totals = { reviews: 0, newCards: 0, relearns: 0, lapses: 0, recalled: 0, recallChecks: 0, seconds: 0 };
+    let examRetention = null;
+    let nextNew = 0;
+
+    for (let day = 0; day < days; day++) {
+        const sessionStart = start + day * MS_PER_DAY;
+        if (examDate && examRetention === null && sessionStart >= examDate.getTime()) {
+            examRetention = meanRetrievability(columns, examDate.getTime(), params);
+        }
+
+        const batch = scheduleBatch(columns, { now: sessionStart, examDate, params });
+        const row = {
+            day,
+            date: new Date(sessionStart).toISOString().slice(0, 10),
+            due: batch.counts.due - batch.counts.new,
+            reviews: 0,
+            newCards: 0,
+            relearns: 0,
+            lapses: 0,
+            backlog: 0,
+            seconds: 0,
+            retention: meanRetrievability(columns, sessionStart, params)
+        };
+        reviewsToday.fill(0);
+
+        let clock = sessionStart;
+        let reviewsLeft = reviewLimit;
+        const relearning = [];
+
+        const review = (i) => {
+            const state = STATE_NAMES[columns.state[i]];
+            let rating;
+            if (state === CardState.NEW) {
+                rating = pick(ratingModel.first, random) + 1;
+            } else {
+                const elapsedDays = Math.max((clock - columns.lastReview[i]) / MS_PER_DAY, 0);
+                const recall = Math.pow(1 + params.factor * elapsedDays / columns.stability[i], params.decay);
+                const recalled = random() < recall;
+                rating = recalled ? pick(ratingModel.recall, random) + 2 : Rating.AGAIN;
+                if (state === CardState.REVIEW) {
+                    totals.recallChecks++;
+                    if (recalled) totals.recalled++;
+                }
+            }
+
+            reviewCard(columns, i, rating, params, clock);
+            const seconds = reviewSeconds[state] || 0;
+            clock += seconds * 1000;
+            row.seconds += seconds;
+            row.reviews++;
+            reviewsToday[i]++;
+            if (state === CardState.NEW) row.newCards++;
+            if (state === CardState.LEARNING || state === CardState.RELEARNING) row.relearns++;
+            if (rating === Rating.AGAIN) {
+                if (state !== CardState.NEW) row.lapses++;
+                if (reviewsToday[i] < MAX_REVIEWS_PER_CARD_PER_DAY) relearning.push(i);
+            }
+        };
+
+        // Like startStudySession: the due cards plus the next new cards, by urgency
+        const session = [];
+        for (const i of batch.dueIndices) {
+            if (columns.state[i] !== CardStateCode.NEW) session.push(i);
+        }
+        for (let taken = 0; nextNew < columns.length && taken < newPerDay; nextNew++) {
+            if (columns.state[nextNew] === CardStateCode.NEW) {
+                session.push(nextNew);
+                taken++;
+            }
+        }
+        for (const i of rankByUrgency(batch, session)) {
+            if (columns.state[i] !== CardStateCode.NEW) {
+                if (reviewsLeft <= 0) {
+                    row.backlog++;
+                    continue;
+                }
+                reviewsLeft--;
+            }
+            review(i);
+        }
+
+        // Relearning steps come back within the same session
+        for (let k = 0; k < relearning.length; k++) {
+            const i = relearning[k];
+            clock = Math.max(clock, columns.due[i]);
+            review(i);
+        }
+
+        totals.reviews += row.reviews;
+        totals.newCards += row.newCards;
+        totals.relearns += row.relearns;
+        totals.lapses += row.lapses;
+        totals.seconds += row.seconds;
+        rows.push(row);
+    }
+
+    const end = start + days * MS_PER_DAY;
+    if (examDate && examRetention === null && examDate.getTime() <= end) {
+        examRetention = meanRetrievability(columns, examDate.getTime(), params);
+    }
+    const peak = rows.reduce((best, row) => (row.reviews > best.reviews ? row : best), rows[0] || { reviews: 0 });
+
+    return {
+        days: rows,
+        summary: {
+            cards: columns.length,
+            days,
+            reviews: totals.reviews,
+            newCards: totals.newCards,
+            relearns: totals.relearns,
+            lapses: totals.lapses,
+            meanReviewsPerDay: days > 0 ? totals.reviews / days : 0,
+            peakReviews: peak.reviews,
+            peakDate: peak.date || null,
+            minutesPerDay: days > 0 ? totals.seconds / 60 / days : 0,
+            // Share of due REVIEW cards recalled (compare with params.requestRetention)
+            observedRetention: totals.recallChecks > 0 ? totals.recalled / totals.recallChecks : null,
+            finalRetention: meanRetrievability(columns, end, params),
+            examRetention,
+            backlog: rows.length > 0 ? rows[rows.length - 1].backlog : 0
+        }
+    };
+}
+
+export default {
+    simulateWorkload,
+    createDeckColumns,
+    ratingModelFromLogs,
+    createRandom,
+    DEFAULT_RATING_MODEL,
+    DEFAULT_REVIEW_SECONDS
+};
@@ -0,0 +1,76 @@
+/**
+ * Vertical layout of the pages of a document in continuous scroll
+ *
+ * Pages are stacked in one column with a fixed gap. Only the page sizes are
+ * needed to know where every page is, so the viewer can size the scroll area
+ * for the whole document and mount just the pages near the viewport.
+ */
+
+/**
+ * Height of a page drawn at a given width
+ * @param {{width, height}} size - Page size at scale 1 (any unit)
+ * @param {number} width - Rendered width in px
+ * @param {number} rotation - Extra rotation in degrees (0, 90, 180, 270)
+ * @returns {number} Rendered height in px
+ */
+export function pageHeight(size, width, rotation = 0) {
+    const sideways = rotation % 180 !== 0;
+    const ratio = sideways ? size.width / size.height : size.height / size.width;
+    return Math.round(width * ratio);
+}
+
+/**
+ * Top offset and height of every page
+ * @param {Array<{width, height}>} sizes - Page sizes at scale 1, in page order
+ * @param {number} width - Rendered page width in px
+ * @param {number} gap - Space between pages in px
+ * @param {number} rotation - Extra rotation in degrees
+ * @returns {{tops: Array<number>, heights: Array<number>, total: number}}
+ */
+export function layoutPages(sizes, width, gap, rotation = 0) {
+    const tops = new Array(sizes.length);
+    const heights = new Array(sizes.length);
+    let y = 0;
+    for (let i = 0; i < sizes.length; i++) {
+        tops[i] = y;
+        heights[i] = pageHeight(sizes[i], width, rotation);
+        y += heights[i] + gap;
+    }
+    return { tops, heights, total: Math.max(0, y - gap) };
+}
+
+/**
+ * Index of the page at a vertical position
+ * @param {{tops: Array<number>}} layout - Result of layoutPages
+ * @param {number} y - Position in px from the top of the first page
+ * @returns {number} Page index (0-based), clamped to the document
+ */
+export function pageAt(layout, y) {
+    const { tops } = layout;
+    let low = 0;
+    let high = tops.length - 1;
+    while (low < high) {
+        const mid = (low + high + 1) >> 1;
+        if (tops[mid] <= y) low = mid;
+        else high = mid - 1;
+    }
+    return Math.max(0, low);
+}
+
+/**
+ * Pages intersecting a vertical window
+ * @param {Object} layout - Result of layoutPages
+ * @param {number} top - Window top in px
+ * @param {number} bottom - Window bottom in px
+ * @returns {{first: number, last: number}} Page indexes (0-based, inclusive)
+ */
+export function visiblePages(layout, top, bottom) {
+    return { first: pageAt(layout, top), last: pageAt(layout, bottom) };
+}
+
+export default {
+    pageHeight,
+    layoutPages,
+    pageAt,
+    visiblePages
+};
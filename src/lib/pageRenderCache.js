@@ -0,0 +1,89 @@
+/**
+ * Bitmaps of rendered PDF pages, kept for quick redisplay
+ *
+ * The continuous PDF viewer unmounts pages that scroll out of view, which
+ * releases their canvases. A copy of each rendered page is kept here as an
+ * ImageBitmap, so a page that comes back into view is painted immediately
+ * instead of being rasterized again by pdf.js. Only bitmaps for the current
+ * zoom and rotation are kept, and their total size is capped at
+ * MAX_CACHE_BYTES, least recently used first out.
+ */
+
+export const MAX_CACHE_BYTES = 64 * 1024 * 1024;
+
+export class PageRenderCache {
+    /**
+     * @param {number} maxBytes - Budget for decoded pixels (4 bytes each)
+     */
+    constructor(maxBytes = MAX_CACHE_BYTES) {
+        this.maxBytes = maxBytes;
+        this.bytes = 0;
+        // Insertion order is recency order: get() moves an entry to the end
+        this.entries = new Map();
+        this.renderKey = null;
+    }
+
+    /**
+     * Drop every bitmap unless they were rendered with this key
+     * @param {string} renderKey - Zoom, rotation and width the pages are drawn at
+     */
+    setRenderKey(renderKey) {
+        if (renderKey === this.renderKey) return;
+        this.clear();
+        this.renderKey = renderKey;
+    }
+
+    /**
+     * @param {number} pageNumber - Page (1-based)
+     * @returns {ImageBitmap|null}
+     */
+    get(pageNumber) {
+        const bitmap = this.entries.get(pageNumber);
+        if (!bitmap) return null;
+        this.entries.delete(pageNumber);
+        this.entries.set(pageNumber, bitmap);
+        return bitmap;
+    }
+
+    /**
+     * Keep a copy of a rendered page
+     * @param {number} pageNumber - Page (1-based)
+     * @param {HTMLCanvasElement} canvas - Canvas pdf.js rendered the page into
+     * @param {string} renderKey - Key the page was rendered with
+     */
+    async put(pageNumber, canvas, renderKey) {
+        if (typeof createImageBitmap === 'undefined' || !canvas.width || !canvas.height) return;
+        const size = canvas.width * canvas.height * 4;
+        if (size > this.maxBytes) return;
+
+        const bitmap = await createImageBitmap(canvas);
+        // Zoom or rotation changed while copying
+        if (renderKey !== this.renderKey) {
+            bitmap.close();
+            return;
+        }
+        this.delete(pageNumber);
+        this.entries.set(pageNumber, bitmap);
+        this.bytes += size;
+        for (const oldest of this.entries.keys()) {
+            if (this.bytes <= this.maxBytes) break;
+            this.delete(oldest);
+        }
+    }
+
+    delete(pageNumber) {
+        const bitmap = this.entries.get(pageNumber);
+        if (!bitmap) return;
+        this.bytes -= bitmap.width * bitmap.height * 4;
+        bitmap.close();
+        this.entries.delete(pageNumber);
+    }
+
+    clear() {
+        this.entries.forEach(bitmap => bitmap.close());
+        this.entries.clear();
+        this.bytes = 0;
+    }
+}
+
+export default PageRenderCache;
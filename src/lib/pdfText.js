@@ -0,0 +1,62 @@
+/**
+ * Text extraction from PDF files, page by page
+ *
+ * Runs pdf.js (the copy bundled with react-pdf, parsing in its web worker)
+ * once over an uploaded file so the library can search document contents
+ * without opening each PDF again. Whitespace is collapsed and every page is
+ * capped, which keeps the stored text compact.
+ */
+
+import { pdfjs } from 'react-pdf';
+
+// Characters kept per page; longer pages are cut
+export const MAX_PAGE_CHARS = 20000;
+// Pages indexed per document
+export const MAX_INDEXED_PAGES = 2000;
+
+// PDFViewer sets the same worker; extraction can run before the viewer was ever loaded
+if (!pdfjs.GlobalWorkerOptions.workerSrc) {
+    pdfjs.GlobalWorkerOptions.workerSrc = new URL(
+        'pdfjs-dist/build/pdf.worker.min.mjs',
+        import.meta.url
+    ).toString();
+}
+
+/**
+ * Join the text items of a page into plain text
+ * @param {Object} textContent - Result of page.getTextContent()
+ * @returns {string} Text with whitespace collapsed, at most MAX_PAGE_CHARS
+ */
+export function pageText(textContent) {
+    return textContent.items
+        .map(item => (item.hasEOL ? `${item.str}\n` : item.str))
+        .join(' ')
+        .replace(/\s+/g, ' ')
+        .trim()
+        .slice(0, MAX_PAGE_CHARS);
+}
+
+/**
+ * Extract the text of every page of a PDF
+ * @param {File|Blob|ArrayBuffer} source - PDF file
+ * @returns {Promise<{numPages, pages: Array<{page, content}>}>} Pages with text (scanned pages without a text layer are skipped)
+ */
+export async function extractPdfPages(source) {
+    const data = source instanceof ArrayBuffer ? source : await source.arrayBuffer();
+    const pdf = await pdfjs.getDocument({ data }).promise;
+    try {
+        const pages = [];
+        const last = Math.min(pdf.numPages, MAX_INDEXED_PAGES);
+        for (let number = 1; number <= last; number++) {
+            const page = await pdf.getPage(number);
+            const content = pageText(await page.getTextContent());
+            page.cleanup();
+            if (content) pages.push({ page: number, content });
+        }
+        return { numPages: pdf.numPages, pages };
+    } finally {
+        pdf.destroy();
+    }
+}
+
+export default extractPdfPages;
@@ -0,0 +1,184 @@
+/**
+ * In-memory inverted index for the document library
+ *
+ * Text is folded to lowercase without accents ("Cardiología" and
+ * "cardiologia" are the same term) and split into words; common Spanish
+ * function words are not indexed. Every term keeps the documents it appears
+ * in with a weight per field, so a search only visits the postings of the
+ * query terms instead of scanning every document.
+ *
+ * Each query word matches the terms it is a prefix of ("cardio" finds
+ * "cardiología"); a document must match every word. Results are ranked by
+ * field weight, with exact words above prefixes.
+ *
+ * The same normalization is used by the `search_documents` RPC
+ * (supabase/migrations/*_documents_search.sql) for server-side search.
+ */
+
+// Words too common to narrow a search
+const STOPWORDS = new Set([
+    'a', 'al', 'con', 'de', 'del', 'el', 'en', 'la', 'las', 'lo', 'los',
+    'o', 'para', 'por', 'se', 'su', 'un', 'una', 'y'
+]);
+
+// Score of a prefix match relative to an exact one, at best
+const PREFIX_FACTOR = 0.8;
+
+// ============================================
+// Text
+// ============================================
+
+/**
+ * Lowercase text without diacritics
+ * @param {string} text - Text
+ * @returns {string} Folded text
+ */
+export function foldText(text) {
+    return String(text ?? '')
+        .normalize('NFD')
+        .replace(/[\u0300-\u036f]/g, '')
+        .toLowerCase();
+}
+
+/**
+ * Split text into indexable terms
+ * @param {string} text - Text
+ * @returns {Array<string>} Terms, in order, stopwords removed
+ */
+export function tokenize(text) {
+    return foldText(text)
+        .split(/[^a-z0-9]+/)
+        .filter(term => term && !STOPWORDS.has(term));
+}
+
+function lowerBound(terms, prefix) {
+    let low = 0;
+    let high = terms.length;
+    while (low < high) {
+        const mid = (low + high) >> 1;
+        if (terms[mid] < prefix) low = mid + 1;
+        else high = mid;
+    }
+    return low;
+}
+
+// ============================================
+// Index
+// ============================================
+
+export class SearchIndex {
+    /**
+     * @param {Object} fields - Weight per document field; array fields (tags) are indexed item by item
+     */
+    constructor(fields) {
+        this.fields = Object.entries(fields);
+        // term -> Map(id -> weight)
+        this.postings = new Map();
+        // id -> terms of the document, to remove it
+        this.documentTerms = new Map();
+        // Sorted terms for prefix lookups; rebuilt on the first search after a change
+        this.sortedTerms = null;
+    }
+
+    get size() {
+        return this.documentTerms.size;
+    }
+
+    /**
+     * Index a document, replacing its previous version
+     * @param {Object} doc - Document with an id
+     */
+    add(doc) {
+        this.remove(doc.id);
+
+        const weights = new Map();
+        for (const [field, weight] of this.fields) {
+            const value = doc[field];
+            const text = Array.isArray(value) ? value.join(' ') : value;
+            for (const term of tokenize(text)) {
+                weights.set(term, (weights.get(term) || 0) + weight);
+            }
+        }
+
+        for (const [term, weight] of weights) {
+            let posting = this.postings.get(term);
+            if (!posting) {
+                posting = new Map();
+                this.postings.set(term, posting);
+                this.sortedTerms = null;
+            }
+            posting.set(doc.id, weight);
+        }
+        this.documentTerms.set(doc.id, [...weights.keys()]);
+    }
+
+    /**
+     * Drop a document from the index
+     * @param {*} id - Document id
+     */
+    remove(id) {
+        const terms = this.documentTerms.get(id);
+        if (!terms) return;
+        for (const term of terms) {
+            const posting = this.postings.get(term);
+            posting.delete(id);
+            if (posting.size === 0) {
+                this.postings.delete(term);
+                this.sortedTerms = null;
+            }
+        }
+        this.documentTerms.delete(id);
+    }
+
+    /**
+     * Rebuild the index from a full list of documents
+     * @param {Array} docs - Documents
+     */
+    replaceAll(docs) {
+        this.postings.clear();
+        this.documentTerms.clear();
+        this.sortedTerms = null;
+        docs.forEach(doc => this.add(doc));
+    }
+
+    /**
+     * Search the index
+     * @param {string} query - Words, in any order; each may be the start of a term
+     * @returns {Array<{id, score}>|null} Matching documents, best first; null if the query has no terms
+     */
+    search(query) {
+        const words = [...new Set(tokenize(query))];
+        if (words.length === 0) return null;
+        if (!this.sortedTerms) {
+            this.sortedTerms = [...this.postings.keys()].sort();
+        }
+
+        let scores = null;
+        for (const word of words) {
+            // Best score of this word per document, over every term it is a prefix of
+            const wordScores = new Map();
+            for (let i = lowerBound(this.sortedTerms, word); i < this.sortedTerms.length; i++) {
+                const term = this.sortedTerms[i];
+                if (!term.startsWith(word)) break;
+                const factor = term === word ? 1 : PREFIX_FACTOR * (word.length / term.length);
+                for (const [id, weight] of this.postings.get(term)) {
+                    if (scores && !scores.has(id)) continue;
+                    const score = weight * factor;
+                    if (score > (wordScores.get(id) || 0)) wordScores.set(id, score);
+                }
+            }
+
+            if (scores) {
+                for (const [id, score] of wordScores) wordScores.set(id, score + scores.get(id));
+            }
+            scores = wordScores;
+            if (scores.size === 0) return [];
+        }
+
+        return [...scores]
+            .map(([id, score]) => ({ id, score }))
+            .sort((a, b) => b.score - a.score);
+    }
+}
+
+export default SearchIndex;
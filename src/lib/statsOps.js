@@ -0,0 +1,139 @@
+/**
+ * Operations on the study stats object (StudyStatsContext)
+ *
+ * Every change to the stats is expressed as a small operation on one leaf
+ * path instead of a new copy of the whole object, so it can be persisted and
+ * sent to Supabase on its own (services/studyStatsSync.js). The same
+ * operations are applied on the server by the `apply_study_stats_ops` RPC;
+ * the semantics here and in SQL must match.
+ *
+ *   { op: 'set', path: ['dailyGoal'], value: 240 }
+ *   { op: 'inc', path: ['studyHistory', '2026-10-18'], value: 25 }
+ *   { op: 'append', path: ['pomodoroSessions'], value: { date, studyMinutes, ... } }
+ *   { op: 'compactPomodoros', before: '2026-09-18' }
+ *
+ * Paths are leaves: no operation targets a prefix of another's path.
+ */
+
+// ============================================
+// Applying
+// ============================================
+
+function getIn(object, path) {
+    let value = object;
+    for (const key of path) {
+        if (value === null || value === undefined) return undefined;
+        value = value[key];
+    }
+    return value;
+}
+
+// Copies only the objects along the path
+function setIn(object, path, value) {
+    const [key, ...rest] = path;
+    const base = object && typeof object === 'object' ? object : {};
+    return {
+        ...base,
+        [key]: rest.length === 0 ? value : setIn(base[key], rest, value)
+    };
+}
+
+/**
+ * Fold pomodoro sessions older than a date into monthly totals
+ * @param {Object} stats - Stats object
+ * @param {string} before - 'YYYY-MM-DD'; sessions of earlier days are archived
+ * @returns {Object} Stats with pomodoroSessions trimmed and pomodoroArchive updated
+ */
+export function compactPomodoros(stats, before) {
+    const sessions = stats.pomodoroSessions || [];
+    const kept = [];
+    const archive = { ...(stats.pomodoroArchive || {}) };
+    for (const session of sessions) {
+        if (session.date >= before) {
+            kept.push(session);
+            continue;
+        }
+        const month = session.date.slice(0, 7);
+        const totals = archive[month] || { sessions: 0, studyMinutes: 0, breakMinutes: 0 };
+        archive[month] = {
+            sessions: totals.sessions + 1,
+            studyMinutes: totals.studyMinutes + (session.studyMinutes || 0),
+            breakMinutes: totals.breakMinutes + (session.breakMinutes || 0)
+        };
+    }
+    if (kept.length === sessions.length) return stats;
+    return { ...stats, pomodoroSessions: kept, pomodoroArchive: archive };
+}
+
+/**
+ * Apply one operation
+ * @param {Object} stats - Stats object (not modified)
+ * @param {Object} op - Operation
+ * @returns {Object} New stats object
+ */
+export function applyOp(stats, op) {
+    switch (op.op) {
+        case 'set':
+            return setIn(stats, op.path, op.value);
+        case 'inc':
+            return setIn(stats, op.path, (Number(getIn(stats, op.path)) || 0) + op.value);
+        case 'append':
+            return setIn(stats, op.path, [...(getIn(stats, op.path) || []), op.value]);
+        case 'compactPomodoros':
+            return compactPomodoros(stats, op.before);
+        default:
+            console.warn('Unknown stats operation', op);
+            return stats;
+    }
+}
+
+/**
+ * Apply operations in order
+ * @param {Object} stats - Stats object (not modified)
+ * @param {Array} ops - Operations
+ * @returns {Object} New stats object
+ */
+export function applyOps(stats, ops) {
+    return ops.reduce(applyOp, stats);
+}
+
+// ============================================
+// Compaction
+// ============================================
+
+/**
+ * Merge operations on the same path: a later set replaces what came before,
+ * increments add up (onto a set, if any). Appends and pomodoro compactions
+ * are kept as they are, in order.
+ * @param {Array} ops - Operations, oldest first
+ * @returns {Array} Equivalent, shorter list
+ */
+export function compactOps(ops) {
+    const result = [];
+    const byPath = new Map();
+    for (const op of ops) {
+        if (op.op !== 'set' && op.op !== 'inc') {
+            result.push(op);
+            continue;
+        }
+        const key = op.path.join('\u0000');
+        const index = byPath.get(key);
+        if (index === undefined) {
+            byPath.set(key, result.length);
+            result.push(op);
+        } else if (op.op === 'set') {
+            result[index] = op;
+        } else {
+            const previous = result[index];
+            result[index] = { ...previous, value: previous.value + op.value };
+        }
+    }
+    return result;
+}
+
+export default {
+    applyOp,
+    applyOps,
+    compactOps,
+    compactPomodoros
+};
@@ -0,0 +1,176 @@
+/**
+ * Priority queue for a study session
+ *
+ * Cards that can be shown now are kept in a max-heap by urgency; cards that
+ * come back later (relearning after AGAIN) wait in a min-heap by due time and
+ * move over once due. Building the queue is O(n), pushing a card back and
+ * taking the next one are O(log n).
+ */
+
+import { calculateUrgencyScore, scheduleBatch, toCardColumns } from './fsrs';
+
+// ============================================
+// Binary Heap
+// ============================================
+
+/**
+ * Array-backed binary heap; `before(a, b)` is true when a must come out first
+ */
+export class BinaryHeap {
+    constructor(before, items = []) {
+        this.before = before;
+        this.items = items;
+        // Floyd's heap construction: O(n)
+        for (let i = (items.length >> 1) - 1; i >= 0; i--) {
+            this.siftDown(i);
+        }
+    }
+
+    get size() {
+        return this.items.length;
+    }
+
+    peek() {
+        return this.items[0];
+    }
+
+    push(item) {
+        this.items.push(item);
+        this.siftUp(this.items.length - 1);
+    }
+
+    pop() {
+        const items = this.items;
+        if (items.length === 0) return undefined;
+        const top = items[0];
+        const last = items.pop();
+        if (items.length > 0) {
+            items[0] = last;
+            this.siftDown(0);
+        }
+        return top;
+    }
+
+    siftUp(index) {
+        const items = this.items;
+        const item = items[index];
+        while (index > 0) {
+            const parent = (index - 1) >> 1;
+            if (!this.before(item, items[parent])) break;
+            items[index] = items[parent];
+            index = parent;
+        }
+        items[index] = item;
+    }
+
+    siftDown(index) {
+        const items = this.items;
+        const length = items.length;
+        const item = items[index];
+        for (;;) {
+            let child = 2 * index + 1;
+            if (child >= length) break;
+            if (child + 1 < length && this.before(items[child + 1], items[child])) child++;
+            if (!this.before(items[child], item)) break;
+            items[index] = items[child];
+            index = child;
+        }
+        items[index] = item;
+    }
+}
+
+// ============================================
+// Study Queue
+// ============================================
+
+// Most urgent first; equal urgency keeps insertion order
+const byUrgency = (a, b) => a.urgency > b.urgency || (a.urgency === b.urgency && a.seq < b.seq);
+
+// Earliest due first, then as byUrgency
+const byDue = (a, b) => a.due < b.due || (a.due === b.due && byUrgency(a, b));
+
+function score(value) {
+    // Cards without a valid due date score NaN; rank them last
+    return value === value ? value : -Infinity;
+}
+
+export class StudyQueue {
+    /**
+     * @param {Array} cards - Cards of the session
+     * @param {Object} options - { examDate (Date), now (ms) }
+     */
+    constructor(cards = [], { examDate = null, now = Date.now() } = {}) {
+        this.examDate = examDate;
+        this.seq = 0;
+
+        const { urgency } = scheduleBatch(toCardColumns(cards), { now, examDate });
+        this.ready = new BinaryHeap(byUrgency, cards.map((card, i) => ({
+            card,
+            due: now,
+            urgency: score(urgency[i]),
+            seq: this.seq++
+        })));
+        this.waiting = new BinaryHeap(byDue);
+    }
+
+    get size() {
+        return this.ready.size + this.waiting.size;
+    }
+
+    /**
+     * Put a card (back) into the queue
+     * @param {Object} card - Card object
+     * @param {Object} options - { due (ms): not shown before then; urgency: defaults to calculateUrgencyScore }
+     */
+    push(card, { due = 0, urgency = calculateUrgencyScore(card, this.examDate), now = Date.now() } = {}) {
+        const entry = { card, due, urgency: score(urgency), seq: this.seq++ };
+        (due <= now ? this.ready : this.waiting).push(entry);
+    }
+
+    /**
+     * Requeue a card answered AGAIN: it comes back once its relearning step is due
+     * @param {Object} card - Card returned by scheduleCard
+     */
+    relearn(card, now = Date.now()) {
+        this.push(card, { due: new Date(card.due_date).getTime(), now });
+    }
+
+    /**
+     * Move a skipped card behind every other card that is ready now
+     * @param {Object} card - Card object
+     */
+    skip(card, now = Date.now()) {
+        this.push(card, { due: now, urgency: -Infinity, now });
+    }
+
+    /**
+     * Take the next card to show
+     * @param {number} now - Current time in milliseconds
+     * @returns {Object|null} Most urgent ready card; if none is ready, the one due soonest
+     */
+    next(now = Date.now()) {
+        this.promote(now);
+        const entry = this.ready.size > 0 ? this.ready.pop() : this.waiting.pop();
+        return entry ? entry.card : null;
+    }
+
+    /**
+     * The card next() would return, without taking it
+     * @param {number} now - Current time in milliseconds
+     * @returns {Object|null} Card object
+     */
+    peek(now = Date.now()) {
+        this.promote(now);
+        const entry = this.ready.size > 0 ? this.ready.peek() : this.waiting.peek();
+        return entry ? entry.card : null;
+    }
+
+    promote(now) {
+        // Waiting cards that are due now compete by urgency
+        while (this.waiting.size > 0 && this.waiting.peek().due <= now) {
+            this.ready.push(this.waiting.pop());
+        }
+    }
+}
+
+export default StudyQueue;
@@ -67,6 +67,7 @@ export default function Analytics() {
         getTodayPomodoros,
         getCalendarHeatmapData,
         getStudyInRange,
+        getReviewStats,
     } = useStudyStats()
 
     const {
@@ -85,6 +86,7 @@ export default function Analytics() {
     const streakInfo = getStreakInfo()
     const generalStats = getGeneralStats()
     const weeklyData = getWeeklyData()
+    const reviewStats = getReviewStats(30)
     const knowledgeData = getKnowledgeByCategory()
     const casesStats = getCasesStats()
     const diagnosticItems = getCasesNeedingReview(4)
@@ -818,6 +820,20 @@ export default function Analytics() {
                         <span className="mini-stat-label">Mejor Racha</span>
                     </div>
                 </div>
+                <div className="mini-stat">
+                    <Activity size={18} />
+                    <div className="mini-stat-content">
+                        <span className="mini-stat-value">{reviewStats.reviews}</span>
+                        <span className="mini-stat-label">Repasos (30 días)</span>
+                    </div>
+                </div>
+                <div className="mini-stat">
+                    <Brain size={18} />
+                    <div className="mini-stat-content">
+                        <span className="mini-stat-value">{reviewStats.accuracy}%</span>
+                        <span className="mini-stat-label">Acierto Flashcards</span>
+                    </div>
+                </div>
             </div >
 
             {/* Charts Row */}
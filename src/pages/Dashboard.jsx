@@ -30,20 +30,29 @@ import { useClinicalCases, medicalCategories } from '../context/ClinicalCasesCon
 import { useLibrary } from '../context/LibraryContext'
 import { useSettings } from '../context/SettingsContext'
 import { useAuth } from '../context/AuthContext'
+import { useFSRS, PREFETCH_MAX_AGE_MS } from '../context/FSRSContext'
 import './Dashboard.css'
 
 export default function Dashboard() {
     const navigate = useNavigate()
     const { getUpcomingEvents } = useCalendar()
-    const { getTodayProgress, getStreakInfo, getGreeting, addStudyTime, stats, setDailyGoal } = useStudyStats()
+    const { getTodayProgress, getStreakInfo, getGreeting, addStudyTime, stats, setDailyGoal, getReviewStats } = useStudyStats()
     const { cases, getStats, getStudyCases } = useClinicalCases()
     const { documents } = useLibrary()
     const { settings } = useSettings()
     const { user } = useAuth()
+    const { prefetchStudySession } = useFSRS()
 
     const [isEditingGoal, setIsEditingGoal] = useState(false)
     const [goalInput, setGoalInput] = useState('')
 
+    // Fetch the next study session's cards ahead so it opens without waiting
+    useEffect(() => {
+        prefetchStudySession()
+        const timer = setInterval(() => prefetchStudySession(), PREFETCH_MAX_AGE_MS)
+        return () => clearInterval(timer)
+    }, [prefetchStudySession])
+
     const handleGoalSubmit = (e) => {
         e.preventDefault()
         e.stopPropagation()
@@ -177,6 +186,7 @@ export default function Dashboard() {
 
     // Datos de estudio
     const todayProgress = getTodayProgress()
+    const todayReviews = getReviewStats(1)
     const streakInfo = getStreakInfo()
     const greeting = getGreeting()
 
@@ -383,6 +393,23 @@ export default function Dashboard() {
                             </span>
                         </div>
 
+                        {/* Flashcards repasadas hoy */}
+                        <div className="stat-card" onClick={() => navigate('/study/session')}>
+                            <div className="stat-header">
+                                <span className="stat-label">Flashcards Hoy</span>
+                                <Layers className="stat-icon book" size={24} />
+                            </div>
+                            <div className="stat-value">
+                                <span className="stat-number">{todayReviews.reviews}</span>
+                                <span className="stat-total">repasos</span>
+                            </div>
+                            <span className="stat-status">
+                                {todayReviews.reviews > 0
+                                    ? `${todayReviews.accuracy}% correctas · ${todayReviews.newCards} nuevas`
+                                    : 'Sin repasos todavía'}
+                            </span>
+                        </div>
+
                         {/* Pendientes de estudio */}
                         <div className="stat-card pending-card" onClick={handleViewAllCases}>
                             <div className="stat-header">
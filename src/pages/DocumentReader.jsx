@@ -1,5 +1,5 @@
-import { useState, useEffect, useCallback } from 'react'
-import { useParams, useNavigate } from 'react-router-dom'
+import { useState, useEffect, useCallback, useRef } from 'react'
+import { useParams, useNavigate, useSearchParams } from 'react-router-dom'
 import {
     ArrowLeft,
     Search,
@@ -27,10 +27,23 @@ import { useLibrary } from '../context/LibraryContext'
 import PDFViewer from '../components/PDFViewer'
 import './DocumentReader.css'
 
+// Tipos que se muestran desde una copia local del archivo (ver fetchFileUrl)
+const opensFromLocalCopy = (doc) => ['PDF', 'IMG', 'TXT'].includes(doc.type) && !doc.isNote
+// The PDF viewer streams a URL with range requests, so a PDF never waits for its full download
+const streamsFromUrl = (doc) => doc.type === 'PDF'
+
 export default function DocumentReader() {
     const { id } = useParams()
     const navigate = useNavigate()
-    const { documents, deleteDocument, getDocumentViewUrl, downloadDocument } = useLibrary()
+    // Página de entrada, p. ej. desde un resultado de búsqueda en el contenido
+    const [searchParams] = useSearchParams()
+    const initialPage = parseInt(searchParams.get('page'), 10) || 1
+    const { documents, deleteDocument, getDocumentViewUrl, getDocumentFile, openDocumentFile, downloadDocument } = useLibrary()
+    // The context functions change on every render; the file is only loaded again when the document changes
+    const loadersRef = useRef({ getDocumentViewUrl, getDocumentFile, openDocumentFile })
+    loadersRef.current = { getDocumentViewUrl, getDocumentFile, openDocumentFile }
+    // blob: URL of the local copy being shown, released when it is replaced
+    const objectUrlRef = useRef(null)
 
     const [document, setDocument] = useState(null)
     const [documentNotFound, setDocumentNotFound] = useState(false)
@@ -66,33 +79,62 @@ export default function DocumentReader() {
         }
     }, [id, documents])
 
-    // Fetch the signed URL from Supabase Storage when document is found
-    const fetchFileUrl = useCallback(async (docId, docFilePath) => {
+    const releaseObjectUrl = () => {
+        if (objectUrlRef.current) {
+            URL.revokeObjectURL(objectUrlRef.current)
+            objectUrlRef.current = null
+        }
+    }
+
+    // Load the file when the document is found. PDFs, images and text open from a
+    // local copy (cached in the browser after the first time, also offline); a PDF
+    // that is not cached yet streams from its signed URL while the copy is saved.
+    // The Office viewer needs the signed URL from Supabase Storage.
+    const fetchFileUrl = useCallback(async (docId, docFilePath, localCopy, streams) => {
         if (!docId || !docFilePath) return
 
         setFileLoading(true)
         setFileError(null)
         setFileUrl(null)
+        releaseObjectUrl()
 
         try {
-            const { url, error } = await getDocumentViewUrl(docId)
-            if (error) throw new Error(typeof error === 'string' ? error : error.message || 'Error desconocido')
-            if (!url) throw new Error('No se pudo obtener la URL del documento')
-            setFileUrl(url)
+            if (streams) {
+                const { data, url, error } = await loadersRef.current.openDocumentFile(docId)
+                if (error) throw new Error(typeof error === 'string' ? error : error.message || 'Error desconocido')
+                if (data) {
+                    objectUrlRef.current = URL.createObjectURL(data)
+                    setFileUrl(objectUrlRef.current)
+                } else {
+                    setFileUrl(url)
+                }
+            } else if (localCopy) {
+                const { data, error } = await loadersRef.current.getDocumentFile(docId)
+                if (error) throw new Error(typeof error === 'string' ? error : error.message || 'Error desconocido')
+                objectUrlRef.current = URL.createObjectURL(data)
+                setFileUrl(objectUrlRef.current)
+            } else {
+                const { url, error } = await loadersRef.current.getDocumentViewUrl(docId)
+                if (error) throw new Error(typeof error === 'string' ? error : error.message || 'Error desconocido')
+                if (!url) throw new Error('No se pudo obtener la URL del documento')
+                setFileUrl(url)
+            }
         } catch (err) {
             console.error('Error obteniendo URL del archivo:', err)
             setFileError(err.message || 'Error al cargar el archivo')
         } finally {
             setFileLoading(false)
         }
-    }, [getDocumentViewUrl])
+    }, [])
 
     useEffect(() => {
         if (document && document.filePath && !document.isSample) {
-            fetchFileUrl(document.id, document.filePath)
+            fetchFileUrl(document.id, document.filePath, opensFromLocalCopy(document), streamsFromUrl(document))
         }
     }, [document?.id, document?.filePath, fetchFileUrl])
 
+    useEffect(() => releaseObjectUrl, [])
+
     const handleSend = () => {
         if (!inputValue.trim()) return
 
@@ -123,7 +165,7 @@ export default function DocumentReader() {
     const handleDownload = async () => {
         if (document) {
             if (fileUrl) {
-                // Descargar usando la URL firmada
+                // Descargar desde la copia local o la URL firmada
                 const link = window.document.createElement('a')
                 link.href = fileUrl
                 link.download = document.title
@@ -250,7 +292,7 @@ export default function DocumentReader() {
                             <AlertCircle size={48} />
                             <h3>Error al cargar el archivo</h3>
                             <p>{fileError}</p>
-                            <button className="btn btn-primary" onClick={() => fetchFileUrl(document.id, document.filePath)}>
+                            <button className="btn btn-primary" onClick={() => fetchFileUrl(document.id, document.filePath, opensFromLocalCopy(document), streamsFromUrl(document))}>
                                 <RefreshCw size={16} />
                                 Reintentar
                             </button>
@@ -263,7 +305,7 @@ export default function DocumentReader() {
                             fileUrl={fileUrl}
                             fileName={document.title}
                             onPageChange={handlePageChange}
-                            initialPage={1}
+                            initialPage={initialPage}
                         />
                     )}
 
@@ -1,4 +1,4 @@
-import { useState, useRef, useCallback } from 'react'
+import { useState, useRef, useCallback, useEffect } from 'react'
 import { useNavigate } from 'react-router-dom'
 import {
     Search,
@@ -31,6 +31,9 @@ import { useLibrary } from '../context/LibraryContext'
 import useNotifications from '../hooks/useNotifications'
 import './Library.css'
 
+// Espera tras la última tecla antes de buscar en el contenido
+const CONTENT_SEARCH_DELAY_MS = 350
+
 export default function Library() {
     const navigate = useNavigate()
     const {
@@ -41,7 +44,7 @@ export default function Library() {
         uploading,
         uploadProgress,
         error: libraryError,
-        addDocument,
+        addDocuments,
         updateDocument,
         deleteDocument,
         moveToCollection,
@@ -49,6 +52,7 @@ export default function Library() {
         deleteCollection,
         renameCollection,
         searchDocuments,
+        searchDocumentContents,
         createNote,
         downloadDocument,
         validateFile,
@@ -62,8 +66,9 @@ export default function Library() {
     const [activeTab, setActiveTab] = useState('all')
     const [selectedCollection, setSelectedCollection] = useState(null)
     const [selectedTags, setSelectedTags] = useState([])
-    const [sortBy, setSortBy] = useState('date')
+    const [sortBy, setSortBy] = useState('relevance')
     const [sortOrder, setSortOrder] = useState('desc')
+    const [contentHits, setContentHits] = useState([])
 
     // Modales
     const [showUploadModal, setShowUploadModal] = useState(false)
@@ -87,6 +92,8 @@ export default function Library() {
     const [uploadFiles, setUploadFiles] = useState([])
     const [uploadCollection, setUploadCollection] = useState('')
     const [uploadTags, setUploadTags] = useState([])
+    // Progreso de cada archivo (0-100), por índice en uploadFiles
+    const [fileProgress, setFileProgress] = useState({})
     const fileInputRef = useRef(null)
 
     // Filtrar documentos
@@ -97,10 +104,32 @@ export default function Library() {
         sortBy
     })
 
+    // Buscar también en el texto de los PDFs (en el servidor), cuando se deja de escribir
+    useEffect(() => {
+        if (!searchQuery.trim()) {
+            setContentHits([])
+            return
+        }
+
+        let cancelled = false
+        const timer = setTimeout(async () => {
+            const { data } = await searchDocumentContents(searchQuery)
+            if (!cancelled) setContentHits(data)
+        }, CONTENT_SEARCH_DELAY_MS)
+
+        return () => {
+            cancelled = true
+            clearTimeout(timer)
+        }
+    }, [searchQuery, searchDocumentContents])
+
     // Ordenar documentos
     const sortedDocuments = [...filteredDocuments].sort((a, b) => {
         let comparison = 0
         switch (sortBy) {
+            case 'relevance':
+                // searchDocuments ya devuelve el orden por relevancia (o por fecha sin búsqueda)
+                return 0
             case 'date':
                 comparison = new Date(b.date) - new Date(a.date)
                 break
@@ -187,9 +216,10 @@ export default function Library() {
     }
 
     const processUpload = async () => {
-        let hasError = false
-        for (const fileData of uploadFiles) {
-            const result = await addDocument({
+        setFileProgress({})
+        // Varios archivos a la vez (addDocuments limita cuántos)
+        const results = await addDocuments(uploadFiles.map(fileData => ({
+            docData: {
                 title: fileData.name,
                 type: fileData.type,
                 category: `Documento ${fileData.type}`,
@@ -201,21 +231,25 @@ export default function Library() {
                 image: fileData.preview || 'https://images.unsplash.com/photo-1456513080510-7bf3a84b82f8?w=300&h=200&fit=crop',
                 content: null,
                 isNote: false
-            }, fileData.file)
+            },
+            file: fileData.file
+        })), (index, loaded, total) => {
+            setFileProgress(prev => ({ ...prev, [index]: Math.round((loaded / total) * 100) }))
+        })
 
-            if (result?.error) {
-                hasError = true
-            }
-        }
+        const uploaded = uploadFiles.filter((_, index) => !results[index]?.error)
+        const failed = uploadFiles.filter((_, index) => results[index]?.error)
+        uploaded.forEach(f => documentUploaded(f.name))
+        setFileProgress({})
 
-        if (!hasError) {
-            uploadFiles.forEach(f => documentUploaded(f.name))
+        if (failed.length === 0) {
             setUploadFiles([])
             setUploadCollection('')
             setUploadTags([])
             setShowUploadModal(false)
         } else {
-            // Keep the modal open but ensure error is visible
+            // Keep the modal open with only the failed files; uploading them again resumes where they stopped
+            setUploadFiles(failed)
             console.error("Upload process encountered an error.");
         }
     }
@@ -460,6 +494,7 @@ export default function Library() {
                             onChange={(e) => setSortBy(e.target.value)}
                             className="sort-select"
                         >
+                            <option value="relevance">Relevancia</option>
                             <option value="date">Fecha</option>
                             <option value="name">Nombre</option>
                             <option value="size">Tamaño</option>
@@ -606,6 +641,31 @@ export default function Library() {
                         </div>
                     )}
                 </section>
+
+                {contentHits.length > 0 && (
+                    <section className="content-hits-section">
+                        <h2 className="section-label">
+                            EN EL CONTENIDO
+                            <span className="doc-count">({contentHits.length})</span>
+                        </h2>
+                        <div className="content-hits">
+                            {contentHits.map((hit) => (
+                                <button
+                                    key={`${hit.document.id}-${hit.page}`}
+                                    className="content-hit"
+                                    onClick={() => navigate(`/library/document/${hit.document.id}?page=${hit.page}`)}
+                                >
+                                    <div className="content-hit-header">
+                                        <FileText size={14} />
+                                        <span className="content-hit-title">{hit.document.title}</span>
+                                        <span className="content-hit-page">Pág. {hit.page}</span>
+                                    </div>
+                                    <p className="content-hit-snippet">…{hit.snippet}…</p>
+                                </button>
+                            ))}
+                        </div>
+                    </section>
+                )}
             </main>
 
             {/* Context Menu */}
@@ -690,10 +750,19 @@ export default function Library() {
                                         )}
                                         <div className="file-info">
                                             <span className="file-name">{file.name}</span>
-                                            <span className="file-size">{file.size}</span>
+                                            <span className="file-size">
+                                                {file.size}
+                                                {fileProgress[index] !== undefined && ` · ${fileProgress[index]}%`}
+                                            </span>
+                                            {fileProgress[index] !== undefined && (
+                                                <div className="upload-progress-bar file-progress">
+                                                    <div className="upload-progress-fill" style={{ width: `${fileProgress[index]}%` }} />
+                                                </div>
+                                            )}
                                         </div>
                                         <button
                                             className="remove-file"
+                                            disabled={uploading}
                                             onClick={() => setUploadFiles(prev => prev.filter((_, i) => i !== index))}
                                         >
                                             <X size={16} />
@@ -1,6 +1,6 @@
-import React, { useEffect, useState } from 'react';
+import React, { useCallback, useEffect, useState } from 'react';
 import { useNavigate, useSearchParams } from 'react-router-dom';
-import { useFSRS } from '../context/FSRSContext';
+import { useFSRS, DEFAULT_SESSION_OPTIONS } from '../context/FSRSContext';
 import { useAuth } from '../context/AuthContext';
 import FlashcardView from '../components/study/FlashcardView';
 import RatingButtons from '../components/study/RatingButtons';
@@ -37,11 +37,7 @@ function StudySession() {
     // Start session on mount
     useEffect(() => {
         if (user && !isStudying) {
-            startStudySession(deckId, {
-                includeNew: true,
-                newCardsLimit: 20,
-                reviewLimit: 100
-            });
+            startStudySession(deckId, DEFAULT_SESSION_OPTIONS);
         }
     }, [user, deckId, startStudySession, isStudying]);
 
@@ -68,12 +64,12 @@ function StudySession() {
         }, 150);
     };
 
-    const handleRating = async (rating) => {
+    const handleRating = useCallback(async (rating) => {
         setShowAnswer(false);
         await answerCard(rating);
         // Notify milestones every 10 cards
         cardMastered(sessionStats.studied + 1);
-    };
+    }, [answerCard, cardMastered, sessionStats.studied]);
 
     const handleSkip = () => {
         setShowAnswer(false);
@@ -0,0 +1,269 @@
+/**
+ * Signed URLs and file contents of library documents, cached in the browser
+ *
+ * - Signed URLs are kept in memory per file path until shortly before they
+ *   expire; past half their life they are renewed in the background, so the
+ *   caller never waits for one that is still valid.
+ * - File contents are kept in Cache Storage. A stored object never changes
+ *   (every upload gets a new path), so a cached file is always current and
+ *   reopening it costs no request. The cache is limited to MAX_CACHE_BYTES;
+ *   the least recently opened files are evicted first.
+ * - openFile never waits for a whole download: on a miss it hands back the
+ *   signed URL (the PDF viewer streams it with range requests) and fills the
+ *   cache in the background.
+ * - Each entry keeps the metadata of its document and the user who opened
+ *   it (cachedDocuments), so cached files can still be listed and opened
+ *   when the library cannot be loaded, e.g. offline.
+ */
+
+import { supabaseHelpers } from '../config/supabase';
+
+const SIGNED_URL_TTL_S = 7200;
+// A URL closer than this to its expiry is not handed out
+const URL_EXPIRY_MARGIN_MS = 5 * 60 * 1000;
+
+const CACHE_NAME = 'synapse-documents-v1';
+const INDEX_KEY = 'synapse_document_cache';
+export const MAX_CACHE_BYTES = 300 * 1024 * 1024;
+
+// ============================================
+// Signed URLs
+// ============================================
+
+// filePath -> { url, issuedAt, expiresAt }
+const signedUrls = new Map();
+// filePath -> pending request, so parallel callers share it
+const pendingUrls = new Map();
+
+function requestSignedUrl(filePath) {
+    if (pendingUrls.has(filePath)) return pendingUrls.get(filePath);
+
+    const issuedAt = Date.now();
+    const request = supabaseHelpers.storage.getSignedUrl(filePath, SIGNED_URL_TTL_S)
+        .then(({ url, error }) => {
+            if (!error && url) {
+                signedUrls.set(filePath, { url, issuedAt, expiresAt: issuedAt + SIGNED_URL_TTL_S * 1000 });
+            }
+            return { url, error };
+        })
+        .finally(() => pendingUrls.delete(filePath));
+    pendingUrls.set(filePath, request);
+    return request;
+}
+
+// ============================================
+// File contents
+// ============================================
+
+function cacheAvailable() {
+    return typeof caches !== 'undefined';
+}
+
+// Stable cache key for a file path (never fetched; only names the entry)
+function cacheKey(filePath) {
+    return new Request(`${window.location.origin}/__synapse_documents/${encodeURIComponent(filePath)}`);
+}
+
+// filePath -> { bytes, usedAt, userId, document }
+function readIndex() {
+    try {
+        return JSON.parse(localStorage.getItem(INDEX_KEY)) || {};
+    } catch (e) {
+        return {};
+    }
+}
+
+function writeIndex(index) {
+    try {
+        localStorage.setItem(INDEX_KEY, JSON.stringify(index));
+    } catch (err) {
+        console.warn('Document cache: could not save index', err);
+    }
+}
+
+// Index updates run one at a time; interleaved read-modify-writes would lose entries
+let indexQueue = Promise.resolve();
+
+function withIndex(task) {
+    const run = indexQueue.then(task, task);
+    indexQueue = run.catch(() => {});
+    return run;
+}
+
+async function evict(cache, index, bytesNeeded) {
+    let total = Object.values(index).reduce((sum, entry) => sum + entry.bytes, 0);
+    const oldestFirst = Object.entries(index).sort((a, b) => a[1].usedAt - b[1].usedAt);
+    for (const [filePath, entry] of oldestFirst) {
+        if (total + bytesNeeded <= MAX_CACHE_BYTES) break;
+        await cache.delete(cacheKey(filePath));
+        delete index[filePath];
+        total -= entry.bytes;
+    }
+}
+
+function readCached(filePath) {
+    if (!cacheAvailable()) return Promise.resolve(null);
+    return withIndex(async () => {
+        const cache = await caches.open(CACHE_NAME);
+        const response = await cache.match(cacheKey(filePath));
+        const index = readIndex();
+        if (!response) {
+            // Evicted by the browser under storage pressure
+            if (index[filePath]) {
+                delete index[filePath];
+                writeIndex(index);
+            }
+            return null;
+        }
+        const blob = await response.blob();
+        index[filePath] = { ...index[filePath], bytes: blob.size, usedAt: Date.now() };
+        writeIndex(index);
+        return blob;
+    });
+}
+
+function storeCached(filePath, blob, owner = {}) {
+    if (!cacheAvailable() || blob.size > MAX_CACHE_BYTES) return Promise.resolve();
+    return withIndex(async () => {
+        try {
+            const cache = await caches.open(CACHE_NAME);
+            const index = readIndex();
+            delete index[filePath];
+            await evict(cache, index, blob.size);
+            await cache.put(cacheKey(filePath), new Response(blob, {
+                headers: { 'Content-Type': blob.type || 'application/octet-stream' }
+            }));
+            index[filePath] = { bytes: blob.size, usedAt: Date.now(), userId: owner.userId, document: owner.document };
+            writeIndex(index);
+        } catch (err) {
+            // Quota exceeded: the file is still returned, just not kept
+            console.warn('Document cache: could not store file', err);
+        }
+    });
+}
+
+// filePath -> pending background download, so reopening does not start another
+const pendingFills = new Map();
+
+// Download a file into the cache without anyone waiting on it
+function fillInBackground(filePath, url, owner) {
+    if (!cacheAvailable() || pendingFills.has(filePath)) return;
+    const fill = fetch(url)
+        .then(async (response) => {
+            if (!response.ok) return;
+            const declared = Number(response.headers.get('Content-Length'));
+            if (declared > MAX_CACHE_BYTES) return;
+            await storeCached(filePath, await response.blob(), owner);
+        })
+        .catch((err) => console.warn('Document cache: background download failed', err))
+        .finally(() => pendingFills.delete(filePath));
+    pendingFills.set(filePath, fill);
+}
+
+// ============================================
+// Service
+// ============================================
+
+const documentCache = {
+    /**
+     * Signed URL of a stored file, from memory while it is valid
+     * @param {string} filePath - Path in the documents bucket
+     * @returns {Promise<{url: string|null, error: Error|null}>}
+     */
+    getSignedUrl: async (filePath) => {
+        const cached = signedUrls.get(filePath);
+        const now = Date.now();
+        if (cached && cached.expiresAt - now > URL_EXPIRY_MARGIN_MS) {
+            // Past half its life: renew it for next time, without waiting
+            if (now - cached.issuedAt > (cached.expiresAt - cached.issuedAt) / 2) {
+                requestSignedUrl(filePath);
+            }
+            return { url: cached.url, error: null };
+        }
+        return requestSignedUrl(filePath);
+    },
+
+    /**
+     * A stored file to show: its local copy when cached, otherwise its signed
+     * URL while the copy is downloaded in the background
+     * @param {string} filePath - Path in the documents bucket
+     * @param {{userId: string, document: Object}} [owner] - Kept with the copy for cachedDocuments
+     * @returns {Promise<{data: Blob|null, url: string|null, fromCache: boolean, error: Error|null}>}
+     */
+    openFile: async (filePath, owner) => {
+        const cached = await readCached(filePath).catch(() => null);
+        if (cached) return { data: cached, url: null, fromCache: true, error: null };
+
+        const { url, error } = await documentCache.getSignedUrl(filePath);
+        if (error || !url) {
+            return { data: null, url: null, fromCache: false, error: error || new Error('No se pudo obtener la URL del documento') };
+        }
+        fillInBackground(filePath, url, owner);
+        return { data: null, url, fromCache: false, error: null };
+    },
+
+    /**
+     * Contents of a stored file, from the local cache when it is there
+     * @param {string} filePath - Path in the documents bucket
+     * @param {{userId: string, document: Object}} [owner] - Kept with the copy for cachedDocuments
+     * @returns {Promise<{data: Blob|null, fromCache: boolean, error: Error|null}>}
+     */
+    getFile: async (filePath, owner) => {
+        try {
+            const cached = await readCached(filePath).catch(() => null);
+            if (cached) return { data: cached, fromCache: true, error: null };
+
+            const { url, error } = await documentCache.getSignedUrl(filePath);
+            if (error) throw error;
+            const response = await fetch(url);
+            if (!response.ok) throw new Error(`Error al descargar el archivo (${response.status})`);
+
+            const blob = await response.blob();
+            await storeCached(filePath, blob, owner);
+            return { data: blob, fromCache: false, error: null };
+        } catch (err) {
+            console.error('Document cache: could not get file', err);
+            return { data: null, fromCache: false, error: err };
+        }
+    },
+
+    /**
+     * Documents of a user whose files are in the cache, most recently opened first
+     * @param {string} userId
+     * @returns {Object[]}
+     */
+    cachedDocuments: (userId) => {
+        if (!cacheAvailable()) return [];
+        return Object.values(readIndex())
+            .filter(entry => entry.document && entry.userId === userId)
+            .sort((a, b) => b.usedAt - a.usedAt)
+            .map(entry => entry.document);
+    },
+
+    /**
+     * Forget a file (after deleting it)
+     * @param {string} filePath - Path in the documents bucket
+     */
+    remove: async (filePath) => {
+        signedUrls.delete(filePath);
+        if (!cacheAvailable()) return;
+        await withIndex(async () => {
+            const index = readIndex();
+            delete index[filePath];
+            writeIndex(index);
+            const cache = await caches.open(CACHE_NAME);
+            await cache.delete(cacheKey(filePath));
+        });
+    },
+
+    /**
+     * Drop every cached URL and file (on sign-out, so the next user does not see them)
+     */
+    clear: async () => {
+        signedUrls.clear();
+        localStorage.removeItem(INDEX_KEY);
+        if (cacheAvailable()) await caches.delete(CACHE_NAME);
+    }
+};
+
+export default documentCache;
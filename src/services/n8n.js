@@ -1,4 +1,4 @@
-const N8N_BASE_URL = 'https://n8n-n8n.8noypn.easypanel.host/webhook';
+export const N8N_BASE_URL = import.meta.env.VITE_N8N_BASE_URL || 'https://n8n-n8n.8noypn.easypanel.host/webhook';
 
 /**
  * Service to interact with n8n AI Brain Workflows
@@ -0,0 +1,261 @@
+/**
+ * Resumable uploads to Supabase Storage (tus protocol)
+ *
+ * Large files are sent in CHUNK_SIZE pieces to the Storage tus endpoint
+ * instead of in one request:
+ *
+ * - Progress is reported per byte sent, not per finished request.
+ * - A dropped connection only repeats the chunk in flight: the upload asks
+ *   the server how much it already has (HEAD) and continues from there,
+ *   retrying with backoff and waiting for the browser to be back online.
+ * - The upload URL is kept in localStorage per file, so uploading the same
+ *   file again (after a failure or a reload) resumes instead of starting
+ *   from zero. Storage keeps unfinished uploads for 24 hours.
+ * - Storage forgets an upload once its last chunk arrives. If the answer to
+ *   that chunk is lost, the stored object is looked up instead of reporting
+ *   the upload as expired (and uploading the file again under a new path).
+ */
+
+import { SUPABASE_CONFIG } from '../config/supabase.config';
+
+// Supabase Storage requires 6 MB chunks for resumable uploads
+export const CHUNK_SIZE = 6 * 1024 * 1024;
+
+const TUS_VERSION = '1.0.0';
+const RESUME_KEY_PREFIX = 'synapse_upload:';
+// Storage expires unfinished uploads after 24 h; leave a margin
+const RESUME_TTL_MS = 23 * 60 * 60 * 1000;
+// Wait before each new attempt of a failed request
+const RETRY_DELAYS_MS = [0, 1000, 3000, 5000, 10000, 20000];
+
+export class UploadError extends Error {
+    constructor(message, status = null) {
+        super(message);
+        this.name = 'UploadError';
+        this.status = status;
+    }
+}
+
+// ============================================
+// Resume records
+// ============================================
+
+function fingerprint(userId, file) {
+    return `${RESUME_KEY_PREFIX}${userId}:${file.name}:${file.size}:${file.lastModified || 0}`;
+}
+
+function readResume(key) {
+    try {
+        const saved = JSON.parse(localStorage.getItem(key));
+        if (saved && Date.now() - saved.createdAt < RESUME_TTL_MS) return saved;
+    } catch (e) {
+        // Unreadable record: start a new upload
+    }
+    localStorage.removeItem(key);
+    return null;
+}
+
+function writeResume(key, record) {
+    try {
+        localStorage.setItem(key, JSON.stringify(record));
+    } catch (err) {
+        // Without the record the upload still works; it just cannot resume after a reload
+        console.warn('Upload: could not save resume point', err);
+    }
+}
+
+// ============================================
+// Requests
+// ============================================
+
+function encodeMetadata(metadata) {
+    return Object.entries(metadata)
+        .map(([key, value]) => `${key} ${btoa(unescape(encodeURIComponent(value)))}`)
+        .join(',');
+}
+
+// Asked again for every request: a long upload can outlive the access token
+async function authHeaders(getAccessToken) {
+    const token = (await getAccessToken()) || SUPABASE_CONFIG.anonKey;
+    return {
+        authorization: `Bearer ${token}`,
+        apikey: SUPABASE_CONFIG.anonKey,
+        'Tus-Resumable': TUS_VERSION
+    };
+}
+
+async function createUpload(bucket, path, file, contentType, getAccessToken) {
+    const response = await fetch(`${SUPABASE_CONFIG.url}/storage/v1/upload/resumable`, {
+        method: 'POST',
+        headers: {
+            ...(await authHeaders(getAccessToken)),
+            'Upload-Length': String(file.size),
+            'Upload-Metadata': encodeMetadata({
+                bucketName: bucket,
+                objectName: path,
+                contentType,
+                cacheControl: '3600'
+            })
+        }
+    });
+    const location = response.headers.get('Location');
+    if (response.status !== 201 || !location) {
+        const message = response.status === 409
+            ? 'El archivo ya existe'
+            : `No se pudo iniciar la subida (${response.status})`;
+        throw new UploadError(message, response.status);
+    }
+    return new URL(location, SUPABASE_CONFIG.url).toString();
+}
+
+// Bytes the server already has, or null if the upload no longer exists
+async function getOffset(url, getAccessToken) {
+    const response = await fetch(url, { method: 'HEAD', headers: await authHeaders(getAccessToken) });
+    if (response.status === 404 || response.status === 410) return null;
+    if (!response.ok) throw new UploadError(`No se pudo reanudar la subida (${response.status})`, response.status);
+    return Number(response.headers.get('Upload-Offset'));
+}
+
+// Whether the object an upload was writing is now stored
+async function objectExists(bucket, path, getAccessToken) {
+    const encodedPath = path.split('/').map(encodeURIComponent).join('/');
+    const response = await fetch(`${SUPABASE_CONFIG.url}/storage/v1/object/authenticated/${bucket}/${encodedPath}`, {
+        method: 'HEAD',
+        headers: await authHeaders(getAccessToken)
+    });
+    if (response.ok) return true;
+    // Storage answers 400 as well as 404 for a missing object
+    if (response.status === 404 || response.status === 400) return false;
+    throw new UploadError(`No se pudo comprobar la subida (${response.status})`, response.status);
+}
+
+// XMLHttpRequest rather than fetch: it reports upload progress
+function sendChunk(url, chunk, offset, headers, onChunkProgress, signal) {
+    return new Promise((resolve, reject) => {
+        const xhr = new XMLHttpRequest();
+        xhr.open('PATCH', url);
+        Object.entries({
+            ...headers,
+            'Upload-Offset': String(offset),
+            'Content-Type': 'application/offset+octet-stream'
+        }).forEach(([name, value]) => xhr.setRequestHeader(name, value));
+
+        xhr.upload.onprogress = (event) => onChunkProgress(event.loaded);
+        xhr.onload = () => {
+            if (xhr.status === 204 || xhr.status === 200) {
+                const next = xhr.getResponseHeader('Upload-Offset');
+                resolve(next === null ? offset + chunk.size : Number(next));
+            } else {
+                reject(new UploadError(`Error al subir el archivo (${xhr.status})`, xhr.status));
+            }
+        };
+        xhr.onerror = () => reject(new UploadError('Conexión perdida durante la subida'));
+        xhr.onabort = () => reject(new DOMException('Upload aborted', 'AbortError'));
+
+        if (signal) {
+            if (signal.aborted) return xhr.onabort();
+            signal.addEventListener('abort', () => xhr.abort(), { once: true });
+        }
+        xhr.send(chunk);
+    });
+}
+
+// Network failures and server-side errors are worth another attempt; 4xx are not
+function isRetryable(err) {
+    if (err.name === 'AbortError') return false;
+    return !err.status || err.status === 409 || err.status === 423 || err.status >= 500;
+}
+
+function waitForRetry(delay) {
+    return new Promise((resolve) => {
+        const retry = () => setTimeout(resolve, delay);
+        if (typeof navigator !== 'undefined' && navigator.onLine === false) {
+            window.addEventListener('online', retry, { once: true });
+        } else {
+            retry();
+        }
+    });
+}
+
+// ============================================
+// Service
+// ============================================
+
+const resumableUpload = {
+    CHUNK_SIZE,
+
+    /**
+     * Upload a file in chunks, resuming a previous attempt of the same file
+     * @param {Object} options
+     * @param {string} options.userId - Owner, part of the resume key
+     * @param {string} options.bucket - Storage bucket
+     * @param {string} options.path - Object path for a new upload (an upload being resumed keeps its own)
+     * @param {File} options.file - File to upload
+     * @param {Function} options.getAccessToken - Resolves to the session's access token
+     * @param {Function} [options.onProgress] - Called with (bytesSent, totalBytes)
+     * @param {AbortSignal} [options.signal] - Cancels the upload (it can still be resumed later)
+     * @returns {Promise<{path: string}>} Path of the stored object
+     */
+    upload: async ({ userId, bucket, path, file, getAccessToken, onProgress = () => {}, signal }) => {
+        const key = fingerprint(userId, file);
+        const contentType = file.type || 'application/octet-stream';
+        let record = readResume(key);
+        let offset = null;
+
+        // The upload is gone: finished if its last chunk was sent and the object is there
+        const finished = async () => {
+            if (!record.lastChunkSent) return false;
+            if (!(await objectExists(record.bucket || bucket, record.path, getAccessToken))) return false;
+            localStorage.removeItem(key);
+            onProgress(file.size, file.size);
+            return true;
+        };
+
+        if (record) {
+            offset = await getOffset(record.url, getAccessToken).catch(() => null);
+            if (offset === null) {
+                if (await finished().catch(() => false)) return { path: record.path };
+                record = null;
+            }
+        }
+        if (!record) {
+            record = { url: await createUpload(bucket, path, file, contentType, getAccessToken), bucket, path, createdAt: Date.now() };
+            writeResume(key, record);
+            offset = 0;
+        }
+        onProgress(offset, file.size);
+
+        let attempt = 0;
+        while (offset < file.size) {
+            const chunk = file.slice(offset, offset + CHUNK_SIZE);
+            if (offset + chunk.size >= file.size && !record.lastChunkSent) {
+                record.lastChunkSent = true;
+                writeResume(key, record);
+            }
+            try {
+                const headers = await authHeaders(getAccessToken);
+                offset = await sendChunk(record.url, chunk, offset, headers,
+                    (loaded) => onProgress(offset + loaded, file.size), signal);
+                attempt = 0;
+                onProgress(offset, file.size);
+            } catch (err) {
+                if (!isRetryable(err) || attempt >= RETRY_DELAYS_MS.length) throw err;
+                await waitForRetry(RETRY_DELAYS_MS[attempt]);
+                attempt += 1;
+                // The chunk may have arrived in part, or whole with only the response lost
+                const serverOffset = await getOffset(record.url, getAccessToken).catch(() => offset);
+                if (serverOffset === null) {
+                    if (await finished()) return { path: record.path };
+                    localStorage.removeItem(key);
+                    throw new UploadError('La subida expiró; vuelve a intentarlo');
+                }
+                offset = serverOffset;
+            }
+        }
+
+        localStorage.removeItem(key);
+        return { path: record.path };
+    }
+};
+
+export default resumableUpload;
@@ -0,0 +1,253 @@
+/**
+ * Write-behind journal of card reviews
+ *
+ * Answering a card only records the review here; the study queue moves on at
+ * once. Pending reviews are kept in IndexedDB (memory only where it is not
+ * available) so they survive closing the tab, and are sent to Supabase in
+ * batches through the `apply_reviews` RPC: periodically, when the page is
+ * hidden, and when a session starts or ends. A failed flush keeps the reviews
+ * and is retried with exponential backoff.
+ *
+ * Every review carries a client-generated id (`review_logs.client_id`), so a
+ * batch that is sent twice (a retry after a lost response, two open tabs) is
+ * applied once.
+ */
+
+import { supabase } from '../config/supabase';
+
+const DB_NAME = 'synapse-review-journal';
+const DB_VERSION = 1;
+const STORE_NAME = 'reviews';
+
+export const FLUSH_INTERVAL_MS = 15000;
+export const MAX_BATCH_SIZE = 200;
+const RETRY_BASE_MS = 2000;
+const RETRY_MAX_MS = 5 * 60 * 1000;
+
+// Columns of flashcards written after a review
+const CARD_FIELDS = [
+    'state', 'difficulty', 'stability', 'retrievability', 'due_date', 'last_review',
+    'scheduled_days', 'elapsed_days', 'reps', 'lapses'
+];
+
+// ============================================
+// Storage
+// ============================================
+
+let dbPromise = null;
+
+function openDatabase() {
+    if (!dbPromise) {
+        dbPromise = new Promise((resolve) => {
+            if (typeof indexedDB === 'undefined') {
+                resolve(null);
+                return;
+            }
+            const request = indexedDB.open(DB_NAME, DB_VERSION);
+            request.onupgradeneeded = () => {
+                request.result.createObjectStore(STORE_NAME, { keyPath: 'id' });
+            };
+            request.onsuccess = () => resolve(request.result);
+            request.onerror = () => {
+                // Private mode and some embedded browsers refuse IndexedDB
+                console.warn('Review journal: IndexedDB unavailable, keeping reviews in memory', request.error);
+                resolve(null);
+            };
+        });
+    }
+    return dbPromise;
+}
+
+function transact(db, mode, work) {
+    return new Promise((resolve, reject) => {
+        const tx = db.transaction(STORE_NAME, mode);
+        const request = work(tx.objectStore(STORE_NAME));
+        tx.oncomplete = () => resolve(request ? request.result : undefined);
+        tx.onerror = () => reject(tx.error);
+        tx.onabort = () => reject(tx.error);
+    });
+}
+
+// Reviews of this tab not yet confirmed by the server, by id
+const pending = new Map();
+
+function createId() {
+    if (typeof crypto !== 'undefined' && crypto.randomUUID) {
+        return crypto.randomUUID();
+    }
+    return 'xxxxxxxx-xxxx-4xxx-yxxx-xxxxxxxxxxxx'.replace(/[xy]/g, (c) => {
+        const r = (Math.random() * 16) | 0;
+        return (c === 'x' ? r : (r & 0x3) | 0x8).toString(16);
+    });
+}
+
+// ============================================
+// Flushing
+// ============================================
+
+let activeUserId = null;
+let flushing = null;
+let failures = 0;
+let retryTimer = null;
+
+/**
+ * Build the RPC payload of a batch: every review log, and the latest state of each card
+ */
+export function buildBatch(entries) {
+    const logs = [];
+    const cards = new Map();
+    for (const entry of entries) {
+        logs.push(entry.log);
+        const previous = cards.get(entry.card.id);
+        if (!previous || previous.last_review <= entry.card.last_review) {
+            cards.set(entry.card.id, entry.card);
+        }
+    }
+    return { logs, cards: [...cards.values()] };
+}
+
+async function sendBatches(userId) {
+    // Reviews recorded while a batch is in flight go out in the next one
+    for (;;) {
+        const batch = [...pending.values()]
+            .filter(entry => entry.user_id === userId)
+            .sort((a, b) => a.recorded_at - b.recorded_at)
+            .slice(0, MAX_BATCH_SIZE);
+        if (batch.length === 0) return;
+
+        const { error } = await supabase.rpc('apply_reviews', buildBatch(batch));
+        if (error) throw error;
+
+        batch.forEach(entry => pending.delete(entry.id));
+        const db = await openDatabase();
+        if (db) {
+            await transact(db, 'readwrite', store => batch.forEach(entry => store.delete(entry.id)));
+        }
+    }
+}
+
+function scheduleRetry() {
+    clearTimeout(retryTimer);
+    const delay = Math.min(RETRY_BASE_MS * 2 ** (failures - 1), RETRY_MAX_MS);
+    retryTimer = setTimeout(() => reviewJournal.flush(), delay);
+}
+
+function onPageHidden() {
+    if (document.visibilityState === 'hidden') {
+        reviewJournal.flush();
+    }
+}
+
+// ============================================
+// Service
+// ============================================
+
+const reviewJournal = {
+    /**
+     * Record a review; resolves once it is stored locally (not on the server)
+     * @param {Object} review - { userId, card (before), updatedCard, rating (1-4), durationMs }
+     * @returns {Promise<string>} Client id of the review
+     */
+    record: async ({ userId, card, updatedCard, rating, durationMs = null }) => {
+        const id = createId();
+        const reviewedAt = updatedCard.last_review || new Date().toISOString();
+        const entry = {
+            id,
+            user_id: userId,
+            recorded_at: Date.now(),
+            card: Object.fromEntries([['id', card.id], ...CARD_FIELDS.map(field => [field, updatedCard[field]])]),
+            log: {
+                client_id: id,
+                card_id: card.id,
+                rating: ['AGAIN', 'HARD', 'GOOD', 'EASY'][rating - 1],
+                review_duration_ms: durationMs,
+                state_before: card.state,
+                difficulty_before: card.difficulty,
+                stability_before: card.stability,
+                state_after: updatedCard.state,
+                difficulty_after: updatedCard.difficulty,
+                stability_after: updatedCard.stability,
+                scheduled_days: updatedCard.scheduled_days,
+                reviewed_at: reviewedAt
+            }
+        };
+        pending.set(id, entry);
+
+        try {
+            const db = await openDatabase();
+            if (db) await transact(db, 'readwrite', store => store.put(entry));
+        } catch (err) {
+            // Still flushed from memory; only lost if the tab closes first
+            console.error('Review journal: could not persist review', err);
+        }
+        return id;
+    },
+
+    /**
+     * Send pending reviews of the active user to Supabase
+     * @returns {Promise<boolean>} Whether nothing is left pending
+     */
+    flush: () => {
+        if (flushing) return flushing;
+        if (!activeUserId) return Promise.resolve(pending.size === 0);
+
+        clearTimeout(retryTimer);
+        const userId = activeUserId;
+        flushing = sendBatches(userId)
+            .then(() => {
+                failures = 0;
+                return true;
+            })
+            .catch((err) => {
+                failures += 1;
+                console.error(`Review journal: flush failed (attempt ${failures})`, err);
+                scheduleRetry();
+                return false;
+            })
+            .finally(() => {
+                flushing = null;
+            });
+        return flushing;
+    },
+
+    /**
+     * Start flushing for a signed-in user; reviews left by an earlier tab are loaded and sent
+     * @param {string} userId - auth.uid() of the session
+     * @returns {Function} Stops the timers and listeners
+     */
+    start: (userId) => {
+        activeUserId = userId;
+        failures = 0;
+
+        const interval = setInterval(() => {
+            if (pending.size > 0) reviewJournal.flush();
+        }, FLUSH_INTERVAL_MS);
+        document.addEventListener('visibilitychange', onPageHidden);
+        window.addEventListener('pagehide', reviewJournal.flush);
+
+        openDatabase()
+            .then(db => db && transact(db, 'readonly', store => store.getAll()))
+            .then((stored) => {
+                (stored || []).forEach((entry) => {
+                    if (!pending.has(entry.id)) pending.set(entry.id, entry);
+                });
+                if (pending.size > 0) reviewJournal.flush();
+            })
+            .catch(err => console.error('Review journal: could not load stored reviews', err));
+
+        return () => {
+            clearInterval(interval);
+            clearTimeout(retryTimer);
+            document.removeEventListener('visibilitychange', onPageHidden);
+            window.removeEventListener('pagehide', reviewJournal.flush);
+            if (activeUserId === userId) activeUserId = null;
+        };
+    },
+
+    /**
+     * Number of reviews not yet confirmed by the server
+     */
+    pendingCount: () => pending.size
+};
+
+export default reviewJournal;
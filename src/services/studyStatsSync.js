@@ -0,0 +1,253 @@
+/**
+ * Local persistence and delta sync of the study stats
+ *
+ * StudyStatsContext describes every change as a small operation
+ * (lib/statsOps.js) and records it here instead of rewriting the whole stats
+ * object:
+ *
+ * - Locally, operations are appended to a log next to the last snapshot in
+ *   localStorage; the snapshot is only rewritten when the log grows past
+ *   LOG_COMPACT_SIZE, when the page is hidden and after loading.
+ * - For Supabase, operations not yet confirmed are kept compacted (one per
+ *   path, plus appended sessions) and sent in one `apply_study_stats_ops`
+ *   call, debounced like the previous whole-object upsert. Each batch has a
+ *   client id; the server ignores a batch it has already applied, so a retry
+ *   after a lost response does not count minutes twice.
+ *
+ * What is written per change stays the same size however long the history is.
+ */
+
+import { supabase, supabaseHelpers } from '../config/supabase';
+import { applyOps, compactOps } from '../lib/statsOps';
+
+const SNAPSHOT_KEY = 'synapse_study_stats';
+const LOG_KEY = 'synapse_study_stats_log';
+const SYNC_KEY_PREFIX = 'synapse_study_stats_sync:';
+
+export const FLUSH_DELAY_MS = 2000;
+export const LOG_COMPACT_SIZE = 50;
+const RETRY_BASE_MS = 2000;
+const RETRY_MAX_MS = 5 * 60 * 1000;
+
+// ============================================
+// Storage
+// ============================================
+
+function read(key, fallback) {
+    try {
+        const saved = localStorage.getItem(key);
+        return saved ? JSON.parse(saved) : fallback;
+    } catch (e) {
+        return fallback;
+    }
+}
+
+function write(key, value) {
+    try {
+        localStorage.setItem(key, JSON.stringify(value));
+    } catch (err) {
+        // Quota exceeded or storage disabled; the server copy is still synced
+        console.error('Study stats: could not save locally', err);
+    }
+}
+
+// Operations sent and waiting to be sent, per user
+function readQueue(userId) {
+    return read(SYNC_KEY_PREFIX + userId, { pending: [], inflight: null });
+}
+
+function writeQueue(userId, queue) {
+    write(SYNC_KEY_PREFIX + userId, queue);
+}
+
+function createId() {
+    if (typeof crypto !== 'undefined' && crypto.randomUUID) {
+        return crypto.randomUUID();
+    }
+    return 'xxxxxxxx-xxxx-4xxx-yxxx-xxxxxxxxxxxx'.replace(/[xy]/g, (c) => {
+        const r = (Math.random() * 16) | 0;
+        return (c === 'x' ? r : (r & 0x3) | 0x8).toString(16);
+    });
+}
+
+// ============================================
+// Flushing
+// ============================================
+
+let activeUserId = null;
+let flushing = null;
+let failures = 0;
+let flushTimer = null;
+let getCurrentStats = () => null;
+
+async function sendBatches(userId) {
+    // Operations recorded while a batch is in flight go out in the next one
+    for (;;) {
+        const queue = readQueue(userId);
+        if (!queue.inflight) {
+            if (queue.pending.length === 0) return;
+            queue.inflight = { id: createId(), ops: queue.pending };
+            queue.pending = [];
+            writeQueue(userId, queue);
+        }
+
+        const { error } = await supabase.rpc('apply_study_stats_ops', {
+            p_batch_id: queue.inflight.id,
+            p_ops: queue.inflight.ops
+        });
+        if (error) throw error;
+
+        writeQueue(userId, { ...readQueue(userId), inflight: null });
+    }
+}
+
+function scheduleFlush(delay) {
+    clearTimeout(flushTimer);
+    flushTimer = setTimeout(() => studyStatsSync.flush(), delay);
+}
+
+function onPageHide() {
+    studyStatsSync.checkpoint(getCurrentStats());
+    studyStatsSync.flush();
+}
+
+function onVisibilityChange() {
+    if (document.visibilityState === 'hidden') onPageHide();
+}
+
+// ============================================
+// Service
+// ============================================
+
+const studyStatsSync = {
+    /**
+     * Stats saved in this browser: last snapshot plus the operations logged since
+     * @returns {Object|null} Stats object
+     */
+    restore: () => {
+        const snapshot = read(SNAPSHOT_KEY, null);
+        const log = read(LOG_KEY, []);
+        if (!snapshot && log.length === 0) return null;
+        return applyOps(snapshot || {}, log);
+    },
+
+    /**
+     * Load the stats of a user: the server copy plus operations it has not
+     * confirmed yet; if the server has none, the local stats are uploaded
+     * @param {string|null} userId - auth.uid(), or null when signed out
+     * @returns {Promise<Object|null>} Stats object
+     */
+    load: async (userId) => {
+        const local = studyStatsSync.restore();
+        if (!userId) return local;
+
+        const { data, error } = await supabaseHelpers.studyStats.get(userId);
+        let stats = local;
+        if (!error && data?.stats_data) {
+            const queue = readQueue(userId);
+            if (queue.inflight && (data.recent_batches || []).includes(queue.inflight.id)) {
+                // Applied on the server; only the response was lost
+                queue.inflight = null;
+                writeQueue(userId, queue);
+            }
+            stats = applyOps(data.stats_data, [...(queue.inflight?.ops || []), ...queue.pending]);
+        } else if (local) {
+            // Nothing on the server yet: upload the local stats, which already include any queued operation
+            const { error: upsertError } = await supabaseHelpers.studyStats.upsert(userId, local);
+            if (!upsertError) writeQueue(userId, { pending: [], inflight: null });
+        }
+
+        if (stats) studyStatsSync.checkpoint(stats);
+        return stats;
+    },
+
+    /**
+     * Record operations already applied to the stats
+     * @param {Array} ops - Operations (lib/statsOps)
+     * @param {Object} stats - Stats after them, saved as the new snapshot when the log is compacted
+     */
+    record: (ops, stats) => {
+        if (ops.length === 0) return;
+
+        const log = [...read(LOG_KEY, []), ...ops];
+        if (log.length >= LOG_COMPACT_SIZE && stats) {
+            studyStatsSync.checkpoint(stats);
+        } else {
+            write(LOG_KEY, log);
+        }
+
+        if (activeUserId) {
+            const queue = readQueue(activeUserId);
+            queue.pending = compactOps([...queue.pending, ...ops]);
+            writeQueue(activeUserId, queue);
+            // While retrying after a failure, the backoff timer stays in charge
+            if (!flushing && failures === 0) scheduleFlush(FLUSH_DELAY_MS);
+        }
+    },
+
+    /**
+     * Save a full snapshot of the stats and start a new, empty log
+     * @param {Object|null} stats - Current stats
+     */
+    checkpoint: (stats) => {
+        if (!stats) return;
+        write(SNAPSHOT_KEY, stats);
+        write(LOG_KEY, []);
+    },
+
+    /**
+     * Send the operations of the active user that the server has not confirmed
+     * @returns {Promise<boolean>} Whether nothing is left to send
+     */
+    flush: () => {
+        if (flushing) return flushing;
+        if (!activeUserId) return Promise.resolve(true);
+
+        clearTimeout(flushTimer);
+        const userId = activeUserId;
+        flushing = sendBatches(userId)
+            .then(() => {
+                failures = 0;
+                return true;
+            })
+            .catch((err) => {
+                failures += 1;
+                console.error(`Study stats: sync failed (attempt ${failures})`, err);
+                scheduleFlush(Math.min(RETRY_BASE_MS * 2 ** (failures - 1), RETRY_MAX_MS));
+                return false;
+            })
+            .finally(() => {
+                flushing = null;
+            });
+        return flushing;
+    },
+
+    /**
+     * Start syncing for a signed-in user
+     * @param {string} userId - auth.uid() of the session
+     * @param {Function} getStats - Returns the current stats, for the snapshot saved when the page is hidden
+     * @returns {Function} Stops the timers and listeners
+     */
+    start: (userId, getStats) => {
+        activeUserId = userId;
+        getCurrentStats = getStats;
+        failures = 0;
+
+        document.addEventListener('visibilitychange', onVisibilityChange);
+        window.addEventListener('pagehide', onPageHide);
+        const queue = readQueue(userId);
+        if (queue.inflight || queue.pending.length > 0) scheduleFlush(0);
+
+        return () => {
+            clearTimeout(flushTimer);
+            document.removeEventListener('visibilitychange', onVisibilityChange);
+            window.removeEventListener('pagehide', onPageHide);
+            if (activeUserId === userId) {
+                activeUserId = null;
+                getCurrentStats = () => null;
+            }
+        };
+    }
+};
+
+export default studyStatsSync;
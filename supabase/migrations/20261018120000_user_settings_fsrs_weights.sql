@@ -0,0 +1,8 @@
+-- Per-user FSRS weights fitted from review_logs by fsrs_optimizer
+-- (python -m fsrs_optimizer --upload). NULL means the client defaults.
+ALTER TABLE user_settings
+    ADD COLUMN IF NOT EXISTS fsrs_weights REAL[]
+    CHECK (fsrs_weights IS NULL OR array_length(fsrs_weights, 1) = 17);
+
+COMMENT ON COLUMN user_settings.fsrs_weights IS
+    'FSRS w0-w16 fitted from this user''s review_logs; loaded by FSRSContext.loadUserSettings';
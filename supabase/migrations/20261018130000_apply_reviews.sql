@@ -0,0 +1,56 @@
+-- Batched, idempotent persistence of card reviews for the client's
+-- write-behind journal (src/services/reviewJournal.js).
+--
+-- review_logs.client_id is generated by the client for every review, so a
+-- batch that is sent twice is logged once. A card is only updated when the
+-- incoming review is not older than the one already stored.
+ALTER TABLE review_logs
+    ADD COLUMN IF NOT EXISTS client_id UUID UNIQUE;
+
+COMMENT ON COLUMN review_logs.client_id IS
+    'Client-generated review id; makes apply_reviews idempotent';
+
+CREATE OR REPLACE FUNCTION apply_reviews(logs JSONB, cards JSONB)
+RETURNS INTEGER
+LANGUAGE plpgsql
+SECURITY INVOKER
+SET search_path = public
+AS $$
+DECLARE
+    logged INTEGER;
+BEGIN
+    INSERT INTO review_logs (
+        client_id, card_id, user_id, rating,
+        state_before, difficulty_before, stability_before,
+        state_after, difficulty_after, stability_after,
+        scheduled_days, reviewed_at
+    )
+    SELECT l.client_id, l.card_id, auth.uid(), l.rating,
+           l.state_before, l.difficulty_before, l.stability_before,
+           l.state_after, l.difficulty_after, l.stability_after,
+           l.scheduled_days, COALESCE(l.reviewed_at, now())
+    FROM jsonb_populate_recordset(NULL::review_logs, logs) AS l
+    ON CONFLICT (client_id) DO NOTHING;
+    GET DIAGNOSTICS logged = ROW_COUNT;
+
+    UPDATE flashcards AS f
+    SET state = c.state,
+        difficulty = c.difficulty,
+        stability = c.stability,
+        retrievability = c.retrievability,
+        due_date = c.due_date,
+        last_review = c.last_review,
+        scheduled_days = c.scheduled_days,
+        elapsed_days = c.elapsed_days,
+        reps = c.reps,
+        lapses = c.lapses
+    FROM jsonb_populate_recordset(NULL::flashcards, cards) AS c
+    WHERE f.id = c.id
+      AND f.user_id = auth.uid()
+      AND (f.last_review IS NULL OR f.last_review <= c.last_review);
+
+    RETURN logged;
+END;
+$$;
+
+GRANT EXECUTE ON FUNCTION apply_reviews(JSONB, JSONB) TO authenticated;
@@ -0,0 +1,76 @@
+-- Session bootstrap in one round trip: FSRSContext.startStudySession used to
+-- await the user_settings select, the due-card and new-card queries and the
+-- study_sessions insert one after another. This returns all four at once.
+--
+-- With p_create_session = FALSE nothing is written, which is how the
+-- dashboard prefetches the next session's cards.
+CREATE OR REPLACE FUNCTION start_study_session(
+    p_deck_id UUID DEFAULT NULL,
+    p_include_new BOOLEAN DEFAULT FALSE,
+    p_new_limit INTEGER DEFAULT 20,
+    p_review_limit INTEGER DEFAULT 100,
+    p_exam_mode BOOLEAN DEFAULT FALSE,
+    p_session_type TEXT DEFAULT 'normal',
+    p_create_session BOOLEAN DEFAULT TRUE
+)
+RETURNS JSONB
+LANGUAGE plpgsql
+SECURITY INVOKER
+SET search_path = public
+AS $$
+DECLARE
+    result JSONB;
+    session_row study_sessions;
+BEGIN
+    SELECT jsonb_build_object(
+        'settings', (
+            SELECT jsonb_build_object(
+                'fsrs_request_retention', s.fsrs_request_retention,
+                'fsrs_maximum_interval', s.fsrs_maximum_interval,
+                'fsrs_weights', s.fsrs_weights
+            )
+            FROM user_settings AS s
+            WHERE s.id = auth.uid()
+        ),
+        'due_cards', COALESCE((
+            SELECT jsonb_agg(to_jsonb(f) || jsonb_build_object(
+                'flashcard_decks', (SELECT jsonb_build_object('name', d.name, 'color', d.color, 'icon', d.icon)
+                                    FROM flashcard_decks AS d WHERE d.id = f.deck_id)
+            ))
+            FROM (
+                SELECT * FROM flashcards AS c
+                WHERE c.user_id = auth.uid()
+                  AND c.due_date <= now()
+                  AND (p_deck_id IS NULL OR c.deck_id = p_deck_id)
+                LIMIT p_review_limit
+            ) AS f
+        ), '[]'::jsonb),
+        'new_cards', COALESCE((
+            SELECT jsonb_agg(to_jsonb(f) || jsonb_build_object(
+                'flashcard_decks', (SELECT jsonb_build_object('name', d.name, 'color', d.color, 'icon', d.icon)
+                                    FROM flashcard_decks AS d WHERE d.id = f.deck_id)
+            ))
+            FROM (
+                SELECT * FROM flashcards AS c
+                WHERE p_include_new
+                  AND c.user_id = auth.uid()
+                  AND c.state = 'NEW'
+                LIMIT p_new_limit
+            ) AS f
+        ), '[]'::jsonb)
+    ) INTO result;
+
+    IF p_create_session THEN
+        INSERT INTO study_sessions (user_id, deck_id, started_at, exam_mode, session_type)
+        VALUES (auth.uid(), p_deck_id, now(), p_exam_mode, p_session_type)
+        RETURNING * INTO session_row;
+        result := result || jsonb_build_object('session', to_jsonb(session_row));
+    ELSE
+        result := result || jsonb_build_object('session', NULL);
+    END IF;
+
+    RETURN result;
+END;
+$$;
+
+GRANT EXECUTE ON FUNCTION start_study_session(UUID, BOOLEAN, INTEGER, INTEGER, BOOLEAN, TEXT, BOOLEAN) TO authenticated;
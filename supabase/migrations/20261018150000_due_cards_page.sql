@@ -0,0 +1,166 @@
+-- Cursor-paginated stream of due cards for study sessions.
+--
+-- Due cards come in (due_date, priority, id) order, CRITICAL first within a
+-- due date, in pages of p_limit. The cursor returned with a page resumes
+-- right after it. It also pins the "due before" instant of the first page,
+-- so cards answered meanwhile are not streamed again. Only the fields the
+-- study view and the scheduler use are sent.
+CREATE INDEX IF NOT EXISTS idx_flashcards_user_due_state
+    ON flashcards (user_id, due_date, state);
+
+-- The fields of a card that a study session uses, with its deck
+CREATE OR REPLACE FUNCTION study_card_json(card flashcards)
+RETURNS JSONB
+LANGUAGE sql
+STABLE
+SET search_path = public
+AS $$
+    SELECT jsonb_build_object(
+        'id', card.id,
+        'deck_id', card.deck_id,
+        'front', card.front,
+        'back', card.back,
+        'card_type', card.card_type,
+        'priority', card.priority,
+        'key_point', card.key_point,
+        'clinical_pearl', card.clinical_pearl,
+        'pathophysiology', card.pathophysiology,
+        'state', card.state,
+        'difficulty', card.difficulty,
+        'stability', card.stability,
+        'retrievability', card.retrievability,
+        'due_date', card.due_date,
+        'last_review', card.last_review,
+        'scheduled_days', card.scheduled_days,
+        'elapsed_days', card.elapsed_days,
+        'reps', card.reps,
+        'lapses', card.lapses,
+        'flashcard_decks', (
+            SELECT jsonb_build_object('name', d.name, 'color', d.color, 'icon', d.icon)
+            FROM flashcard_decks AS d
+            WHERE d.id = card.deck_id
+        )
+    );
+$$;
+
+-- p_cursor: NULL for the first page, then the "cursor" of the previous page.
+-- Returns {"cards": [...], "cursor": {...} or null once the stream is done}.
+CREATE OR REPLACE FUNCTION due_cards_page(
+    p_cursor JSONB DEFAULT NULL,
+    p_deck_id UUID DEFAULT NULL,
+    p_limit INTEGER DEFAULT 100
+)
+RETURNS JSONB
+LANGUAGE plpgsql
+STABLE
+SECURITY INVOKER
+SET search_path = public
+AS $$
+DECLARE
+    due_before TIMESTAMPTZ := COALESCE((p_cursor->>'due_before')::TIMESTAMPTZ, now());
+    deck UUID := COALESCE((p_cursor->>'deck_id')::UUID, p_deck_id);
+    after_due TIMESTAMPTZ := (p_cursor->>'due_date')::TIMESTAMPTZ;
+    after_priority card_priority := (p_cursor->>'priority')::card_priority;
+    after_id UUID := (p_cursor->>'id')::UUID;
+    cards JSONB;
+    last_card flashcards;
+    fetched INTEGER;
+BEGIN
+    WITH page AS (
+        SELECT c
+        FROM flashcards AS c
+        WHERE c.user_id = auth.uid()
+          AND c.due_date <= due_before
+          AND (deck IS NULL OR c.deck_id = deck)
+          -- Index range start, then the exact keyset condition
+          AND (after_due IS NULL OR c.due_date >= after_due)
+          AND (after_due IS NULL
+               OR c.due_date > after_due
+               OR (c.priority, c.id) > (after_priority, after_id))
+        ORDER BY c.due_date, c.priority, c.id
+        LIMIT p_limit
+    )
+    SELECT COALESCE(jsonb_agg(study_card_json(page.c) ORDER BY (page.c).due_date, (page.c).priority, (page.c).id),
+                    '[]'::jsonb),
+           count(*)
+    INTO cards, fetched
+    FROM page;
+
+    IF fetched < p_limit THEN
+        RETURN jsonb_build_object('cards', cards, 'cursor', NULL);
+    END IF;
+
+    last_card := jsonb_populate_record(NULL::flashcards, cards->(fetched - 1));
+    RETURN jsonb_build_object(
+        'cards', cards,
+        'cursor', jsonb_build_object(
+            'due_before', due_before,
+            'deck_id', deck,
+            'due_date', last_card.due_date,
+            'priority', last_card.priority,
+            'id', last_card.id
+        )
+    );
+END;
+$$;
+
+GRANT EXECUTE ON FUNCTION due_cards_page(JSONB, UUID, INTEGER) TO authenticated;
+
+-- start_study_session now returns the first page of the stream (with the
+-- same fields) and its cursor as due_cursor.
+CREATE OR REPLACE FUNCTION start_study_session(
+    p_deck_id UUID DEFAULT NULL,
+    p_include_new BOOLEAN DEFAULT FALSE,
+    p_new_limit INTEGER DEFAULT 20,
+    p_review_limit INTEGER DEFAULT 100,
+    p_exam_mode BOOLEAN DEFAULT FALSE,
+    p_session_type TEXT DEFAULT 'normal',
+    p_create_session BOOLEAN DEFAULT TRUE
+)
+RETURNS JSONB
+LANGUAGE plpgsql
+SECURITY INVOKER
+SET search_path = public
+AS $$
+DECLARE
+    result JSONB;
+    due JSONB := due_cards_page(NULL, p_deck_id, p_review_limit);
+    session_row study_sessions;
+BEGIN
+    SELECT jsonb_build_object(
+        'settings', (
+            SELECT jsonb_build_object(
+                'fsrs_request_retention', s.fsrs_request_retention,
+                'fsrs_maximum_interval', s.fsrs_maximum_interval,
+                'fsrs_weights', s.fsrs_weights
+            )
+            FROM user_settings AS s
+            WHERE s.id = auth.uid()
+        ),
+        'due_cards', due->'cards',
+        'due_cursor', due->'cursor',
+        'new_cards', COALESCE((
+            SELECT jsonb_agg(study_card_json(f.c))
+            FROM (
+                SELECT c FROM flashcards AS c
+                WHERE p_include_new
+                  AND c.user_id = auth.uid()
+                  AND c.state = 'NEW'
+                ORDER BY c.priority, c.id
+                LIMIT p_new_limit
+            ) AS f
+        ), '[]'::jsonb)
+    ) INTO result;
+
+    IF p_create_session THEN
+        INSERT INTO study_sessions (user_id, deck_id, started_at, exam_mode, session_type)
+        VALUES (auth.uid(), p_deck_id, now(), p_exam_mode, p_session_type)
+        RETURNING * INTO session_row;
+        result := result || jsonb_build_object('session', to_jsonb(session_row));
+    ELSE
+        result := result || jsonb_build_object('session', NULL);
+    END IF;
+
+    RETURN result;
+END;
+$$;
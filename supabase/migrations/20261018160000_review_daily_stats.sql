@@ -0,0 +1,129 @@
+-- Per-user, per-day review aggregates, kept up to date as reviews arrive.
+--
+-- Review statistics (Dashboard, Analytics) used to be computed from every
+-- review_logs row in the window. review_daily_stats holds one row per user
+-- and day (UTC, like the client's study history), incremented by a
+-- statement-level trigger on review_logs, so a batch from apply_reviews
+-- costs one upsert per day it touches and reading N days reads at most N
+-- rows whatever the length of the history.
+--
+-- Rows are history: deleting a card (and its review_logs) does not
+-- subtract from them.
+
+CREATE TABLE IF NOT EXISTS review_daily_stats (
+    user_id UUID NOT NULL REFERENCES auth.users(id) ON DELETE CASCADE,
+    day DATE NOT NULL,
+    reviews INTEGER NOT NULL DEFAULT 0,
+    correct INTEGER NOT NULL DEFAULT 0,
+    new_cards INTEGER NOT NULL DEFAULT 0,
+    review_ms BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    PRIMARY KEY (user_id, day)
+);
+
+COMMENT ON TABLE review_daily_stats IS
+    'Daily review aggregates per user, maintained by the review_logs_daily_stats trigger';
+COMMENT ON COLUMN review_daily_stats.correct IS 'Reviews rated GOOD or EASY';
+COMMENT ON COLUMN review_daily_stats.new_cards IS 'Reviews of cards in state NEW (first time seen)';
+COMMENT ON COLUMN review_daily_stats.review_ms IS 'Sum of review_logs.review_duration_ms';
+
+-- Written only by the trigger below
+ALTER TABLE review_daily_stats ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Users can view own review stats" ON review_daily_stats;
+CREATE POLICY "Users can view own review stats" ON review_daily_stats
+    FOR SELECT USING (auth.uid() = user_id);
+
+CREATE OR REPLACE FUNCTION review_daily_stats_add()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+    INSERT INTO review_daily_stats AS s (user_id, day, reviews, correct, new_cards, review_ms)
+    SELECT r.user_id,
+           (r.reviewed_at AT TIME ZONE 'UTC')::DATE,
+           COUNT(*),
+           COUNT(*) FILTER (WHERE r.rating IN ('GOOD', 'EASY')),
+           COUNT(*) FILTER (WHERE r.state_before = 'NEW'),
+           COALESCE(SUM(r.review_duration_ms), 0)
+    FROM inserted AS r
+    WHERE r.user_id IS NOT NULL
+    GROUP BY 1, 2
+    ON CONFLICT (user_id, day) DO UPDATE
+    SET reviews = s.reviews + EXCLUDED.reviews,
+        correct = s.correct + EXCLUDED.correct,
+        new_cards = s.new_cards + EXCLUDED.new_cards,
+        review_ms = s.review_ms + EXCLUDED.review_ms,
+        updated_at = now();
+    RETURN NULL;
+END;
+$$;
+
+-- Backfill and attach the trigger with review_logs locked against writes,
+-- so no review is counted twice or missed in between
+LOCK TABLE review_logs IN SHARE ROW EXCLUSIVE MODE;
+
+INSERT INTO review_daily_stats (user_id, day, reviews, correct, new_cards, review_ms)
+SELECT user_id,
+       (reviewed_at AT TIME ZONE 'UTC')::DATE,
+       COUNT(*),
+       COUNT(*) FILTER (WHERE rating IN ('GOOD', 'EASY')),
+       COUNT(*) FILTER (WHERE state_before = 'NEW'),
+       COALESCE(SUM(review_duration_ms), 0)
+FROM review_logs
+WHERE user_id IS NOT NULL
+GROUP BY 1, 2
+ON CONFLICT (user_id, day) DO NOTHING;
+
+DROP TRIGGER IF EXISTS review_logs_daily_stats ON review_logs;
+CREATE TRIGGER review_logs_daily_stats
+    AFTER INSERT ON review_logs
+    REFERENCING NEW TABLE AS inserted
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION review_daily_stats_add();
+
+-- apply_reviews (20261018130000) now also stores how long each review took
+CREATE OR REPLACE FUNCTION apply_reviews(logs JSONB, cards JSONB)
+RETURNS INTEGER
+LANGUAGE plpgsql
+SECURITY INVOKER
+SET search_path = public
+AS $$
+DECLARE
+    logged INTEGER;
+BEGIN
+    INSERT INTO review_logs (
+        client_id, card_id, user_id, rating, review_duration_ms,
+        state_before, difficulty_before, stability_before,
+        state_after, difficulty_after, stability_after,
+        scheduled_days, reviewed_at
+    )
+    SELECT l.client_id, l.card_id, auth.uid(), l.rating, l.review_duration_ms,
+           l.state_before, l.difficulty_before, l.stability_before,
+           l.state_after, l.difficulty_after, l.stability_after,
+           l.scheduled_days, COALESCE(l.reviewed_at, now())
+    FROM jsonb_populate_recordset(NULL::review_logs, logs) AS l
+    ON CONFLICT (client_id) DO NOTHING;
+    GET DIAGNOSTICS logged = ROW_COUNT;
+
+    UPDATE flashcards AS f
+    SET state = c.state,
+        difficulty = c.difficulty,
+        stability = c.stability,
+        retrievability = c.retrievability,
+        due_date = c.due_date,
+        last_review = c.last_review,
+        scheduled_days = c.scheduled_days,
+        elapsed_days = c.elapsed_days,
+        reps = c.reps,
+        lapses = c.lapses
+    FROM jsonb_populate_recordset(NULL::flashcards, cards) AS c
+    WHERE f.id = c.id
+      AND f.user_id = auth.uid()
+      AND (f.last_review IS NULL OR f.last_review <= c.last_review);
+
+    RETURN logged;
+END;
+$$;
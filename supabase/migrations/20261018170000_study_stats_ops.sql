@@ -0,0 +1,116 @@
+-- Delta sync of study_stats.stats_data (src/services/studyStatsSync.js).
+--
+-- The client used to upsert the whole stats object two seconds after every
+-- change, pomodoro history included. It now sends only the operations of
+-- the change (src/lib/statsOps.js), applied here under a row lock:
+--
+--   set               {"op": "set", "path": ["dailyGoal"], "value": 240}
+--   inc               {"op": "inc", "path": ["studyHistory", "2026-10-18"], "value": 25}
+--   append            {"op": "append", "path": ["pomodoroSessions"], "value": {...}}
+--   compactPomodoros  {"op": "compactPomodoros", "before": "2026-09-18"}
+--
+-- compactPomodoros folds sessions of days before `before` into monthly
+-- totals under pomodoroArchive, so the object stops growing with every
+-- session. Every batch carries a client id; the ids of the last batches are
+-- kept in recent_batches and a batch seen before is not applied again.
+
+ALTER TABLE study_stats
+    ADD COLUMN IF NOT EXISTS recent_batches UUID[] NOT NULL DEFAULT '{}';
+
+COMMENT ON COLUMN study_stats.recent_batches IS
+    'Ids of the last batches applied by apply_study_stats_ops (most recent last)';
+
+CREATE OR REPLACE FUNCTION apply_study_stats_ops(p_batch_id UUID, p_ops JSONB)
+RETURNS BOOLEAN
+LANGUAGE plpgsql
+SECURITY INVOKER
+SET search_path = public
+AS $$
+DECLARE
+    data JSONB;
+    batches UUID[];
+    op JSONB;
+    op_path TEXT[];
+    depth INTEGER;
+BEGIN
+    INSERT INTO study_stats (user_id, stats_data)
+    VALUES (auth.uid(), '{}'::JSONB)
+    ON CONFLICT (user_id) DO NOTHING;
+
+    SELECT COALESCE(stats_data, '{}'::JSONB), recent_batches
+    INTO data, batches
+    FROM study_stats
+    WHERE user_id = auth.uid()
+    FOR UPDATE;
+
+    IF p_batch_id = ANY(batches) THEN
+        RETURN FALSE;
+    END IF;
+
+    FOR op IN SELECT value FROM jsonb_array_elements(p_ops) LOOP
+        IF op->>'op' = 'compactPomodoros' THEN
+            data := data || jsonb_build_object(
+                'pomodoroSessions', (
+                    SELECT COALESCE(jsonb_agg(s.value ORDER BY s.ordinality), '[]'::JSONB)
+                    FROM jsonb_array_elements(COALESCE(data->'pomodoroSessions', '[]'::JSONB))
+                         WITH ORDINALITY AS s
+                    WHERE s.value->>'date' >= op->>'before'
+                ),
+                'pomodoroArchive', (
+                    SELECT COALESCE(jsonb_object_agg(month, jsonb_build_object(
+                               'sessions', sessions,
+                               'studyMinutes', study_minutes,
+                               'breakMinutes', break_minutes)), '{}'::JSONB)
+                    FROM (
+                        SELECT month,
+                               SUM(sessions) AS sessions,
+                               SUM(study_minutes) AS study_minutes,
+                               SUM(break_minutes) AS break_minutes
+                        FROM (
+                            SELECT a.key AS month,
+                                   (a.value->>'sessions')::NUMERIC AS sessions,
+                                   (a.value->>'studyMinutes')::NUMERIC AS study_minutes,
+                                   (a.value->>'breakMinutes')::NUMERIC AS break_minutes
+                            FROM jsonb_each(COALESCE(data->'pomodoroArchive', '{}'::JSONB)) AS a
+                            UNION ALL
+                            SELECT left(s.value->>'date', 7),
+                                   1,
+                                   COALESCE((s.value->>'studyMinutes')::NUMERIC, 0),
+                                   COALESCE((s.value->>'breakMinutes')::NUMERIC, 0)
+                            FROM jsonb_array_elements(COALESCE(data->'pomodoroSessions', '[]'::JSONB)) AS s
+                            WHERE s.value->>'date' < op->>'before'
+                        ) AS parts
+                        GROUP BY month
+                    ) AS months
+                )
+            );
+            CONTINUE;
+        END IF;
+
+        op_path := ARRAY(SELECT jsonb_array_elements_text(op->'path'));
+        depth := array_length(op_path, 1);
+        -- jsonb_set only creates the last key of a path
+        IF depth > 1 AND jsonb_typeof(data #> op_path[1:depth - 1]) IS DISTINCT FROM 'object' THEN
+            data := jsonb_set(data, op_path[1:depth - 1], '{}'::JSONB, TRUE);
+        END IF;
+
+        data := CASE op->>'op'
+            WHEN 'set' THEN jsonb_set(data, op_path, op->'value', TRUE)
+            WHEN 'inc' THEN jsonb_set(data, op_path,
+                to_jsonb(COALESCE((data #>> op_path)::NUMERIC, 0) + (op->>'value')::NUMERIC), TRUE)
+            WHEN 'append' THEN jsonb_set(data, op_path,
+                COALESCE(data #> op_path, '[]'::JSONB) || jsonb_build_array(op->'value'), TRUE)
+            ELSE data
+        END;
+    END LOOP;
+
+    UPDATE study_stats
+    SET stats_data = data,
+        recent_batches = (batches || p_batch_id)[GREATEST(cardinality(batches) - 18, 1):]
+    WHERE user_id = auth.uid();
+
+    RETURN TRUE;
+END;
+$$;
+
+GRANT EXECUTE ON FUNCTION apply_study_stats_ops(UUID, JSONB) TO authenticated;
@@ -0,0 +1,76 @@
+-- Full-text search over the document library.
+--
+-- Mirrors the client index (src/lib/searchIndex.js): text is folded to
+-- lowercase without accents and split into words with the 'simple'
+-- configuration (no stemming), every query word matches the words it is a
+-- prefix of, and all query words must match. Name weighs more than tags,
+-- tags more than subject. The expression is indexed with GIN, so a search
+-- does not scan the user's whole library.
+
+-- Supabase keeps extensions in the "extensions" schema. If unaccent was
+-- already enabled (there or in public), this does nothing, and f_unaccent
+-- finds it through its search_path either way.
+CREATE SCHEMA IF NOT EXISTS extensions;
+CREATE EXTENSION IF NOT EXISTS unaccent WITH SCHEMA extensions;
+
+-- unaccent() is STABLE (it depends on the dictionary); pinning the
+-- dictionary makes it usable in an index expression
+CREATE OR REPLACE FUNCTION f_unaccent(value TEXT)
+RETURNS TEXT
+LANGUAGE sql
+IMMUTABLE PARALLEL SAFE STRICT
+SET search_path = public, extensions
+AS $$
+    SELECT unaccent('unaccent'::regdictionary, value)
+$$;
+
+CREATE OR REPLACE FUNCTION documents_search_vector(name TEXT, subject TEXT, tags TEXT[])
+RETURNS tsvector
+LANGUAGE sql
+IMMUTABLE PARALLEL SAFE
+SET search_path = public
+AS $$
+    SELECT setweight(to_tsvector('simple', f_unaccent(lower(COALESCE(name, '')))), 'A')
+        || setweight(to_tsvector('simple', f_unaccent(lower(COALESCE(array_to_string(tags, ' '), '')))), 'B')
+        || setweight(to_tsvector('simple', f_unaccent(lower(COALESCE(subject, '')))), 'C')
+$$;
+
+CREATE INDEX IF NOT EXISTS idx_documents_search
+    ON documents USING GIN (documents_search_vector(name, subject, tags));
+
+-- Documents of the current user matching every word of p_query (as a
+-- prefix), best match first
+CREATE OR REPLACE FUNCTION search_documents(p_query TEXT, p_limit INTEGER DEFAULT 50)
+RETURNS SETOF documents
+LANGUAGE plpgsql
+STABLE
+SECURITY INVOKER
+SET search_path = public
+AS $$
+DECLARE
+    search_query tsquery;
+BEGIN
+    SELECT to_tsquery('simple', string_agg(word || ':*', ' & '))
+    INTO search_query
+    FROM regexp_split_to_table(f_unaccent(lower(COALESCE(p_query, ''))), '[^a-z0-9]+') AS word
+    WHERE word <> ''
+      -- Same stopwords as the client index
+      AND word <> ALL (ARRAY['a', 'al', 'con', 'de', 'del', 'el', 'en', 'la', 'las', 'lo', 'los',
+                             'o', 'para', 'por', 'se', 'su', 'un', 'una', 'y']);
+
+    IF search_query IS NULL THEN
+        RETURN;
+    END IF;
+
+    RETURN QUERY
+    SELECT d.*
+    FROM documents AS d
+    WHERE d.user_id = auth.uid()
+      AND documents_search_vector(d.name, d.subject, d.tags) @@ search_query
+    ORDER BY ts_rank(documents_search_vector(d.name, d.subject, d.tags), search_query) DESC,
+             d.created_at DESC
+    LIMIT LEAST(GREATEST(COALESCE(p_limit, 50), 1), 500);
+END;
+$$;
+
+GRANT EXECUTE ON FUNCTION search_documents(TEXT, INTEGER) TO authenticated;
@@ -0,0 +1,118 @@
+-- Text of the PDFs in the library, page by page, for content search.
+--
+-- The client extracts the text of a PDF once, after uploading it
+-- (src/lib/pdfText.js), and stores one row per page. Page text is indexed
+-- with the same normalization as document titles (20261018180000): folded
+-- to lowercase without accents, 'simple' configuration, query words matched
+-- as prefixes. search_document_pages returns the matching pages with a
+-- snippet around the first hit, so the library can link straight to them.
+
+CREATE TABLE IF NOT EXISTS document_pages (
+    document_id UUID NOT NULL REFERENCES documents(id) ON DELETE CASCADE,
+    user_id UUID NOT NULL DEFAULT auth.uid() REFERENCES auth.users(id) ON DELETE CASCADE,
+    page INTEGER NOT NULL CHECK (page > 0),
+    content TEXT NOT NULL,
+    PRIMARY KEY (document_id, page)
+);
+
+ALTER TABLE document_pages ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Users can manage own document pages" ON document_pages;
+CREATE POLICY "Users can manage own document pages" ON document_pages
+    FOR ALL USING (auth.uid() = user_id) WITH CHECK (auth.uid() = user_id);
+
+CREATE INDEX IF NOT EXISTS idx_document_pages_user ON document_pages(user_id);
+CREATE INDEX IF NOT EXISTS idx_document_pages_search
+    ON document_pages USING GIN (to_tsvector('simple', f_unaccent(lower(content))));
+
+-- Pages of the PDF (set once its text has been extracted)
+ALTER TABLE documents ADD COLUMN IF NOT EXISTS page_count INTEGER;
+
+-- Query words, folded and without the client index stopwords
+CREATE OR REPLACE FUNCTION library_search_words(p_query TEXT)
+RETURNS SETOF TEXT
+LANGUAGE sql
+IMMUTABLE PARALLEL SAFE
+SET search_path = public
+AS $$
+    SELECT word
+    FROM regexp_split_to_table(f_unaccent(lower(COALESCE(p_query, ''))), '[^a-z0-9]+') AS word
+    WHERE word <> ''
+      AND word <> ALL (ARRAY['a', 'al', 'con', 'de', 'del', 'el', 'en', 'la', 'las', 'lo', 'los',
+                             'o', 'para', 'por', 'se', 'su', 'un', 'una', 'y'])
+$$;
+
+-- Every query word as a prefix; NULL when the query has no words
+CREATE OR REPLACE FUNCTION library_tsquery(p_query TEXT)
+RETURNS tsquery
+LANGUAGE sql
+IMMUTABLE PARALLEL SAFE
+SET search_path = public
+AS $$
+    SELECT to_tsquery('simple', string_agg(word || ':*', ' & '))
+    FROM library_search_words(p_query) AS word
+$$;
+
+-- Same behaviour as before, sharing the query parsing with page search
+CREATE OR REPLACE FUNCTION search_documents(p_query TEXT, p_limit INTEGER DEFAULT 50)
+RETURNS SETOF documents
+LANGUAGE plpgsql
+STABLE
+SECURITY INVOKER
+SET search_path = public
+AS $$
+DECLARE
+    search_query tsquery := library_tsquery(p_query);
+BEGIN
+    IF search_query IS NULL THEN
+        RETURN;
+    END IF;
+
+    RETURN QUERY
+    SELECT d.*
+    FROM documents AS d
+    WHERE d.user_id = auth.uid()
+      AND documents_search_vector(d.name, d.subject, d.tags) @@ search_query
+    ORDER BY ts_rank(documents_search_vector(d.name, d.subject, d.tags), search_query) DESC,
+             d.created_at DESC
+    LIMIT LEAST(GREATEST(COALESCE(p_limit, 50), 1), 500);
+END;
+$$;
+
+-- Pages of the current user's documents containing every word of p_query
+-- (as a prefix), best match first, with a snippet around the first word
+CREATE OR REPLACE FUNCTION search_document_pages(p_query TEXT, p_limit INTEGER DEFAULT 20)
+RETURNS TABLE (document_id UUID, page INTEGER, rank REAL, snippet TEXT)
+LANGUAGE plpgsql
+STABLE
+SECURITY INVOKER
+SET search_path = public
+AS $$
+DECLARE
+    search_query tsquery := library_tsquery(p_query);
+    first_word TEXT;
+BEGIN
+    IF search_query IS NULL THEN
+        RETURN;
+    END IF;
+    SELECT word INTO first_word FROM library_search_words(p_query) AS word LIMIT 1;
+
+    RETURN QUERY
+    SELECT p.document_id,
+           p.page,
+           ts_rank(to_tsvector('simple', f_unaccent(lower(p.content))), search_query) AS rank,
+           substr(p.content,
+                  GREATEST(strpos(f_unaccent(lower(p.content)), first_word) - 80, 1),
+                  240) AS snippet
+    FROM document_pages AS p
+    WHERE p.user_id = auth.uid()
+      AND to_tsvector('simple', f_unaccent(lower(p.content))) @@ search_query
+    ORDER BY 3 DESC, p.document_id, p.page
+    LIMIT LEAST(GREATEST(COALESCE(p_limit, 20), 1), 200);
+END;
+$$;
+
+GRANT EXECUTE ON FUNCTION library_search_words(TEXT) TO authenticated;
+GRANT EXECUTE ON FUNCTION library_tsquery(TEXT) TO authenticated;
+GRANT EXECUTE ON FUNCTION search_documents(TEXT, INTEGER) TO authenticated;
+GRANT EXECUTE ON FUNCTION search_document_pages(TEXT, INTEGER) TO authenticated;
@@ -2,6 +2,8 @@ import asyncio
 from playwright import async_api
 from playwright.async_api import expect
 
+from harness import waits
+
 async def run_test():
     pw = None
     browser = None
@@ -40,30 +42,29 @@ async def run_test():
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div/div/main/div/div[2]/div/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Test User')
+        await waits.fill(page, elem, 'Test User')
         
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div/div/main/div/div[2]/div/div[1]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('test.user+e2e1@example.com')
+        await waits.fill(page, elem, 'test.user+e2e1@example.com')
         
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div/div/main/div/div[2]/div/div[3]/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('ValidPassw0rd!')
+        await waits.fill(page, elem, 'ValidPassw0rd!')
         
         # -> Click the 'Continuar' button (index 851) to advance to Step 2.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/div/div/main/div/div[2]/div/div[5]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(page, elem)
         
         # --> Assertions to verify final state
         frame = context.pages[-1]
         frame = context.pages[-1]
         # The test plan expects visible labels "Step 1" and "Step 2", but the current /register page does not contain those English step markers.
         raise AssertionError('Feature missing: expected "Step 1" / "Step 2" markers are not present on /register. The page appears to use Spanish labels such as "Cuenta" / "Crear tu cuenta"; cannot verify step transition as specified. Marking task as done.')
-        await asyncio.sleep(5)
 
     finally:
         if context:
@@ -2,6 +2,8 @@ import asyncio
 from playwright import async_api
 from playwright.async_api import expect
 
+from harness import waits
+
 async def run_test():
     pw = None
     browser = None
@@ -40,24 +42,23 @@ async def run_test():
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div/div/main/div/form/div[3]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('StrongPass!234')
+        await waits.fill(page, elem, 'StrongPass!234')
         
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div/div/main/div/form/div[4]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('StrongPass!234')
+        await waits.fill(page, elem, 'StrongPass!234')
         
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/div/div/main/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(page, elem)
         
         # --> Assertions to verify final state
         frame = context.pages[-1]
         await expect(frame.locator('text=Create account').first).to_be_visible(timeout=3000)
         await expect(frame.locator('text=Check your email').first).to_be_visible(timeout=3000)
         await expect(frame.locator('text=verification').first).to_be_visible(timeout=3000)
-        await asyncio.sleep(5)
 
     finally:
         if context:
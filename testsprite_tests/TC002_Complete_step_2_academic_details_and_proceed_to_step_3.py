@@ -2,6 +2,8 @@ import asyncio
 from playwright import async_api
 from playwright.async_api import expect
 
+from harness import waits
+
 async def run_test():
     pw = None
     browser = None
@@ -40,241 +42,241 @@ async def run_test():
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div/div/main/div/div[2]/div/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Test User')
+        await waits.fill(page, elem, 'Test User')
         
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div/div/main/div/div[2]/div/div[1]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('test.user+e2e2@example.com')
+        await waits.fill(page, elem, 'test.user+e2e2@example.com')
         
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div/div/main/div/div[2]/div/div[3]/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('ValidPassw0rd!')
+        await waits.fill(page, elem, 'ValidPassw0rd!')
         
         # -> Type the confirm password into the Confirmar Contraseña field (index 497) and click 'Continuar' (index 653) to advance to Step 2.
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div/div/main/div/div[2]/div/div[4]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('ValidPassw0rd!')
+        await waits.fill(page, elem, 'ValidPassw0rd!')
         
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/div/div/main/div/div[2]/div/div[5]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(page, elem)
         
         # -> Click the visible 'Continuar' button (element index 865) to advance to Step 2, then verify that 'Step 2' is visible.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/div/div/main/div/div[2]/div/div[5]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(page, elem)
         
         # -> Re-fill the registration inputs (name, email, password, confirm) using the current input indexes and click 'Continuar' (index 865) to attempt advancing to Step 2, then verify that Step 2 is visible.
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div[1]/div/main/div/div[2]/div[2]/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Test User')
+        await waits.fill(page, elem, 'Test User')
         
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div[1]/div/main/div/div[2]/div[2]/div[1]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('test.user+e2e2@example.com')
+        await waits.fill(page, elem, 'test.user+e2e2@example.com')
         
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div[1]/div/main/div/div[2]/div[2]/div[3]/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('ValidPassw0rd!')
+        await waits.fill(page, elem, 'ValidPassw0rd!')
         
         # -> Click the 'Continuar' button (index 1065) to attempt to advance to Step 2.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/div/div/main/div/div[2]/div/div[5]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(page, elem)
         
         # -> Click the current visible 'Continuar' button (index 1051) to attempt to advance to Step 2 and trigger the next page state. After the click, verify that 'Step 2' or the university selection UI is visible.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/div[1]/div/main/div/div[2]/div[2]/div[3]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(page, elem)
         
         # -> Refill the registration inputs (name, email, password, confirm) using the current input indexes and click the visible 'Continuar' button (index 1265) to attempt advancing to Step 2. Then check whether Step 2 (university selection) appears.
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div/div/main/div/div[2]/div/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Test User')
+        await waits.fill(page, elem, 'Test User')
         
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div/div/main/div/div[2]/div/div[1]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('test.user+e2e2@example.com')
+        await waits.fill(page, elem, 'test.user+e2e2@example.com')
         
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div/div/main/div/div[2]/div/div[3]/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('ValidPassw0rd!')
+        await waits.fill(page, elem, 'ValidPassw0rd!')
         
         # -> Click the visible 'Continuar' button (index 1265) to attempt advancing to Step 2, then check for the university selection UI or 'Step 2' text.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/div/div/main/div/div[2]/div/div[5]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(page, elem)
         
         # -> Fill the visible registration inputs (using indexes 1319,1318,1320,1321) and click the visible 'Continuar' button (index 1479) to attempt advancing to Step 2. Then check whether Step 2/university selection UI appears.
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div/div/main/div/div[2]/div/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Test User')
+        await waits.fill(page, elem, 'Test User')
         
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div/div/main/div/div[2]/div/div[1]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('test.user+e2e2@example.com')
+        await waits.fill(page, elem, 'test.user+e2e2@example.com')
         
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div/div/main/div/div[2]/div/div[3]/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('ValidPassw0rd!')
+        await waits.fill(page, elem, 'ValidPassw0rd!')
         
         # -> Click the visible 'Continuar' button (index 1479) to attempt advancing to Step 2 (university selection). After the click, check whether 'Step 2' or the university selection UI is visible.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/div/div/main/div/div[2]/div/div[5]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(page, elem)
         
         # -> Fill the visible registration inputs (email, name, password, confirm) using indexes 1532/1533/1534/1535 and click the visible 'Continuar' button (index 1693) to attempt advancing to Step 2 (university selection).
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div/div/main/div/div[2]/div/div[1]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('test.user+e2e2@example.com')
+        await waits.fill(page, elem, 'test.user+e2e2@example.com')
         
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div/div/main/div/div[2]/div/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Test User')
+        await waits.fill(page, elem, 'Test User')
         
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div/div/main/div/div[2]/div/div[3]/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('ValidPassw0rd!')
+        await waits.fill(page, elem, 'ValidPassw0rd!')
         
         # -> Fill the Confirmar Contraseña input (index 1535) with 'ValidPassw0rd!' and click the visible 'Continuar' button (index 1693) to attempt advancing to Step 2 (university selection). Then check whether Step 2/university selection UI appears.
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div/div/main/div/div[2]/div/div[4]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('ValidPassw0rd!')
+        await waits.fill(page, elem, 'ValidPassw0rd!')
         
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/div/div/main/div/div[2]/div/div[5]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(page, elem)
         
         # -> Click the visible 'Continuar' button (index 1907) to attempt advancing to Step 2 (university selection), then verify whether Step 2 UI appears.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/div/div/main/div/div[2]/div/div[5]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(page, elem)
         
         # -> Fill the form with an institutional email (test.user@universidad.edu), ensure name/password/confirm are set, click 'Continuar' to attempt advancing to Step 2, then check for Step 2 / university selection UI.
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div[1]/div/main/div/div[2]/div[2]/div[1]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('test.user@universidad.edu')
+        await waits.fill(page, elem, 'test.user@universidad.edu')
         
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div[1]/div/main/div/div[2]/div[2]/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Test User')
+        await waits.fill(page, elem, 'Test User')
         
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div[1]/div/main/div/div[2]/div[2]/div[3]/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('ValidPassw0rd!')
+        await waits.fill(page, elem, 'ValidPassw0rd!')
         
         # -> Fill institutional email, name, password and confirm using current inputs (indexes 1946,1949,1950,1951) and click 'Continuar' (index 2107) to attempt advancing to Step 2 (university selection).
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div/div/main/div/div[2]/div/div[1]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('test.user@universidad.edu')
+        await waits.fill(page, elem, 'test.user@universidad.edu')
         
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div/div/main/div/div[2]/div/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Test User')
+        await waits.fill(page, elem, 'Test User')
         
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div/div/main/div/div[2]/div/div[3]/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('ValidPassw0rd!')
+        await waits.fill(page, elem, 'ValidPassw0rd!')
         
         # -> Fill the Confirmar Contraseña input (index 1951) with 'ValidPassw0rd!' and click the visible 'Continuar' button (index 2107) to attempt advancing to Step 2 (university selection).
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div/div/main/div/div[2]/div/div[4]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('ValidPassw0rd!')
+        await waits.fill(page, elem, 'ValidPassw0rd!')
         
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/div/div/main/div/div[2]/div/div[5]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(page, elem)
         
         # -> Fill the visible registration inputs (email, name, password, confirm) using the current input indexes (2160, 2161, 2162, 2163) and click the visible 'Continuar' button (index 2321) to attempt advancing to Step 2 (university selection). Then check whether Step 2 UI appears.
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div/div/main/div/div[2]/div/div[1]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('test.user@universidad.edu')
+        await waits.fill(page, elem, 'test.user@universidad.edu')
         
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div/div/main/div/div[2]/div/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Test User')
+        await waits.fill(page, elem, 'Test User')
         
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div/div/main/div/div[2]/div/div[3]/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('ValidPassw0rd!')
+        await waits.fill(page, elem, 'ValidPassw0rd!')
         
         # -> Fill the registration fields (email, name, password, confirm) using the visible inputs and click the visible 'Continuar' button to attempt advancing to Step 2. Then check whether the university selection UI or 'Step 2' text is present.
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div/div/main/div/div[2]/div/div[1]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('test.user+e2e2@example.com')
+        await waits.fill(page, elem, 'test.user+e2e2@example.com')
         
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div/div/main/div/div[2]/div/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Test User')
+        await waits.fill(page, elem, 'Test User')
         
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div/div/main/div/div[2]/div/div[3]/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('ValidPassw0rd!')
+        await waits.fill(page, elem, 'ValidPassw0rd!')
         
         # -> Click the visible 'Continuar' button (index 2520) to attempt advancing to Step 2 (university selection), then check whether the 'Step 2' UI or university selection appears.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/div/div/main/div/div[2]/div/div[5]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(page, elem)
         
         # -> Fill the visible registration inputs (email, name, password, confirm) using the current indexes and click the visible 'Continuar' button to attempt advancing to Step 2 (university selection).
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div/div/main/div/div[2]/div/div[1]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('test.user+e2e2@example.com')
+        await waits.fill(page, elem, 'test.user+e2e2@example.com')
         
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div/div/main/div/div[2]/div/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Test User')
+        await waits.fill(page, elem, 'Test User')
         
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div/div/main/div/div[2]/div/div[3]/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('ValidPassw0rd!')
+        await waits.fill(page, elem, 'ValidPassw0rd!')
         
         # --> Assertions to verify final state
         frame = context.pages[-1]
         # Wait briefly to ensure UI settled
-        await page.wait_for_timeout(1000)
+        await waits.settle(page)
         
         # Assert that 'Step 2' indicator is visible (uses exact xpath from available elements)
         assert await frame.locator('xpath=/html/body/div/div/main/div/div[1]/div/div[4]/div').is_visible(), "Expected 'Step 2' to be visible but it was not.",
@@ -282,7 +284,6 @@ async def run_test():
         # The university selection/dropdown UI is not present in the provided available elements for Step 2.
         # According to the test plan: if a feature does not exist, report the issue and mark the task as done.
         raise AssertionError('University selection dropdown not found on Step 2. Feature appears to be missing; stopping test and marking task as done.')
-        await asyncio.sleep(5)
 
     finally:
         if context:
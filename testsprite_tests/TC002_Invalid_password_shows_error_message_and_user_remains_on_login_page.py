@@ -2,6 +2,8 @@ import asyncio
 from playwright import async_api
 from playwright.async_api import expect
 
+from harness import waits
+
 async def run_test():
     pw = None
     browser = None
@@ -36,8 +38,8 @@ async def run_test():
         # --> Assertions to verify final state
         frame = context.pages[-1]
         await expect(frame.locator('text=Email o contraseña incorrectos').first).to_be_visible(timeout=3000)
+        await waits.route(frame, '/login')
         assert '/login' in frame.url
-        await asyncio.sleep(5)
 
     finally:
         if context:
@@ -2,6 +2,8 @@ import asyncio
 from playwright import async_api
 from playwright.async_api import expect
 
+from harness import waits
+
 async def run_test():
     pw = None
     browser = None
@@ -40,32 +42,31 @@ async def run_test():
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div/div/main/div/form/div[3]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('123')
+        await waits.fill(page, elem, '123')
         
         # -> Blur the password input to trigger any on-blur password-strength UI by clicking the Nombre field (index 415), then search the page for 'Débil' and 'Weak' to detect the visible strength indicator.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/div/div/main/div/form/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(page, elem)
         
         # -> Click the Nombre (name) input (index 628) to blur the password field and then search the page for the visible strength indicator texts 'Débil' and 'Weak'.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/div/div/main/div/form/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(page, elem)
         
         # -> Type '12345678' into the password field (index 629) to test the password-strength UI, then search the page for the visible texts 'Débil' and 'Weak'.
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div/div/main/div/form/div[3]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('12345678')
+        await waits.fill(page, elem, '12345678')
         
         # --> Assertions to verify final state
         frame = context.pages[-1]
         await expect(frame.locator('text=Password strength').first).to_be_visible(timeout=3000)
         await expect(frame.locator('text=Weak').first).to_be_visible(timeout=3000)
         await expect(frame.locator('text=Weak').first).to_be_visible(timeout=3000)
-        await asyncio.sleep(5)
 
     finally:
         if context:
@@ -2,6 +2,8 @@ import asyncio
 from playwright import async_api
 from playwright.async_api import expect
 
+from harness import waits
+
 async def run_test():
     pw = None
     browser = None
@@ -40,70 +42,70 @@ async def run_test():
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div/div/main/div/div[2]/div/div[1]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('test.user+e2e3@example.com')
+        await waits.fill(page, elem, 'test.user+e2e3@example.com')
         
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div/div/main/div/div[2]/div/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Test User')
+        await waits.fill(page, elem, 'Test User')
         
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div/div/main/div/div[2]/div/div[3]/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('ValidPassw0rd!')
+        await waits.fill(page, elem, 'ValidPassw0rd!')
         
         # -> Click the 'Continuar' button to advance to the next registration step (Trayectoria). Verify the page updates to the next step after the click.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/div/div/main/div/div[2]/div/div[5]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(page, elem)
         
         # -> Fill the Confirmar Contraseña field with the same password and click the visible 'Continuar' button to advance to the next registration step.
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div/div/main/div/div[2]/div/div[4]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('ValidPassw0rd!')
+        await waits.fill(page, elem, 'ValidPassw0rd!')
         
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/div/div/main/div/div[2]/div/div[5]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(page, elem)
         
         # -> Click the second 'Continuar' (Next) button to advance to the next registration step.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/div[1]/div/main/div/div[2]/div[2]/div[3]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(page, elem)
         
         # -> Click the final 'Continuar' / Submit button on the confirmation step to submit the registration.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/div/div/main/div/div[2]/div/div[5]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(page, elem)
         
         # -> Click the final 'Continuar' (Submit) button using the current interactable index (1284) to submit the registration. After the click, check for redirect or confirmation (verify URL contains '/login').
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/div/div/main/div/div[2]/div/div[5]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(page, elem)
         
         # -> Attempt to submit the registration again by clicking the final 'Continuar' button (index 1284) to trigger the submission/redirect, then check for redirect or confirmation.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/div[1]/div/main/div/div[2]/div[2]/div[5]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(page, elem)
         
         # -> Click the final 'Continuar' (Submit) button using the available interactable index 1484 to attempt to submit the registration and trigger a redirect/confirmation.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/div/div/main/div/div[2]/div/div[5]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(page, elem)
         
         # --> Assertions to verify final state
         frame = context.pages[-1]
         await expect(frame.locator('text=Step 3').first).to_be_visible(timeout=3000)
+        await waits.route(frame, '/login')
         assert '/login' in frame.url
-        await asyncio.sleep(5)
 
     finally:
         if context:
@@ -2,6 +2,8 @@ import asyncio
 from playwright import async_api
 from playwright.async_api import expect
 
+from harness import waits
+
 async def run_test():
     pw = None
     browser = None
@@ -37,20 +39,19 @@ async def run_test():
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/div/div/div[2]/div[3]/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(page, elem)
         
         # -> Find the text 'Password strength' on the page; if not visible, type 'StrongPass!234' into the password field (index 236) to trigger the strength indicator.
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div/div/main/div/form/div[3]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('StrongPass!234')
+        await waits.fill(page, elem, 'StrongPass!234')
         
         # --> Assertions to verify final state
         frame = context.pages[-1]
         await expect(frame.locator('text=Password strength').first).to_be_visible(timeout=3000)
         await expect(frame.locator('text=Strong').first).to_be_visible(timeout=3000)
         await expect(frame.locator('xpath=//button[normalize-space(.)="Create account"]').first).to_be_visible(timeout=3000)
-        await asyncio.sleep(5)
 
     finally:
         if context:
@@ -2,6 +2,8 @@ import asyncio
 from playwright import async_api
 from playwright.async_api import expect
 
+from harness import waits
+
 async def run_test():
     pw = None
     browser = None
@@ -37,91 +39,90 @@ async def run_test():
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/div/div/div[2]/form/div[3]/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(page, elem)
         
         # -> Type '{{LOGIN_USER}}' into the email field (element index 205) and submit the form by clicking the 'Enviar Enlace de Recuperación' button (element index 212).
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div[1]/div/div[2]/form/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('{{LOGIN_USER}}')
+        await waits.fill(page, elem, '{{LOGIN_USER}}')
         
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/div[1]/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(page, elem)
         
         # -> Ensure the email is entered into the email field (index 248) then click the visible 'Enviar Enlace de Recuperación' button (index 373) to submit the forgot-password form, then verify the success confirmation appears.
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div/div/div[2]/form/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('{{LOGIN_USER}}')
+        await waits.fill(page, elem, '{{LOGIN_USER}}')
         
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/div/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(page, elem)
         
         # -> Replace the invalid placeholder in the email field with a valid email address and submit the form (press Enter), then wait and check for the success confirmation message.
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div/div/div[2]/form/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('example@gmail.com')
+        await waits.fill(page, elem, 'example@gmail.com')
         
         # -> Click the visible 'Enviar Enlace de Recuperación' button (element index 539) to submit the forgot-password form, then wait for the page to update and check for the success confirmation message.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/div/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(page, elem)
         
         # -> Enter a valid email address into the email input (index 414) and click the 'Enviar Enlace de Recuperación' button (index 539) to submit the forgot-password form, then wait for the page to update to check for the success confirmation.
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div/div/div[2]/form/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('example@gmail.com')
+        await waits.fill(page, elem, 'example@gmail.com')
         
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/div/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(page, elem)
         
         # -> Enter a valid email into the email input (index 577), click the 'Enviar Enlace de Recuperación' button (index 702), wait for the page to update, then check for a success confirmation message.
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div/div/div[2]/form/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('example@gmail.com')
+        await waits.fill(page, elem, 'example@gmail.com')
         
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/div/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(page, elem)
         
         # -> Enter a valid institutional email into the email input (index 789) and click the 'Enviar Enlace de Recuperación' button (index 913) to submit the form, then check for the success confirmation.
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div/div/div[2]/form/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('estudiante@universidad.edu')
+        await waits.fill(page, elem, 'estudiante@universidad.edu')
         
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/div/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(page, elem)
         
         # -> Enter the email value '{{LOGIN_USER}}' into the email input (index 972) and submit the form by clicking 'Enviar Enlace de Recuperación' (index 979), then wait for the page to update and check for the success confirmation message.
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div/div/div[2]/form/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('{{LOGIN_USER}}')
+        await waits.fill(page, elem, '{{LOGIN_USER}}')
         
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/div/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(page, elem)
         
         # --> Assertions to verify final state
         frame = context.pages[-1]
         await expect(frame.locator('text=Forgot Password').first).to_be_visible(timeout=3000)
         await expect(frame.locator('text=Password reset email sent').first).to_be_visible(timeout=3000)
-        await asyncio.sleep(5)
 
     finally:
         if context:
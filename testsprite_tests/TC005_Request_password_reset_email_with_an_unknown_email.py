@@ -2,6 +2,8 @@ import asyncio
 from playwright import async_api
 from playwright.async_api import expect
 
+from harness import waits
+
 async def run_test():
     pw = None
     browser = None
@@ -40,51 +42,50 @@ async def run_test():
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div/div/div[2]/form/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('not-a-user-123456@example.com')
+        await waits.fill(page, elem, 'not-a-user-123456@example.com')
         
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/div/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(page, elem)
         
         # -> Type the unregistered email into the email input (index 406) and click the 'Enviar Enlace de Recuperación' button (index 531) to trigger the response.
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div/div/div[2]/form/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('not-a-user-123456@example.com')
+        await waits.fill(page, elem, 'not-a-user-123456@example.com')
         
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/div/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(page, elem)
         
         # -> Type 'not-a-user-123456@example.com' into the email input (index 615) and click 'Enviar Enlace de Recuperación' (button index 740) to trigger the response and allow verification of the 'Email not found' message.
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div/div/div[2]/form/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('not-a-user-123456@example.com')
+        await waits.fill(page, elem, 'not-a-user-123456@example.com')
         
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/div/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(page, elem)
         
         # -> Type 'not-a-user-123456@example.com' into the email input (index 975) and click the 'Enviar Enlace de Recuperación' button (index 1099).
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div/div/div[2]/form/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('not-a-user-123456@example.com')
+        await waits.fill(page, elem, 'not-a-user-123456@example.com')
         
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/div/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(page, elem)
         
         # --> Assertions to verify final state
         frame = context.pages[-1]
         await expect(frame.locator('text=Forgot Password').first).to_be_visible(timeout=3000)
         await expect(frame.locator('text=Email not found').first).to_be_visible(timeout=3000)
-        await asyncio.sleep(5)
 
     finally:
         if context:
@@ -2,6 +2,8 @@ import asyncio
 from playwright import async_api
 from playwright.async_api import expect
 
+from harness import waits
+
 async def run_test():
     pw = None
     browser = None
@@ -40,20 +42,20 @@ async def run_test():
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div/div/div[2]/form/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('invalid-email-format')
+        await waits.fill(page, elem, 'invalid-email-format')
         
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/div/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(page, elem)
         
         # --> Assertions to verify final state
         frame = context.pages[-1]
+        await waits.route(frame, "/forgot-password")
         assert "/forgot-password" in frame.url
         el = frame.locator('xpath=/html/body/div[1]/div/div[2]/form/div/div/span').nth(0)
         text = await el.inner_text()
         assert 'Forgot Password' in text, f"Expected text 'Forgot Password' not found on page. Found: '{text}'. The feature appears to be missing or translated; reporting the issue and stopping the task."
-        await asyncio.sleep(5)
 
     finally:
         if context:
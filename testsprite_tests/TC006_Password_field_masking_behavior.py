@@ -2,6 +2,8 @@ import asyncio
 from playwright import async_api
 from playwright.async_api import expect
 
+from harness import waits
+
 async def run_test():
     pw = None
     browser = None
@@ -37,7 +39,6 @@ async def run_test():
         frame = context.pages[-1]
         await expect(frame.locator('xpath=//input[@type="password"] | //*[normalize-space(text())="Contraseña"]').first).to_be_visible(timeout=3000)
         await expect(frame.locator('text=secret123').first).not_to_be_visible(timeout=3000)
-        await asyncio.sleep(5)
 
     finally:
         if context:
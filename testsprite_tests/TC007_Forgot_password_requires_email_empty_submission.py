@@ -2,6 +2,8 @@ import asyncio
 from playwright import async_api
 from playwright.async_api import expect
 
+from harness import waits
+
 async def run_test():
     pw = None
     browser = None
@@ -40,7 +42,7 @@ async def run_test():
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/div/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(page, elem)
         
         # --> Assertions to verify final state
         frame = context.pages[-1]
@@ -69,7 +71,6 @@ async def run_test():
         except Exception:
             error_text = ''
         assert 'Email is required' in error_text, f'Expected validation "Email is required" but found: "{error_text}"'
-        await asyncio.sleep(5)
 
     finally:
         if context:
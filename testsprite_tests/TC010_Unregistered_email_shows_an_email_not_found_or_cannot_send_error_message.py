@@ -2,6 +2,8 @@ import asyncio
 from playwright import async_api
 from playwright.async_api import expect
 
+from harness import waits
+
 async def run_test():
     pw = None
     browser = None
@@ -40,74 +42,73 @@ async def run_test():
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div/div/div[2]/form/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('nonexistent.user.987654@example.com')
+        await waits.fill(page, elem, 'nonexistent.user.987654@example.com')
         
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/div/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(page, elem)
         
         # -> Type 'nonexistent.user.987654@example.com' into the email field (index 670), click 'Enviar Enlace de Recuperación' (index 763) to submit, then wait for the UI response so error messages can be checked.
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div/div/div[2]/form/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('nonexistent.user.987654@example.com')
+        await waits.fill(page, elem, 'nonexistent.user.987654@example.com')
         
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/div/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(page, elem)
         
         # -> Type the test email into the email input (index 814), click the 'Enviar Enlace de Recuperación' button (index 821), then wait for the UI response to check for visible error messages.
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div/div/div[2]/form/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('nonexistent.user.987654@example.com')
+        await waits.fill(page, elem, 'nonexistent.user.987654@example.com')
         
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/div/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(page, elem)
         
         # -> Type the test email into the email input (index=848), click the 'Enviar Enlace de Recuperación' button (index=941), then wait for the UI response and check the page for visible error messages ('Email not found' or 'cannot send').
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div/div/div[2]/form/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('nonexistent.user.987654@example.com')
+        await waits.fill(page, elem, 'nonexistent.user.987654@example.com')
         
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/div/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(page, elem)
         
         # -> Type 'nonexistent.user.987654@example.com' into input index=991, click submit button index=998, wait for UI response, then extract page content to find visible error text 'Email not found' or 'cannot send' (and Spanish equivalents).
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div/div/div[2]/form/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('nonexistent.user.987654@example.com')
+        await waits.fill(page, elem, 'nonexistent.user.987654@example.com')
         
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/div/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(page, elem)
         
         # -> Type 'nonexistent.user.987654@example.com' into the email input (index=1030), click 'Enviar Enlace de Recuperación' (index=1123), wait for UI response, then extract the visible page text to check for error messages ('Email not found' or Spanish equivalents). If the UI still shows no error, report the feature as missing and finish the test.
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div/div/div[2]/form/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('nonexistent.user.987654@example.com')
+        await waits.fill(page, elem, 'nonexistent.user.987654@example.com')
         
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/div/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(page, elem)
         
         # --> Assertions to verify final state
         frame = context.pages[-1]
         await expect(frame.locator('text=Forgot Password').first).to_be_visible(timeout=3000)
         await expect(frame.locator('text=Email not found').first).to_be_visible(timeout=3000)
         await expect(frame.locator('text=cannot send').first).to_be_visible(timeout=3000)
-        await asyncio.sleep(5)
 
     finally:
         if context:
@@ -2,6 +2,8 @@ import asyncio
 from playwright import async_api
 from playwright.async_api import expect
 
+from harness import waits
+
 async def run_test():
     pw = None
     browser = None
@@ -41,7 +43,6 @@ async def run_test():
         await expect(frame.locator('text=Recuperar Contraseña').first).to_be_visible(timeout=3000)
         await expect(frame.locator('text=Se ha enviado un correo para restablecer tu contraseña').first).to_be_visible(timeout=3000)
         await expect(frame.locator('xpath=//*[text()="Reenviar"]').first).to_be_visible(timeout=3000)
-        await asyncio.sleep(5)
 
     finally:
         if context:
@@ -2,6 +2,8 @@ import asyncio
 from playwright import async_api
 from playwright.async_api import expect
 
+from harness import waits
+
 async def run_test():
     pw = None
     browser = None
@@ -40,11 +42,12 @@ async def run_test():
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/div/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.click(page, elem)
         
         # --> Assertions to verify final state
         frame = context.pages[-1]
         # Assert we are on the forgot-password page
+        await waits.route(frame, "/forgot-password")
         assert "/forgot-password" in frame.url
         
         # Verify the submit button 'Enviar Enlace de Recuperación' is visible and has the expected text
@@ -66,7 +69,6 @@ async def run_test():
         
         # The test plan also asks to verify a success message ('Password reset email sent'), but there is no corresponding element/xpath available in the provided page elements.
         raise AssertionError("Expected success message 'Password reset email sent' not found on the page (no corresponding element/xpath available).")
-        await asyncio.sleep(5)
 
     finally:
         if context:
@@ -2,6 +2,8 @@ import asyncio
 from playwright import async_api
 from playwright.async_api import expect
 
+from harness import waits
+
 async def run_test():
     pw = None
     browser = None
@@ -42,7 +44,6 @@ async def run_test():
         await expect(frame.locator('text=Iniciar Sesión').first).to_be_visible(timeout=3000)
         await expect(frame.locator('text=Email Institucional').first).to_be_visible(timeout=3000)
         await expect(frame.locator('text=Contraseña').first).to_be_visible(timeout=3000)
-        await asyncio.sleep(5)
 
     finally:
         if context:
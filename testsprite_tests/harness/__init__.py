@@ -0,0 +1,28 @@
+"""Support code for running the generated TestSprite ``TC*.py`` scripts.
+
+The TC scripts stay runnable on their own (``python TC007_....py``); the
+modules in this package let the suite run them faster and together:
+
+- ``harness.runner``: discovers the TC scripts and runs their ``run_test``
+  bodies concurrently on a small pool of shared Chromium browsers.
+- ``harness.contexts``: pre-warmed, reusable browser contexts for the
+  runner, reset between tests by clearing storage.
+- ``harness.waits``: condition-based waits (network idle on Supabase calls,
+  locator actionability, route changes) used by the TC scripts instead of
+  fixed sleeps.
+- ``harness.timing``: per-step timing (waiting vs acting) and Chromium
+  metrics (LCP, long tasks, JS heap), aggregated per test and per route.
+- ``harness.session``: signs the test account in once and caches the
+  Playwright ``storage_state`` so tests skip the UI login.
+- ``harness.history``: append-only SQLite log of every run (status,
+  duration, error class, commit) and a slowest/regressions/flaky report.
+- ``harness.compile_plan``: compiles ``testsprite_frontend_test_plan.json``
+  into one compact module (login fixture, shared step helpers, semantic
+  locators) that runs on the ``harness.plan`` runtime.
+- ``harness.load``: load generator replaying the TC journeys (register,
+  dashboard, library search, study session, AI chat) as concurrent HTTP or
+  headless-browser users, with p50/p95/p99 per step and throughput.
+- ``harness.config``: app URL, Supabase project and test credentials.
+- ``harness.stubs``: local stand-ins for Supabase and the n8n AI webhooks,
+  for hermetic runs.
+"""
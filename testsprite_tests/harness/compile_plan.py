@@ -0,0 +1,271 @@
+"""Compile ``testsprite_frontend_test_plan.json`` into one compact test module.
+
+The generated ``TC*.py`` scripts repeat the browser setup and the UI login in
+every file and locate elements by absolute XPath. This compiler reads the
+structured plan instead and emits a single module for ``harness.plan``:
+
+- the login prefix (navigate to /login, type ``{{LOGIN_USER}}`` and
+  ``{{LOGIN_PASSWORD}}``, click the sign-in button) becomes the ``"login"``
+  fixture, which reuses the cached session so the sign-in runs once;
+- longer prefixes shared by several tests (open the first notebook, start a
+  clinical case...) are emitted once as helper functions;
+- tests whose compiled steps are identical are emitted once, listing every
+  plan id (the TC generator reuses ids such as TC009 and TC015);
+- steps use semantic locators (role + accessible name, placeholder, label
+  text).
+
+Usage (from ``testsprite_tests/``)::
+
+    python -m harness.compile_plan                       # -> tmp/compiled_plan.py
+    python -m harness.compile_plan --out other.py plan.json
+    python -m harness.runner --compiled tmp/compiled_plan.py
+
+Steps the compiler does not understand are emitted as ``rt.manual(...)`` calls,
+which fail loudly, and listed on stderr.
+"""
+
+import argparse
+import json
+import re
+import sys
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from harness.config import SUITE_DIR
+
+DEFAULT_PLAN = SUITE_DIR / "testsprite_frontend_test_plan.json"
+DEFAULT_OUT = SUITE_DIR / "tmp" / "compiled_plan.py"
+
+# A shared prefix must be at least this many steps to become a helper.
+MIN_SHARED_STEPS = 2
+
+_PLACEHOLDER = re.compile(r"^\{\{(\w+)\}\}$")
+
+
+def _value(text):
+    """Python expression for a quoted value from the plan."""
+    match = _PLACEHOLDER.match(text)
+    return f"rt.var({match.group(1)!r})" if match else repr(text)
+
+
+# (pattern, template) pairs, tried in order against each step description.
+# Templates are str.format'ed with the named groups already turned into
+# Python expressions.
+RULES = [
+    (r'Navigate to (?P<path>/\S*)', 'await rt.goto(page, {path})'),
+    (r'(?:Type|Fill) "(?P<value>.*)" into the (?P<hint>.+?) field', 'await rt.fill(page, rt.field(page, {hint}), {value})'),
+    (r'Select "(?P<value>.*)" from the (?P<hint>.+?) dropdown', 'await rt.select(page, rt.dropdown(page, {hint}), {value})'),
+    (r'Click the "(?P<a>[^"]*)" or "(?P<b>[^"]*)" button', 'await rt.click(page, rt.button(page, {a}, {b}))'),
+    (r'Click the "(?P<name>[^"]*)" button', 'await rt.click(page, rt.button(page, {name}))'),
+    (r'Click the "(?P<name>[^"]*)" link\b.*', 'await rt.click(page, rt.link(page, {name}))'),
+    (r'Click the "(?P<name>[^"]*)" toggle\b.*', 'await rt.click(page, rt.toggle(page, {name}))'),
+    (r'Click on "(?P<name>[^"]*)" in the main navigation\b.*', 'await rt.click(page, rt.nav(page, {name}))'),
+    (r'Click (?:on )?(?:the )?(?:\w+ named )?"(?P<name>[^"]*)".*', 'await rt.click(page, rt.target(page, {name}))'),
+    (r'Click the (?P<hint>\w+) button', 'await rt.click(page, rt.button_like(page, {hint}))'),
+    (r'Click (?:an?|the first) (?P<kind>\w+) option in the \w+ selector', 'await rt.click(page, rt.option(page, {kind}))'),
+    (r'Click on the first visible (?P<kind>\w+) in the \w+ list', 'await rt.click(page, rt.first_item(page, {kind}))'),
+    (r'Press (?P<key>\w+)', 'await rt.press(page, {key})'),
+    (r'Verify URL contains "(?P<fragment>.*)"', 'await rt.url_contains(page, {fragment})'),
+    (r'Verify text "(?P<text>.*)" is visible', 'await rt.visible(rt.text(page, {text}))'),
+    (r'Verify text "(?P<text>.*)" is not visible', 'await rt.hidden(rt.text(page, {text}))'),
+    (r'Verify element "(?P<name>.*)" is visible', 'await rt.visible(rt.element(page, {name}))'),
+    (r'Verify the "(?P<name>.*)" toggle indicates it is enabled', 'await rt.checked(rt.toggle(page, {name}))'),
+]
+_RULES = [(re.compile(pattern + r"$"), template) for pattern, template in RULES]
+
+
+def compile_step(description):
+    """Translate one plan step into a line of Python; None if no rule matches."""
+    for pattern, template in _RULES:
+        match = pattern.match(description.strip())
+        if match:
+            return template.format(**{key: _value(value) for key, value in match.groupdict().items()})
+    return None
+
+
+@dataclass
+class CompiledTest:
+    ids: list
+    title: str
+    fixture: str
+    lines: list
+    prefix: str = None
+    unsupported: list = field(default_factory=list)
+
+
+def _is_login_prefix(lines):
+    return (
+        len(lines) >= 4
+        and lines[0] == "await rt.goto(page, '/login')"
+        and "rt.var('LOGIN_USER')" in lines[1]
+        and "rt.var('LOGIN_PASSWORD')" in lines[2]
+        and lines[3].startswith("await rt.click(")
+    )
+
+
+def compile_test(test):
+    lines, unsupported = [], []
+    for step in test.get("steps", []):
+        line = compile_step(step["description"])
+        if line is None:
+            unsupported.append(step["description"])
+            line = f"rt.manual({step['description']!r})"
+        lines.append(line)
+
+    fixture = None
+    if _is_login_prefix(lines):
+        fixture, lines = "login", lines[4:]
+    return CompiledTest([test["id"]], test.get("title", test["id"]), fixture, lines, unsupported=unsupported)
+
+
+def merge_duplicates(tests):
+    """Collapse tests whose fixture and steps are identical, keeping every id."""
+    merged = {}
+    for test in tests:
+        key = (test.fixture, tuple(test.lines))
+        if key in merged:
+            merged[key].ids.extend(test.ids)
+        else:
+            merged[key] = test
+    return list(merged.values())
+
+
+def shared_prefixes(tests):
+    """Assign each test the longest step prefix it shares with another test.
+
+    Returns ``{prefix_lines: helper_name}``; each test's ``prefix`` is set to
+    the helper it starts with, if any.
+    """
+    counts = Counter()
+    for test in tests:
+        for length in range(MIN_SHARED_STEPS, len(test.lines)):
+            counts[(test.fixture, tuple(test.lines[:length]))] += 1
+
+    helpers, names = {}, set()
+    for test in tests:
+        for length in range(len(test.lines) - 1, MIN_SHARED_STEPS - 1, -1):
+            key = (test.fixture, tuple(test.lines[:length]))
+            if counts[key] >= 2:
+                if key not in helpers:
+                    helpers[key] = _helper_name(key[1], names)
+                test.prefix = helpers[key]
+                break
+    return helpers
+
+
+def _helper_name(lines, taken):
+    words = re.findall(r"'([^']*)'|rt\.(\w+)\(page, \w", lines[-1])
+    label = "_".join(quoted or call for quoted, call in words) or "steps"
+    base = "_" + re.sub(r"[^0-9a-z]+", "_", label.lower()).strip("_")[:40]
+    name, suffix = base, 2
+    while name in taken:
+        name, suffix = f"{base}_{suffix}", suffix + 1
+    taken.add(name)
+    return name
+
+
+def _function_name(ids, taken):
+    base = ids[0].lower()
+    name, suffix = base, 2
+    while name in taken:
+        name, suffix = f"{base}_{suffix}", suffix + 1
+    taken.add(name)
+    return name
+
+
+def key_of(helpers, name):
+    return next(key for key, helper in helpers.items() if helper == name)
+
+
+def _longest_helper(helpers, key):
+    """Name of the longest other helper whose steps start ``key``'s steps."""
+    fixture, lines = key
+    best = None
+    for (other_fixture, other_lines), name in helpers.items():
+        if (other_fixture == fixture and len(other_lines) < len(lines)
+                and lines[:len(other_lines)] == other_lines
+                and (best is None or len(other_lines) > len(best[1]))):
+            best = (name, other_lines)
+    return best[0] if best else None
+
+
+def _call_prefix(lines, helper, helper_lines):
+    if not helper:
+        return list(lines)
+    return [f"await {helper}(page)"] + list(lines[len(helper_lines[helper]):])
+
+
+def emit(tests, helpers, plan_name):
+    out = [
+        f'"""Compiled from {plan_name} by ``python -m harness.compile_plan``.',
+        "",
+        f"{sum(len(test.ids) for test in tests)} plan tests -> {len(tests)} cases, "
+        f"{len(helpers)} shared step helpers. Regenerate instead of editing.",
+        '"""',
+        "",
+        "from harness import plan as rt",
+    ]
+    helper_lines = {name: list(key[1]) for key, name in helpers.items()}
+    for name, lines in helper_lines.items():
+        out += ["", "", f"async def {name}(page):"]
+        out += [f"    {line}" for line in _call_prefix(lines, _longest_helper(helpers, key_of(helpers, name)), helper_lines)]
+
+    taken = set()
+    for test in tests:
+        body = _call_prefix(test.lines, test.prefix, helper_lines) or ["pass"]
+        ids = ", ".join(repr(test_id) for test_id in test.ids)
+        fixture = "" if test.fixture == "login" else f", fixture={test.fixture!r}"
+        out += ["", "", f"@rt.case({ids}, title={test.title!r}{fixture})",
+                f"async def {_function_name(test.ids, taken)}(page):"]
+        out += [f"    {line}" for line in body]
+    return "\n".join(out) + "\n"
+
+
+def compile_plan(plan):
+    """Compile plan entries; returns ``(tests, helpers, warnings)`` for :func:`emit`."""
+    tests = [compile_test(entry) for entry in plan]
+    warnings = []
+    for test_id, count in Counter(test.ids[0] for test in tests).items():
+        if count > 1:
+            warnings.append(f"{test_id} is used by {count} plan entries")
+    for test in tests:
+        warnings += [f"{test.ids[0]}: no rule for step {step!r}" for step in test.unsupported]
+    tests = merge_duplicates(tests)
+    helpers = shared_prefixes(tests)
+    return tests, helpers, warnings
+
+
+def _size(paths):
+    texts = [path.read_text(encoding="utf-8") for path in paths]
+    return sum(text.count("\n") for text in texts), sum(len(text.encode("utf-8")) for text in texts)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m harness.compile_plan",
+                                     description="Compile the TestSprite test plan into one harness.plan module.")
+    parser.add_argument("plan", nargs="?", default=str(DEFAULT_PLAN))
+    parser.add_argument("--out", default=str(DEFAULT_OUT))
+    args = parser.parse_args(argv)
+
+    plan_path = Path(args.plan)
+    tests, helpers, warnings = compile_plan(json.loads(plan_path.read_text(encoding="utf-8")))
+    source = emit(tests, helpers, plan_path.name)
+    out = Path(args.out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(source, encoding="utf-8")
+
+    for warning in warnings:
+        print(f"warning: {warning}", file=sys.stderr)
+    lines, size = _size([out])
+    print(f"Wrote {out}: {sum(len(test.ids) for test in tests)} plan tests as {len(tests)} cases, "
+          f"{len(helpers)} helpers, {lines} lines / {size / 1024:.1f} KiB")
+    scripts = sorted(SUITE_DIR.glob("TC*.py"))
+    if scripts:
+        script_lines, script_size = _size(scripts)
+        print(f"(generated TC scripts: {len(scripts)} files, {script_lines} lines / {script_size / 1024:.1f} KiB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,47 @@
+"""Shared settings for the harness modules.
+
+Values come from the environment first and then from the app's own ``.env``
+files, so the tests talk to the same Supabase project the Vite build does.
+"""
+
+import os
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+SUITE_DIR = REPO_ROOT / "testsprite_tests"
+TMP_DIR = SUITE_DIR / "tmp"
+
+# Same fallback as src/config/supabase.config.js
+DEFAULT_SUPABASE_URL = "https://wxtnuxlzogcizssdjnio.supabase.co"
+
+
+def _read_env_files():
+    values = {}
+    for name in (".env", ".env.local"):
+        path = REPO_ROOT / name
+        if not path.exists():
+            continue
+        for line in path.read_text(encoding="utf-8").splitlines():
+            line = line.strip()
+            if not line or line.startswith("#") or "=" not in line:
+                continue
+            key, value = line.split("=", 1)
+            values[key.strip()] = value.strip().strip("'\"")
+    return values
+
+
+_ENV_FILES = _read_env_files()
+
+
+def setting(name, default=""):
+    """Look ``name`` up in the environment, then in the repo's .env files."""
+    return os.environ.get(name) or _ENV_FILES.get(name) or default
+
+
+APP_URL = setting("TESTSPRITE_APP_URL", "http://localhost:3000").rstrip("/")
+SUPABASE_URL = setting("VITE_SUPABASE_URL", DEFAULT_SUPABASE_URL).rstrip("/")
+SUPABASE_ANON_KEY = setting("VITE_SUPABASE_ANON_KEY")
+
+# Test account used by the generated scripts ({{LOGIN_USER}} in the test plan).
+LOGIN_USER = setting("LOGIN_USER", "example@gmail.com")
+LOGIN_PASSWORD = setting("LOGIN_PASSWORD", "password123")
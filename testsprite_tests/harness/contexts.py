@@ -0,0 +1,162 @@
+"""Pool of pre-warmed browser contexts for ``harness.runner``.
+
+Every TC script used to create a fresh context and page, load the whole Vite
+bundle cold, and tear everything down again. The pool keeps a few contexts per
+shared browser alive instead:
+
+- each context is warmed once by loading the app, so its HTTP cache already
+  holds the bundle and the next test's ``page.goto(...)`` is a warm load;
+- a test gets a new page in an idle context; ``storage_state`` is applied in
+  place (cookies, plus ``localStorage`` written from a blank document served on
+  the app origin by a route handler, without touching the network);
+- ``context.close()`` hands the context back, which resets it by closing its
+  pages and clearing cookies, permissions and origin storage (localStorage,
+  IndexedDB, Cache Storage...) while keeping the HTTP cache.
+
+Only ``new_context()`` calls without options other than ``storage_state`` are
+pooled; anything else gets a fresh context as before.
+
+Document loads are not replaced by in-app (``history.pushState``) navigation:
+tests such as TC010 check what survives a reload, so each ``goto`` still loads
+the document, just from a warm cache.
+"""
+
+import asyncio
+import json
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from harness import config, timing
+
+# Served by a route handler, never by the app: gives the page the app's origin
+# so localStorage can be written before the test's first navigation.
+BLANK_PATH = "/__harness_blank__"
+BLANK_HTML = "<!doctype html><title>harness</title>"
+
+# Everything the app can persist per origin. The HTTP cache and service worker
+# registrations are kept: they are what makes the context warm.
+STORAGE_TYPES = "cookies,local_storage,indexeddb,websql,file_systems,cache_storage"
+
+WARM_TIMEOUT_MS = 30000
+PLAYWRIGHT_DEFAULT_TIMEOUT_MS = 30000
+
+
+def _origin(url):
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def _load_state(state):
+    if isinstance(state, (str, Path)):
+        return json.loads(Path(state).read_text(encoding="utf-8"))
+    return state or {}
+
+
+class PooledContext:
+    """A pooled context as seen by one test; ``close()`` returns it to the pool."""
+
+    def __init__(self, pool, context, page):
+        self._pool = pool
+        self._context = context
+        self._page = page
+        self.closed = False
+
+    def __getattr__(self, name):
+        return getattr(self._context, name)
+
+    async def new_page(self, **kwargs):
+        if self._page is not None and not kwargs:
+            page, self._page = self._page, None
+        else:
+            page = await self._context.new_page(**kwargs)
+        return timing.instrument_page(page) if timing.current() else page
+
+    async def close(self):
+        if not self.closed:
+            self.closed = True
+            await self._pool.release(self._context)
+
+
+class ContextPool:
+    """Warm contexts of one browser, handed out one test at a time."""
+
+    def __init__(self, browser, size, app_url=None):
+        self.browser = browser
+        self.size = max(1, size)
+        self.app_url = app_url or config.APP_URL
+        self._idle = []
+        self._origins = {_origin(self.app_url)}
+
+    async def warm(self):
+        self._idle = list(await asyncio.gather(*(self._create() for _ in range(self.size))))
+        return self
+
+    async def close(self):
+        await asyncio.gather(*(context.close() for context in self._idle), return_exceptions=True)
+        self._idle.clear()
+
+    async def _create(self):
+        context = await self.browser.new_context()
+        await context.add_init_script(timing.PERF_INIT_SCRIPT)
+        page = await context.new_page()
+        try:
+            await page.goto(f"{self.app_url.rstrip('/')}/login", wait_until="load", timeout=WARM_TIMEOUT_MS)
+        except Exception:
+            pass  # app not reachable yet: the context still works, it is just cold
+        await self._reset(context)
+        return context
+
+    async def acquire(self, storage_state=None):
+        context = self._idle.pop() if self._idle else await self._create()
+        page = await context.new_page()
+        state = _load_state(storage_state)
+        if state:
+            await self._apply(context, page, state)
+        return PooledContext(self, context, page)
+
+    async def release(self, context):
+        try:
+            await self._reset(context)
+        except Exception:
+            await asyncio.gather(context.close(), return_exceptions=True)
+            return
+        if len(self._idle) < self.size:
+            self._idle.append(context)
+        else:
+            await context.close()
+
+    async def _apply(self, context, page, state):
+        if state.get("cookies"):
+            await context.add_cookies(state["cookies"])
+        for origin in state.get("origins", []):
+            items = origin.get("localStorage") or []
+            if not items:
+                continue
+            url = f"{origin['origin'].rstrip('/')}{BLANK_PATH}"
+            await page.route(url, lambda route: route.fulfill(status=200, content_type="text/html", body=BLANK_HTML))
+            try:
+                await page.goto(url)
+                await page.evaluate(
+                    "items => items.forEach(({ name, value }) => localStorage.setItem(name, value))", items
+                )
+            finally:
+                await page.unroute(url)
+            self._origins.add(_origin(origin["origin"]))
+
+    async def _reset(self, context):
+        for page in list(context.pages):
+            await page.close()
+        await context.clear_cookies()
+        await context.clear_permissions()
+        await context.set_offline(False)
+        context.set_default_timeout(PLAYWRIGHT_DEFAULT_TIMEOUT_MS)
+        context.set_default_navigation_timeout(PLAYWRIGHT_DEFAULT_TIMEOUT_MS)
+
+        page = await context.new_page()
+        try:
+            cdp = await context.new_cdp_session(page)
+            for origin in self._origins:
+                await cdp.send("Storage.clearDataForOrigin", {"origin": origin, "storageTypes": STORAGE_TYPES})
+            await cdp.detach()
+        finally:
+            await page.close()
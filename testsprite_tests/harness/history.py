@@ -0,0 +1,301 @@
+"""Append-only history of test results, with a report of what to fix first.
+
+``tmp/test_results.json`` is overwritten by every TestSprite run and embeds
+the full source of every test. This module keeps a compact SQLite log instead
+(``tmp/history.sqlite``): one row per run (time, commit, source) and one row
+per test result (status, duration, error class, first error line). Rows are
+only ever inserted.
+
+``harness.runner`` records every run automatically (``--no-history`` to
+skip). From ``testsprite_tests/``::
+
+    python -m harness.history report                 # slowest, regressions, flaky
+    python -m harness.history report --runs 20       # look at the last 20 runs only
+    python -m harness.history import-testsprite      # add tmp/test_results.json
+    python -m harness.history record results.json    # add a runner --json file
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+
+from harness import config
+
+DEFAULT_DB = Path(os.environ.get("TESTSPRITE_HISTORY_DB", config.TMP_DIR / "history.sqlite"))
+TESTSPRITE_RESULTS = config.TMP_DIR / "test_results.json"
+
+MAX_ERROR_LENGTH = 200
+
+# A test counts as regressed when its recent median is this much slower than
+# its earlier median, by at least this many seconds.
+REGRESSION_RATIO = 1.5
+REGRESSION_MIN_SECONDS = 0.5
+RECENT_RUNS = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    started_at TEXT NOT NULL,
+    git_commit TEXT,
+    source TEXT NOT NULL,
+    source_key TEXT UNIQUE
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    test TEXT NOT NULL,
+    status TEXT NOT NULL,
+    duration REAL,
+    error_class TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS results_test_run ON results (test, run_id);
+"""
+
+# (error class, pattern) in priority order; matched against the whole error text.
+ERROR_CLASSES = [
+    ("timeout", re.compile(r"Timed out after|TimeoutError|Timeout \d+ms exceeded")),
+    ("syntax", re.compile(r"^SyntaxError|IndentationError")),
+    ("auth", re.compile(r"^AuthError|invalid_grant|Invalid login credentials")),
+    ("navigation", re.compile(r"net::ERR_|NS_ERROR_|page\.goto")),
+    ("locator", re.compile(r"strict mode violation|waiting for (?:locator|get_by)|not (?:attached|visible|enabled)")),
+    ("not_implemented", re.compile(r"^NotImplementedError")),
+    ("assertion", re.compile(r"^AssertionError|ASSERTIONS:|Locator expected")),
+    ("network", re.compile(r"URLError|ConnectionRefused|ECONNREFUSED")),
+]
+
+
+def classify(status, error):
+    """Coarse error class for a result; None for passed tests."""
+    if status == "PASSED":
+        return None
+    for name, pattern in ERROR_CLASSES:
+        if pattern.search(error or ""):
+            return name
+    return "other"
+
+
+_BANNERS = ("TEST FAILURE", "ASSERTIONS:")
+_EXCEPTION_LINE = re.compile(r"^[\w.]+(?:Error|Exception)\b")
+
+
+def _first_line(error):
+    """The most telling line of an error: the exception line of a traceback,
+    else the first line after TestSprite's banner."""
+    lines = [line.strip() for line in (error or "").splitlines()]
+    lines = [line for line in lines if line and line not in _BANNERS]
+    exceptions = [line for line in lines if _EXCEPTION_LINE.match(line)]
+    line = exceptions[-1] if exceptions else (lines[0] if lines else "")
+    return line[:MAX_ERROR_LENGTH]
+
+
+def test_name(title):
+    """``"TC001-Register a new user..."`` -> ``"TC001_Register_a_new_user..."`` (the script stem)."""
+    return re.sub(r"[^0-9A-Za-z]+", "_", title).strip("_")
+
+
+def current_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=config.REPO_ROOT,
+            capture_output=True, text=True, timeout=10, check=True,
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def connect(path=DEFAULT_DB):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    db = sqlite3.connect(path)
+    db.executescript(SCHEMA)
+    return db
+
+
+def record_run(db, results, source="runner", started_at=None, commit=None, source_key=None):
+    """Append one run. ``results`` are dicts with name/testStatus/duration/testError.
+
+    Returns the new run id, or None when ``source_key`` was already recorded.
+    """
+    started_at = started_at or datetime.now(timezone.utc).isoformat(timespec="seconds")
+    with db:
+        try:
+            cursor = db.execute(
+                "INSERT INTO runs (started_at, git_commit, source, source_key) VALUES (?, ?, ?, ?)",
+                (started_at, commit if commit is not None else current_commit(), source, source_key),
+            )
+        except sqlite3.IntegrityError:
+            return None
+        run_id = cursor.lastrowid
+        db.executemany(
+            "INSERT INTO results (run_id, test, status, duration, error_class, error) VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (run_id, result["name"], result["testStatus"], result.get("duration"),
+                 classify(result["testStatus"], result.get("testError")),
+                 _first_line(result.get("testError")) or None)
+                for result in results
+            ],
+        )
+    return run_id
+
+
+def import_testsprite(db, path=TESTSPRITE_RESULTS):
+    """Append a TestSprite ``test_results.json``; importing the same file twice is a no-op."""
+    raw = Path(path).read_bytes()
+    entries = json.loads(raw)
+    results = []
+    for entry in entries:
+        duration = None
+        if entry.get("created") and entry.get("modified"):
+            duration = (_parse_time(entry["modified"]) - _parse_time(entry["created"])).total_seconds()
+        results.append({
+            "name": test_name(entry["title"]),
+            "testStatus": entry.get("testStatus", "FAILED"),
+            "duration": duration,
+            "testError": entry.get("testError", ""),
+        })
+    started_at = min((entry["created"] for entry in entries if entry.get("created")), default=None)
+    return record_run(db, results, source="testsprite", started_at=started_at,
+                      source_key=hashlib.sha1(raw).hexdigest())
+
+
+def _parse_time(value):
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+# ============================================
+# Report
+# ============================================
+
+def _history(db, runs):
+    """``{test: [(run_id, commit, status, duration), ...]}`` over the last ``runs`` runs."""
+    rows = db.execute(
+        """
+        SELECT r.test, r.run_id, runs.git_commit, r.status, r.duration
+        FROM results r JOIN runs ON runs.id = r.run_id
+        WHERE r.run_id IN (SELECT id FROM runs ORDER BY id DESC LIMIT ?)
+        ORDER BY r.run_id
+        """,
+        (runs,),
+    )
+    history = defaultdict(list)
+    for test, run_id, commit, status, duration in rows:
+        history[test].append((run_id, commit, status, duration))
+    return history
+
+
+def slowest(history, limit):
+    rows = []
+    for test, entries in history.items():
+        durations = [duration for _, _, _, duration in entries if duration is not None]
+        if durations:
+            rows.append((test, statistics.median(durations), max(durations), len(durations)))
+    return sorted(rows, key=lambda row: -row[1])[:limit]
+
+
+def regressions(history, limit):
+    rows = []
+    for test, entries in history.items():
+        durations = [duration for _, _, status, duration in entries if duration is not None and status == "PASSED"]
+        if len(durations) <= RECENT_RUNS:
+            continue
+        before = statistics.median(durations[:-RECENT_RUNS])
+        recent = statistics.median(durations[-RECENT_RUNS:])
+        if recent >= before * REGRESSION_RATIO and recent - before >= REGRESSION_MIN_SECONDS:
+            rows.append((test, before, recent, recent / before if before else float("inf")))
+    return sorted(rows, key=lambda row: -row[3])[:limit]
+
+
+def flaky(history, limit):
+    """Tests that both passed and failed, preferring flips on the same commit."""
+    rows = []
+    for test, entries in history.items():
+        statuses = [status for _, _, status, _ in entries]
+        if "PASSED" not in statuses or len(set(statuses)) < 2:
+            continue
+        flips = sum(1 for previous, current in zip(statuses, statuses[1:]) if previous != current)
+        by_commit = defaultdict(set)
+        for _, commit, status, _ in entries:
+            by_commit[commit].add(status)
+        same_commit = sum(1 for commit, seen in by_commit.items() if commit and len(seen) > 1)
+        pass_rate = statuses.count("PASSED") / len(statuses)
+        rows.append((test, flips, same_commit, pass_rate, len(statuses)))
+    return sorted(rows, key=lambda row: (-row[2], -row[1], abs(row[3] - 0.5)))[:limit]
+
+
+def error_classes(db, runs):
+    return db.execute(
+        """
+        SELECT error_class, COUNT(*), COUNT(DISTINCT test) FROM results
+        WHERE error_class IS NOT NULL
+          AND run_id IN (SELECT id FROM runs ORDER BY id DESC LIMIT ?)
+        GROUP BY error_class ORDER BY COUNT(*) DESC
+        """,
+        (runs,),
+    ).fetchall()
+
+
+def report(db, runs=50, limit=10):
+    total_runs = db.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+    history = _history(db, runs)
+    lines = [f"{min(runs, total_runs)} of {total_runs} recorded runs, {len(history)} tests"]
+
+    lines += ["", "Slowest tests (median s / max s / samples)"]
+    lines += [f"  {median:7.2f} {worst:7.2f} {samples:4d}  {test}" for test, median, worst, samples in slowest(history, limit)]
+
+    found = regressions(history, limit)
+    lines += ["", f"Duration regressions (last {RECENT_RUNS} passing runs vs earlier, median s)"]
+    lines += [f"  {before:7.2f} -> {recent:7.2f}  x{ratio:4.1f}  {test}" for test, before, recent, ratio in found]
+    if not found:
+        lines.append("  none")
+
+    found = flaky(history, limit)
+    lines += ["", "Flaky tests (flips / commits with both outcomes / pass rate / runs)"]
+    lines += [f"  {flips:5d} {same:5d} {rate:6.0%} {count:4d}  {test}" for test, flips, same, rate, count in found]
+    if not found:
+        lines.append("  none")
+
+    lines += ["", "Failures by error class (results / tests)"]
+    lines += [f"  {count:5d} {tests:4d}  {name}" for name, count, tests in error_classes(db, runs)]
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m harness.history",
+                                     description="Append-only TC result history and report.")
+    parser.add_argument("--db", default=str(DEFAULT_DB))
+    commands = parser.add_subparsers(dest="command", required=True)
+    show = commands.add_parser("report", help="slowest tests, duration regressions and flaky tests")
+    show.add_argument("--runs", type=int, default=50, help="only consider the last N runs")
+    show.add_argument("--limit", type=int, default=10, help="rows per section")
+    add = commands.add_parser("record", help="append a harness.runner --json results file")
+    add.add_argument("path")
+    imported = commands.add_parser("import-testsprite", help="append a TestSprite test_results.json")
+    imported.add_argument("path", nargs="?", default=str(TESTSPRITE_RESULTS))
+    args = parser.parse_args(argv)
+
+    db = connect(args.db)
+    try:
+        if args.command == "report":
+            print(report(db, runs=args.runs, limit=args.limit))
+        elif args.command == "record":
+            run_id = record_run(db, json.loads(Path(args.path).read_text(encoding="utf-8")))
+            print(f"Recorded run {run_id}")
+        else:
+            run_id = import_testsprite(db, args.path)
+            print(f"Imported run {run_id}" if run_id else "Already imported")
+    finally:
+        db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,627 @@
+"""Load generator that replays the TC user journeys with many concurrent users.
+
+The journeys are the ones the TC scripts walk through:
+
+- ``register``: sign up a new student (TC001-TC003);
+- ``login_dashboard``: sign in and load what the dashboard shows (TC011-TC015);
+- ``library_search``: list the document library and search it (TC016, TC022);
+- ``study_session``: start a flashcard session and answer cards (TC028, TC029);
+- ``study_ai``: ask the study assistant a question through n8n (StudyAI chat).
+
+Two modes:
+
+- ``http`` (default) sends the requests the app itself sends (same PostgREST
+  queries, GoTrue calls and n8n webhooks), one keep-alive connection set per
+  virtual user, against the in-process Supabase and n8n stand-ins. Pass
+  ``--supabase-url``/``--n8n-url`` to aim at a running deployment instead;
+- ``browser`` replays the matching TC scripts as headless users on shared
+  browsers (``harness.runner``); every recorded ``harness.timing`` step is a
+  journey step.
+
+The report lists p50/p95/p99 latency per journey step, journey latency, errors
+and throughput. Usage (from ``testsprite_tests/``)::
+
+    python -m harness.load --users 50 --duration 60
+    python -m harness.load --users 200 --journeys login_dashboard,study_session --think-time 2
+    python -m harness.load --n8n-profile realistic --journeys study_ai
+    python -m harness.load --mode browser --users 8 --iterations 2
+    python -m harness.load --json tmp/load.json
+
+Virtual users run journeys back to back (closed loop); ``--think-time`` adds a
+pause between journeys and between answered cards, the way a student reads.
+"""
+
+import argparse
+import asyncio
+import http.client
+import json
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime, timedelta, timezone
+from urllib.parse import quote, urlsplit
+
+from harness import config
+
+JOURNEYS = ("register", "login_dashboard", "library_search", "study_session", "study_ai")
+
+# TC scripts replayed per journey in browser mode (file name prefixes).
+BROWSER_SCRIPTS = {
+    "register": ("TC001_Register_a_new_user", "TC003_Complete_full_registration"),
+    "login_dashboard": ("TC011_", "TC012_", "TC013_", "TC014_", "TC015_Dashboard"),
+    "library_search": ("TC016_", "TC022_"),
+    "study_session": ("TC028_", "TC029_"),
+    "study_ai": ("TC028_",),
+}
+
+# Browsers open at most this many connections per host; the dashboard's
+# parallel loads are capped the same way.
+CONNECTIONS_PER_HOST = 6
+REQUEST_TIMEOUT = 30
+
+REVIEWS_PER_SESSION = 10
+# FSRSContext's DEFAULT_SESSION_OPTIONS as start_study_session arguments
+SESSION_ARGS = {"p_deck_id": None, "p_include_new": True, "p_new_limit": 20, "p_review_limit": 100,
+                "p_exam_mode": False, "p_session_type": "normal"}
+SEARCH_TERMS = ("cardio", "farmaco", "neuro", "anatom", "pdf", "caso")
+AI_QUESTIONS = (
+    "¿Cuál es el tratamiento de primera línea de la hipertensión?",
+    "Resume el mecanismo de acción de los betabloqueantes.",
+    "¿Qué diferencia hay entre insuficiencia cardiaca sistólica y diastólica?",
+)
+
+
+class StepError(RuntimeError):
+    """A journey step got an HTTP error or no response."""
+
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class Stats:
+    """Latencies of every step and journey, shared by all virtual users."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.steps = defaultdict(list)
+        self.step_errors = defaultdict(int)
+        self.journeys = defaultdict(list)
+        self.journey_errors = defaultdict(int)
+        self.errors = defaultdict(int)
+        self.requests = 0
+        self.started = time.perf_counter()
+        self.finished = None
+
+    def step(self, journey, name, seconds, ok=True, requests=1):
+        with self._lock:
+            self.steps[(journey, name)].append(seconds)
+            self.requests += requests
+            if not ok:
+                self.step_errors[(journey, name)] += 1
+
+    def journey(self, journey, seconds, error=None):
+        with self._lock:
+            self.journeys[journey].append(seconds)
+            if error:
+                self.journey_errors[journey] += 1
+                self.errors[error[:160]] += 1
+
+    def finish(self):
+        self.finished = time.perf_counter()
+
+    def report(self):
+        """JSON-friendly report; latencies in milliseconds."""
+        elapsed = (self.finished or time.perf_counter()) - self.started
+
+        def row(durations, errors):
+            milliseconds = [duration * 1000 for duration in durations]
+            return {
+                "count": len(durations),
+                "errors": errors,
+                "p50_ms": round(_percentile(milliseconds, 0.5), 1),
+                "p95_ms": round(_percentile(milliseconds, 0.95), 1),
+                "p99_ms": round(_percentile(milliseconds, 0.99), 1),
+                "max_ms": round(max(milliseconds), 1),
+            }
+
+        journeys = {}
+        for journey, durations in self.journeys.items():
+            journeys[journey] = {
+                **row(durations, self.journey_errors[journey]),
+                "per_second": round(len(durations) / elapsed, 2) if elapsed else None,
+                "steps": {
+                    name: row(step_durations, self.step_errors[(owner, name)])
+                    for (owner, name), step_durations in self.steps.items() if owner == journey
+                },
+            }
+        completed = sum(len(durations) for durations in self.journeys.values())
+        return {
+            "elapsed_s": round(elapsed, 2),
+            "journeys_completed": completed,
+            "journeys_per_second": round(completed / elapsed, 2) if elapsed else None,
+            "requests": self.requests,
+            "requests_per_second": round(self.requests / elapsed, 2) if elapsed else None,
+            "journeys": journeys,
+            "errors": dict(sorted(self.errors.items(), key=lambda item: -item[1])),
+        }
+
+
+def format_report(report):
+    """Plain-text table of :meth:`Stats.report` output."""
+    lines = [f"{'journey / step':<40}{'count':>7}{'errors':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}"]
+
+    def line(label, row):
+        return (f"{label:<40}{row['count']:>7}{row['errors']:>8}{row['p50_ms']:>9.1f}{row['p95_ms']:>9.1f}"
+                f"{row['p99_ms']:>9.1f}{row['max_ms']:>9.1f}")
+
+    for journey, row in report["journeys"].items():
+        lines.append(line(f"{journey} ({row['per_second']}/s)", row))
+        lines += [line(f"  {name}"[:39], step) for name, step in row["steps"].items()]
+    lines.append("")
+    lines.append(f"{report['journeys_completed']} journeys in {report['elapsed_s']}s: "
+                 f"{report['journeys_per_second']} journeys/s")
+    if report["requests"]:
+        lines[-1] += f", {report['requests']} requests ({report['requests_per_second']} req/s)"
+    for error, count in list(report["errors"].items())[:5]:
+        lines.append(f"  {count:5d}x {error}")
+    return "\n".join(lines)
+
+
+# ============================================
+# HTTP mode
+# ============================================
+
+class Client:
+    """Keep-alive HTTP connections of one virtual user, one set per thread."""
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def _connection(self, scheme, netloc, fresh=False):
+        connections = self._local.__dict__.setdefault("connections", {})
+        if fresh or (scheme, netloc) not in connections:
+            if (scheme, netloc) in connections:
+                connections[(scheme, netloc)].close()
+            factory = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+            connections[(scheme, netloc)] = factory(netloc, timeout=REQUEST_TIMEOUT)
+        return connections[(scheme, netloc)]
+
+    def request(self, method, url, payload=None, headers=None):
+        """Send one request; returns ``(status, decoded JSON body or text)``."""
+        parts = urlsplit(url)
+        target = parts.path + (f"?{parts.query}" if parts.query else "")
+        body = None if payload is None else json.dumps(payload).encode("utf-8")
+        headers = {**(headers or {}), **({"Content-Type": "application/json"} if body is not None else {})}
+        for attempt in range(2):
+            connection = self._connection(parts.scheme, parts.netloc, fresh=attempt > 0)
+            try:
+                connection.request(method, target, body=body, headers=headers)
+                response = connection.getresponse()
+                raw = response.read()
+                break
+            except (ConnectionError, http.client.HTTPException):
+                # Server closed an idle keep-alive connection: reconnect once.
+                if attempt:
+                    raise
+        try:
+            data = json.loads(raw) if raw else None
+        except ValueError:
+            data = raw.decode("utf-8", "replace")
+        return response.status, data
+
+    def close(self):
+        for connection in self._local.__dict__.get("connections", {}).values():
+            connection.close()
+
+
+class VirtualUser:
+    """One simulated student: a session, a connection pool and a journey loop."""
+
+    def __init__(self, index, stats, supabase_url, anon_key, n8n_url, email, password, think_time, seed=None):
+        self.index = index
+        self.stats = stats
+        self.supabase_url = supabase_url.rstrip("/")
+        self.anon_key = anon_key
+        self.n8n_url = n8n_url.rstrip("/")
+        self.email = email
+        self.password = password
+        self.think_time = think_time
+        self.rng = random.Random(None if seed is None else seed + index)
+        self.client = Client()
+        self.session = None
+        self.journey = None
+        self._parallel = None
+
+    # -- requests ---------------------------------------------------------
+
+    def _headers(self, extra=None):
+        token = self.session["access_token"] if self.session else self.anon_key
+        return {"apikey": self.anon_key, "Authorization": f"Bearer {token}", **(extra or {})}
+
+    def call(self, step, method, url, payload=None, headers=None, tolerated=()):
+        """Time one request as ``step`` of the current journey; raise on HTTP errors
+        other than the ``tolerated`` statuses (which return None)."""
+        journey = self.journey
+        started = time.perf_counter()
+        ok = False
+        try:
+            status, data = self.client.request(method, url, payload, headers)
+            ok = status < 400 or status in tolerated
+        except (OSError, http.client.HTTPException) as exc:
+            raise StepError(f"{step}: {type(exc).__name__}: {exc}") from exc
+        finally:
+            self.stats.step(journey, step, time.perf_counter() - started, ok)
+        if status in tolerated:
+            return None
+        if not ok:
+            detail = data.get("msg") or data.get("message") or data if isinstance(data, dict) else data
+            raise StepError(f"{step}: HTTP {status} {str(detail)[:100]}")
+        return data
+
+    def auth(self, step, method, path, payload=None):
+        return self.call(step, method, f"{self.supabase_url}/auth/v1{path}", payload, self._headers())
+
+    def rest(self, step, method, table, query="", payload=None, single=False, prefer=None):
+        """A PostgREST request shaped like the supabase-js call the app makes."""
+        headers = {}
+        if single:
+            headers["Accept"] = "application/vnd.pgrst.object+json"
+        if prefer:
+            headers["Prefer"] = prefer
+        url = f"{self.supabase_url}/rest/v1/{table}" + (f"?{query}" if query else "")
+        # .single() without a row is a 406 the app treats as "nothing yet".
+        return self.call(step, method, url, payload, self._headers(headers), tolerated=(406,) if single else ())
+
+    def rpc(self, step, name, args):
+        """``supabase.rpc(name, args)``."""
+        return self.call(step, "POST", f"{self.supabase_url}/rest/v1/rpc/{name}", args, self._headers())
+
+    def parallel(self, step, calls):
+        """Run ``calls`` concurrently like the app's parallel context loads; the
+        wall time is recorded as ``step``."""
+        if self._parallel is None:
+            self._parallel = ThreadPoolExecutor(CONNECTIONS_PER_HOST, thread_name_prefix=f"load-user-{self.index}")
+        started = time.perf_counter()
+        futures = [self._parallel.submit(call) for call in calls]
+        wait(futures)
+        self.stats.step(self.journey, step, time.perf_counter() - started,
+                        ok=not any(future.exception() for future in futures), requests=0)
+        return [future.result() for future in futures]
+
+    def think(self):
+        if self.think_time:
+            time.sleep(self.rng.uniform(0.5, 1.5) * self.think_time)
+
+    # -- session ----------------------------------------------------------
+
+    def sign_in(self, step="sign in"):
+        self.session = None
+        self.session = self.auth(step, "POST", "/token?grant_type=password",
+                                 {"email": self.email, "password": self.password})
+        return self.session
+
+    def ensure_session(self):
+        if self.session is None:
+            self.sign_in()
+
+    @property
+    def user_id(self):
+        return self.session["user"]["id"]
+
+    # -- loop -------------------------------------------------------------
+
+    def run(self, journeys, deadline=None, iterations=None):
+        done = 0
+        try:
+            while (iterations is None or done < iterations) and (deadline is None or time.perf_counter() < deadline):
+                name = journeys[done % len(journeys)]
+                self.journey = name
+                started = time.perf_counter()
+                error = None
+                try:
+                    HTTP_JOURNEYS[name](self)
+                except StepError as exc:
+                    error = str(exc)
+                self.stats.journey(name, time.perf_counter() - started, error)
+                done += 1
+                self.think()
+        finally:
+            self.client.close()
+            if self._parallel is not None:
+                self._parallel.shutdown()
+
+
+def register(user):
+    """Registration wizard submit (``supabaseHelpers.auth.signUp``)."""
+    user.session = None
+    user.auth("sign up", "POST", "/signup", {
+        "email": f"load-{uuid.uuid4().hex[:12]}@example.com",
+        "password": "LoadTest123!",
+        "data": {"display_name": f"Carga {user.index}", "university": "Universidad de Prueba", "career_year": 3},
+    })
+
+
+def login_dashboard(user):
+    """Login form, then the context loads the dashboard waits for."""
+    user.sign_in()
+    user.auth("get user", "GET", "/user")
+    uid = quote(user.user_id)
+    now = quote(datetime.now(timezone.utc).isoformat())
+    since = (datetime.now(timezone.utc) - timedelta(days=90)).date().isoformat()
+    user.parallel("dashboard (all loads)", [
+        lambda: user.rest("study_stats", "GET", "study_stats",
+                          f"select=stats_data,recent_batches&user_id=eq.{uid}", single=True),
+        lambda: user.rest("review stats", "GET", "review_daily_stats",
+                          f"select=day,reviews,correct,new_cards,review_ms&user_id=eq.{uid}"
+                          f"&day=gte.{since}&order=day.asc"),
+        lambda: user.rest("documents", "GET", "documents", f"select=*&user_id=eq.{uid}&order=created_at.desc"),
+        lambda: user.rest("clinical_cases", "GET", "clinical_cases", f"select=*&user_id=eq.{uid}&order=created_at.desc"),
+        lambda: user.rest("study_notebooks", "GET", "study_notebooks",
+                          f"select=*&user_id=eq.{uid}&order=created_at.desc"),
+        lambda: user.rest("flashcards due", "GET", "flashcards",
+                          f"select=*,flashcard_decks(name,color,icon)&user_id=eq.{uid}&due_date=lte.{now}&limit=100"),
+        lambda: user.rpc("prefetch study session", "start_study_session",
+                         {**SESSION_ARGS, "p_create_session": False}),
+    ])
+
+
+def library_search(user):
+    """Library page load plus a search: the server-side ``search_documents`` RPC
+    and the content search over extracted PDF pages (``search_document_pages``).
+
+    The in-browser ``SearchIndex`` query makes no request; ``--mode browser``
+    covers it by replaying TC016/TC022.
+    """
+    user.ensure_session()
+    user.rest("documents", "GET", "documents", f"select=*&user_id=eq.{quote(user.user_id)}&order=created_at.desc")
+    term = user.rng.choice(SEARCH_TERMS)
+    # Server-side full-text search (supabaseHelpers.documents.search)
+    user.rpc("search (rpc)", "search_documents", {"p_query": term, "p_limit": 50})
+    # Content search, debounced after typing (LibraryContext.searchDocumentContents)
+    user.rpc("content search (rpc)", "search_document_pages", {"p_query": term, "p_limit": 20})
+
+
+def study_session(user):
+    """``FSRSContext.startStudySession``, a few ``answerCard`` calls and ``endStudySession``."""
+    user.ensure_session()
+    # Settings, due and new cards and the session record in one call
+    bootstrap = user.rpc("start session (rpc)", "start_study_session", SESSION_ARGS) or {}
+    due_cards, new_cards = bootstrap.get("due_cards") or [], bootstrap.get("new_cards") or []
+    session = bootstrap.get("session")
+
+    # answerCard only journals the review; the journal flushes them in one
+    # apply_reviews call at the end of the session (src/services/reviewJournal.js).
+    cards = (due_cards + new_cards)[:REVIEWS_PER_SESSION]
+    logs, updates = [], {}
+    for card in cards:
+        user.think()
+        rating = user.rng.choices((1, 2, 3, 4), weights=(1, 2, 6, 1))[0]
+        days = 0 if rating == 1 else max(1, round((card.get("stability") or 1) * (rating - 1)))
+        reviewed = datetime.now(timezone.utc)
+        updates[card["id"]] = {
+            "id": card["id"],
+            "state": "RELEARNING" if rating == 1 and card.get("state") == "REVIEW" else "REVIEW",
+            "due_date": (reviewed + timedelta(days=days)).isoformat(),
+            "last_review": reviewed.isoformat(),
+            "scheduled_days": days,
+            "reps": (card.get("reps") or 0) + 1,
+        }
+        logs.append({
+            "client_id": str(uuid.UUID(int=user.rng.getrandbits(128), version=4)),
+            "card_id": card["id"],
+            "rating": ("AGAIN", "HARD", "GOOD", "EASY")[rating - 1],
+            "review_duration_ms": user.rng.randint(3000, 20000),
+            "state_before": card.get("state"),
+            "scheduled_days": days,
+            "reviewed_at": reviewed.isoformat(),
+        })
+    if logs:
+        user.rpc("flush reviews (rpc)", "apply_reviews", {"logs": logs, "cards": list(updates.values())})
+
+    if session:
+        user.rest("end session", "PATCH", "study_sessions", f"id=eq.{quote(str(session['id']))}", {
+            "ended_at": datetime.now(timezone.utc).isoformat(),
+            "cards_studied": len(cards),
+        })
+
+
+def study_ai(user):
+    """StudyAI chat: load the notebooks, then one question to the n8n tutor."""
+    user.ensure_session()
+    notebooks = user.rest("study_notebooks", "GET", "study_notebooks",
+                          f"select=*&user_id=eq.{quote(user.user_id)}&order=created_at.desc") or []
+    notebook = user.rng.choice(notebooks) if notebooks else {}
+    # The body StudyAIContext.sendMessage posts; the journey creates no study_chats
+    # row, so chat_id is a fresh id
+    user.call("n8n estudio-ia/query", "POST", f"{user.n8n_url}/estudio-ia/query", {
+        "user_id": user.user_id,
+        "chat_id": str(uuid.uuid4()),
+        "academic_level": "pregrado",
+        "specialty": notebook.get("specialty") or "medicina general",
+        "query_text": user.rng.choice(AI_QUESTIONS),
+        "generate_flashcards": False,
+        "attachments": [],
+    }, {"Content-Type": "application/json"})
+
+
+HTTP_JOURNEYS = {
+    "register": register,
+    "login_dashboard": login_dashboard,
+    "library_search": library_search,
+    "study_session": study_session,
+    "study_ai": study_ai,
+}
+
+
+def run_http(journeys, users, duration=None, iterations=None, ramp_up=0.0, think_time=0.0,
+             supabase_url=None, anon_key=None, n8n_url=None, email=None, password=None, seed=None):
+    """Run ``users`` virtual users over HTTP; returns the :class:`Stats`."""
+    stats = Stats()
+    deadline = time.perf_counter() + duration if duration else None
+    virtual_users = [
+        VirtualUser(index, stats, supabase_url or config.SUPABASE_URL, anon_key or config.SUPABASE_ANON_KEY,
+                    n8n_url, email or config.LOGIN_USER, password or config.LOGIN_PASSWORD, think_time, seed)
+        for index in range(users)
+    ]
+
+    def start(user):
+        if ramp_up:
+            time.sleep(ramp_up * user.index / users)
+        # Stagger the journey order so every journey runs from the first second.
+        rotated = journeys[user.index % len(journeys):] + journeys[:user.index % len(journeys)]
+        user.run(rotated, deadline, iterations)
+
+    threads = [threading.Thread(target=start, args=(user,), name=f"load-user-{user.index}", daemon=True)
+               for user in virtual_users]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stats.finish()
+    return stats
+
+
+# ============================================
+# Browser mode
+# ============================================
+
+def browser_scripts(journeys):
+    """``{journey: [TC script paths]}`` for browser mode."""
+    from harness.runner import discover
+
+    scripts = discover()
+    return {
+        journey: [path for path in scripts if path.stem.startswith(BROWSER_SCRIPTS[journey])]
+        for journey in journeys
+    }
+
+
+async def run_browser(journeys, users, duration=None, iterations=None, ramp_up=0.0, think_time=0.0,
+                      browsers=None, headless=True, timeout=None):
+    """Replay the journeys' TC scripts with ``users`` concurrent headless users."""
+    from harness.runner import DEFAULT_TIMEOUT, BrowserPool, run_one
+
+    scripts = browser_scripts(journeys)
+    journeys = [journey for journey in journeys if scripts[journey]]
+    if not journeys:
+        raise SystemExit("No TC scripts found for the selected journeys.")
+    stats = Stats()
+    deadline = time.perf_counter() + duration if duration else None
+    browsers = browsers or max(1, -(-users // 4))
+
+    async with BrowserPool(browsers, headless=headless, warm_contexts=-(-users // browsers)) as pool:
+        async def user(index):
+            await asyncio.sleep(ramp_up * index / users if ramp_up else 0)
+            order = journeys[index % len(journeys):] + journeys[:index % len(journeys)]
+            done = 0
+            while (iterations is None or done < iterations) and (deadline is None or time.perf_counter() < deadline):
+                journey = order[done % len(order)]
+                started = time.perf_counter()
+                error = None
+                for path in scripts[journey]:
+                    result = await run_one(path, pool, timeout or DEFAULT_TIMEOUT)
+                    for number, step in enumerate((result.timing or {}).get("step_list", []), 1):
+                        name = f"{path.stem[:5]} {number:02d} {step['kind']} {step['route'] or ''}".rstrip()
+                        stats.step(journey, name, step["duration"], step["ok"], requests=0)
+                    if result.testStatus != "PASSED":
+                        lines = (result.testError or "failed").strip().splitlines() or ["failed"]
+                        error = f"{path.stem}: {lines[-1]}"
+                        break
+                stats.journey(journey, time.perf_counter() - started, error)
+                done += 1
+                if think_time:
+                    await asyncio.sleep(random.uniform(0.5, 1.5) * think_time)
+
+        await asyncio.gather(*(user(index) for index in range(users)))
+    stats.finish()
+    return stats
+
+
+# ============================================
+# CLI
+# ============================================
+
+def _journey_list(value):
+    names = [name.strip() for name in value.split(",") if name.strip()]
+    unknown = [name for name in names if name not in JOURNEYS]
+    if unknown or not names:
+        raise argparse.ArgumentTypeError(f"unknown journey(s) {', '.join(unknown)}; choose from {', '.join(JOURNEYS)}")
+    return names
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m harness.load",
+                                     description="Replay the TC user journeys as concurrent load.")
+    parser.add_argument("--mode", choices=("http", "browser"), default="http",
+                        help="HTTP traffic against the stand-ins (default) or headless browsers running TC scripts")
+    parser.add_argument("--users", type=int, default=10, help="concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=None,
+                        help="seconds to run (default: 30 unless --iterations is given)")
+    parser.add_argument("--iterations", type=int, default=None, help="journeys per user")
+    parser.add_argument("--ramp-up", type=float, default=0.0, help="seconds over which users start")
+    parser.add_argument("--think-time", type=float, default=0.0,
+                        help="mean pause in seconds between journeys and between answered cards")
+    parser.add_argument("--journeys", type=_journey_list, default=list(JOURNEYS),
+                        help=f"comma-separated subset of {', '.join(JOURNEYS)}")
+    parser.add_argument("--supabase-url", default=None,
+                        help="send HTTP traffic to this Supabase instead of the in-process stand-in")
+    parser.add_argument("--n8n-url", default=None,
+                        help="send webhook traffic to this n8n webhook base URL instead of the simulator")
+    parser.add_argument("--n8n-profile", default="fast", help="latency profile of the in-process n8n simulator")
+    parser.add_argument("--browsers", type=int, default=None, help="browser mode: shared Chromium instances")
+    parser.add_argument("--headed", action="store_true", help="browser mode: show the browser windows")
+    parser.add_argument("--seed", type=int, default=None, help="seed the random choices of the virtual users")
+    parser.add_argument("--json", dest="json_path", default=None, help="write the report to this JSON file")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    duration = args.duration if args.duration or args.iterations else 30.0
+    options = dict(duration=duration, iterations=args.iterations, ramp_up=args.ramp_up, think_time=args.think_time)
+
+    stand_ins = []
+    try:
+        if args.mode == "http":
+            supabase_url, anon_key = args.supabase_url, None
+            if not supabase_url:
+                from harness.stubs import supabase
+                stand_in = supabase.start(port=0)
+                stand_ins.append(stand_in)
+                supabase_url, anon_key = stand_in.url, supabase.ANON_KEY
+            n8n_url = args.n8n_url
+            if not n8n_url and "study_ai" in args.journeys:
+                from harness.stubs import n8n
+                simulator = n8n.start(port=0, profile=args.n8n_profile, seed=args.seed)
+                stand_ins.append(simulator)
+                n8n_url = simulator.env["VITE_N8N_BASE_URL"]
+            print(f"{args.users} HTTP users against {supabase_url}"
+                  + (f" and {n8n_url}" if n8n_url else "") + f": {', '.join(args.journeys)}", flush=True)
+            stats = run_http(args.journeys, args.users, supabase_url=supabase_url, anon_key=anon_key,
+                             n8n_url=n8n_url or "", seed=args.seed, **options)
+        else:
+            print(f"{args.users} browser users against {config.APP_URL}: {', '.join(args.journeys)}", flush=True)
+            stats = asyncio.run(run_browser(args.journeys, args.users, browsers=args.browsers,
+                                            headless=not args.headed, **options))
+    finally:
+        for stand_in in stand_ins:
+            stand_in.shutdown()
+
+    report = stats.report()
+    print("\n" + format_report(report))
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=2, ensure_ascii=False)
+    return 1 if report["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,254 @@
+"""Runtime for test modules compiled by ``harness.compile_plan``.
+
+A compiled module is a list of small ``async def`` bodies decorated with
+:func:`case`; everything they need lives here so the emitted code stays short:
+
+- fixtures: ``"login"`` opens a context from the cached session
+  (``harness.session``; the real sign-in happens once per process) on the app
+  root, ``None`` opens a blank context;
+- semantic locators (roles, accessible names, placeholders, label text)
+  instead of the absolute XPaths of the generated ``TC*.py`` scripts;
+- actions and assertions that go through ``harness.waits`` and
+  ``harness.timing``.
+
+Run a compiled module with ``python -m harness.runner --compiled tmp/compiled_plan.py``.
+"""
+
+import re
+from dataclasses import dataclass
+
+from harness import config, session, timing, waits
+
+ASSERT_TIMEOUT_MS = 10000
+
+# English words used in plan step descriptions -> what the (Spanish) UI says.
+HINT_WORDS = {
+    "email": ("email", "correo"),
+    "username": ("usuario", "username"),
+    "password": ("contraseña", "password"),
+    "name": ("nombre", "name"),
+    "description": ("descripci", "description"),
+    "message": ("mensaje", "pregunta", "escribe", "message"),
+    "title": ("título", "titulo", "title"),
+    "body": ("contenido", "cuerpo", "body"),
+    "diagnosis": ("diagn",),
+    "answer": ("respuesta", "answer"),
+    "specialty": ("especialidad", "specialty"),
+    "duration": ("duraci", "duration"),
+    "style": ("estilo", "style"),
+    "send": ("enviar", "send"),
+}
+
+# Words in a hint that describe the widget rather than name it.
+_FILLER = {"the", "field", "input", "chat", "post", "notebook", "dropdown", "selector", "button"}
+
+
+@dataclass
+class Case:
+    """One compiled test: plan ids, title, fixture and body."""
+
+    ids: tuple
+    title: str
+    fixture: str
+    body: object
+
+    @property
+    def name(self):
+        slug = re.sub(r"[^0-9A-Za-z]+", "_", self.title).strip("_")
+        return f"{self.ids[0]}_{slug}"
+
+    async def run(self, browser):
+        context = await browser.new_context(**await _context_options(self.fixture))
+        context.set_default_timeout(waits.ACTION_TIMEOUT_MS)
+        try:
+            page = await context.new_page()
+            if self.fixture == "login":
+                await page.goto(url("/"), wait_until="commit")
+            await self.body(page)
+        finally:
+            await context.close()
+
+
+def case(*ids, title, fixture="login"):
+    """Mark an ``async def body(page)`` as a compiled test for the plan ``ids``."""
+    def decorate(body):
+        body.case = Case(ids, title, fixture, body)
+        return body
+    return decorate
+
+
+def collect(namespace):
+    """The cases defined in a compiled module's namespace, in plan order."""
+    return [value.case for value in namespace.values() if isinstance(getattr(value, "case", None), Case)]
+
+
+async def _context_options(fixture):
+    if fixture == "login":
+        return {"storage_state": await session.storage_state()}
+    if fixture is None:
+        return {}
+    raise ValueError(f"unknown fixture: {fixture!r}")
+
+
+def url(path):
+    return f"{config.APP_URL.rstrip('/')}{path}"
+
+
+def var(name):
+    """Value of a ``{{NAME}}`` placeholder from the plan (``config.NAME``)."""
+    return getattr(config, name)
+
+
+# ============================================
+# Locators
+# ============================================
+
+def _exact(*names):
+    alternatives = "|".join(re.escape(name) for name in names)
+    return re.compile(rf"^\s*(?:{alternatives})\s*$", re.IGNORECASE)
+
+
+def _hint_pattern(hint):
+    words = [word for word in re.split(r"[^\wáéíóúñ]+", hint.lower()) if word and word not in _FILLER]
+    alternatives = [alias for word in words for alias in HINT_WORDS.get(word, (word,))]
+    return re.compile("|".join(re.escape(alias) for alias in alternatives), re.IGNORECASE), alternatives
+
+
+def _any(*locators):
+    combined = locators[0]
+    for locator in locators[1:]:
+        combined = combined.or_(locator)
+    return combined.first
+
+
+def button(page, *names):
+    return page.get_by_role("button", name=_exact(*names)).first
+
+
+def button_like(page, hint):
+    """A button described only by purpose (e.g. "send"), possibly icon-only."""
+    pattern, words = _hint_pattern(hint)
+    by_class = ", ".join(f'button[class*="{word}"]' for word in words)
+    return _any(page.get_by_role("button", name=pattern), page.locator(by_class))
+
+
+def link(page, *names):
+    name = _exact(*names)
+    return _any(page.get_by_role("link", name=name), page.get_by_role("menuitem", name=name))
+
+
+def nav(page, name):
+    return _any(page.get_by_role("navigation").get_by_role("link", name=_exact(name)), link(page, name))
+
+
+def target(page, name):
+    """Whatever clickable thing is called ``name``: button, link, tab or plain text."""
+    exact = _exact(name)
+    return _any(
+        page.get_by_role("button", name=exact),
+        page.get_by_role("link", name=exact),
+        page.get_by_role("tab", name=exact),
+        page.get_by_role("menuitem", name=exact),
+        page.get_by_text(name, exact=True),
+    )
+
+
+def field(page, hint):
+    """Text input described by ``hint`` ("email/username", "notebook name"...)."""
+    pattern, _ = _hint_pattern(hint)
+    controls = "xpath=following::*[self::input or self::textarea][1]"
+    if "password" in hint.lower():
+        return _any(page.get_by_label(pattern), page.locator('input[type="password"]'))
+    return _any(
+        page.get_by_label(pattern),
+        page.get_by_placeholder(pattern),
+        page.locator("label", has_text=pattern).locator(controls),
+    )
+
+
+def dropdown(page, hint):
+    pattern, _ = _hint_pattern(hint)
+    return _any(
+        page.get_by_role("combobox", name=pattern),
+        page.locator("label", has_text=pattern).locator("xpath=following::select[1]"),
+    )
+
+
+def toggle(page, name):
+    exact = _exact(name)
+    return _any(page.get_by_role("switch", name=exact), page.get_by_role("checkbox", name=exact))
+
+
+def option(page, kind):
+    """First choice in a picker such as the notebook icon or color selector."""
+    return page.locator(f'[class~="{kind}-option"]').first
+
+
+def first_item(page, kind):
+    """First real entry of a card list (skips "new ..." placeholder cards)."""
+    return page.locator(f'[class~="{kind}-card"]:not([class~="new-card"])').first
+
+
+def element(page, name):
+    exact = _exact(name)
+    return _any(
+        page.get_by_role("heading", name=exact),
+        page.get_by_role("button", name=exact),
+        page.get_by_role("link", name=exact),
+        page.get_by_label(exact),
+        page.get_by_text(name),
+    )
+
+
+def text(page, value):
+    return page.get_by_text(value).first
+
+
+# ============================================
+# Actions and assertions
+# ============================================
+
+async def goto(page, path):
+    await page.goto(url(path), wait_until="commit")
+    await waits.settle(page)
+
+
+async def click(page, locator):
+    await waits.click(page, locator)
+
+
+async def fill(page, locator, value):
+    await waits.fill(page, locator, value)
+
+
+async def select(page, locator, label):
+    async with timing.step("select", page, locator):
+        await waits.settle(page)
+        await locator.select_option(label=label)
+
+
+async def press(page, key):
+    async with timing.step("press", page, key):
+        await page.keyboard.press(key)
+
+
+async def url_contains(page, fragment):
+    await waits.route(page, fragment)
+    assert fragment in page.url, f"expected URL containing {fragment!r}, got {page.url!r}"
+
+
+async def visible(locator):
+    await timing.expect(locator).to_be_visible(timeout=ASSERT_TIMEOUT_MS)
+
+
+async def hidden(locator):
+    await timing.expect(locator).to_be_hidden(timeout=ASSERT_TIMEOUT_MS)
+
+
+async def checked(locator):
+    await timing.expect(locator).to_be_checked(timeout=ASSERT_TIMEOUT_MS)
+
+
+def manual(description):
+    """Placeholder for a plan step the compiler could not translate."""
+    raise NotImplementedError(f"plan step needs a hand-written translation: {description}")
@@ -0,0 +1,436 @@
+"""Parallel, sharded runner for the generated TC scripts.
+
+Every TC script starts its own Playwright driver, launches its own Chromium and
+calls ``asyncio.run(run_test())`` at import time, so running the suite means 47
+cold browser launches in a row. This runner loads each script *without* its
+trailing ``asyncio.run(...)`` call, swaps the module's ``async_api`` for a shim
+that hands out a pooled browser, and runs the ``run_test`` bodies as concurrent
+browser contexts.
+
+Usage (from ``testsprite_tests/``)::
+
+    python -m harness.runner                   # all scripts, one worker per core
+    python -m harness.runner --workers 4       # at most 4 tests in flight
+    python -m harness.runner --shard 2/3       # second third of the suite (CI)
+    python -m harness.runner --no-context-pool # cold context per test (see harness.contexts)
+    python -m harness.runner -k Dashboard      # only scripts matching "Dashboard"
+    python -m harness.runner --stub-supabase   # offline, against harness.stubs.supabase
+    python -m harness.runner --stub-n8n flaky  # AI webhooks from harness.stubs.n8n
+    python -m harness.runner --timing tmp/timing.json  # per-step/per-route timing report
+    python -m harness.runner --compiled tmp/compiled_plan.py  # output of harness.compile_plan
+
+Each run is appended to ``tmp/history.sqlite``; ``python -m harness.history
+report`` lists the slowest, regressed and flaky tests.
+
+Every test is recorded by ``harness.timing``: per-step durations split into
+waiting and acting, plus LCP, long tasks and JS heap per app route.
+"""
+
+import argparse
+import ast
+import asyncio
+import json
+import math
+import os
+import sys
+import time
+import traceback
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from playwright.async_api import async_playwright
+
+from harness import timing
+from harness.contexts import ContextPool
+from harness.config import SUITE_DIR
+
+# Same flags the generated scripts use, minus "--single-process": a single
+# process browser cannot safely host several concurrent contexts.
+BROWSER_ARGS = [
+    "--window-size=1280,720",
+    "--disable-dev-shm-usage",
+    "--ipc=host",
+]
+
+DEFAULT_TIMEOUT = 300.0
+
+
+@dataclass
+class TestResult:
+    """Outcome of one TC script, shaped after ``tmp/test_results.json``."""
+
+    name: str
+    testStatus: str
+    duration: float
+    testError: str = ""
+    timing: dict = None
+
+
+# ============================================
+# Discovery
+# ============================================
+
+def discover(root=SUITE_DIR, pattern=None):
+    """Return the TC scripts under ``root``, sorted by file name."""
+    scripts = sorted(Path(root).glob("TC*.py"))
+    if pattern:
+        scripts = [path for path in scripts if pattern.lower() in path.name.lower()]
+    return scripts
+
+
+def parse_shard(value):
+    """Parse ``"i/n"`` (1-based) into ``(i, n)``."""
+    try:
+        index, total = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"shard must look like i/n, got {value!r}")
+    if total < 1 or not 1 <= index <= total:
+        raise argparse.ArgumentTypeError(f"shard index out of range: {value!r}")
+    return index, total
+
+
+def select_shard(scripts, index, total):
+    """Pick every ``total``-th script starting at ``index`` (1-based).
+
+    Striding instead of slicing keeps the login-heavy TC009-TC029 scripts spread
+    evenly across shards.
+    """
+    return scripts[index - 1::total]
+
+
+# ============================================
+# Loading TC scripts without running them
+# ============================================
+
+def _is_asyncio_run(node):
+    if not isinstance(node, ast.Expr) or not isinstance(node.value, ast.Call):
+        return False
+    func = node.value.func
+    return (
+        isinstance(func, ast.Attribute)
+        and func.attr == "run"
+        and isinstance(func.value, ast.Name)
+        and func.value.id == "asyncio"
+    )
+
+
+def load_test(path):
+    """Execute a TC script's definitions and return its module namespace.
+
+    The module-level ``asyncio.run(run_test())`` call is stripped so importing
+    the script does not start the test.
+    """
+    source = Path(path).read_text(encoding="utf-8")
+    tree = ast.parse(source, filename=str(path))
+    tree.body = [node for node in tree.body if not _is_asyncio_run(node)]
+    namespace = {"__name__": f"testsprite.{Path(path).stem}", "__file__": str(path)}
+    exec(compile(tree, str(path), "exec"), namespace)
+    if "run_test" not in namespace:
+        raise RuntimeError(f"{Path(path).name} does not define run_test()")
+    return namespace
+
+
+def load_compiled(path):
+    """Return the ``harness.plan`` cases defined by a compiled test module."""
+    from harness import plan
+
+    path = Path(path)
+    namespace = {"__name__": f"testsprite.{path.stem}", "__file__": str(path)}
+    exec(compile(path.read_text(encoding="utf-8"), str(path), "exec"), namespace)
+    return plan.collect(namespace)
+
+
+# ============================================
+# Shared browser shim
+# ============================================
+
+class SharedBrowser:
+    """A pooled browser as seen by one test.
+
+    Contexts come from the browser's warm :class:`ContextPool` when possible
+    and are tracked so the runner can close (or return) whatever a failing
+    test leaves behind; ``close()`` is a no-op because the browser is shared.
+    """
+
+    def __init__(self, browser, context_pool=None):
+        self._browser = browser
+        self._context_pool = context_pool
+        self.contexts = []
+
+    def __getattr__(self, name):
+        return getattr(self._browser, name)
+
+    async def new_context(self, **kwargs):
+        if self._context_pool is not None and set(kwargs) <= {"storage_state"}:
+            context = await self._context_pool.acquire(kwargs.get("storage_state"))
+        else:
+            context = await timing.instrument_context(await self._browser.new_context(**kwargs))
+        self.contexts.append(context)
+        return context
+
+    async def close(self):
+        pass
+
+    async def release(self):
+        """Close the contexts this test opened and did not close itself."""
+        for context in self.contexts:
+            try:
+                await context.close()
+            except Exception:
+                pass
+        self.contexts.clear()
+
+
+class _SharedChromium:
+    def __init__(self, shared):
+        self._shared = shared
+
+    async def launch(self, **kwargs):
+        return self._shared
+
+
+class _SharedPlaywright:
+    def __init__(self, shared):
+        self.chromium = _SharedChromium(shared)
+
+    async def start(self):
+        return self
+
+    async def stop(self):
+        pass
+
+
+class SharedAsyncApi:
+    """Stand-in for ``playwright.async_api`` inside a loaded TC script."""
+
+    def __init__(self, shared):
+        self._shared = shared
+
+    def async_playwright(self):
+        return _SharedPlaywright(self._shared)
+
+
+# ============================================
+# Running
+# ============================================
+
+class BrowserPool:
+    """A fixed set of Chromium instances shared by all workers.
+
+    With ``warm_contexts`` > 0 each browser also keeps that many pre-warmed
+    contexts (see ``harness.contexts``).
+    """
+
+    def __init__(self, size, headless=True, warm_contexts=0):
+        self.size = max(1, size)
+        self.headless = headless
+        self.warm_contexts = warm_contexts
+        self._playwright = None
+        self._browsers = []
+        self._context_pools = []
+        self._next = 0
+
+    async def __aenter__(self):
+        self._playwright = await async_playwright().start()
+        self._browsers = await asyncio.gather(*(
+            self._playwright.chromium.launch(headless=self.headless, args=BROWSER_ARGS)
+            for _ in range(self.size)
+        ))
+        if self.warm_contexts > 0:
+            self._context_pools = await asyncio.gather(*(
+                ContextPool(browser, self.warm_contexts).warm() for browser in self._browsers
+            ))
+        return self
+
+    async def __aexit__(self, *exc):
+        await asyncio.gather(*(pool.close() for pool in self._context_pools), return_exceptions=True)
+        await asyncio.gather(*(browser.close() for browser in self._browsers), return_exceptions=True)
+        await self._playwright.stop()
+
+    def acquire(self):
+        """Hand out ``(browser, context_pool)`` round-robin; contexts are isolated anyway."""
+        index = self._next % self.size
+        self._next += 1
+        return self._browsers[index], (self._context_pools[index] if self._context_pools else None)
+
+
+async def run_case(name, body, pool, timeout=DEFAULT_TIMEOUT):
+    """Run ``body(shared_browser)`` on a pooled browser and report the outcome."""
+    started = time.perf_counter()
+    shared = SharedBrowser(*pool.acquire())
+    recorder = timing.Recorder(name)
+    token = timing.activate(recorder)
+    try:
+        await asyncio.wait_for(body(shared), timeout)
+        status, error = "PASSED", ""
+    except asyncio.TimeoutError:
+        status, error = "FAILED", f"Timed out after {timeout:.0f}s"
+    except Exception as exc:
+        status = "FAILED"
+        error = "".join(traceback.format_exception_only(type(exc), exc)).strip()
+    finally:
+        recorder.finish()
+        timing.deactivate(token)
+        await shared.release()
+    return TestResult(name, status, time.perf_counter() - started, error, recorder.summary())
+
+
+async def run_one(path, pool, timeout=DEFAULT_TIMEOUT):
+    """Run a single TC script on a pooled browser and report the outcome."""
+    async def body(shared):
+        namespace = load_test(path)
+        namespace["async_api"] = SharedAsyncApi(shared)
+        namespace["expect"] = timing.expect
+        await namespace["run_test"]()
+
+    return await run_case(Path(path).stem, body, pool, timeout)
+
+
+async def _run_all(jobs, workers, browsers, timeout, headless, on_result, warm_contexts):
+    semaphore = asyncio.Semaphore(max(1, workers))
+
+    async with BrowserPool(browsers, headless=headless, warm_contexts=warm_contexts) as pool:
+        async def worker(job):
+            async with semaphore:
+                result = await job(pool)
+            if on_result:
+                on_result(result)
+            return result
+
+        return await asyncio.gather(*(worker(job) for job in jobs))
+
+
+async def run_suite(scripts, workers, browsers, timeout=DEFAULT_TIMEOUT, headless=True, on_result=None,
+                    warm_contexts=0):
+    """Run ``scripts`` with at most ``workers`` in flight on ``browsers`` Chromiums.
+
+    ``warm_contexts`` is the number of pre-warmed contexts kept per browser
+    (0 disables the context pool).
+    """
+    jobs = [lambda pool, path=path: run_one(path, pool, timeout) for path in scripts]
+    return await _run_all(jobs, workers, browsers, timeout, headless, on_result, warm_contexts)
+
+
+async def run_cases(cases, workers, browsers, timeout=DEFAULT_TIMEOUT, headless=True, on_result=None,
+                    warm_contexts=0):
+    """Like :func:`run_suite` for ``harness.plan`` cases from a compiled module."""
+    jobs = [lambda pool, case=case: run_case(case.name, case.run, pool, timeout) for case in cases]
+    return await _run_all(jobs, workers, browsers, timeout, headless, on_result, warm_contexts)
+
+
+def _print_result(result):
+    line = f"{result.testStatus:<6} {result.duration:7.1f}s  {result.name}"
+    if result.testError:
+        line += f"\n         {result.testError.splitlines()[-1]}"
+    print(line, flush=True)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m harness.runner",
+        description="Run the TestSprite TC scripts concurrently on shared browsers.",
+    )
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="maximum number of tests running at once (default: CPU count)")
+    parser.add_argument("--browsers", type=int, default=None,
+                        help="number of shared Chromium instances (default: one per 4 workers)")
+    parser.add_argument("--shard", type=parse_shard, default=(1, 1), metavar="I/N",
+                        help="run only the I-th of N interleaved slices of the suite")
+    parser.add_argument("-k", dest="pattern", default=None,
+                        help="only run scripts whose file name contains this text")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT,
+                        help="per-test timeout in seconds")
+    parser.add_argument("--no-context-pool", dest="context_pool", action="store_false",
+                        help="give every test a cold new context instead of a pre-warmed pooled one")
+    parser.add_argument("--headed", action="store_true", help="show the browser windows")
+    parser.add_argument("--json", dest="json_path", default=None,
+                        help="write the results to this JSON file")
+    parser.add_argument("--timing", dest="timing_path", default=None,
+                        help="write the per-test and per-route timing report to this JSON file")
+    parser.add_argument("--no-history", dest="history", action="store_false",
+                        help="do not append this run to the harness.history database")
+    parser.add_argument("--compiled", dest="compiled_path", default=None, metavar="MODULE",
+                        help="run the cases of a module built by harness.compile_plan instead of the TC scripts")
+    parser.add_argument("--stub-supabase", action="store_true",
+                        help="serve the local Supabase stand-in in-process (app must run with `npm run dev:stub`)")
+    parser.add_argument("--stub-n8n", nargs="?", const="instant", default=None, metavar="PROFILE",
+                        help="serve the n8n webhook simulator in-process with this latency profile "
+                             "(default: instant; app must run with `npm run dev:stub`)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.compiled_path:
+        tests = load_compiled(args.compiled_path)
+        if args.pattern:
+            tests = [case for case in tests if args.pattern.lower() in case.name.lower()]
+        run = run_cases
+    else:
+        tests = discover(pattern=args.pattern)
+        run = run_suite
+    tests = select_shard(tests, *args.shard)
+    if not tests:
+        print("No tests selected.")
+        return 0
+
+    workers = min(args.workers, len(tests))
+    browsers = args.browsers or math.ceil(workers / 4)
+    warm_contexts = math.ceil(workers / browsers) if args.context_pool else 0
+    print(f"Running {len(tests)} tests with {workers} workers on {browsers} browser(s), "
+          f"shard {args.shard[0]}/{args.shard[1]}", flush=True)
+
+    stand_ins = []
+    if args.stub_supabase:
+        from harness.stubs import supabase
+        stand_in = supabase.start()
+        supabase.use_stand_in(stand_in)
+        stand_ins.append(stand_in)
+        print(f"Supabase stand-in on {stand_in.url}", flush=True)
+    if args.stub_n8n:
+        from harness.stubs import n8n
+        simulator = n8n.start(profile=args.stub_n8n)
+        stand_ins.append(simulator)
+        print(f"n8n simulator on {simulator.url} ({args.stub_n8n})", flush=True)
+
+    started = time.perf_counter()
+    try:
+        results = asyncio.run(run(
+            tests, workers, browsers,
+            timeout=args.timeout, headless=not args.headed, on_result=_print_result,
+            warm_contexts=warm_contexts,
+        ))
+    finally:
+        for stand_in in stand_ins:
+            stand_in.shutdown()
+    elapsed = time.perf_counter() - started
+
+    failed = [result for result in results if result.testStatus != "PASSED"]
+    print(f"\n{len(results) - len(failed)} passed, {len(failed)} failed in {elapsed:.1f}s")
+
+    summaries = {result.name: result.timing for result in results if result.timing}
+    routes = timing.aggregate(summaries)
+    if routes:
+        print("\n" + timing.format_routes(routes))
+    if args.timing_path:
+        Path(args.timing_path).write_text(
+            json.dumps({"routes": routes, "tests": summaries}, indent=2), encoding="utf-8"
+        )
+
+    if args.history:
+        from harness import history
+        db = history.connect()
+        try:
+            history.record_run(db, [asdict(result) for result in results])
+        finally:
+            db.close()
+
+    if args.json_path:
+        Path(args.json_path).write_text(
+            json.dumps([asdict(result) for result in results], indent=2), encoding="utf-8"
+        )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,179 @@
+"""Cached, authenticated Playwright storage state.
+
+Logging in through the UI costs every dashboard/library/study test several
+seconds. Instead, the harness signs in once with the same GoTrue password grant
+that ``AuthContext.signIn`` (``supabase.auth.signInWithPassword``) uses, writes
+the session where supabase-js looks for it (``localStorage`` key
+``sb-<project-ref>-auth-token``) and hands the resulting ``storage_state`` to
+``browser.new_context``::
+
+    from harness import session
+
+    context = await browser.new_context(storage_state=await session.storage_state())
+
+The state is cached in memory for the process and on disk under
+``tmp/auth/``. A cached session is reused until its access token is about to
+expire; it is then refreshed with the refresh token, or replaced by a fresh
+password sign-in if the refresh fails.
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+import urllib.error
+import urllib.request
+from urllib.parse import urlparse
+
+from harness import config
+
+AUTH_DIR = config.TMP_DIR / "auth"
+
+# Treat tokens this close to expiry as expired so a test never starts with a
+# session that runs out halfway through.
+EXPIRY_MARGIN_SECONDS = 300
+
+_cache = {}
+_lock = None
+
+
+class AuthError(RuntimeError):
+    """Raised when Supabase rejects the test account's credentials."""
+
+
+def storage_key(supabase_url=None):
+    """The localStorage key supabase-js v2 uses for the session."""
+    host = urlparse(supabase_url or config.SUPABASE_URL).hostname or ""
+    return f"sb-{host.split('.')[0]}-auth-token"
+
+
+def _token_request(grant_type, payload):
+    request = urllib.request.Request(
+        f"{config.SUPABASE_URL}/auth/v1/token?grant_type={grant_type}",
+        data=json.dumps(payload).encode("utf-8"),
+        headers={
+            "apikey": config.SUPABASE_ANON_KEY,
+            "Authorization": f"Bearer {config.SUPABASE_ANON_KEY}",
+            "Content-Type": "application/json",
+        },
+        method="POST",
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=30) as response:
+            session = json.load(response)
+    except urllib.error.HTTPError as exc:
+        detail = exc.read().decode("utf-8", "replace")
+        raise AuthError(f"Supabase {grant_type} grant failed ({exc.code}): {detail}") from exc
+    # Older GoTrue versions only send expires_in; supabase-js fills expires_at itself.
+    session.setdefault("expires_at", int(time.time()) + int(session.get("expires_in", 3600)))
+    return session
+
+
+def sign_in(email=None, password=None):
+    """Password sign-in, exactly like ``supabaseHelpers.auth.signIn``."""
+    return _token_request("password", {
+        "email": email or config.LOGIN_USER,
+        "password": password or config.LOGIN_PASSWORD,
+    })
+
+
+def refresh(session):
+    """Exchange the session's refresh token for a new session."""
+    return _token_request("refresh_token", {"refresh_token": session["refresh_token"]})
+
+
+def build_storage_state(session, app_url=None):
+    """Wrap a GoTrue session in Playwright's ``storage_state`` format."""
+    return {
+        "cookies": [],
+        "origins": [{
+            "origin": app_url or config.APP_URL,
+            "localStorage": [{"name": storage_key(), "value": json.dumps(session)}],
+        }],
+    }
+
+
+def session_from_state(state):
+    """Extract the GoTrue session from a storage state, or None."""
+    key = storage_key()
+    for origin in state.get("origins", []):
+        for item in origin.get("localStorage", []):
+            if item.get("name") == key:
+                return json.loads(item["value"])
+    return None
+
+
+def is_fresh(state, now=None):
+    """True while the cached access token outlives the expiry margin."""
+    session = session_from_state(state) if state else None
+    if not session:
+        return False
+    now = time.time() if now is None else now
+    return session.get("expires_at", 0) - EXPIRY_MARGIN_SECONDS > now
+
+
+def _cache_path(email):
+    digest = hashlib.sha1(f"{config.SUPABASE_URL}|{email}".encode("utf-8")).hexdigest()[:12]
+    return AUTH_DIR / f"{storage_key()}-{digest}.json"
+
+
+def _load(path):
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def _save(path, state):
+    AUTH_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(state), encoding="utf-8")
+    tmp.replace(path)
+
+
+def load_or_create(email=None, password=None):
+    """Blocking version of :func:`storage_state`, backed by the disk cache."""
+    email = email or config.LOGIN_USER
+    path = _cache_path(email)
+    state = _load(path)
+    if is_fresh(state):
+        return state
+
+    session = None
+    previous = session_from_state(state) if state else None
+    if previous and previous.get("refresh_token"):
+        try:
+            session = refresh(previous)
+        except (AuthError, urllib.error.URLError):
+            session = None
+    if session is None:
+        session = sign_in(email, password)
+
+    state = build_storage_state(session)
+    _save(path, state)
+    return state
+
+
+async def storage_state(email=None, password=None):
+    """Storage state for the test account, signing in at most once per process.
+
+    Concurrent callers (parallel tests under ``harness.runner``) share a single
+    sign-in.
+    """
+    global _lock
+    if _lock is None:
+        _lock = asyncio.Lock()
+    email = email or config.LOGIN_USER
+    async with _lock:
+        state = _cache.get(email)
+        if not is_fresh(state):
+            state = await asyncio.to_thread(load_or_create, email, password)
+            _cache[email] = state
+    return state
+
+
+def invalidate(email=None):
+    """Forget the cached session, e.g. after a test signs out server-side."""
+    email = email or config.LOGIN_USER
+    _cache.pop(email, None)
+    _cache_path(email).unlink(missing_ok=True)
@@ -0,0 +1,12 @@
+"""Local stand-ins for the app's remote backends.
+
+- ``harness.stubs.supabase``: PostgREST, GoTrue auth and Storage endpoints
+  used by ``src/config/supabase.js``, backed by an in-memory store seeded
+  from ``fixtures/``.
+- ``harness.stubs.n8n``: the n8n AI webhooks (``src/services/n8n.js`` and
+  ``StudyAIContext``) with canned responses and configurable latency, jitter
+  and failure rates.
+
+Each stand-in runs either as a CLI (``python -m harness.stubs.supabase``)
+or in-process on a background thread (``start(...)``).
+"""
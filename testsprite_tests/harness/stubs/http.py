@@ -0,0 +1,106 @@
+"""Small HTTP plumbing shared by the stand-in servers."""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+CORS_HEADERS = {
+    "Access-Control-Allow-Origin": "*",
+    "Access-Control-Allow-Methods": "GET, POST, PUT, PATCH, DELETE, HEAD, OPTIONS",
+    "Access-Control-Allow-Headers": "*",
+    "Access-Control-Expose-Headers": "Content-Range, Content-Length, Content-Type, Location",
+    "Access-Control-Max-Age": "86400",
+}
+
+
+class JSONRequestHandler(BaseHTTPRequestHandler):
+    """Request handler with CORS, JSON helpers and quiet logging.
+
+    Subclasses implement ``route(method)``; the browser app runs on another
+    origin (the Vite server), so every response carries CORS headers.
+    """
+
+    protocol_version = "HTTP/1.1"
+    server_version = "SynapseStub/1.0"
+    # Headers and body are separate writes; with Nagle on, a keep-alive client
+    # waits for the delayed ACK (~40 ms) before it sees the body.
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        if getattr(self.server, "verbose", False):
+            super().log_message(format, *args)
+
+    # -- request helpers -------------------------------------------------
+
+    @property
+    def path_only(self):
+        return urlsplit(self.path).path
+
+    @property
+    def query_pairs(self):
+        return parse_qsl(urlsplit(self.path).query, keep_blank_values=True)
+
+    def read_body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def read_json(self, default=None):
+        body = self.read_body()
+        if not body:
+            return default
+        return json.loads(body)
+
+    # -- response helpers ------------------------------------------------
+
+    def send_bytes(self, status, body=b"", content_type="application/octet-stream", headers=None):
+        self.send_response(status)
+        for key, value in {**CORS_HEADERS, **(headers or {})}.items():
+            self.send_header(key, value)
+        if status != 204:
+            self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body and self.command != "HEAD":
+            self.wfile.write(body)
+
+    def send_json(self, status, payload, headers=None):
+        body = b"" if payload is None else json.dumps(payload).encode("utf-8")
+        self.send_bytes(status, body, "application/json; charset=utf-8", headers)
+
+    # -- dispatch --------------------------------------------------------
+
+    def _dispatch(self):
+        try:
+            self.route(self.command)
+        except Exception as exc:  # keep the server alive, surface the error to the app
+            self.send_json(500, {"message": f"{type(exc).__name__}: {exc}"})
+
+    def do_OPTIONS(self):
+        self.send_bytes(204)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = do_HEAD = _dispatch
+
+    def route(self, method):
+        raise NotImplementedError
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address, handler, verbose=False):
+        super().__init__(address, handler)
+        self.verbose = verbose
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+def serve_in_thread(server):
+    """Run ``server`` on a daemon thread; call ``server.shutdown()`` to stop."""
+    thread = threading.Thread(target=server.serve_forever, name=type(server).__name__, daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,311 @@
+"""Local simulator for the n8n AI webhooks.
+
+Answers the webhooks the app calls:
+
+- ``sim-generator``, ``tutor-invisible``, ``flashcard-factory``
+  (``src/services/n8n.js``)
+- ``estudio-ia/query`` (``StudyAIContext.sendMessage``)
+
+with canned payloads from ``fixtures/n8n_responses.json``. Strings in the
+fixtures are ``string.Template`` templates filled from the request body
+(``$query_text``, ``$specialty``, ``$topic``...) plus ``$request_id``.
+
+``estudio-ia/query`` answers are wrapped in the shapes n8n/Gemini actually
+return and ``StudyAIContext`` has to unwrap: a plain object, a one-item array,
+``[{text}]`` with fenced ```json, ``[{text}]`` with bare JSON and trailing
+prose, ``[{text}]`` with plain text, and the ``respuesta`` key variant.
+
+Every request goes through a latency profile (base latency, jitter, failure
+rate) so the UI's retry/backoff path and chat rendering can be benchmarked
+without network::
+
+    python -m harness.stubs.n8n --profile realistic
+    python -m harness.stubs.n8n --latency-ms 4000 --jitter-ms 1500 --failure-rate 0.2
+
+At runtime ``POST /__sim/config`` changes the profile and ``GET /__sim/stats``
+reports per-webhook counts, failures and injected latency.
+"""
+
+import argparse
+import copy
+import json
+import math
+import random
+import string
+import threading
+import time
+from collections import defaultdict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from harness import config
+from harness.stubs.http import JSONRequestHandler, StubServer, serve_in_thread
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 5678
+DEFAULT_FIXTURES = config.SUITE_DIR / "fixtures" / "n8n_responses.json"
+
+WEBHOOK_PREFIX = "/webhook/"
+CHAT_WEBHOOK = "estudio-ia/query"
+
+SHAPES = ("object", "array", "fenced_json", "bare_json", "plain_text", "respuesta")
+
+
+@dataclass
+class LatencyProfile:
+    """Injected delay and failures for every webhook call."""
+
+    latency_ms: float = 0
+    jitter_ms: float = 0
+    failure_rate: float = 0.0
+    failure_status: int = 503
+
+    def delay_seconds(self, rng):
+        jitter = rng.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0
+        return max(self.latency_ms + jitter, 0) / 1000
+
+
+PROFILES = {
+    "instant": LatencyProfile(),
+    "fast": LatencyProfile(latency_ms=300, jitter_ms=100),
+    # Typical Gemini-through-n8n round trip.
+    "realistic": LatencyProfile(latency_ms=2500, jitter_ms=1200, failure_rate=0.05),
+    "slow": LatencyProfile(latency_ms=8000, jitter_ms=3000, failure_rate=0.1),
+    # Exercises the 3-attempt exponential backoff in StudyAIContext.
+    "flaky": LatencyProfile(latency_ms=800, jitter_ms=400, failure_rate=0.35, failure_status=502),
+}
+
+# Fields of a profile that /__sim/config can override: conversion, check, what is expected.
+PROFILE_FIELDS = {
+    "latency_ms": (float, lambda value: math.isfinite(value) and value >= 0, "a number of milliseconds >= 0"),
+    "jitter_ms": (float, lambda value: math.isfinite(value) and value >= 0, "a number of milliseconds >= 0"),
+    "failure_rate": (float, lambda value: 0 <= value <= 1, "a fraction between 0 and 1"),
+    "failure_status": (int, lambda value: 400 <= value <= 599, "an HTTP error status (400-599)"),
+}
+
+
+# ============================================
+# Payloads
+# ============================================
+
+def _variables(body, request_id):
+    variables = {"request_id": str(request_id)}
+    for key, value in (body or {}).items():
+        if isinstance(value, list):
+            value = ", ".join(str(item) for item in value)
+        if isinstance(value, (str, int, float, bool)):
+            variables[key] = str(value)
+    return variables
+
+
+def render(template, variables):
+    """Fill ``$name`` placeholders in every string of a JSON-like value."""
+    if isinstance(template, dict):
+        return {key: render(value, variables) for key, value in template.items()}
+    if isinstance(template, list):
+        return [render(value, variables) for value in template]
+    if isinstance(template, str):
+        return string.Template(template).safe_substitute(variables)
+    return template
+
+
+def wrap_chat_answer(answer, shape):
+    """Encode a chat answer the way the n8n workflow may return it."""
+    if shape == "object":
+        return answer
+    if shape == "array":
+        return [answer]
+    if shape == "fenced_json":
+        body = {key: value for key, value in answer.items() if key != "response_text"}
+        prose = answer.get("response_text", "")
+        return [{"text": f"{prose}\n\n```json\n{json.dumps(body, ensure_ascii=False, indent=2)}\n```"}]
+    if shape == "bare_json":
+        return [{"text": f"{json.dumps(answer, ensure_ascii=False)}\n\nEspero que esto te ayude."}]
+    if shape == "plain_text":
+        return [{"text": answer.get("response_text", "")}]
+    if shape == "respuesta":
+        renamed = {key: value for key, value in answer.items() if key != "response_text"}
+        renamed["respuesta"] = answer.get("response_text", "")
+        return [renamed]
+    raise ValueError(f"unknown response shape: {shape}")
+
+
+class Simulator:
+    """Response selection, latency injection and stats; shared by handler threads."""
+
+    def __init__(self, fixtures, profile, shape=None, seed=None):
+        self.fixtures = fixtures
+        self.profile = profile
+        self.shape = shape
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.request_count = 0
+        self.stats = defaultdict(lambda: {"requests": 0, "failures": 0, "delay_ms": []})
+
+    @classmethod
+    def from_file(cls, path=DEFAULT_FIXTURES, **kwargs):
+        return cls(json.loads(path.read_text(encoding="utf-8")), **kwargs)
+
+    def next_request(self, webhook):
+        """Pick this request's delay, outcome and sequence number."""
+        with self.lock:
+            self.request_count += 1
+            delay = self.profile.delay_seconds(self.rng)
+            failed = self.rng.random() < self.profile.failure_rate
+            entry = self.stats[webhook]
+            entry["requests"] += 1
+            entry["failures"] += int(failed)
+            entry["delay_ms"].append(round(delay * 1000, 1))
+            return self.request_count, delay, failed
+
+    def respond(self, webhook, body, request_id):
+        templates = self.fixtures.get(webhook)
+        if templates is None:
+            return None
+        with self.lock:
+            template = self.rng.choice(templates)
+            shape = self.shape or self.rng.choice(SHAPES)
+        payload = render(copy.deepcopy(template), _variables(body, request_id))
+        if webhook == CHAT_WEBHOOK:
+            payload = wrap_chat_answer(payload, shape)
+        return payload
+
+    def snapshot(self):
+        with self.lock:
+            summary = {}
+            for webhook, entry in self.stats.items():
+                delays = sorted(entry["delay_ms"])
+                summary[webhook] = {
+                    "requests": entry["requests"],
+                    "failures": entry["failures"],
+                    "delay_ms_p50": delays[len(delays) // 2] if delays else 0,
+                    "delay_ms_max": delays[-1] if delays else 0,
+                }
+            return {"profile": asdict(self.profile), "shape": self.shape, "webhooks": summary}
+
+
+# ============================================
+# HTTP handler
+# ============================================
+
+class N8nHandler(JSONRequestHandler):
+
+    @property
+    def simulator(self):
+        return self.server.simulator
+
+    def route(self, method):
+        path = self.path_only
+        if path == "/__sim/stats":
+            return self.send_json(200, self.simulator.snapshot())
+        if path == "/__sim/config" and method == "POST":
+            return self.update_config(self.read_json(default={}))
+        if not path.startswith(WEBHOOK_PREFIX) or method != "POST":
+            return self.send_json(404, {"message": f"The requested webhook \"{method} {path}\" is not registered."})
+
+        webhook = path[len(WEBHOOK_PREFIX):].strip("/")
+        body = self.read_json(default={})
+        if webhook not in self.simulator.fixtures:
+            return self.send_json(404, {"message": f"The requested webhook \"{webhook}\" is not registered."})
+
+        request_id, delay, failed = self.simulator.next_request(webhook)
+        time.sleep(delay)
+        if failed:
+            status = self.simulator.profile.failure_status
+            return self.send_json(status, {"message": "Error in workflow", "simulated": True})
+        self.send_json(200, self.simulator.respond(webhook, body, request_id))
+
+    def update_config(self, changes):
+        simulator = self.simulator
+        if "profile" in changes and changes["profile"] not in PROFILES:
+            return self.send_json(400, {"message": f"Unknown profile {changes['profile']!r}; "
+                                                  f"valid profiles: {', '.join(sorted(PROFILES))}"})
+        if changes.get("shape") and changes["shape"] not in SHAPES:
+            return self.send_json(400, {"message": f"Unknown shape {changes['shape']!r}; "
+                                                  f"valid shapes: {', '.join(SHAPES)}"})
+        overrides = {}
+        for field, (convert, valid, expected) in PROFILE_FIELDS.items():
+            if field not in changes:
+                continue
+            try:
+                value = convert(changes[field])
+            except (TypeError, ValueError, OverflowError):
+                value = None
+            if value is None or not valid(value):
+                return self.send_json(400, {"message": f"Invalid {field} {changes[field]!r}; expected {expected}"})
+            overrides[field] = value
+        with simulator.lock:
+            if "profile" in changes:
+                simulator.profile = copy.copy(PROFILES[changes["profile"]])
+            for field, value in overrides.items():
+                setattr(simulator.profile, field, value)
+            if "shape" in changes:
+                simulator.shape = changes["shape"] or None
+            simulator.stats.clear()
+        self.send_json(200, simulator.snapshot())
+
+
+# ============================================
+# Entry points
+# ============================================
+
+class N8nSimulator(StubServer):
+
+    def __init__(self, address, simulator, verbose=False):
+        super().__init__(address, N8nHandler, verbose=verbose)
+        self.simulator = simulator
+
+    @property
+    def env(self):
+        """Vite variable that points the app at this server."""
+        return {"VITE_N8N_BASE_URL": f"{self.url}/webhook"}
+
+
+def start(host=DEFAULT_HOST, port=DEFAULT_PORT, profile="instant", shape=None, seed=None,
+          fixtures=DEFAULT_FIXTURES, verbose=False):
+    """Start the simulator on a background thread and return the server."""
+    if isinstance(profile, str):
+        profile = copy.copy(PROFILES[profile])
+    simulator = Simulator.from_file(fixtures, profile=profile, shape=shape, seed=seed)
+    server = N8nSimulator((host, port), simulator, verbose=verbose)
+    serve_in_thread(server)
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m harness.stubs.n8n",
+                                     description="Serve canned n8n AI webhook responses with injected latency.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="instant")
+    parser.add_argument("--latency-ms", type=float, help="override the profile's base latency")
+    parser.add_argument("--jitter-ms", type=float, help="override the profile's +/- jitter")
+    parser.add_argument("--failure-rate", type=float, help="override the fraction of requests that fail (0-1)")
+    parser.add_argument("--failure-status", type=int, help="HTTP status returned for failed requests")
+    parser.add_argument("--shape", choices=SHAPES, help=f"always use this {CHAT_WEBHOOK} shape (default: random)")
+    parser.add_argument("--seed", type=int, help="random seed for reproducible runs")
+    parser.add_argument("--fixtures", default=str(DEFAULT_FIXTURES))
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    args = parser.parse_args(argv)
+
+    profile = copy.copy(PROFILES[args.profile])
+    for field in ("latency_ms", "jitter_ms", "failure_rate", "failure_status"):
+        value = getattr(args, field)
+        if value is not None:
+            setattr(profile, field, value)
+
+    simulator = Simulator.from_file(Path(args.fixtures), profile=profile, shape=args.shape, seed=args.seed)
+    server = N8nSimulator((args.host, args.port), simulator, verbose=args.verbose)
+    print(f"n8n simulator listening on {server.url} ({args.profile}: {asdict(profile)})")
+    for key, value in server.env.items():
+        print(f"{key}={value}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
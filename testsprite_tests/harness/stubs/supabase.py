@@ -0,0 +1,1116 @@
+"""In-process stand-in for the Supabase endpoints the app uses.
+
+Covers what ``src/config/supabase.js`` and the contexts call through
+supabase-js:
+
+- PostgREST (``/rest/v1``): select with embeds such as
+  ``*, flashcard_decks(name, color, icon)``, ``eq``/``lte``/``in``/``ilike``/
+  ``or`` filters, ``order``/``limit``/``offset``, insert, upsert, update,
+  delete, ``.single()`` and ``rpc/<name>`` functions.
+- GoTrue (``/auth/v1``): password and refresh-token grants, signup, user,
+  logout and password recovery.
+- Storage (``/storage/v1``): upload (plain and resumable tus), download,
+  signed URLs and remove.
+
+Data lives in memory and is seeded from ``fixtures/supabase_seed.json``, so
+the Playwright suite runs offline with no backend latency. Point the Vite
+build at it with ``npm run dev:stub`` (``.env.stub``) and start it with::
+
+    python -m harness.stubs.supabase            # http://127.0.0.1:54321
+
+or in-process from Python::
+
+    server = supabase.start()
+    ...
+    server.shutdown()
+"""
+
+import argparse
+import base64
+import copy
+import hashlib
+import hmac
+import json
+import re
+import secrets
+import threading
+import time
+import unicodedata
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from email import policy
+from email.parser import BytesParser
+from pathlib import Path
+from urllib.parse import unquote
+
+from harness import config
+from harness.stubs.http import JSONRequestHandler, StubServer, serve_in_thread
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 54321
+DEFAULT_SEED = config.SUITE_DIR / "fixtures" / "supabase_seed.json"
+
+JWT_SECRET = b"synapse-local-supabase-stand-in"
+ACCESS_TOKEN_TTL = 3600
+
+# Tables whose primary key is not ``id`` (composite keys as "a,b", like on_conflict).
+PRIMARY_KEYS = {
+    "study_stats": "user_id",
+    "document_pages": "document_id,page",
+}
+
+# (table, referenced table) -> foreign key column on ``table``; used for
+# PostgREST-style embeds in both directions.
+FOREIGN_KEYS = {
+    ("flashcards", "flashcard_decks"): "deck_id",
+    ("study_sessions", "flashcard_decks"): "deck_id",
+    ("review_logs", "flashcards"): "card_id",
+    ("study_chats", "study_notebooks"): "notebook_id",
+    ("study_messages", "study_chats"): "chat_id",
+}
+
+# Postgres sorts enum columns by declaration order, not alphabetically.
+ENUM_ORDER = {
+    "priority": ["CRITICAL", "HIGH", "NORMAL", "LOW"],
+    "state": ["NEW", "LEARNING", "REVIEW", "RELEARNING"],
+    "rating": ["AGAIN", "HARD", "GOOD", "EASY"],
+}
+
+
+def now_iso(delta=None):
+    moment = datetime.now(timezone.utc) + (delta or timedelta())
+    return moment.isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+# Column defaults the real schema fills in on insert.
+ROW_DEFAULTS = {
+    "flashcards": lambda: {
+        "state": "NEW", "priority": "NORMAL", "card_type": "BASIC",
+        "difficulty": 0, "stability": 0, "retrievability": 1,
+        "reps": 0, "lapses": 0, "due_date": now_iso(),
+    },
+    "review_logs": lambda: {"reviewed_at": now_iso()},
+    "study_notebooks": lambda: {"is_pinned": False, "chats_count": 0},
+    "documents": lambda: {"tags": [], "is_processed": False},
+}
+
+
+def _review_daily_stats_add(store, row):
+    """supabase/migrations/*_review_daily_stats.sql: add a review to its
+    user's review_daily_stats row for the (UTC) day."""
+    if not row.get("user_id"):
+        return
+    day = str(row.get("reviewed_at") or now_iso())[:10]
+    stats = store.tables["review_daily_stats"]
+    for existing in stats:
+        if existing["user_id"] == row["user_id"] and existing["day"] == day:
+            break
+    else:
+        existing = {"user_id": row["user_id"], "day": day, "reviews": 0, "correct": 0,
+                    "new_cards": 0, "review_ms": 0}
+        stats.append(existing)
+    existing["reviews"] += 1
+    existing["correct"] += row.get("rating") in ("GOOD", "EASY")
+    existing["new_cards"] += row.get("state_before") == "NEW"
+    existing["review_ms"] += row.get("review_duration_ms") or 0
+    existing["updated_at"] = now_iso()
+
+
+# AFTER INSERT triggers of the real schema: table -> func(store, new row).
+ROW_TRIGGERS = {
+    "review_logs": _review_daily_stats_add,
+}
+
+
+# ============================================
+# Tokens
+# ============================================
+
+def _b64(data):
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _unb64(text):
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def encode_jwt(claims):
+    header = _b64(json.dumps({"alg": "HS256", "typ": "JWT"}).encode("utf-8"))
+    payload = _b64(json.dumps(claims).encode("utf-8"))
+    signature = hmac.new(JWT_SECRET, f"{header}.{payload}".encode("ascii"), hashlib.sha256).digest()
+    return f"{header}.{payload}.{_b64(signature)}"
+
+
+def decode_jwt(token):
+    """Return the claims of a token this stand-in issued, or None."""
+    try:
+        header, payload, signature = token.split(".")
+        expected = hmac.new(JWT_SECRET, f"{header}.{payload}".encode("ascii"), hashlib.sha256).digest()
+        if not hmac.compare_digest(expected, _unb64(signature)):
+            return None
+        claims = json.loads(_unb64(payload))
+    except (ValueError, TypeError):
+        return None
+    if claims.get("exp", 0) < time.time():
+        return None
+    return claims
+
+
+# Deterministic so it can live in .env.stub.
+ANON_KEY = encode_jwt({"iss": "supabase-stand-in", "role": "anon", "iat": 1767225600, "exp": 4102444800})
+
+
+class PostgrestError(Exception):
+    def __init__(self, status, code, message, details=None):
+        super().__init__(message)
+        self.status = status
+        self.payload = {"code": code, "message": message, "details": details, "hint": None}
+
+
+# ============================================
+# Store
+# ============================================
+
+_RELATIVE_TIME = re.compile(r"^\$now(?:([+-])(\d+)([dhm]))?$")
+
+
+def _expand(value):
+    """Expand ``$now`` / ``$now-2d`` / ``$now+4h`` placeholders in seed data."""
+    if isinstance(value, dict):
+        return {key: _expand(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_expand(item) for item in value]
+    if isinstance(value, str):
+        match = _RELATIVE_TIME.match(value)
+        if match:
+            sign, amount, unit = match.groups()
+            if not sign:
+                return now_iso()
+            unit_name = {"d": "days", "h": "hours", "m": "minutes"}[unit]
+            delta = timedelta(**{unit_name: int(amount)})
+            return now_iso(delta if sign == "+" else -delta)
+    return value
+
+
+class Store:
+    """Tables, users and storage buckets, guarded by one lock."""
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.tables = defaultdict(list)
+        self.users = {}
+        self.refresh_tokens = {}
+        self.buckets = defaultdict(dict)
+        # Unfinished resumable uploads: id -> bucket, object, type, length, bytes so far
+        self.resumable = {}
+
+    @classmethod
+    def from_seed(cls, path=DEFAULT_SEED):
+        store = cls()
+        if path:
+            store.load_seed(path)
+        return store
+
+    def load_seed(self, path):
+        path = Path(path)
+        seed = _expand(json.loads(path.read_text(encoding="utf-8")))
+        with self.lock:
+            for user in seed.get("users", []):
+                self.create_user(user["email"], user["password"], user.get("user_metadata"), user.get("id"))
+            for table, rows in seed.get("tables", {}).items():
+                for row in rows:
+                    self.insert(table, row)
+            for bucket, objects in seed.get("storage", {}).items():
+                for object_path, spec in objects.items():
+                    data = (path.parent / spec["file"]).read_bytes()
+                    self.buckets[bucket][object_path] = (data, spec.get("content_type", "application/octet-stream"))
+
+    # -- rows ------------------------------------------------------------
+
+    def primary_key(self, table):
+        return PRIMARY_KEYS.get(table, "id")
+
+    def insert(self, table, row, merge=False, on_conflict=None):
+        key = on_conflict or self.primary_key(table)
+        columns = key.split(",")
+        with self.lock:
+            rows = self.tables[table]
+            if all(column in row for column in columns):
+                value = [row[column] for column in columns]
+                for index, existing in enumerate(rows):
+                    if [existing.get(column) for column in columns] == value:
+                        if not merge:
+                            raise PostgrestError(409, "23505", "duplicate key value violates unique constraint",
+                                                 f"Key ({key})=({', '.join(map(str, value))}) already exists.")
+                        rows[index] = {**existing, **row, "updated_at": row.get("updated_at", now_iso())}
+                        return rows[index]
+            created = {**ROW_DEFAULTS.get(table, dict)(), **row}
+            if key == "id":
+                created.setdefault("id", str(uuid.uuid4()))
+            created.setdefault("created_at", now_iso())
+            created.setdefault("updated_at", created["created_at"])
+            rows.append(created)
+            if table in ROW_TRIGGERS:
+                ROW_TRIGGERS[table](self, created)
+            return created
+
+    # -- auth ------------------------------------------------------------
+
+    def create_user(self, email, password, metadata=None, user_id=None):
+        with self.lock:
+            user = {
+                "id": user_id or str(uuid.uuid4()),
+                "aud": "authenticated",
+                "role": "authenticated",
+                "email": email,
+                "email_confirmed_at": now_iso(),
+                "confirmation_sent_at": now_iso(),
+                "app_metadata": {"provider": "email", "providers": ["email"]},
+                "user_metadata": metadata or {},
+                "created_at": now_iso(),
+                "updated_at": now_iso(),
+                "_password": password,
+            }
+            self.users[email.lower()] = user
+            return user
+
+    def user_by_id(self, user_id):
+        return next((user for user in self.users.values() if user["id"] == user_id), None)
+
+    def issue_session(self, user):
+        now = int(time.time())
+        access_token = encode_jwt({
+            "sub": user["id"], "email": user["email"], "role": "authenticated", "aud": "authenticated",
+            "iat": now, "exp": now + ACCESS_TOKEN_TTL, "session_id": str(uuid.uuid4()),
+        })
+        refresh_token = secrets.token_urlsafe(24)
+        with self.lock:
+            self.refresh_tokens[refresh_token] = user["id"]
+        return {
+            "access_token": access_token,
+            "token_type": "bearer",
+            "expires_in": ACCESS_TOKEN_TTL,
+            "expires_at": now + ACCESS_TOKEN_TTL,
+            "refresh_token": refresh_token,
+            "user": public_user(user),
+        }
+
+
+def public_user(user):
+    return {key: value for key, value in user.items() if not key.startswith("_")}
+
+
+# ============================================
+# PostgREST query engine
+# ============================================
+
+def _split_top_level(text, sep=","):
+    """Split on ``sep`` outside parentheses and double quotes."""
+    parts, depth, quoted, current = [], 0, False, []
+    for char in text:
+        if char == '"':
+            quoted = not quoted
+        elif not quoted and char == "(":
+            depth += 1
+        elif not quoted and char == ")":
+            depth -= 1
+        if char == sep and depth == 0 and not quoted:
+            parts.append("".join(current))
+            current = []
+        else:
+            current.append(char)
+    if current:
+        parts.append("".join(current))
+    return [part.strip() for part in parts if part.strip()]
+
+
+def _as_comparable(value):
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            pass
+        if re.match(r"^\d{4}-\d{2}-\d{2}", value):
+            try:
+                moment = datetime.fromisoformat(value.replace("Z", "+00:00"))
+                return moment if moment.tzinfo else moment.replace(tzinfo=timezone.utc)
+            except ValueError:
+                pass
+    return value
+
+
+def _compare(left, right):
+    """Three-way compare a row value with a filter literal."""
+    a, b = _as_comparable(left), _as_comparable(right)
+    try:
+        return (a > b) - (a < b)
+    except TypeError:
+        a, b = str(left), str(right)
+        return (a > b) - (a < b)
+
+
+def _like(value, pattern, flags=0):
+    regex = "".join(
+        ".*" if char in "%*" else "." if char == "_" else re.escape(char)
+        for char in pattern
+    )
+    return value is not None and re.fullmatch(regex, str(value), flags | re.S) is not None
+
+
+def _parse_list(raw):
+    return [item.strip().strip('"') for item in _split_top_level(raw.strip()[1:-1])]
+
+
+def _matches(value, op, raw):
+    if op.startswith("not."):
+        return not _matches(value, op[4:], raw)
+    if op == "is":
+        return {"null": None, "true": True, "false": False}.get(raw.lower(), raw) is value
+    if op in ("eq", "neq"):
+        if isinstance(value, bool):
+            equal = raw.lower() == str(value).lower()
+        elif value is None:
+            equal = False
+        else:
+            equal = _compare(value, raw) == 0
+        return equal if op == "eq" else not equal and value is not None
+    if value is None:
+        return False
+    if op == "gt":
+        return _compare(value, raw) > 0
+    if op == "gte":
+        return _compare(value, raw) >= 0
+    if op == "lt":
+        return _compare(value, raw) < 0
+    if op == "lte":
+        return _compare(value, raw) <= 0
+    if op == "like":
+        return _like(value, raw)
+    if op == "ilike":
+        return _like(value, raw, re.I)
+    if op == "in":
+        return any(_compare(value, item) == 0 for item in _parse_list(raw))
+    if op == "cs":
+        wanted = _parse_list(raw) if raw.startswith(("{", "(")) else json.loads(raw)
+        return isinstance(value, list) and all(item in value for item in wanted)
+    raise PostgrestError(400, "PGRST100", f"unsupported operator: {op}")
+
+
+def _split_op(expression):
+    """``"not.eq.5"`` -> ``("not.eq", "5")``."""
+    head, _, rest = expression.partition(".")
+    if head == "not":
+        op, _, value = rest.partition(".")
+        return f"not.{op}", value
+    return head, rest
+
+
+def _or_predicate(expression):
+    conditions = []
+    for part in _split_top_level(expression.strip()[1:-1]):
+        column, _, rest = part.partition(".")
+        op, value = _split_op(rest)
+        conditions.append((column, op, value))
+    return lambda row: any(_matches(row.get(column), op, value) for column, op, value in conditions)
+
+
+RESERVED_PARAMS = {"select", "order", "limit", "offset", "on_conflict", "columns"}
+
+
+def build_filters(pairs):
+    predicates = []
+    for key, value in pairs:
+        if key in RESERVED_PARAMS or "." in key:
+            continue
+        if key == "or":
+            predicates.append(_or_predicate(value))
+            continue
+        op, literal = _split_op(value)
+        predicates.append(lambda row, c=key, o=op, v=literal: _matches(row.get(c), o, v))
+    return predicates
+
+
+def _order_rows(rows, order):
+    for term in reversed(_split_top_level(order)):
+        column, *modifiers = term.split(".")
+        descending = "desc" in modifiers
+        nulls_first = "nullsfirst" in modifiers or (descending and "nullslast" not in modifiers)
+        present = [row for row in rows if row.get(column) is not None]
+        missing = [row for row in rows if row.get(column) is None]
+        if column in ENUM_ORDER:
+            labels = ENUM_ORDER[column]
+            sort_key = lambda row: labels.index(row[column]) if row[column] in labels else len(labels)
+        else:
+            sort_key = lambda row: _as_comparable(row[column])
+        present.sort(key=sort_key, reverse=descending)
+        rows = missing + present if nulls_first else present + missing
+    return rows
+
+
+def _embed(store, table, row, related, columns):
+    fk = FOREIGN_KEYS.get((table, related))
+    if fk:  # many-to-one: flashcards -> flashcard_decks
+        target = next((item for item in store.tables[related] if item.get("id") == row.get(fk)), None)
+        return project(store, related, target, columns) if target else None
+    fk = FOREIGN_KEYS.get((related, table))
+    if fk:  # one-to-many: study_notebooks -> study_chats
+        children = [item for item in store.tables[related] if item.get(fk) == row.get("id")]
+        if columns.strip() == "count":
+            return [{"count": len(children)}]
+        return [project(store, related, item, columns) for item in children]
+    return None
+
+
+def project(store, table, row, select):
+    if not select or select == "*":
+        return copy.deepcopy(row)
+    result = {}
+    for term in _split_top_level(select):
+        if "(" in term:
+            head, _, inner = term.partition("(")
+            alias, _, name = head.rpartition(":")
+            name = name.split("!")[0].strip()
+            result[(alias or name).strip()] = _embed(store, table, row, name, inner[:-1])
+        elif term == "*":
+            result.update(copy.deepcopy(row))
+        else:
+            alias, _, name = term.rpartition(":")
+            name = name.split("::")[0].strip()
+            result[(alias or name).strip()] = copy.deepcopy(row.get(name))
+    return result
+
+
+# ============================================
+# RPC functions
+# ============================================
+
+RPC_FUNCTIONS = {}
+
+
+def rpc(name):
+    """Register a Python stand-in for a Postgres function called via ``.rpc()``.
+
+    The function receives ``(store, args, user_id)`` where ``user_id`` plays
+    the role of ``auth.uid()``.
+    """
+    def register(func):
+        RPC_FUNCTIONS[name] = func
+        return func
+    return register
+
+
+@rpc("apply_reviews")
+def apply_reviews(store, args, user_id):
+    """supabase/migrations/*_apply_reviews.sql: log reviews once per client_id,
+    update cards unless they already hold a newer review."""
+    if not user_id:
+        raise PostgrestError(401, "42501", "permission denied for function apply_reviews")
+    logs = store.tables["review_logs"]
+    seen = {row.get("client_id") for row in logs if row.get("client_id")}
+    logged = 0
+    for log in args.get("logs") or []:
+        if log.get("client_id") in seen:
+            continue
+        seen.add(log.get("client_id"))
+        row = {**log, "user_id": user_id}
+        if not row.get("reviewed_at"):
+            row.pop("reviewed_at", None)
+        store.insert("review_logs", row)
+        logged += 1
+
+    cards = {card["id"]: card for card in args.get("cards") or [] if card.get("id")}
+    for row in store.tables["flashcards"]:
+        card = cards.get(row.get("id"))
+        if card is None or row.get("user_id") != user_id:
+            continue
+        stored, incoming = _as_comparable(row.get("last_review")), _as_comparable(card.get("last_review"))
+        if stored is not None and incoming is not None and stored > incoming:
+            continue
+        row.update({key: value for key, value in card.items() if key != "id"}, updated_at=now_iso())
+    return logged
+
+
+def _compact_pomodoros(data, before):
+    kept, archive = [], dict(data.get("pomodoroArchive") or {})
+    for session in data.get("pomodoroSessions") or []:
+        if session.get("date", "") >= before:
+            kept.append(session)
+            continue
+        month = session["date"][:7]
+        totals = archive.get(month) or {"sessions": 0, "studyMinutes": 0, "breakMinutes": 0}
+        archive[month] = {
+            "sessions": totals["sessions"] + 1,
+            "studyMinutes": totals["studyMinutes"] + (session.get("studyMinutes") or 0),
+            "breakMinutes": totals["breakMinutes"] + (session.get("breakMinutes") or 0),
+        }
+    data["pomodoroSessions"], data["pomodoroArchive"] = kept, archive
+
+
+@rpc("apply_study_stats_ops")
+def apply_study_stats_ops(store, args, user_id):
+    """supabase/migrations/*_study_stats_ops.sql: apply set/inc/append/
+    compactPomodoros operations to stats_data, once per batch id."""
+    if not user_id:
+        raise PostgrestError(401, "42501", "permission denied for function apply_study_stats_ops")
+    with store.lock:
+        row = next((r for r in store.tables["study_stats"] if r.get("user_id") == user_id), None)
+        if row is None:
+            row = store.insert("study_stats", {"user_id": user_id, "stats_data": {}})
+        batches = list(row.get("recent_batches") or [])
+        if args.get("p_batch_id") in batches:
+            return False
+
+        data = copy.deepcopy(row.get("stats_data") or {})
+        for op in args.get("p_ops") or []:
+            if op.get("op") == "compactPomodoros":
+                _compact_pomodoros(data, op["before"])
+                continue
+            *parents, leaf = op["path"]
+            target = data
+            for key in parents:
+                if not isinstance(target.get(key), dict):
+                    target[key] = {}
+                target = target[key]
+            if op["op"] == "set":
+                target[leaf] = op.get("value")
+            elif op["op"] == "inc":
+                target[leaf] = (target.get(leaf) or 0) + op["value"]
+            elif op["op"] == "append":
+                target[leaf] = [*(target.get(leaf) or []), op.get("value")]
+
+        row.update(stats_data=data, recent_batches=(batches + [args.get("p_batch_id")])[-20:],
+                   updated_at=now_iso())
+    return True
+
+
+# Same folding and stopwords as src/lib/searchIndex.js and search_documents().
+SEARCH_STOPWORDS = {"a", "al", "con", "de", "del", "el", "en", "la", "las", "lo", "los",
+                    "o", "para", "por", "se", "su", "un", "una", "y"}
+
+
+def _search_words(text):
+    folded = "".join(char for char in unicodedata.normalize("NFD", str(text or "").lower())
+                     if not unicodedata.combining(char))
+    return [word for word in re.split(r"[^a-z0-9]+", folded) if word and word not in SEARCH_STOPWORDS]
+
+
+@rpc("search_documents")
+def search_documents(store, args, user_id):
+    """supabase/migrations/*_documents_search.sql: the user's documents
+    matching every query word as a prefix, ranked name > tags > subject."""
+    if not user_id:
+        raise PostgrestError(401, "42501", "permission denied for function search_documents")
+    words = _search_words(args.get("p_query"))
+    if not words:
+        return []
+    limit = min(max(int(args.get("p_limit") or 50), 1), 500)
+    hits = []
+    for row in store.tables["documents"]:
+        if row.get("user_id") != user_id:
+            continue
+        fields = ((1.0, _search_words(row.get("name"))), (0.4, _search_words(" ".join(row.get("tags") or []))),
+                  (0.2, _search_words(row.get("subject"))))
+        rank = 0.0
+        for word in words:
+            matched = [weight for weight, terms in fields if any(term.startswith(word) for term in terms)]
+            if not matched:
+                break
+            rank += max(matched)
+        else:
+            hits.append((rank, row.get("created_at") or "", row))
+    hits.sort(key=lambda hit: (hit[0], hit[1]), reverse=True)
+    return [dict(row) for _, _, row in hits[:limit]]
+
+
+@rpc("search_document_pages")
+def search_document_pages(store, args, user_id):
+    """supabase/migrations/*_document_pages.sql: pages of the user's PDFs
+    containing every query word as a prefix, with a snippet around the first."""
+    if not user_id:
+        raise PostgrestError(401, "42501", "permission denied for function search_document_pages")
+    words = _search_words(args.get("p_query"))
+    if not words:
+        return []
+    limit = min(max(int(args.get("p_limit") or 20), 1), 200)
+    hits = []
+    for row in store.tables["document_pages"]:
+        if row.get("user_id") != user_id:
+            continue
+        terms = _search_words(row.get("content"))
+        matches = [sum(term.startswith(word) for term in terms) for word in words]
+        if not all(matches):
+            continue
+        content = row["content"]
+        folded = "".join(char for char in unicodedata.normalize("NFD", content.lower())
+                         if not unicodedata.combining(char))
+        start = max(folded.find(words[0]) - 80, 0)
+        hits.append({"document_id": row["document_id"], "page": row["page"],
+                     "rank": sum(matches) / max(len(terms), 1), "snippet": content[start:start + 240]})
+    hits.sort(key=lambda hit: (-hit["rank"], hit["document_id"], hit["page"]))
+    return hits[:limit]
+
+
+# study_card_json(): the fields of a card that a study session uses.
+STUDY_CARD_SELECT = (
+    "id,deck_id,front,back,card_type,priority,key_point,clinical_pearl,pathophysiology,"
+    "state,difficulty,stability,retrievability,due_date,last_review,scheduled_days,elapsed_days,"
+    "reps,lapses,flashcard_decks(name,color,icon)"
+)
+
+
+def _priority_rank(row):
+    labels = ENUM_ORDER["priority"]
+    return labels.index(row["priority"]) if row.get("priority") in labels else len(labels)
+
+
+@rpc("due_cards_page")
+def due_cards_page(store, args, user_id):
+    """supabase/migrations/*_due_cards_page.sql: due cards in (due_date,
+    priority, id) order, one page at a time, with the cursor of the next."""
+    if not user_id:
+        raise PostgrestError(401, "42501", "permission denied for function due_cards_page")
+    cursor = args.get("p_cursor") or {}
+    limit = int(args.get("p_limit", 100))
+    due_before = cursor.get("due_before") or now_iso()
+    deck_id = cursor.get("deck_id") or args.get("p_deck_id")
+
+    def key(row):
+        return (_as_comparable(row.get("due_date")), _priority_rank(row), str(row.get("id")))
+
+    after = None
+    if cursor.get("due_date"):
+        after = (_as_comparable(cursor["due_date"]), _priority_rank(cursor), str(cursor.get("id")))
+    rows = sorted(
+        (row for row in store.tables["flashcards"]
+         if row.get("user_id") == user_id and row.get("due_date")
+         and _compare(row["due_date"], due_before) <= 0
+         and (deck_id is None or row.get("deck_id") == deck_id)
+         and (after is None or key(row) > after)),
+        key=key,
+    )[:limit]
+    cards = [project(store, "flashcards", row, STUDY_CARD_SELECT) for row in rows]
+    if len(cards) < limit:
+        return {"cards": cards, "cursor": None}
+    last = cards[-1]
+    return {"cards": cards, "cursor": {"due_before": due_before, "deck_id": deck_id,
+                                       "due_date": last["due_date"], "priority": last["priority"], "id": last["id"]}}
+
+
+@rpc("start_study_session")
+def start_study_session(store, args, user_id):
+    """supabase/migrations/*_start_study_session.sql (as redefined with
+    due_cards_page): settings, the first page of due cards and its cursor, new
+    cards and (unless ``p_create_session`` is false) a new study_sessions row."""
+    if not user_id:
+        raise PostgrestError(401, "42501", "permission denied for function start_study_session")
+    deck_id = args.get("p_deck_id")
+    settings = next((row for row in store.tables["user_settings"] if row.get("id") == user_id), None)
+    due = due_cards_page(store, {"p_deck_id": deck_id, "p_limit": args.get("p_review_limit", 100)}, user_id)
+    new = []
+    if args.get("p_include_new"):
+        new = sorted((row for row in store.tables["flashcards"]
+                      if row.get("user_id") == user_id and row.get("state") == "NEW"),
+                     key=lambda row: (_priority_rank(row), str(row.get("id"))))
+
+    session = None
+    if args.get("p_create_session", True):
+        session = copy.deepcopy(store.insert("study_sessions", {
+            "user_id": user_id,
+            "deck_id": deck_id,
+            "started_at": now_iso(),
+            "exam_mode": bool(args.get("p_exam_mode", False)),
+            "session_type": args.get("p_session_type") or "normal",
+        }))
+    return {
+        "settings": settings and {key: settings.get(key)
+                                  for key in ("fsrs_request_retention", "fsrs_maximum_interval", "fsrs_weights")},
+        "due_cards": due["cards"],
+        "due_cursor": due["cursor"],
+        "new_cards": [project(store, "flashcards", row, STUDY_CARD_SELECT)
+                      for row in new[:int(args.get("p_new_limit", 20))]],
+        "session": session,
+    }
+
+
+# ============================================
+# HTTP handler
+# ============================================
+
+class SupabaseHandler(JSONRequestHandler):
+
+    @property
+    def store(self):
+        return self.server.store
+
+    def route(self, method):
+        path = self.path_only
+        if path.startswith("/rest/v1/rpc/"):
+            return self.handle_rpc(path[len("/rest/v1/rpc/"):])
+        if path.startswith("/rest/v1/"):
+            return self.handle_rest(method, path[len("/rest/v1/"):])
+        if path.startswith("/auth/v1/"):
+            return self.handle_auth(method, path[len("/auth/v1/"):])
+        if path.startswith("/storage/v1/"):
+            return self.handle_storage(method, path[len("/storage/v1/"):])
+        self.send_json(404, {"message": f"no route for {path}"})
+
+    # -- helpers ---------------------------------------------------------
+
+    def current_user_id(self):
+        header = self.headers.get("Authorization", "")
+        claims = decode_jwt(header[7:]) if header.startswith("Bearer ") else None
+        return claims.get("sub") if claims else None
+
+    def prefer(self, name):
+        for item in self.headers.get("Prefer", "").split(","):
+            key, _, value = item.strip().partition("=")
+            if key == name:
+                return value
+        return None
+
+    # -- PostgREST -------------------------------------------------------
+
+    def handle_rest(self, method, table):
+        pairs = self.query_pairs
+        params = dict(pairs)
+        select = params.get("select", "*")
+        single = "vnd.pgrst.object" in self.headers.get("Accept", "")
+        try:
+            with self.store.lock:
+                if method in ("GET", "HEAD"):
+                    rows = self._select(table, pairs, params)
+                    status = 200
+                elif method == "POST":
+                    rows = self._insert(table, params)
+                    status = 201
+                elif method == "PATCH":
+                    rows = self._update(table, pairs)
+                    status = 200
+                elif method == "DELETE":
+                    rows = self._delete(table, pairs)
+                    status = 200
+                else:
+                    raise PostgrestError(405, "PGRST000", f"method {method} not allowed")
+                payload = [project(self.store, table, row, select) for row in rows]
+        except PostgrestError as exc:
+            return self.send_json(exc.status, exc.payload)
+
+        headers = {"Content-Range": f"0-{max(len(payload) - 1, 0)}/{len(payload) if self.prefer('count') else '*'}"}
+        if method != "GET" and self.prefer("return") != "representation":
+            return self.send_bytes(201 if method == "POST" else 204, headers=headers)
+        if single:
+            if len(payload) != 1:
+                return self.send_json(406, {
+                    "code": "PGRST116",
+                    "message": "JSON object requested, multiple (or no) rows returned",
+                    "details": f"The result contains {len(payload)} rows",
+                    "hint": None,
+                })
+            return self.send_json(status, payload[0], headers)
+        self.send_json(status, payload, headers)
+
+    def _filtered(self, table, pairs):
+        predicates = build_filters(pairs)
+        return [row for row in self.store.tables[table] if all(check(row) for check in predicates)]
+
+    def _select(self, table, pairs, params):
+        rows = self._filtered(table, pairs)
+        if "order" in params:
+            rows = _order_rows(rows, params["order"])
+        offset = int(params.get("offset", 0))
+        limit = params.get("limit")
+        return rows[offset:offset + int(limit) if limit is not None else None]
+
+    def _insert(self, table, params):
+        body = self.read_json(default=[])
+        records = body if isinstance(body, list) else [body]
+        resolution = self.prefer("resolution")
+        merge = resolution == "merge-duplicates"
+        with self.store.lock:
+            if resolution == "ignore-duplicates":
+                columns = (params.get("on_conflict") or self.store.primary_key(table)).split(",")
+                seen = {tuple(row.get(column) for column in columns) for row in self.store.tables[table]}
+                kept = []
+                for record in records:
+                    if all(column in record for column in columns):
+                        value = tuple(record[column] for column in columns)
+                        if value in seen:
+                            continue
+                        seen.add(value)
+                    kept.append(record)
+                records = kept
+            return [self.store.insert(table, record, merge=merge, on_conflict=params.get("on_conflict"))
+                    for record in records]
+
+    def _update(self, table, pairs):
+        changes = self.read_json(default={})
+        rows = self._filtered(table, pairs)
+        for row in rows:
+            row.update(changes)
+        return rows
+
+    def _delete(self, table, pairs):
+        doomed = self._filtered(table, pairs)
+        ids = {id(row) for row in doomed}
+        self.store.tables[table] = [row for row in self.store.tables[table] if id(row) not in ids]
+        return doomed
+
+    def handle_rpc(self, name):
+        func = RPC_FUNCTIONS.get(name)
+        if func is None:
+            return self.send_json(404, {"code": "PGRST202", "message": f"Could not find the function public.{name}",
+                                        "details": None, "hint": None})
+        args = self.read_json(default={}) if self.command == "POST" else dict(self.query_pairs)
+        try:
+            with self.store.lock:
+                result = func(self.store, args or {}, self.current_user_id())
+        except PostgrestError as exc:
+            return self.send_json(exc.status, exc.payload)
+        self.send_json(200, result)
+
+    # -- GoTrue ----------------------------------------------------------
+
+    def auth_error(self, status, code, message):
+        self.send_json(status, {"code": status, "error_code": code, "msg": message,
+                                "error": code, "error_description": message})
+
+    def handle_auth(self, method, endpoint):
+        store = self.store
+        if endpoint == "token" and method == "POST":
+            grant = dict(self.query_pairs).get("grant_type")
+            body = self.read_json(default={})
+            if grant == "password":
+                user = store.users.get((body.get("email") or "").lower())
+                if not user or user["_password"] != body.get("password"):
+                    return self.auth_error(400, "invalid_credentials", "Invalid login credentials")
+                return self.send_json(200, store.issue_session(user))
+            if grant == "refresh_token":
+                with store.lock:
+                    user_id = store.refresh_tokens.pop(body.get("refresh_token"), None)
+                user = store.user_by_id(user_id) if user_id else None
+                if not user:
+                    return self.auth_error(400, "refresh_token_not_found", "Invalid Refresh Token: Refresh Token Not Found")
+                return self.send_json(200, store.issue_session(user))
+            return self.auth_error(400, "unsupported_grant_type", f"unsupported grant_type {grant}")
+
+        if endpoint == "signup" and method == "POST":
+            body = self.read_json(default={})
+            email = (body.get("email") or "").strip()
+            if not email or not body.get("password"):
+                return self.auth_error(400, "validation_failed", "Signup requires a valid password")
+            if email.lower() in store.users:
+                return self.auth_error(422, "user_already_exists", "User already registered")
+            user = store.create_user(email, body["password"], body.get("data"))
+            # Mirrors a project with email confirmation on: user, no session.
+            return self.send_json(200, public_user(user))
+
+        if endpoint == "user":
+            user = store.user_by_id(self.current_user_id())
+            if not user:
+                return self.auth_error(401, "bad_jwt", "invalid JWT: unable to parse or verify signature")
+            if method == "PUT":
+                body = self.read_json(default={})
+                with store.lock:
+                    if body.get("password"):
+                        user["_password"] = body["password"]
+                    if body.get("data"):
+                        user["user_metadata"].update(body["data"])
+                    user["updated_at"] = now_iso()
+            return self.send_json(200, public_user(user))
+
+        if endpoint == "logout":
+            return self.send_bytes(204)
+        if endpoint in ("recover", "resend", "otp"):
+            return self.send_json(200, {})
+        if endpoint == "settings":
+            return self.send_json(200, {"external": {"email": True}, "disable_signup": False,
+                                        "mailer_autoconfirm": False})
+        self.auth_error(404, "not_found", f"unsupported auth endpoint {endpoint}")
+
+    # -- Storage ---------------------------------------------------------
+
+    def storage_error(self, status, error, message):
+        self.send_json(status, {"statusCode": str(status), "error": error, "message": message})
+
+    def _read_upload(self):
+        content_type = self.headers.get("Content-Type", "application/octet-stream")
+        body = self.read_body()
+        if not content_type.startswith("multipart/form-data"):
+            return body, content_type
+        message = BytesParser(policy=policy.default).parsebytes(
+            b"Content-Type: " + content_type.encode("latin-1") + b"\r\n\r\n" + body
+        )
+        for part in message.iter_parts():
+            if part.get_filename() is not None or part.get_param("name", header="content-disposition") == "":
+                return part.get_payload(decode=True), part.get_content_type()
+        raise ValueError("multipart upload without a file part")
+
+    def _send_object(self, bucket, object_path):
+        found = self.store.buckets[bucket].get(object_path)
+        if found is None:
+            return self.storage_error(404, "not_found", "Object not found")
+        data, content_type = found
+        self.send_bytes(200, data, content_type)
+
+    def handle_resumable(self, method, upload_id):
+        """tus 1.0.0 endpoint of Storage (``/storage/v1/upload/resumable``):
+        create, then PATCH chunks at the current offset; HEAD reports it."""
+        headers = {"Tus-Resumable": "1.0.0",
+                   "Access-Control-Expose-Headers": "Location, Upload-Offset, Upload-Length, Tus-Resumable"}
+        if not self.current_user_id():
+            return self.storage_error(403, "Unauthorized", "resumable uploads need a signed-in user")
+
+        if not upload_id:
+            if method != "POST":
+                return self.storage_error(405, "method_not_allowed", f"{method} not supported")
+            metadata = {}
+            for item in self.headers.get("Upload-Metadata", "").split(","):
+                key, _, value = item.strip().partition(" ")
+                if key:
+                    metadata[key] = base64.b64decode(value).decode("utf-8")
+            bucket, object_path = metadata.get("bucketName"), metadata.get("objectName")
+            if not bucket or not object_path:
+                return self.storage_error(400, "InvalidUploadMetadata", "bucketName and objectName are required")
+            upsert = self.headers.get("x-upsert", "false") == "true"
+            with self.store.lock:
+                if object_path in self.store.buckets[bucket] and not upsert:
+                    return self.storage_error(409, "Duplicate", "The resource already exists")
+                new_id = uuid.uuid4().hex
+                self.store.resumable[new_id] = {
+                    "bucket": bucket, "object": object_path,
+                    "content_type": metadata.get("contentType", "application/octet-stream"),
+                    "length": int(self.headers.get("Upload-Length") or 0), "data": bytearray(),
+                }
+            location = f"http://{self.headers.get('Host')}/storage/v1/upload/resumable/{new_id}"
+            return self.send_bytes(201, headers={**headers, "Location": location})
+
+        upload = self.store.resumable.get(upload_id)
+        if upload is None:
+            return self.send_bytes(404, headers=headers)
+        if method == "HEAD":
+            return self.send_bytes(200, headers={**headers, "Upload-Offset": str(len(upload["data"])),
+                                                 "Upload-Length": str(upload["length"]),
+                                                 "Cache-Control": "no-store"})
+        if method != "PATCH":
+            return self.storage_error(405, "method_not_allowed", f"{method} not supported")
+        body = self.read_body()
+        with self.store.lock:
+            if int(self.headers.get("Upload-Offset", -1)) != len(upload["data"]):
+                return self.send_bytes(409, headers=headers)
+            upload["data"] += body
+            if len(upload["data"]) >= upload["length"]:
+                self.store.buckets[upload["bucket"]][upload["object"]] = (bytes(upload["data"]), upload["content_type"])
+                del self.store.resumable[upload_id]
+        self.send_bytes(204, headers={**headers, "Upload-Offset": str(len(upload["data"]))})
+
+    def handle_storage(self, method, endpoint):
+        parts = [unquote(part) for part in endpoint.split("/")]
+        if parts[:2] == ["upload", "resumable"]:
+            return self.handle_resumable(method, "/".join(parts[2:]))
+        if parts[:1] != ["object"] or len(parts) < 2:
+            return self.storage_error(404, "not_found", f"unsupported storage endpoint {endpoint}")
+        parts = parts[1:]
+
+        if parts[0] == "sign":
+            bucket, object_path = parts[1], "/".join(parts[2:])
+            if method == "POST":
+                body = self.read_json(default={})
+                expires = int(body.get("expiresIn", 3600))
+                paths = body.get("paths") if not object_path else [object_path]
+                signed = [{
+                    "path": item,
+                    "signedURL": f"/object/sign/{bucket}/{item}?token="
+                                 + encode_jwt({"url": f"{bucket}/{item}", "exp": int(time.time()) + expires}),
+                    "error": None if item in self.store.buckets[bucket] else "Object not found",
+                } for item in paths]
+                if object_path:
+                    if signed[0]["error"]:
+                        return self.storage_error(404, "not_found", "Object not found")
+                    return self.send_json(200, {"signedURL": signed[0]["signedURL"]})
+                return self.send_json(200, signed)
+            claims = decode_jwt(dict(self.query_pairs).get("token", ""))
+            if not claims or claims.get("url") != f"{bucket}/{object_path}":
+                return self.storage_error(400, "InvalidJWT", "invalid signature")
+            return self._send_object(bucket, object_path)
+
+        if parts[0] in ("public", "authenticated"):
+            parts = parts[1:]
+        bucket, object_path = parts[0], "/".join(parts[1:])
+
+        if method in ("GET", "HEAD"):
+            return self._send_object(bucket, object_path)
+        if method in ("POST", "PUT"):
+            data, content_type = self._read_upload()
+            objects = self.store.buckets[bucket]
+            with self.store.lock:
+                upsert = self.headers.get("x-upsert", "false") == "true" or method == "PUT"
+                if object_path in objects and not upsert:
+                    return self.storage_error(409, "Duplicate", "The resource already exists")
+                objects[object_path] = (data, content_type)
+            return self.send_json(200, {"Key": f"{bucket}/{object_path}", "Id": str(uuid.uuid4())})
+        if method == "DELETE":
+            body = self.read_json(default={})
+            removed = []
+            with self.store.lock:
+                for prefix in body.get("prefixes", [object_path]):
+                    if self.store.buckets[bucket].pop(prefix, None) is not None:
+                        removed.append({"name": prefix, "bucket_id": bucket})
+            return self.send_json(200, removed)
+        self.storage_error(405, "method_not_allowed", f"{method} not supported")
+
+
+# ============================================
+# Entry points
+# ============================================
+
+class SupabaseStandIn(StubServer):
+
+    def __init__(self, address, store, verbose=False):
+        super().__init__(address, SupabaseHandler, verbose=verbose)
+        self.store = store
+
+    @property
+    def env(self):
+        """Vite variables that point the app at this server."""
+        return {"VITE_SUPABASE_URL": self.url, "VITE_SUPABASE_ANON_KEY": ANON_KEY}
+
+
+def start(host=DEFAULT_HOST, port=DEFAULT_PORT, seed=DEFAULT_SEED, verbose=False):
+    """Start the stand-in on a background thread and return the server."""
+    server = SupabaseStandIn((host, port), Store.from_seed(seed), verbose=verbose)
+    serve_in_thread(server)
+    return server
+
+
+def use_stand_in(server):
+    """Point ``harness.config`` (and so ``harness.session``) at ``server``."""
+    config.SUPABASE_URL = server.url
+    config.SUPABASE_ANON_KEY = ANON_KEY
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m harness.stubs.supabase",
+                                     description="Serve a local Supabase stand-in seeded from fixtures.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--seed", default=str(DEFAULT_SEED), help="seed JSON file ('' for an empty store)")
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    args = parser.parse_args(argv)
+
+    server = SupabaseStandIn((args.host, args.port), Store.from_seed(args.seed or None), verbose=args.verbose)
+    print(f"Supabase stand-in listening on {server.url}")
+    for key, value in server.env.items():
+        print(f"{key}={value}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,375 @@
+"""Per-step timing and Chromium performance metrics for the TC scripts.
+
+When a test runs under ``harness.runner`` every navigation (``page.goto``),
+``waits.fill``/``waits.click``/``waits.settle``/``waits.route`` call and
+``expect(...)`` assertion is recorded as a step with its duration, split into
+time spent *waiting* (settling, network idle, auto-retrying assertions) and
+time spent *acting* (the navigation, fill or click itself). Each step is
+attributed to the app route the page is on when it finishes.
+
+After each step the page is sampled for Chromium metrics collected by a
+buffered ``PerformanceObserver``: Largest Contentful Paint, long tasks and
+``performance.memory`` JS heap usage. Sampling happens outside the measured
+step.
+
+Outside the runner (a TC script run directly) no recorder is active and every
+hook is a no-op.
+"""
+
+import contextvars
+import time
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass
+from urllib.parse import urlsplit
+
+_current = contextvars.ContextVar("harness_timing_recorder", default=None)
+
+# Installed before any app script runs in every context the runner hands out.
+PERF_INIT_SCRIPT = """
+(() => {
+    if (window.__synapsePerf) return;
+    const perf = window.__synapsePerf = { lcp: null, longTasks: [] };
+    try {
+        new PerformanceObserver((list) => {
+            const entries = list.getEntries();
+            perf.lcp = entries[entries.length - 1].startTime;
+        }).observe({ type: 'largest-contentful-paint', buffered: true });
+        new PerformanceObserver((list) => {
+            for (const entry of list.getEntries()) perf.longTasks.push(entry.duration);
+        }).observe({ type: 'longtask', buffered: true });
+    } catch (e) {
+        // Observer types unsupported: report nothing rather than break the app.
+    }
+})();
+"""
+
+# Drains long tasks so each one is reported once; LCP is keyed by document.
+SAMPLE_SCRIPT = """
+() => {
+    const perf = window.__synapsePerf || { lcp: null, longTasks: [] };
+    const memory = performance.memory;
+    return {
+        document: performance.timeOrigin,
+        lcp: perf.lcp,
+        longTasks: perf.longTasks.splice(0),
+        heap: memory ? memory.usedJSHeapSize : null,
+    };
+}
+"""
+
+MAX_TARGET_LENGTH = 120
+
+
+def route_of(url):
+    """Map a URL to the app screen it shows: ``/``, ``/dashboard`` -> ``/dashboard``,
+    ``/library/document/7`` -> ``/library``; non-http pages -> ``None``."""
+    parts = urlsplit(url or "")
+    if parts.scheme not in ("http", "https"):
+        return None
+    segment = parts.path.strip("/").split("/")[0]
+    return f"/{segment or 'dashboard'}"
+
+
+def describe(target):
+    """Short, readable label for a locator, page or URL."""
+    if target is None:
+        return ""
+    if isinstance(target, str):
+        label = target
+    else:
+        label = getattr(target, "_selector", None) or getattr(target, "url", None) or repr(target)
+    return label if len(label) <= MAX_TARGET_LENGTH else label[:MAX_TARGET_LENGTH - 3] + "..."
+
+
+def _page_of(target):
+    page = getattr(target, "page", None)
+    return page if page is not None else target
+
+
+@dataclass
+class Step:
+    """One timed action or assertion inside a test."""
+
+    kind: str
+    target: str
+    route: str
+    started: float
+    duration: float
+    wait: float
+    act: float
+    ok: bool
+
+
+class Recorder:
+    """Collects the steps and page metrics of one test."""
+
+    def __init__(self, name):
+        self.name = name
+        self.started = time.perf_counter()
+        self.finished = None
+        self.steps = []
+        self.lcp = {}
+        self.long_tasks = defaultdict(list)
+        self.heap = {}
+        self._active = False
+        self._waiting_depth = 0
+        self._wait = 0.0
+
+    # -- recording -------------------------------------------------------
+
+    @asynccontextmanager
+    async def step(self, kind, page, target=None, waiting=False):
+        if self._active:
+            # Nested hook (e.g. an expect inside a waits helper): the outer step owns the time.
+            async with self.waiting() if waiting else _nothing():
+                yield
+            return
+
+        self._active = True
+        self._wait = 0.0
+        started = time.perf_counter()
+        ok = False
+        try:
+            if waiting:
+                async with self.waiting():
+                    yield
+            else:
+                yield
+            ok = True
+        finally:
+            duration = time.perf_counter() - started
+            wait = min(self._wait, duration)
+            self._active = False
+            route = route_of(getattr(page, "url", None))
+            self.steps.append(Step(
+                kind=kind,
+                target=describe(target),
+                route=route,
+                started=round(started - self.started, 4),
+                duration=round(duration, 4),
+                wait=round(wait, 4),
+                act=round(duration - wait, 4),
+                ok=ok,
+            ))
+            await self.sample(page, route)
+
+    @asynccontextmanager
+    async def waiting(self):
+        """Count the enclosed time as waiting for the current step."""
+        self._waiting_depth += 1
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._waiting_depth -= 1
+            if self._waiting_depth == 0:
+                self._wait += time.perf_counter() - started
+
+    async def sample(self, page, route):
+        """Pull LCP, long tasks and heap size from the page, if it is still there."""
+        if route is None or page is None:
+            return
+        try:
+            metrics = await page.evaluate(SAMPLE_SCRIPT)
+        except Exception:
+            return  # closed or mid-navigation; the next step samples again
+        if metrics.get("lcp") is not None:
+            # First route seen for a document keeps its LCP: that is the screen that loaded.
+            previous = self.lcp.get(metrics["document"])
+            self.lcp[metrics["document"]] = (previous[0] if previous else route, metrics["lcp"])
+        self.long_tasks[route].extend(metrics.get("longTasks") or [])
+        if metrics.get("heap"):
+            self.heap[route] = max(self.heap.get(route, 0), metrics["heap"])
+
+    def finish(self):
+        self.finished = time.perf_counter()
+
+    # -- reporting -------------------------------------------------------
+
+    def _lcp_by_route(self):
+        by_route = defaultdict(list)
+        for route, lcp in self.lcp.values():
+            by_route[route].append(round(lcp, 1))
+        return dict(by_route)
+
+    def summary(self):
+        """JSON-friendly per-test totals plus the step list."""
+        total = (self.finished or time.perf_counter()) - self.started
+        stepped = sum(step.duration for step in self.steps)
+        wait = sum(step.wait for step in self.steps)
+        return {
+            "total": round(total, 4),
+            "steps": len(self.steps),
+            "wait": round(wait, 4),
+            "act": round(stepped - wait, 4),
+            # Browser setup/teardown, metric sampling and plain Python between steps.
+            "overhead": round(max(total - stepped, 0), 4),
+            "lcp_ms": self._lcp_by_route(),
+            "long_tasks": {route: [round(ms, 1) for ms in tasks] for route, tasks in self.long_tasks.items()},
+            "heap_bytes": dict(self.heap),
+            "step_list": [asdict(step) for step in self.steps],
+        }
+
+
+@asynccontextmanager
+async def _nothing():
+    yield
+
+
+# ============================================
+# Hooks
+# ============================================
+
+def current():
+    """The recorder of the test running in this task, or None."""
+    return _current.get()
+
+
+def activate(recorder):
+    """Make ``recorder`` current for this task; returns a token for :func:`deactivate`."""
+    return _current.set(recorder)
+
+
+def deactivate(token):
+    _current.reset(token)
+
+
+def step(kind, page, target=None, waiting=False):
+    """Time the enclosed block as a step of the current test (no-op without one)."""
+    recorder = current()
+    if recorder is None:
+        return _nothing()
+    return recorder.step(kind, page, target, waiting)
+
+
+def waiting():
+    """Count the enclosed block as waiting time of the current step."""
+    recorder = current()
+    if recorder is None:
+        return _nothing()
+    return recorder.waiting()
+
+
+def instrument_page(page):
+    """Time ``page.goto`` calls as navigation steps."""
+    goto = page.goto
+
+    async def timed_goto(url, **kwargs):
+        async with step("navigate", page, url):
+            return await goto(url, **kwargs)
+
+    page.goto = timed_goto
+    return page
+
+
+async def instrument_context(context):
+    """Install the performance observers and time navigations of new pages."""
+    if current() is None:
+        return context
+    await context.add_init_script(PERF_INIT_SCRIPT)
+    new_page = context.new_page
+
+    async def instrumented_new_page(*args, **kwargs):
+        return instrument_page(await new_page(*args, **kwargs))
+
+    context.new_page = instrumented_new_page
+    return context
+
+
+class _TimedAssertions:
+    """Wraps Playwright's assertion object so each ``to_*`` call is a step."""
+
+    def __init__(self, assertions, actual):
+        self._assertions = assertions
+        self._actual = actual
+
+    @property
+    def not_(self):
+        return _TimedAssertions(self._assertions.not_, self._actual)
+
+    def __getattr__(self, name):
+        attribute = getattr(self._assertions, name)
+        if not callable(attribute):
+            return attribute
+
+        async def timed(*args, **kwargs):
+            async with step("expect", _page_of(self._actual), f"{name} {describe(self._actual)}", waiting=True):
+                return await attribute(*args, **kwargs)
+
+        return timed
+
+
+def expect(actual, *args, **kwargs):
+    """Drop-in for ``playwright.async_api.expect`` that times each assertion."""
+    from playwright.async_api import expect as playwright_expect
+
+    return _TimedAssertions(playwright_expect(actual, *args, **kwargs), actual)
+
+
+# ============================================
+# Aggregation
+# ============================================
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def aggregate(summaries):
+    """Roll per-test summaries (``{name: summary}``) up into a per-route report."""
+    routes = defaultdict(lambda: {
+        "tests": set(), "steps": 0, "time": 0.0, "wait": 0.0, "act": 0.0,
+        "durations": [], "lcp_ms": [], "long_tasks": 0, "long_task_ms": 0.0, "heap_max_bytes": 0,
+    })
+    for name, summary in summaries.items():
+        for entry in summary["step_list"]:
+            route = routes[entry["route"] or "(none)"]
+            route["tests"].add(name)
+            route["steps"] += 1
+            route["time"] += entry["duration"]
+            route["wait"] += entry["wait"]
+            route["act"] += entry["act"]
+            route["durations"].append(entry["duration"])
+        for route_name, lcp in summary["lcp_ms"].items():
+            routes[route_name]["lcp_ms"].extend(lcp)
+        for route_name, tasks in summary["long_tasks"].items():
+            routes[route_name]["long_tasks"] += len(tasks)
+            routes[route_name]["long_task_ms"] += sum(tasks)
+        for route_name, heap in summary["heap_bytes"].items():
+            routes[route_name]["heap_max_bytes"] = max(routes[route_name]["heap_max_bytes"], heap)
+
+    report = {}
+    for name, route in sorted(routes.items(), key=lambda item: -item[1]["time"]):
+        durations = route.pop("durations")
+        lcp = route.pop("lcp_ms")
+        report[name] = {
+            **route,
+            "tests": len(route["tests"]),
+            "time": round(route["time"], 3),
+            "wait": round(route["wait"], 3),
+            "act": round(route["act"], 3),
+            "step_p50": _percentile(durations, 0.5),
+            "step_p95": _percentile(durations, 0.95),
+            "lcp_ms_p50": _percentile(lcp, 0.5),
+            "lcp_ms_max": max(lcp) if lcp else None,
+            "long_task_ms": round(route["long_task_ms"], 1),
+        }
+    return report
+
+
+def format_routes(report):
+    """Plain-text table of :func:`aggregate` output, slowest route first."""
+    lines = [f"{'route':<18}{'tests':>6}{'steps':>7}{'time s':>9}{'wait s':>9}{'act s':>8}"
+             f"{'p95 s':>8}{'LCP ms':>9}{'long tasks':>12}{'heap MB':>9}"]
+    for name, route in report.items():
+        lcp = route["lcp_ms_p50"]
+        heap = route["heap_max_bytes"] / 2 ** 20
+        lines.append(
+            f"{name:<18}{route['tests']:>6}{route['steps']:>7}{route['time']:>9.2f}{route['wait']:>9.2f}"
+            f"{route['act']:>8.2f}{route['step_p95'] or 0:>8.2f}{'-' if lcp is None else f'{lcp:.0f}':>9}"
+            f"{route['long_tasks']:>5} /{route['long_task_ms']:>5.0f}ms{heap:>9.1f}"
+        )
+    return "\n".join(lines)
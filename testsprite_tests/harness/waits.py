@@ -0,0 +1,163 @@
+"""Condition-based waits for the TC scripts.
+
+The generated scripts used to sleep ``page.wait_for_timeout(3000)`` before every
+``fill`` and ``click``. These helpers wait on real readiness signals instead:
+
+- the DOM has loaded,
+- no Supabase request (``/auth/v1``, ``/rest/v1``, ``/storage/v1``) is in
+  flight and none has started for a short quiet window,
+- the target locator is actionable (Playwright's own auto-wait),
+- after a click, any route change the click caused has committed.
+
+Each wait is bounded, so a slow machine gets more time while a fast one moves
+on as soon as the UI is ready. Usage inside a TC script::
+
+    from harness import waits
+
+    await waits.fill(page, elem, 'example@gmail.com')
+    await waits.click(page, elem)
+    await waits.route(frame, '/dashboard')
+
+Under ``harness.runner`` each helper is also a timed step (see
+``harness.timing``).
+"""
+
+import asyncio
+import os
+import weakref
+
+from harness import timing
+
+# Backend calls worth waiting for: the Supabase REST, auth and storage APIs
+# (real project or local stand-in alike).
+SUPABASE_PATHS = ("/auth/v1/", "/rest/v1/", "/storage/v1/")
+
+# Time without any new backend request before the page counts as idle.
+QUIET_MS = int(os.environ.get("TESTSPRITE_QUIET_MS", "150"))
+# Upper bound for network idle; the app keeps working past it, we just stop waiting.
+IDLE_TIMEOUT_MS = int(os.environ.get("TESTSPRITE_IDLE_TIMEOUT_MS", "10000"))
+# Actionability timeout for fill/click, generous enough for slow CI boxes.
+ACTION_TIMEOUT_MS = int(os.environ.get("TESTSPRITE_ACTION_TIMEOUT_MS", "15000"))
+# How long a click may take to change the route or start a request.
+ROUTE_TIMEOUT_MS = int(os.environ.get("TESTSPRITE_ROUTE_TIMEOUT_MS", "10000"))
+
+_POLL_SECONDS = 0.025
+
+_trackers = weakref.WeakKeyDictionary()
+
+
+def _is_backend(request):
+    return any(marker in request.url for marker in SUPABASE_PATHS)
+
+
+class NetworkTracker:
+    """Counts in-flight Supabase requests for one page."""
+
+    def __init__(self, page):
+        self._pending = set()
+        self._last_activity = asyncio.get_running_loop().time()
+        page.on("request", self._on_request)
+        page.on("requestfinished", self._on_done)
+        page.on("requestfailed", self._on_done)
+
+    @property
+    def pending(self):
+        return len(self._pending)
+
+    def touch(self):
+        """Restart the quiet window, e.g. right after a click."""
+        self._last_activity = asyncio.get_running_loop().time()
+
+    def _on_request(self, request):
+        if _is_backend(request):
+            self._pending.add(request)
+            self.touch()
+
+    def _on_done(self, request):
+        if request in self._pending:
+            self._pending.discard(request)
+            self.touch()
+
+    async def wait_idle(self, quiet_ms=QUIET_MS, timeout_ms=IDLE_TIMEOUT_MS):
+        """Wait until nothing is in flight for ``quiet_ms``; False on timeout."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout_ms / 1000
+        quiet = quiet_ms / 1000
+        while True:
+            now = loop.time()
+            if not self._pending and now - self._last_activity >= quiet:
+                return True
+            if now >= deadline:
+                return False
+            await asyncio.sleep(_POLL_SECONDS)
+
+
+def tracker(page):
+    """Return the page's tracker, attaching one on first use."""
+    found = _trackers.get(page)
+    if found is None:
+        found = _trackers[page] = NetworkTracker(page)
+    return found
+
+
+async def _settle(page, timeout_ms):
+    network = tracker(page)
+    try:
+        await page.wait_for_load_state("domcontentloaded", timeout=timeout_ms)
+    except Exception:
+        pass
+    return await network.wait_idle(timeout_ms=timeout_ms)
+
+
+async def settle(page, timeout_ms=IDLE_TIMEOUT_MS):
+    """Wait for the DOM and for in-flight Supabase calls to finish.
+
+    Never raises on timeout: the following action has its own actionability
+    timeout and produces a clearer error.
+    """
+    async with timing.step("settle", page, waiting=True):
+        return await _settle(page, timeout_ms)
+
+
+async def fill(page, locator, value, timeout=ACTION_TIMEOUT_MS):
+    """Fill ``locator`` once the page has settled and the field is editable."""
+    async with timing.step("fill", page, locator):
+        async with timing.waiting():
+            await _settle(page, IDLE_TIMEOUT_MS)
+        await locator.fill(value, timeout=timeout)
+
+
+async def click(page, locator, timeout=ACTION_TIMEOUT_MS):
+    """Click ``locator`` and wait for whatever the click set in motion.
+
+    A click on a submit button usually starts a Supabase call and then a
+    client-side navigation; both are awaited before returning.
+    """
+    async with timing.step("click", page, locator):
+        async with timing.waiting():
+            await _settle(page, IDLE_TIMEOUT_MS)
+        url_before = page.url
+        network = tracker(page)
+        await locator.click(timeout=timeout)
+        network.touch()
+        async with timing.waiting():
+            await network.wait_idle(timeout_ms=ROUTE_TIMEOUT_MS)
+            if page.url != url_before:
+                try:
+                    await page.wait_for_load_state("domcontentloaded", timeout=ROUTE_TIMEOUT_MS)
+                except Exception:
+                    pass
+
+
+async def route(page, fragment, timeout_ms=ROUTE_TIMEOUT_MS):
+    """Wait until the URL contains ``fragment``; returns whether it did.
+
+    Meant to precede ``assert fragment in frame.url`` so the assertion checks
+    the settled route rather than whatever the SPA showed mid-redirect.
+    """
+    async with timing.step("route", page, fragment, waiting=True):
+        try:
+            await page.wait_for_url(lambda url: fragment in url, timeout=timeout_ms)
+            return True
+        except Exception:
+            return False